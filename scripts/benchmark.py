@@ -0,0 +1,358 @@
+"""Benchmark checkers and editor hot paths on scaled copies of the test inputs.
+
+Usage: From the repository root directory run
+    poetry run python scripts/benchmark.py [options]
+
+For example, to record a baseline, then check later changes against it:
+    poetry run python scripts/benchmark.py --save-baseline bench.json
+    poetry run python scripts/benchmark.py --baseline bench.json
+
+Each input in `tests/input` is repeated 1, 10 and 50 times (see `--scales`)
+to make books of increasing size. Times are the best of `--repeat` runs.
+A benchmark is flagged as a regression if it is slower than the baseline by
+more than `--threshold` (a fraction), and the exit status is then 1.
+
+Benchmarks that need the main window (file open/save, word frequency,
+find/replace all, rewrap and HTML autogenerate) are skipped if there is no
+display available, e.g. run under `xvfb-run` on a headless machine.
+"""
+
+import argparse
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import platform
+import sys
+import tempfile
+import time
+import tkinter as tk
+from typing import Any, Callable
+
+from guiguts.application import Guiguts
+from guiguts.checkers import DocumentSnapshot
+from guiguts.file import the_file
+from guiguts.headless import HEADLESS_TOOLS, load_document
+from guiguts.html_convert import do_html_autogenerate, HTMLGeneratorDialog
+from guiguts.maintext import maintext
+from guiguts.project_dict import ProjectDict
+from guiguts.root import root
+from guiguts.word_frequency import word_frequency
+
+INPUT_DIR = Path(__file__).parent.parent / "tests" / "input"
+DEFAULT_SCALES = "1,10,50"
+DEFAULT_THRESHOLD = 0.25
+# Ignore changes smaller than this, in seconds, since they are mostly noise
+MIN_REGRESSION_SECS = 0.05
+
+
+@dataclass
+class Benchmark:
+    """One benchmark.
+
+    Attributes:
+        name: Name of benchmark.
+        input_name: Name of file in `tests/input` to scale up.
+        prepare: Untimed setup, given name of scaled file. Returns argument for `run`.
+        run: Timed operation.
+        gui: True if benchmark needs the main window.
+    """
+
+    name: str
+    input_name: str
+    prepare: Callable[[Path], Any]
+    run: Callable[[Any], Any]
+    gui: bool = False
+
+
+def prepare_checker(tool: str) -> Callable[[Path], Any]:
+    """Return function to load a file for a checker tool, and load any
+    dictionaries the tool needs, so that only the check itself is timed.
+
+    Args:
+        tool: Name of tool in `HEADLESS_TOOLS`.
+    """
+
+    def prepare(path: Path) -> tuple[DocumentSnapshot, ProjectDict]:
+        """Load file & warm up tool."""
+        document, project_dict, _ = load_document(str(path))
+        HEADLESS_TOOLS[tool](DocumentSnapshot("", document.languages), ProjectDict())
+        return document, project_dict
+
+    return prepare
+
+
+def checker_benchmark(tool: str) -> Benchmark:
+    """Return benchmark for a checker tool, run without the main window.
+
+    Args:
+        tool: Name of tool in `HEADLESS_TOOLS`.
+    """
+    return Benchmark(
+        tool,
+        "pp_complete.txt",
+        prepare_checker(tool),
+        lambda args: HEADLESS_TOOLS[tool](*args),
+    )
+
+
+def load_into_main_window(path: Path) -> None:
+    """Load file into main window, replacing any previous (possibly edited) file.
+
+    Args:
+        path: Name of file to load.
+    """
+    the_file().load_file(str(path))
+    root().update()
+
+
+def run_and_update(func: Callable[[], Any]) -> Callable[[Any], None]:
+    """Return function that runs `func`, then processes pending idle tasks,
+    e.g. redrawing, so that their time is included.
+
+    Args:
+        func: Function to be run.
+    """
+
+    def run(_: Any) -> None:
+        """Run func, then update."""
+        func()
+        root().update_idletasks()
+
+    return run
+
+
+def prepare_html(path: Path) -> None:
+    """Load file and open HTML Generator dialog, as autogenerate expects.
+
+    Args:
+        path: Name of file to load.
+    """
+    load_into_main_window(path)
+    HTMLGeneratorDialog.show_dialog()
+
+
+BENCHMARKS = [
+    checker_benchmark("spell"),
+    checker_benchmark("bookloupe"),
+    checker_benchmark("jeebies"),
+    checker_benchmark("pptxt"),
+    checker_benchmark("levenshtein"),
+    Benchmark(
+        "file_open",
+        "pp_complete.txt",
+        lambda path: path,
+        load_into_main_window,
+        gui=True,
+    ),
+    Benchmark(
+        "file_save",
+        "pp_complete.txt",
+        load_into_main_window,
+        run_and_update(lambda: the_file().save_file()),
+        gui=True,
+    ),
+    Benchmark(
+        "word_frequency",
+        "pp_complete.txt",
+        load_into_main_window,
+        run_and_update(word_frequency),
+        gui=True,
+    ),
+    Benchmark(
+        "find_all",
+        "pp_complete.txt",
+        load_into_main_window,
+        run_and_update(
+            lambda: maintext().find_all(
+                maintext().start_to_end(),
+                "the",
+                regexp=False,
+                wholeword=True,
+                nocase=True,
+            )
+        ),
+        gui=True,
+    ),
+    Benchmark(
+        "replace_all",
+        "pp_complete.txt",
+        load_into_main_window,
+        run_and_update(lambda: maintext().replace_all("the", "teh")),
+        gui=True,
+    ),
+    Benchmark(
+        "rewrap_all",
+        "pp_complete.txt",
+        load_into_main_window,
+        run_and_update(lambda: the_file().rewrap_all()),
+        gui=True,
+    ),
+    Benchmark(
+        "html_autogenerate",
+        "pre_htmlgen.txt",
+        prepare_html,
+        run_and_update(do_html_autogenerate),
+        gui=True,
+    ),
+]
+
+
+def make_scaled_input(input_name: str, scale: int, out_dir: Path) -> Path:
+    """Create file containing several copies of a test input.
+
+    Args:
+        input_name: Name of file in `tests/input`.
+        scale: Number of copies.
+        out_dir: Directory to create file in.
+
+    Returns:
+        Name of scaled file.
+    """
+    path = out_dir / f"{Path(input_name).stem}_{scale}x{Path(input_name).suffix}"
+    if not path.exists():
+        text = (INPUT_DIR / input_name).read_text(encoding="utf-8")
+        path.write_text(text * scale, encoding="utf-8")
+    return path
+
+
+def start_guiguts() -> bool:
+    """Start Guiguts in test mode, with the main window if possible.
+
+    Returns:
+        True if main window was created.
+    """
+    try:
+        Guiguts(args=["--nohome"])
+        return True
+    except tk.TclError as exc:
+        print(f"No display, so skipping benchmarks that need main window: {exc}")
+    # Set up preferences, etc., as for headless checking
+    app = Guiguts.__new__(Guiguts)
+    app.parse_args(["--nohome"])
+    app.initialize_preferences()
+    return False
+
+
+def time_benchmark(benchmark: Benchmark, path: Path, repeat: int) -> float:
+    """Time a benchmark on a file.
+
+    Args:
+        benchmark: Benchmark to time.
+        path: Name of input file.
+        repeat: Number of times to run benchmark.
+
+    Returns:
+        Best time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        arg = benchmark.prepare(path)
+        start = time.perf_counter()
+        benchmark.run(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare_to_baseline(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """Print results alongside baseline, flagging regressions.
+
+    Args:
+        results: Time for each benchmark, keyed by "name@scale".
+        baseline: Baseline time for each benchmark.
+        threshold: Fractional slowdown above which to flag a regression.
+
+    Returns:
+        Keys of benchmarks that regressed.
+    """
+    regressions = []
+    print(f"{'benchmark':<28}{'time':>10}{'baseline':>10}{'change':>9}")
+    for key, secs in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<28}{secs:>10.3f}{'-':>10}")
+            continue
+        change = (secs - base) / base if base else 0.0
+        flag = ""
+        if secs > base * (1 + threshold) and secs - base > MIN_REGRESSION_SECS:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:<28}{secs:>10.3f}{base:>10.3f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    """Run benchmarks.
+
+    Returns:
+        Exit status: 1 if any regressions, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "--scales",
+        default=DEFAULT_SCALES,
+        help=f"Comma-separated scale factors for inputs (default {DEFAULT_SCALES})",
+    )
+    parser.add_argument(
+        "--only",
+        help="Comma-separated names of benchmarks to run: "
+        + ", ".join(benchmark.name for benchmark in BENCHMARKS),
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Runs per benchmark (default 1)"
+    )
+    parser.add_argument("--baseline", help="JSON baseline file to compare with")
+    parser.add_argument("--save-baseline", help="Save results as JSON baseline file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Fractional slowdown to flag as regression (default {DEFAULT_THRESHOLD})",
+    )
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    benchmarks = BENCHMARKS
+    if args.only:
+        names = args.only.split(",")
+        benchmarks = [benchmark for benchmark in BENCHMARKS if benchmark.name in names]
+    gui_ok = start_guiguts()
+
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for benchmark in benchmarks:
+            if benchmark.gui and not gui_ok:
+                continue
+            for scale in scales:
+                path = make_scaled_input(benchmark.input_name, scale, Path(tmp_dir))
+                key = f"{benchmark.name}@{scale}x"
+                results[key] = time_benchmark(benchmark, path, args.repeat)
+                print(f"{key}: {results[key]:.3f}s", file=sys.stderr)
+
+    baseline: dict[str, float] = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fp:
+            baseline = json.load(fp)["results"]
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "machine": platform.platform(),
+                    "python": platform.python_version(),
+                    "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "repeat": args.repeat,
+                    "results": {key: round(secs, 4) for key, secs in results.items()},
+                },
+                fp,
+                indent=2,
+            )
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
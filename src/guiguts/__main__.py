@@ -2,4 +2,6 @@
 
 from guiguts.application import main
 
-main()
+# Guard needed because worker processes import the main module
+if __name__ == "__main__":
+    main()
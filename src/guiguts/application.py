@@ -35,6 +35,7 @@ from guiguts.content_providing import (
 
 from guiguts.file import File, the_file, NUM_RECENT_FILES
 from guiguts.footnotes import footnote_check, FootnoteIndexStyle, footnote_mask
+from guiguts.headless import check_headless, batch_headless, HEADLESS_TOOLS
 from guiguts.html_convert import HTMLGeneratorDialog, HTMLMarkupTypes
 from guiguts.html_tools import (
     HTMLImageAutoDialog,
@@ -142,7 +143,7 @@ from guiguts.tools.jeebies import jeebies_check, JeebiesParanoiaLevel
 from guiguts.tools.levenshtein import levenshtein_check, LevenshteinEditDistance
 from guiguts.tools.pptxt import pptxt
 from guiguts.tools.pphtml import PPhtmlChecker
-from guiguts.tools.ppcomp import PPcompChecker, PPcompDisplayType
+from guiguts.tools.ppcomp import PPcompChecker, PPcompDisplayType, ppcomp_headless
 from guiguts.utilities import (
     is_mac,
     is_windows,
@@ -184,6 +185,20 @@ class Guiguts:
             print(version("guiguts"))
             sys.exit(0)
 
+        if self.args.command == "check":
+            self.logging_init()
+            self.initialize_preferences()
+            tools = self.args.tools.split(",")
+            if self.args.batch:
+                sys.exit(batch_headless(self.args.batch, tools, self.args.report_dir))
+            sys.exit(check_headless(self.args.files, tools, self.args.json))
+
+        if self.args.ppcomp:
+            self.logging_init()
+            self.initialize_preferences()
+            pairs = [(pair[0], pair[1]) for pair in self.args.ppcomp]
+            sys.exit(ppcomp_headless(pairs, self.args.format))
+
         self.logging_init()
         logger.info("Guiguts started")
 
@@ -263,6 +278,9 @@ class Guiguts:
             args = sys.argv[1:]
         else:
             is_test(True)
+        if args and args[0] == "check":
+            self.parse_check_args(args[1:])
+            return
         parser = argparse.ArgumentParser(
             prog="guiguts", description="Guiguts is an ebook creation tool"
         )
@@ -302,7 +320,75 @@ class Guiguts:
             action="store_true",
             help="Reset layout of dialogs and main window to defaults",
         )
+        parser.add_argument(
+            "--ppcomp",
+            nargs=2,
+            action="append",
+            metavar=("FILE1", "FILE2"),
+            help="Compare two files with PPcomp without opening a window (repeatable)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["text", "json"],
+            default="text",
+            help="Output format for `--ppcomp` (default `text`)",
+        )
+        parser.set_defaults(command=None)
+        self.args = parser.parse_args(args)
+
+    def parse_check_args(self, args: list[str]) -> None:
+        """Parse command line args for `check` command, which runs checker
+        tools without opening a window."""
+        parser = argparse.ArgumentParser(
+            prog="guiguts check",
+            description="Run checker tools on files without opening a window",
+        )
+        parser.add_argument("files", nargs="*", help="Names of files to be checked")
+        parser.add_argument(
+            "--tools",
+            required=True,
+            help=f"Comma-separated tools to run, from: {', '.join(HEADLESS_TOOLS)}",
+        )
+        parser.add_argument(
+            "--json",
+            metavar="FILE",
+            help="Write results to FILE as JSON Lines (default stdout)",
+        )
+        parser.add_argument(
+            "--batch",
+            metavar="DIR",
+            help="Check all projects (text/HTML files with bin files) in DIR tree",
+        )
+        parser.add_argument(
+            "--report-dir",
+            metavar="DIR",
+            help="Directory for per-project reports and summary from `--batch`",
+        )
+        parser.add_argument(
+            "-p",
+            "--prefsfile",
+            help="Basename of prefs file (default `GGprefs`)",
+        )
+        parser.add_argument(
+            "-d",
+            "--debug",
+            action="store_true",
+            help="Run in debug mode",
+        )
+        parser.add_argument(
+            "--nohome",
+            action="store_true",
+            help="Do not load the Preferences file",
+        )
+        parser.set_defaults(command="check", version=False)
         self.args = parser.parse_args(args)
+        if self.args.batch:
+            if self.args.files or self.args.json:
+                parser.error("files and --json cannot be used with --batch")
+            if not self.args.report_dir:
+                parser.error("--report-dir is required with --batch")
+        elif not self.args.files:
+            parser.error("files or --batch required")
 
     def load_file_if_given(self) -> None:
         """If filename, or recent number, given on command line
@@ -325,6 +411,11 @@ class Guiguts:
             self.file.image_dir_check()
             self.file.auto_image_check()
 
+    def profile_next_command_callback(self, value: bool) -> None:
+        """Callback when profile next command preference is changed."""
+        if value:
+            logger.info("Next command will be profiled")
+
     def see_image(self) -> None:
         """Show the image corresponding to current location."""
         self.file.image_dir_check()
@@ -696,6 +787,11 @@ class Guiguts:
         preferences.set_default(PrefKey.EBOOKMAKER_ALL, False)
         preferences.set_default(PrefKey.EBOOKMAKER_VERBOSE_OUTPUT, False)
         preferences.set_default(PrefKey.BACKUPS_ENABLED, True)
+        preferences.set_default(PrefKey.TOOL_TIMING, False)
+        preferences.set_default(PrefKey.PROFILE_NEXT_COMMAND, False)
+        preferences.set_callback(
+            PrefKey.PROFILE_NEXT_COMMAND, self.profile_next_command_callback
+        )
         preferences.set_default(PrefKey.AUTOSAVE_ENABLED, False)
         preferences.set_default(PrefKey.AUTOSAVE_INTERVAL, 5)
         preferences.set_default(PrefKey.ASCII_TABLE_HANGING, True)
@@ -838,6 +934,8 @@ class Guiguts:
         ]:
             del custom_menu[2]
         preferences.set(PrefKey.CUSTOM_MENU_ENTRIES, custom_menu)
+        # Profiling only applies to the next command in the same session
+        preferences.set(PrefKey.PROFILE_NEXT_COMMAND, False)
 
     # Lay out menus
     def init_menus(self) -> None:
@@ -1449,6 +1547,7 @@ class Guiguts:
         help_menu.add_button(
             "Command ~Palette", CommandPaletteDialog.show_dialog, "Cmd/Ctrl+Shift+P"
         )
+        help_menu.add_checkbutton("Pro~file Next Command", PrefKey.PROFILE_NEXT_COMMAND)
 
     def init_os_menu(self) -> None:
         """Create the OS-specific menu.
@@ -1465,6 +1564,8 @@ class Guiguts:
         Warning: don't call this too often. It appears that at least on Windows, this can
         sometimes cause the program to silently exit.
         """
+        menubar_metadata().invalidate_palette_index()
+
         # Remove all tk submenus, buttons, checkbuttons and separators
         for top_level in menubar_metadata().entries:
             assert isinstance(top_level, MenuMetadata)
@@ -0,0 +1,185 @@
+"""Schedule work, e.g. highlighting, to be done when the main text changes.
+
+Changes are noted as they happen, then the passes that depend on those
+kinds of change are run once when the program is next idle. A pass may
+provide a function that returns the inputs it depends on, e.g. the text it
+scans, so that it can be skipped if they are unchanged since it last ran.
+"""
+
+from enum import Flag, auto
+import time
+import tkinter as tk
+from typing import Any, Callable, Hashable, Optional
+
+
+class ChangeKind(Flag):
+    """Kinds of change to the main text."""
+
+    TEXT = auto()  # Text edited
+    CURSOR = auto()  # Insert cursor moved, or selection or focus changed
+    VIEW = auto()  # Scrolled or resized
+    ALL = TEXT | CURSOR | VIEW
+
+
+class ChangePass:
+    """One pass to be run when the main text changes.
+
+    Attributes:
+        name: Name of pass.
+        func: Function that does the pass.
+        depends: Kinds of change that the pass needs to be run after.
+        inputs: Optional function returning the values the pass depends on.
+        last_inputs: Value returned by `inputs` when pass last ran.
+        avg_secs: Moving average of time taken by pass.
+        last_run: Time pass last ran, from `time.perf_counter`.
+        deferred: True if pass has been throttled, and will run later.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], None],
+        depends: ChangeKind,
+        inputs: Optional[Callable[[], Hashable]] = None,
+    ) -> None:
+        """Initialize pass."""
+        self.name = name
+        self.func = func
+        self.depends = depends
+        self.inputs = inputs
+        self.last_inputs: Optional[Hashable] = None
+        self.avg_secs = 0.0
+        self.last_run = 0.0
+        self.deferred = False
+
+
+class ChangeScheduler:
+    """Run passes when idle after the main text changes.
+
+    Only passes that depend on the kinds of change that have happened
+    are run, and those whose inputs are the same as last time are skipped.
+    Passes that take a long time are run at most once per `THROTTLE_SECS`,
+    so that they don't slow down fast typing or scrolling.
+    """
+
+    # A pass taking longer than this on average is throttled
+    HEAVY_PASS_SECS = 0.02
+    # Minimum interval between runs of a throttled pass
+    THROTTLE_SECS = 0.2
+    # Weight of latest time in moving average of time taken by a pass
+    AVG_WEIGHT = 0.3
+
+    def __init__(self, widget: tk.Misc) -> None:
+        """Initialize scheduler.
+
+        Args:
+            widget: Widget used to schedule passes.
+        """
+        self.widget = widget
+        self.passes: dict[str, ChangePass] = {}
+        self.pending = ChangeKind(0)
+        self.scheduled = False
+        # Values shared between passes' input functions during a run
+        self.run_values: dict[Hashable, Any] = {}
+
+    def add_pass(
+        self,
+        name: str,
+        func: Callable[[], None],
+        depends: ChangeKind = ChangeKind.ALL,
+        inputs: Optional[Callable[[], Hashable]] = None,
+    ) -> None:
+        """Add a pass, to be run after passes already added.
+
+        Args:
+            name: Name of pass.
+            func: Function that does the pass.
+            depends: Kinds of change that the pass needs to be run after.
+            inputs: Optional function returning the values the pass depends on;
+                if they are the same as when the pass last ran, it is skipped.
+        """
+        self.passes[name] = ChangePass(name, func, depends, inputs)
+
+    def changed(self, kind: ChangeKind = ChangeKind.ALL) -> None:
+        """Note that a change has happened, and schedule passes to be run.
+
+        Args:
+            kind: Kind(s) of change.
+        """
+        self.pending |= kind
+        if not self.scheduled:
+            self.scheduled = True
+            self.widget.after_idle(self.run)
+
+    def invalidate(self, name: str) -> None:
+        """Force a pass to be run next time, even if its inputs are unchanged,
+        e.g. because its highlighting has been removed.
+
+        Args:
+            name: Name of pass.
+        """
+        self.passes[name].last_inputs = None
+
+    def run_value(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Return a value that may be needed by several passes' input functions,
+        only calling the function to get it once per run.
+
+        Args:
+            key: Key to identify value.
+            func: Function returning value.
+        """
+        if key not in self.run_values:
+            self.run_values[key] = func()
+        return self.run_values[key]
+
+    def run(self) -> None:
+        """Run the passes that depend on the changes since the last run."""
+        kinds = self.pending
+        self.pending = ChangeKind(0)
+        self.scheduled = False
+        self.run_values.clear()
+        for change_pass in self.passes.values():
+            if change_pass.depends & kinds and not change_pass.deferred:
+                self.run_pass(change_pass)
+
+    def run_pass(self, change_pass: ChangePass, throttle: bool = True) -> None:
+        """Run a pass, unless its inputs are unchanged, or it needs throttling.
+
+        Args:
+            change_pass: Pass to run.
+            throttle: False to run pass even if it ran recently.
+        """
+        since_last_run = time.perf_counter() - change_pass.last_run
+        if (
+            throttle
+            and change_pass.avg_secs > self.HEAVY_PASS_SECS
+            and since_last_run < self.THROTTLE_SECS
+        ):
+            change_pass.deferred = True
+            self.widget.after(
+                int((self.THROTTLE_SECS - since_last_run) * 1000) + 1,
+                lambda: self.run_deferred(change_pass),
+            )
+            return
+        inputs = None
+        if change_pass.inputs is not None:
+            inputs = change_pass.inputs()
+            if inputs == change_pass.last_inputs:
+                return
+        start = time.perf_counter()
+        change_pass.func()
+        change_pass.last_run = time.perf_counter()
+        secs = change_pass.last_run - start
+        change_pass.avg_secs += self.AVG_WEIGHT * (secs - change_pass.avg_secs)
+        # Stored after running, so it isn't lost if pass invalidates itself
+        change_pass.last_inputs = inputs
+
+    def run_deferred(self, change_pass: ChangePass) -> None:
+        """Run a pass that was throttled.
+
+        Args:
+            change_pass: Pass to run.
+        """
+        change_pass.deferred = False
+        self.run_values.clear()
+        self.run_pass(change_pass, throttle=False)
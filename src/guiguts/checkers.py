@@ -3,15 +3,19 @@
 from enum import Enum, IntEnum, StrEnum, auto
 import logging
 import math
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, Generator
 
 import regex as re
 
-from guiguts.maintext import maintext, HighlightTag
+from guiguts.maintext import changed_lines, maintext, HighlightTag
 from guiguts.mainwindow import ScrolledReadOnlyText, menubar_metadata
 from guiguts.preferences import PrefKey, preferences, PersistentBoolean
+from guiguts.profiling import note_entries, Timing
 from guiguts.root import root
 from guiguts.utilities import (
     IndexRowCol,
@@ -115,6 +119,25 @@ class CheckerEntry:
         return HighlightTag.CHECKER_ERROR_PREFIX
 
 
+def default_severity(
+    text_range: Optional[IndexRange], error_prefix: str
+) -> CheckerEntrySeverity:
+    """Determine severity of entry if not given explicitly.
+
+    Args:
+        text_range: Start & end of point of interest, if any.
+        error_prefix: Prefix string indicating an error.
+
+    Returns:
+        Severity of entry.
+    """
+    if text_range is None:
+        return CheckerEntrySeverity.OTHER
+    if error_prefix:
+        return CheckerEntrySeverity.ERROR
+    return CheckerEntrySeverity.INFO
+
+
 class CheckerSortType(StrEnum):
     """Enum class to store Checker Dialog sort types."""
 
@@ -430,11 +453,18 @@ class CheckerDialog(ToplevelDialog):
             self.refresh_view_options()
 
         self.rerun_command = rerun_command
+        self.rerunner = rerunner
         self.rerun_button = ttk.Button(
             count_header_frame, text="Re-run", command=rerunner
         )
         self.rerun_button.grid(row=0, column=4, sticky="NSE", padx=(10, 0))
 
+        # Progress of background job, only shown while a job is running
+        self.job: Optional[CheckerJob] = None
+        self.progress_bar = ttk.Progressbar(count_header_frame)
+        self.progress_bar.grid(row=1, column=0, columnspan=5, sticky="EW", pady=(2, 0))
+        self.progress_bar.grid_remove()
+
         # Next a custom frame with contents determined by the dialog, e.g. Footnote tools
         self.custom_frame = ttk.Frame(
             self.top_frame, padding=2, borderwidth=1, relief=tk.GROOVE
@@ -925,7 +955,9 @@ class CheckerDialog(ToplevelDialog):
     def reset(self) -> None:
         """Reset dialog and associated structures & marks."""
         super().reset()
+        self.cancel_job()
         self.entries: list[CheckerEntry] = []
+        self.n_entries_displayed = 0
         self.count_linked_entries = 0
         self.count_suspects = 0
         self.section_count = 0
@@ -939,6 +971,31 @@ class CheckerDialog(ToplevelDialog):
             maintext().clear_marks(self.get_dlg_name())
             maintext().remove_spotlights()
 
+    def cancel_job(self) -> None:
+        """Cancel background job if one is running, discarding its results."""
+        if self.job is not None:
+            self.job.cancel(display=False)
+
+    def show_job_progress(self, fraction: Optional[float]) -> None:
+        """Show progress of background job, and let user cancel it.
+
+        Args:
+            fraction: Fraction of job completed, or None if no job is running.
+        """
+        if not self.progress_bar.winfo_exists():
+            return
+        if fraction is None:
+            self.progress_bar.grid_remove()
+            self.rerun_button.configure(text="Re-run", command=self.rerunner)
+            self.update_count_label()
+            return
+        assert self.job is not None
+        self.progress_bar.grid()
+        self.progress_bar["value"] = 100 * fraction
+        self.update_count_label()
+        self.count_label["text"] += f" - Working... {fraction:.0%}"
+        self.rerun_button.configure(text="Cancel", command=self.job.cancel)
+
     def select_entry_after_undo_redo(self) -> None:
         """Select the saved entry, if any, after a re-run following undo/redo."""
         entry_index = self.selection_on_clear[self.get_dlg_name()]
@@ -1103,14 +1160,8 @@ class CheckerDialog(ToplevelDialog):
             section: Optional overwrite of section count.
         """
         assert ep_index in (0, 1)
-        # Default determination of severity
         if severity is None:
-            if text_range is None:
-                severity = CheckerEntrySeverity.OTHER
-            elif error_prefix:
-                severity = CheckerEntrySeverity.ERROR
-            else:
-                severity = CheckerEntrySeverity.INFO
+            severity = default_severity(text_range, error_prefix)
 
         line = re.sub("\n", "⏎", msg)
         entry = CheckerEntry(
@@ -1151,6 +1202,7 @@ class CheckerDialog(ToplevelDialog):
             complete_msg: Set to False if "Check complete" message not wanted.
         """
 
+        note_entries(len(self.entries))
         Busy.busy()
         try:
             self.do_display_entries(auto_select_line, complete_msg)
@@ -1202,46 +1254,13 @@ class CheckerDialog(ToplevelDialog):
             and self.view_options_frame.winfo_ismapped()
         )
 
-        space = " "
         for entry in self.entries:
-            if self.skip_entry(entry):
-                continue
-            rowcol_str = ""
-            if entry.severity >= CheckerEntrySeverity.INFO:
-                self.count_linked_entries += 1
-            if entry.severity >= CheckerEntrySeverity.ERROR:
-                self.count_suspects += 1
-            if entry.text_range is not None:
-                colstr = f"{entry.text_range.start.col}:"
-                if entry.text_range.start.row < 0:
-                    rowcol_str = f"{space:>{maxrowlen}} {space:<{maxcollen}}"
-                else:
-                    rowcol_str = f"{entry.text_range.start.row:>{maxrowlen}}.{colstr:<{maxcollen}}"
-            ep = "" if hide_ep else entry.error_prefix
-            self.text.insert(tk.END, rowcol_str + ep + entry.text + "\n")
-            if entry.hilite_start is not None and entry.hilite_end is not None:
-                start_rowcol = IndexRowCol(self.text.index(tk.END + "-2line"))
-                start_rowcol.col = entry.hilite_start + len(rowcol_str) + len(ep)
-                end_rowcol = IndexRowCol(
-                    start_rowcol.row,
-                    entry.hilite_end + len(rowcol_str) + len(ep),
-                )
-                self.text.tag_add(
-                    HighlightTag.CHECKER_HIGHLIGHT,
-                    start_rowcol.index(),
-                    end_rowcol.index(),
-                )
-            if ep:
-                start_rowcol = IndexRowCol(self.text.index(tk.END + "-2line"))
-                start_rowcol.col = len(rowcol_str)
-                end_rowcol = IndexRowCol(start_rowcol.row, len(rowcol_str) + len(ep))
-                self.text.tag_add(
-                    entry.error_prefix_tag(),
-                    start_rowcol.index(),
-                    end_rowcol.index(),
-                )
-        # Output "Check complete", so user knows it's done
-        if complete_msg:
+            if not self.skip_entry(entry):
+                self._insert_entry_line(entry, maxrowlen, maxcollen, hide_ep)
+        self.n_entries_displayed = len(self.entries)
+        # Output "Check complete", so user knows it's done,
+        # unless still running, when more entries may be added to the end
+        if complete_msg and self.job is None:
             self.text.insert(tk.END, "\nCheck complete\n")
 
         # The default automatic highlighting of previously selected line, or if none
@@ -1274,6 +1293,95 @@ class CheckerDialog(ToplevelDialog):
         self.update_count_label()
         self.update_view_options_label()
 
+    def _insert_entry_line(
+        self, entry: CheckerEntry, maxrowlen: int, maxcollen: int, hide_ep: bool
+    ) -> None:
+        """Add a line to the end of the dialog to display an entry, and count it.
+
+        Args:
+            entry: Entry to display.
+            maxrowlen: Width of row number field.
+            maxcollen: Width of column number field.
+            hide_ep: True if error prefix is not to be shown.
+        """
+        space = " "
+        rowcol_str = ""
+        if entry.severity >= CheckerEntrySeverity.INFO:
+            self.count_linked_entries += 1
+        if entry.severity >= CheckerEntrySeverity.ERROR:
+            self.count_suspects += 1
+        if entry.text_range is not None:
+            colstr = f"{entry.text_range.start.col}:"
+            if entry.text_range.start.row < 0:
+                rowcol_str = f"{space:>{maxrowlen}} {space:<{maxcollen}}"
+            else:
+                rowcol_str = (
+                    f"{entry.text_range.start.row:>{maxrowlen}}.{colstr:<{maxcollen}}"
+                )
+        ep = "" if hide_ep else entry.error_prefix
+        self.text.insert(tk.END, rowcol_str + ep + entry.text + "\n")
+        if entry.hilite_start is not None and entry.hilite_end is not None:
+            start_rowcol = IndexRowCol(self.text.index(tk.END + "-2line"))
+            start_rowcol.col = entry.hilite_start + len(rowcol_str) + len(ep)
+            end_rowcol = IndexRowCol(
+                start_rowcol.row,
+                entry.hilite_end + len(rowcol_str) + len(ep),
+            )
+            self.text.tag_add(
+                HighlightTag.CHECKER_HIGHLIGHT,
+                start_rowcol.index(),
+                end_rowcol.index(),
+            )
+        if ep:
+            start_rowcol = IndexRowCol(self.text.index(tk.END + "-2line"))
+            start_rowcol.col = len(rowcol_str)
+            end_rowcol = IndexRowCol(start_rowcol.row, len(rowcol_str) + len(ep))
+            self.text.tag_add(
+                entry.error_prefix_tag(),
+                start_rowcol.index(),
+                end_rowcol.index(),
+            )
+
+    def display_new_entries(self) -> None:
+        """Display entries added since the entries were last displayed, while
+        a background job is still running, so the user can start work on them.
+
+        Only done when sorting by line & column. Since tools find problems
+        roughly in file order, new entries can usually just be added to the end
+        of the list. If not, all the entries are sorted and redisplayed. When
+        the job finishes, `display_entries` sorts and lays out all the entries.
+        """
+        if (
+            self.get_dialog_pref(PrefKey.CHECKERDIALOG_SORT_TYPE_DICT)
+            or CheckerSortType.ROWCOL
+        ) != CheckerSortType.ROWCOL or self.n_entries_displayed == len(self.entries):
+            return
+        try:
+            new_entries = sorted(
+                self.entries[self.n_entries_displayed :], key=self.rowcol_key
+            )
+            if self.n_entries_displayed > 0 and self.rowcol_key(
+                new_entries[0]
+            ) < self.rowcol_key(self.entries[self.n_entries_displayed - 1]):
+                # Keep any entry the user has already selected
+                self.do_display_entries(
+                    auto_select_line=bool(self.selected_text), complete_msg=False
+                )
+                return
+            self.entries[self.n_entries_displayed :] = new_entries
+            # Final layout isn't known yet, so allow enough room for any row number
+            maxrowlen = len(str(IndexRowCol(maintext().index(tk.END)).row))
+            hide_ep = (
+                self.get_view_options_count_index()[0] == 1
+                and self.view_options_frame.winfo_ismapped()
+            )
+            for entry in new_entries:
+                if not self.skip_entry(entry):
+                    self._insert_entry_line(entry, maxrowlen, 4, hide_ep)
+            self.n_entries_displayed = len(self.entries)
+        except tk.TclError:
+            logger.debug("Tcl error: Dialog closed while tool was running?")
+
     def showing_suspects_only(self) -> bool:
         """Return whether dialog is showing Suspects Only.
 
@@ -1787,3 +1895,402 @@ class CheckerDialog(ToplevelDialog):
         ):
             return entry.text[entry.hilite_start : entry.hilite_end]
         return entry.text
+
+
+class CheckerReport:
+    """Entries output by a checker, stored ready to add to the dialog.
+
+    Provides the subset of `CheckerDialog` methods that checkers use to output
+    their results, so a checker can be run away from the dialog, e.g. in a
+    worker process or from the command line.
+    """
+
+    def __init__(self) -> None:
+        """Initialize CheckerReport with no entries."""
+        self.records: list[tuple[CheckerEntryType, tuple[Any, ...], dict[str, Any]]] = (
+            []
+        )
+
+    def add_header(self, *header_lines: str) -> None:
+        """Store header lines.
+
+        Args:
+            header_lines: Strings to add as header lines
+        """
+        self.records.append((CheckerEntryType.HEADER, header_lines, {}))
+
+    def add_footer(self, *footer_lines: str) -> None:
+        """Store footer lines.
+
+        Args:
+            footer_lines: Strings to add as footer lines
+        """
+        self.records.append((CheckerEntryType.FOOTER, footer_lines, {}))
+
+    def add_entry(
+        self,
+        msg: str,
+        text_range: Optional[IndexRange] = None,
+        hilite_start: Optional[int] = None,
+        hilite_end: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Store an entry.
+
+        Args:
+            msg: Entry to be displayed.
+            text_range: Optional start & end of point of interest in main text widget.
+            hilite_start: Optional column to begin higlighting entry in dialog.
+            hilite_end: Optional column to end higlighting entry in dialog.
+            kwargs: Other keyword arguments accepted by `CheckerDialog.add_entry`,
+                e.g. `error_prefix`.
+        """
+        self.records.append(
+            (
+                CheckerEntryType.CONTENT,
+                (msg, text_range, hilite_start, hilite_end),
+                kwargs,
+            )
+        )
+
+    def progress(self, fraction: float) -> None:
+        """Note how far through the check has got.
+
+        Does nothing here, but checkers should call it regularly so that
+        when run as a `CheckerJob`, entries can be shown as they are found,
+        and the check can be cancelled.
+
+        Args:
+            fraction: Fraction of check completed, from 0 to 1.
+        """
+
+    def remap_rows(self, first: int, old_end: int, shift: int) -> int:
+        """Move stored entries to allow for lines edited since the text was
+        checked. Entries that are in the edited lines can't be moved, so are
+        left where they were.
+
+        Args:
+            first: Index of first edited line.
+            old_end: Index after last edited line, before the edit.
+            shift: Number of lines added by the edit, negative if removed.
+
+        Returns:
+            Number of entries in the edited lines.
+        """
+        n_unmapped = 0
+        for idx, (entry_type, args, kwargs) in enumerate(self.records):
+            if entry_type != CheckerEntryType.CONTENT or args[1] is None:
+                continue
+            msg, text_range, hilite_start, hilite_end = args
+            if text_range.end.row <= first:  # Rows count from 1, indexes from 0
+                continue
+            if text_range.start.row <= old_end:
+                n_unmapped += 1
+                continue
+            text_range = IndexRange(
+                IndexRowCol(text_range.start.row + shift, text_range.start.col),
+                IndexRowCol(text_range.end.row + shift, text_range.end.col),
+            )
+            self.records[idx] = (
+                entry_type,
+                (msg, text_range, hilite_start, hilite_end),
+                kwargs,
+            )
+        return n_unmapped
+
+    def add_to_dialog(self, dialog: "CheckerDialog") -> None:
+        """Add stored entries to dialog, in the order they were output.
+
+        Args:
+            dialog: Dialog to add entries to.
+        """
+        for entry_type, args, kwargs in self.records:
+            if entry_type == CheckerEntryType.HEADER:
+                dialog.add_header(*args)
+            elif entry_type == CheckerEntryType.FOOTER:
+                dialog.add_footer(*args)
+            else:
+                dialog.add_entry(*args, **kwargs)
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Convert stored entries to dictionaries, e.g. for JSON output.
+
+        Returns:
+            One dictionary per line of output, in the order they were output.
+        """
+        dicts: list[dict[str, Any]] = []
+        for entry_type, args, kwargs in self.records:
+            if entry_type != CheckerEntryType.CONTENT:
+                for line in args:
+                    dicts.append(
+                        {
+                            "type": entry_type.name.lower(),
+                            "message": line,
+                            "severity": CheckerEntrySeverity.OTHER.name.lower(),
+                        }
+                    )
+                continue
+            msg, text_range, hilite_start, hilite_end = args
+            error_prefix = kwargs.get("error_prefix", "")
+            severity = kwargs.get("severity") or default_severity(
+                text_range, error_prefix
+            )
+            record: dict[str, Any] = {
+                "type": entry_type.name.lower(),
+                "message": error_prefix + msg,
+                "severity": severity.name.lower(),
+            }
+            if text_range is not None:
+                record["row"] = text_range.start.row
+                record["col"] = text_range.start.col
+                record["end_row"] = text_range.end.row
+                record["end_col"] = text_range.end.col
+            if hilite_start is not None and hilite_end is not None:
+                record["hilite_start"] = hilite_start + len(error_prefix)
+                record["hilite_end"] = hilite_end + len(error_prefix)
+            dicts.append(record)
+        return dicts
+
+
+class DocumentSnapshot:
+    """Read-only copy of a document's text, for checkers that don't need the
+    main text widget, so they can be run from the command line or in a
+    worker process.
+    """
+
+    def __init__(self, text: str, languages: str = "en") -> None:
+        """Initialize DocumentSnapshot.
+
+        Args:
+            text: Text of whole document, without the widget's final newline.
+            languages: Languages used in text, separated by "+", e.g. "en+fr".
+        """
+        self.text = text
+        self.languages = languages
+        self.lines = text.split("\n")
+
+    @classmethod
+    def from_maintext(cls) -> "DocumentSnapshot":
+        """Create snapshot of text currently in main text widget.
+
+        Returns:
+            Snapshot of the text.
+        """
+        return cls(maintext().get_text(), maintext().languages)
+
+    def get_lines(self) -> Generator[tuple[str, int], None, None]:
+        """Yield each line & line number, as `MainText.get_lines` does."""
+        for line_num, line in enumerate(self.lines, start=1):
+            yield line, line_num
+
+    def get_language_list(self) -> list[str]:
+        """Get list of languages used in text.
+
+        Returns:
+            List of language strings.
+        """
+        return self.languages.split("+")
+
+
+class CheckerJobCancelled(Exception):
+    """Raised in a checker job's worker thread when the job has been cancelled."""
+
+
+class CheckerJobReport(CheckerReport):
+    """Report that passes its entries back to a `CheckerJob` in batches."""
+
+    # Minimum interval between batches in seconds
+    BATCH_INTERVAL = 0.05
+
+    def __init__(self, job: "CheckerJob") -> None:
+        """Initialize report for given job."""
+        super().__init__()
+        self.job = job
+        self.last_sent = time.monotonic()
+
+    def progress(self, fraction: float) -> None:
+        """Pass entries so far back to the job, unless recently done.
+
+        Args:
+            fraction: Fraction of check completed, from 0 to 1.
+
+        Raises:
+            CheckerJobCancelled: If the job has been cancelled.
+        """
+        if self.job.cancelled.is_set():
+            raise CheckerJobCancelled
+        now = time.monotonic()
+        if fraction < 1.0 and now - self.last_sent < self.BATCH_INTERVAL:
+            return
+        self.last_sent = now
+        self.job.results.put((self.records, fraction))
+        self.records = []
+
+
+class CheckerJob:
+    """Run a checker's analysis in a worker thread, so the user can continue
+    working while it runs, adding entries to its dialog as they are found.
+
+    The analysis function is given a snapshot of the text, and a report to add
+    its entries to. It should call the report's `progress` method regularly,
+    which passes the entries so far back to the dialog, and allows the job to
+    be cancelled. The analysis must not use Tk, e.g. the main text widget or the
+    dialog, since it is not run in the Tk main thread.
+
+    Entries found so far are displayed every `DISPLAY_INTERVAL` seconds, so the
+    user can start work on them before the job finishes. If the user edits the
+    text meanwhile, entries are moved to where their lines are now.
+    """
+
+    POLL_MS = 50
+    DISPLAY_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        dialog: "CheckerDialog",
+        name: str,
+        analysis: Callable[[DocumentSnapshot, CheckerReport], None],
+        on_complete: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Initialize checker job.
+
+        Args:
+            dialog: Dialog to show results in.
+            name: Name of tool, used for timing.
+            analysis: Function to run the check.
+            on_complete: Optional function to call after the entries have been
+                displayed, e.g. to select an entry.
+        """
+        self.dialog = dialog
+        self.analysis = analysis
+        self.on_complete = on_complete
+        self.timing = Timing(name)
+        self.cancelled = threading.Event()
+        # Batches of (records, fraction done), then None when finished,
+        # or an exception raised by the analysis
+        self.results: queue.Queue[Optional[tuple[list, float]] | BaseException] = (
+            queue.Queue()
+        )
+        self.document = DocumentSnapshot("")
+        self.next_display = 0.0
+        # Text the edit below was found for, and the edit as
+        # (first edited line, end of edited lines before edit, lines added)
+        self.edited_text = ""
+        self.edit = (0, 0, 0)
+        self.n_unmapped = 0
+
+    def start(self) -> None:
+        """Start the job, cancelling any job already running in the dialog."""
+        self.dialog.cancel_job()
+        self.dialog.job = self
+        self.dialog.show_job_progress(0.0)
+        self.timing.start()
+        self.document = DocumentSnapshot.from_maintext()
+        threading.Thread(target=self._run_worker, daemon=True).start()
+        self.dialog.after(self.POLL_MS, self._poll)
+        Busy.unbusy()
+
+    def cancel(self, display: bool = True) -> None:
+        """Cancel the job.
+
+        Args:
+            display: True to display the entries found so far. False if they
+                are not needed, e.g. because the dialog is being reset.
+        """
+        if self.cancelled.is_set():
+            return
+        self.cancelled.set()
+        if display and self.dialog.winfo_exists():
+            # Don't lose batches the worker had already found
+            while True:
+                try:
+                    result = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(result, tuple):
+                    self._add_batch(*result)
+            self.dialog.add_footer("", "Check cancelled")
+            self._finish()
+            return
+        self.dialog.job = None
+        self.dialog.show_job_progress(None)
+        self.timing.stop()
+
+    def _run_worker(self) -> None:
+        """Run the analysis in the worker thread."""
+        report = CheckerJobReport(self)
+        try:
+            self.analysis(self.document, report)
+            report.progress(1.0)
+            self.results.put(None)
+        except CheckerJobCancelled:
+            pass
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self.results.put(exc)
+
+    def _poll(self) -> None:
+        """Add any new entries to the dialog, and finish if the analysis has."""
+        if self.cancelled.is_set():
+            return
+        if not self.dialog.winfo_exists():
+            self.cancel(display=False)
+            return
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if result is None:
+                self._finish()
+                return
+            if isinstance(result, BaseException):
+                self.cancelled.set()
+                self._finish()
+                raise result
+            self._add_batch(*result)
+        self.dialog.after(self.POLL_MS, self._poll)
+
+    def _add_batch(self, records: list, fraction: float) -> None:
+        """Add a batch of entries to the dialog, displaying them if due.
+
+        Args:
+            records: Records found by the worker since the previous batch.
+            fraction: Fraction of check completed, from 0 to 1.
+        """
+        batch = CheckerReport()
+        batch.records = records
+        text = maintext().get_text()
+        if text != self.document.text:
+            if text != self.edited_text:
+                self.edited_text = text
+                lines = text.split("\n")
+                first, end = changed_lines(self.document.lines, lines)
+                shift = len(lines) - len(self.document.lines)
+                self.edit = (first, end - shift, shift)
+            self.n_unmapped += batch.remap_rows(*self.edit)
+        batch.add_to_dialog(self.dialog)
+        if time.monotonic() >= self.next_display:
+            self.dialog.display_new_entries()
+            self.next_display = time.monotonic() + self.DISPLAY_INTERVAL
+        self.dialog.show_job_progress(fraction)
+
+    def _finish(self) -> None:
+        """Display the entries, and tidy up."""
+        self.dialog.job = None
+        self.dialog.show_job_progress(None)
+        if self.n_unmapped:
+            self.dialog.add_footer(
+                "",
+                "Text was edited while the check was running, so",
+                f"{sing_plur(self.n_unmapped, 'position')} may be wrong. Re-run to update.",
+            )
+        # If user has started work on the entries, don't lose their place
+        user_selected = bool(self.dialog.selected_text)
+        self.dialog.display_entries()
+        self.timing.stop()
+        if (
+            self.on_complete is not None
+            and not self.cancelled.is_set()
+            and not user_selected
+        ):
+            self.on_complete()
@@ -1,8 +1,18 @@
 """Functionality to support content providers."""
 
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 import gzip
 import importlib.resources
 import logging
+import multiprocessing
+import os
 from pathlib import Path
 import shutil
 import subprocess
@@ -2011,32 +2021,285 @@ def cp_fix_empty_pages() -> None:
     logger.info(f"""{sing_plur(n_fixed, '"[Blank Page]" markup')} added""")
 
 
-def compress_png_file(command: list[str], src: Path, dest: Path) -> bool:
+@dataclass
+class PngCompression:
+    """Result of compressing one PNG file.
+
+    Attributes:
+        name: Name of file.
+        size_before: Size of original file in bytes.
+        size_after: Size of file in new folder in bytes.
+        error: Reason for failure, or empty string if successful.
     """
-    Compress a single PNG from src → dest.
-    Returns True if successful, False otherwise.
+
+    name: str
+    size_before: int
+    size_after: int = 0
+    error: str = ""
+
+
+def compress_png_file(command: list[str], src: Path, dest: Path) -> PngCompression:
     """
+    Compress a single PNG from src → dest. If compressed file is no better,
+    copy the original instead. Doesn't log anything, so can be run in a worker
+    thread or process.
+
+    Returns:
+        Sizes before & after, or reason for failure.
+    """
+    try:
+        result = PngCompression(src.name, src.stat().st_size)
+    except OSError as e:
+        return PngCompression(src.name, 0, error=f"Failed to compress {src}: {e}")
     command = [s.replace("$in", str(src)).replace("$out", str(dest)) for s in command]
     if command and command[0]:
         try:
             subprocess.run(command, check=True)
         except FileNotFoundError:
-            logger.error(f"Failed to compress {src}: Unable to run {command[0]}")
-            return False
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to compress {src}: {e}")
-            return False
+            result.error = f"Failed to compress {src}: Unable to run {command[0]}"
+            return result
+        except (subprocess.CalledProcessError, OSError) as e:
+            result.error = f"Failed to compress {src}: {e}"
+            return result
     else:  # Use Pillow
         try:
-            im = Image.open(src)
-            im.save(dest, optimize=True)
+            with Image.open(src) as im:
+                im.save(dest, optimize=True)
         except UnidentifiedImageError:
-            logger.error(f"Failed to compress {src}: Unable to identify image")
-            return False
+            result.error = f"Failed to compress {src}: Unable to identify image"
+            return result
+        except OSError as e:
+            result.error = f"Failed to compress {src}: {e}"
+            return result
     if not dest.is_file():
-        logger.error(f"Failed to create compressed file {dest}")
-        return False
-    return True
+        result.error = f"Failed to create compressed file {dest}"
+        return result
+    result.size_after = dest.stat().st_size
+    if result.size_after >= result.size_before:
+        shutil.copy2(src, dest)
+        result.size_after = result.size_before
+    return result
+
+
+class CompressPngsDialog(ToplevelDialog):
+    """Dialog showing progress of PNG compression, allowing it to be cancelled."""
+
+    manual_page = "Content_Providing_Menu#Compress_PNG_files"
+
+    def __init__(self) -> None:
+        """Initialize Compress PNGs dialog."""
+        super().__init__("Compress PNG Files", resize_y=False)
+        self.job: Optional[PngCompressionJob] = None
+        self.progress_bar = ttk.Progressbar(self.top_frame, length=300)
+        self.progress_bar.grid(row=0, column=0, sticky="NSEW")
+        self.status = tk.StringVar(self, "")
+        ttk.Label(self.top_frame, textvariable=self.status).grid(
+            row=1, column=0, sticky="NSW", pady=5
+        )
+        self.cancel_button = ttk.Button(
+            self.top_frame, text="Cancel", command=self.cancel_job
+        )
+        self.cancel_button.grid(row=2, column=0, sticky="NS")
+
+    def reset(self) -> None:
+        """Cancel any compression that's running."""
+        super().reset()
+        self.cancel_job()
+
+    def cancel_job(self) -> None:
+        """Cancel compression if it's running, leaving "pngs" unchanged."""
+        if self.job is not None:
+            self.job.cancel()
+
+    def show_progress(self, n_done: int, n_files: int, saved: int) -> None:
+        """Show how many files have been compressed so far.
+
+        Args:
+            n_done: Number of files compressed.
+            n_files: Total number of files.
+            saved: Number of bytes saved so far.
+        """
+        if not self.winfo_exists():
+            return
+        self.progress_bar["value"] = 100 * n_done / n_files if n_files else 100
+        self.status.set(
+            f"{n_done} of {n_files} files compressed, saving {saved / 1024:.1f}KB"
+        )
+        self.cancel_button["state"] = tk.NORMAL if self.job else tk.DISABLED
+
+
+class PngCompressionJob:
+    """Compress the PNG files in a folder concurrently, while the user carries on.
+
+    Pillow compression is run in a pool of worker processes, and external
+    commands are run by a pool of threads, one command per thread. If the
+    workers can't be used, files are compressed one at a time instead.
+    Compressed files are written to a temporary folder, which only replaces
+    the original folder if all files are compressed successfully.
+    """
+
+    POLL_MS = 100
+
+    def __init__(
+        self, command: list[str], src_dir: Path, new_dir: Path, old_dir: Path
+    ) -> None:
+        """Initialize compression job.
+
+        Args:
+            command: External command to run, or empty to use Pillow.
+            src_dir: Folder of PNG files to compress.
+            new_dir: Temporary folder to write compressed files to.
+            old_dir: Folder to move original files to when done.
+        """
+        self.command = command
+        self.src_dir = src_dir
+        self.new_dir = new_dir
+        self.old_dir = old_dir
+        self.dialog = CompressPngsDialog.show_dialog()
+        self.files = sorted(src_dir.glob("*.png"))
+        self.executor: Optional[Executor] = None
+        self.futures: dict[Future, Path] = {}
+        # Files to compress in this process, if workers can't be used
+        self.serial: list[Path] = []
+        self.n_done = 0
+        self.total_before = 0
+        self.total_after = 0
+
+    def start(self) -> None:
+        """Start compressing the files."""
+        self.dialog.job = self
+        n_workers = min(len(self.files), os.cpu_count() or 1)
+        try:
+            if n_workers <= 1:
+                self.serial = list(self.files)
+            elif self.command:
+                self.executor = ThreadPoolExecutor(max_workers=n_workers)
+            else:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=n_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            if self.executor is not None:
+                for src_file in self.files:
+                    future = self.executor.submit(
+                        compress_png_file,
+                        self.command,
+                        src_file,
+                        self.new_dir / src_file.name,
+                    )
+                    self.futures[future] = src_file
+        except (OSError, BrokenProcessPool) as exc:
+            logger.debug(f"PNG compression workers failed, so running serially: {exc}")
+            self.serial = [f for f in self.files if f not in self.futures.values()]
+        self.dialog.show_progress(0, len(self.files), 0)
+        self.dialog.after(self.POLL_MS, self._poll)
+
+    def _poll(self) -> None:
+        """Record finished files, and finish when all are done."""
+        if self.dialog.job is not self:
+            return
+        for future in [future for future in self.futures if future.done()]:
+            src_file = self.futures.pop(future)
+            try:
+                result = future.result()
+            except (OSError, BrokenProcessPool) as exc:
+                logger.debug(f"PNG compression worker failed: {exc}")
+                self.serial.append(src_file)
+                continue
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                result = PngCompression(
+                    src_file.name, 0, error=f"Failed to compress {src_file}: {exc}"
+                )
+            if not self._add_result(result):
+                return
+        # Compress one file at a time in this process, so user can still cancel
+        if not self.futures and self.serial:
+            src_file = self.serial.pop(0)
+            try:
+                result = compress_png_file(
+                    self.command, src_file, self.new_dir / src_file.name
+                )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                result = PngCompression(
+                    src_file.name, 0, error=f"Failed to compress {src_file}: {exc}"
+                )
+            if not self._add_result(result):
+                return
+        saved = self.total_before - self.total_after
+        self.dialog.show_progress(self.n_done, len(self.files), saved)
+        if self.futures or self.serial:
+            self.dialog.after(0 if self.serial else self.POLL_MS, self._poll)
+        else:
+            self._finish()
+
+    def _add_result(self, result: PngCompression) -> bool:
+        """Report result of compressing one file.
+
+        Args:
+            result: Result of compression.
+
+        Returns:
+            False if compression failed, and the job has been stopped.
+        """
+        if result.error:
+            logger.error(result.error)
+            self.cancel()
+            return False
+        self.n_done += 1
+        self.total_before += result.size_before
+        self.total_after += result.size_after
+        if result.size_after >= result.size_before:
+            logger.info(f"{result.name} not compressed")
+        else:
+            saved = result.size_before - result.size_after
+            logger.info(
+                f"{result.name} compressed, saving {saved}B ({100 * saved / result.size_before:.1f}%)"
+            )
+        return True
+
+    def cancel(self) -> None:
+        """Stop compressing, and remove the temporary folder, leaving the
+        original files untouched."""
+        if self.dialog.job is not self:
+            return
+        Busy.busy()
+        self._stop_workers()
+        shutil.rmtree(self.new_dir, ignore_errors=True)
+        if self.n_done < len(self.files):
+            logger.info(f"PNG compression stopped: {self.src_dir} has not been changed")
+        Busy.unbusy()
+
+    def _stop_workers(self) -> None:
+        """Cancel files not yet started, and wait for the others to finish."""
+        self.dialog.job = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        self.futures.clear()
+        self.serial.clear()
+        if self.dialog.winfo_exists():
+            self.dialog.show_progress(
+                self.n_done, len(self.files), self.total_before - self.total_after
+            )
+
+    def _finish(self) -> None:
+        """Replace the original folder with the compressed files, keeping the
+        original as a backup."""
+        self._stop_workers()
+        try:
+            self.src_dir.rename(self.old_dir)
+            self.new_dir.rename(self.src_dir)
+        except OSError as exc:
+            logger.error(
+                f"Unable to replace {self.src_dir} with compressed files: {exc}"
+            )
+            return
+        total_saved = self.total_before - self.total_after
+        percent_saved = (
+            100 * total_saved / self.total_before if self.total_before > 0 else 0
+        )
+        logger.info(
+            f"{self.n_done} files compressed, saving {total_saved / 1024:.1f}KB ({percent_saved:.1f}%)"
+        )
 
 
 def cp_compress_pngs() -> None:
@@ -2057,13 +2320,6 @@ def cp_compress_pngs() -> None:
     if old_dir.exists():
         logger.error(f"Error: backup {fd_str} {old_dir} already exists. Aborting.")
         return
-    if new_dir.exists():
-        shutil.rmtree(new_dir)  # clean up any previous run
-    new_dir.mkdir()
-
-    total_before = 0
-    total_after = 0
-    n_files = 0
     cmd_str = preferences.get(PrefKey.CP_PNG_CRUSH_COMMAND)
     if "$in" not in cmd_str or "$out" not in cmd_str:
         logger.error(
@@ -2071,39 +2327,13 @@ def cp_compress_pngs() -> None:
             "Use the Settings dialog, Advanced Tab to configure the PNG compress command (examples in tooltip)"
         )
         return
-    Busy.busy()
     command: list[str] = cmd_str.strip().split()
-    for src_file in src_dir.glob("*.png"):
-        size_before = src_file.stat().st_size
-        total_before += size_before
-        dest_file = new_dir / src_file.name
-        if not compress_png_file(command, src_file, dest_file):
-            Busy.unbusy()
-            return
-        size_after = dest_file.stat().st_size
-        # If "compressed" file is no better, keep the old one
-        if size_after >= size_before:
-            shutil.copy2(src_file, dest_file)
-            total_after += size_before
-            logger.info(f"{src_file.name} not compressed")
-        else:
-            total_after += size_after
-            saved = size_before - size_after
-            logger.info(
-                f"{src_file.name} compressed, saving {saved}B ({100 * saved / size_before:.1f}%)"
-            )
-        root().update()
-        n_files += 1
-
-    src_dir.rename(old_dir)
-    new_dir.rename(src_dir)
-
-    total_saved = total_before - total_after
-    percent_saved = 100 * total_saved / total_before if total_before > 0 else 0
-    logger.info(
-        f"{n_files} files compressed, saving {total_saved / 1024:.1f}KB ({percent_saved:.1f}%)"
-    )
-    Busy.unbusy()
+    # Creating job cancels any previous one before its temporary folder is reused
+    job = PngCompressionJob(command, src_dir, new_dir, old_dir)
+    if new_dir.exists():
+        shutil.rmtree(new_dir)  # clean up any previous run
+    new_dir.mkdir()
+    job.start()
 
 
 def import_tia_ocr_file() -> None:
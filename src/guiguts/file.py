@@ -30,6 +30,7 @@ from guiguts.page_details import (
     STYLE_DITTO,
 )
 from guiguts.preferences import preferences, PrefKey
+from guiguts.profiling import timed
 from guiguts.project_dict import ProjectDict, GOOD_WORDS_FILENAME, BAD_WORDS_FILENAME
 from guiguts.root import root
 
@@ -553,13 +554,7 @@ class File:
         self.set_initial_position(
             bin_dict.get(BINFILE_KEY_INSERTPOSPEER), maintext().peer
         )
-        # Since object loaded from bin file is a dictionary of dictionaries,
-        # need to create PageDetails from the loaded raw data.
-        if page_details := bin_dict.get(BINFILE_KEY_PAGEDETAILS):
-            for img, detail in page_details.items():
-                self.page_details[img] = PageDetail(
-                    detail["index"], detail["style"], detail["number"]
-                )
+        self.page_details.update(page_details_from_bin(bin_dict))
         self.set_page_marks(self.page_details)
         self.image_dir = bin_dict.get(BINFILE_KEY_IMAGEDIR, "")
         self.project_id = bin_dict.get(BINFILE_KEY_PROJECTID, "")
@@ -1030,6 +1025,7 @@ class File:
         self.rewrap_section(ranges[0], bq_depth, skip_indented)
         Busy.unbusy()
 
+    @timed("Rewrap All")
     def rewrap_all(self) -> None:
         """Wrap whole text."""
         Busy.busy()
@@ -1215,6 +1211,26 @@ class File:
         maintext().tag_remove(HighlightTag.BOOKMARK_TAG, "1.0", tk.END)
 
 
+def page_details_from_bin(bin_dict: dict[str, Any]) -> PageDetails:
+    """Create page details from bin file dictionary.
+
+    Since object loaded from bin file is a dictionary of dictionaries,
+    need to create PageDetails from the loaded raw data.
+
+    Args:
+        bin_dict: Dictionary loaded from bin file.
+
+    Returns:
+        Page details, with indexes as they were when bin file was saved.
+    """
+    page_details = PageDetails()
+    for img, detail in (bin_dict.get(BINFILE_KEY_PAGEDETAILS) or {}).items():
+        page_details[img] = PageDetail(
+            detail["index"], detail["style"], detail["number"]
+        )
+    return page_details
+
+
 def bin_name(basename: str) -> str:
     """Get the name of the bin file associated with a text file.
 
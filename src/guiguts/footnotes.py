@@ -18,6 +18,7 @@ from guiguts.preferences import (
     PrefKey,
     preferences,
 )
+from guiguts.profiling import timed
 from guiguts.utilities import (
     IndexRowCol,
     IndexRange,
@@ -1501,6 +1502,7 @@ class FootnoteCheckerDialog(CheckerDialog):
         return entry.text
 
 
+@timed("Footnote Check")
 def footnote_check() -> None:
     """Check footnotes in the currently loaded file."""
     global _the_footnote_checker
@@ -0,0 +1,514 @@
+"""Run checker tools without the GUI, e.g. from the command line."""
+
+import bisect
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from guiguts.checkers import CheckerReport, DocumentSnapshot
+from guiguts.file import bin_name, page_details_from_bin, BINFILE_KEY_LANGUAGES
+from guiguts.page_details import PageDetails
+from guiguts.preferences import preferences, PrefKey
+from guiguts.project_dict import ProjectDict
+from guiguts.spell import (
+    get_spell_checker,
+    add_spelling_entries,
+    SpellChecker,
+)
+from guiguts.tools.bookloupe import BookloupeChecker
+from guiguts.tools.jeebies import JeebiesChecker, DictionaryNotFoundError
+from guiguts.tools.levenshtein import run_levenshtein_check
+from guiguts.tools.pptxt import PPtxtAnalysis, PPTXT_CHECKS, run_pptxt_checks
+from guiguts.utilities import IndexRowCol, load_dict_from_json, is_test
+
+logger = logging.getLogger(__package__)
+
+# Main files of projects found by `find_projects`
+PROJECT_SUFFIXES = (".txt", ".html", ".htm")
+
+
+class HeadlessCheckError(Exception):
+    """Raised when a tool cannot be run on a file."""
+
+
+def load_document(
+    filename: str,
+) -> tuple[DocumentSnapshot, ProjectDict, PageDetails]:
+    """Load a file as the GUI would, without using the main text widget.
+
+    Text is read as UTF-8, falling back to ISO-8859-1, and any BOM is removed.
+    Languages and page details are taken from the bin file; languages default
+    to the default languages preference.
+
+    Args:
+        filename: Name of text file.
+
+    Returns:
+        Snapshot of the file's text, the file's project dictionary, and its
+        page details.
+    """
+    try:
+        with open(filename, "r", encoding="utf-8") as fh:
+            text = fh.read()
+    except UnicodeDecodeError:
+        logger.warning(f"Unable to open {filename} as UTF-8, so opened as ISO-8859-1")
+        with open(filename, "r", encoding="iso-8859-1") as fh:
+            text = fh.read()
+    # Remove BOM from first line if present
+    first_line_end = text.find("\n")
+    if first_line_end < 0:
+        first_line_end = len(text)
+    if (bom_pos := text.find("\ufeff", 0, first_line_end)) >= 0:
+        text = text[:bom_pos] + text[bom_pos + 1 :]
+    languages = ""
+    page_details = PageDetails()
+    if bin_dict := load_dict_from_json(bin_name(filename)):
+        languages = bin_dict.get(BINFILE_KEY_LANGUAGES, "")
+        page_details = page_details_from_bin(bin_dict)
+        page_details.recalculate()
+    if not languages:
+        languages = preferences.get(PrefKey.DEFAULT_LANGUAGES)
+    project_dict = ProjectDict()
+    project_dict.load(filename)
+    return DocumentSnapshot(text, languages), project_dict, page_details
+
+
+def _spell_checker(document: DocumentSnapshot) -> SpellChecker:
+    """Return spell checker for the document's languages.
+
+    Args:
+        document: Snapshot of text to be checked.
+    """
+    checker = get_spell_checker(document.get_language_list())
+    if checker is None:
+        raise HeadlessCheckError(
+            f"Dictionary not found for languages: {document.languages}"
+        )
+    return checker
+
+
+def _run_bookloupe(document: DocumentSnapshot, _: ProjectDict) -> CheckerReport:
+    """Run Bookloupe on document."""
+    report = CheckerReport()
+    checker = BookloupeChecker()
+    checker.dialog = report
+    checker.run_bookloupe(document)
+    return report
+
+
+def _run_jeebies(document: DocumentSnapshot, _: ProjectDict) -> CheckerReport:
+    """Run Jeebies on document."""
+    global _jeebies_checker
+
+    report = CheckerReport()
+    try:
+        if _jeebies_checker is None:
+            _jeebies_checker = JeebiesChecker()
+    except DictionaryNotFoundError as exc:
+        raise HeadlessCheckError(f"Dictionary not found: {exc.file}") from exc
+    _jeebies_checker.run_jeebies(document, report)
+    return report
+
+
+def _run_levenshtein(
+    document: DocumentSnapshot, project_dict: ProjectDict
+) -> CheckerReport:
+    """Run Levenshtein check on document."""
+    report = CheckerReport()
+    run_levenshtein_check(document, project_dict, _spell_checker(document), report)
+    return report
+
+
+def _run_pptxt(document: DocumentSnapshot, project_dict: ProjectDict) -> CheckerReport:
+    """Run PPtxt on document."""
+    analysis = PPtxtAnalysis(
+        document.text,
+        project_dict,
+        verbose=preferences.get(PrefKey.PPTEXT_VERBOSE),
+    )
+    check_names = [name for prefkey, name in PPTXT_CHECKS if preferences.get(prefkey)]
+    # Worker processes already keep the CPUs busy, so don't start more
+    if _in_worker:
+        reports = [analysis.run_check(check_name) for check_name in check_names]
+    else:
+        reports = run_pptxt_checks(analysis, check_names)
+    report = CheckerReport()
+    for check_report in reports:
+        report.records.extend(check_report.records)
+    return report
+
+
+def _run_spell(document: DocumentSnapshot, project_dict: ProjectDict) -> CheckerReport:
+    """Run spell check on document."""
+    report = CheckerReport()
+    report.add_header("Start of Spelling Check", "")
+    bad_spellings = _spell_checker(document).do_spell_check(project_dict, document)
+    add_spelling_entries(bad_spellings, report)
+    return report
+
+
+HEADLESS_TOOLS: dict[str, Callable[[DocumentSnapshot, ProjectDict], CheckerReport]] = {
+    "bookloupe": _run_bookloupe,
+    "jeebies": _run_jeebies,
+    "levenshtein": _run_levenshtein,
+    "pptxt": _run_pptxt,
+    "spell": _run_spell,
+}
+
+# Maximum number of jobs queued in the process pool, per worker process
+MAX_QUEUED_JOBS_PER_WORKER = 2
+
+_in_worker = False
+# Dictionaries are only loaded once per process, and reused for each file:
+# the spell checker is kept by `get_spell_checker`, Jeebies's phrases here.
+_jeebies_checker: Optional[JeebiesChecker] = None
+# Most recently loaded file, since consecutive jobs usually check the same file
+_loaded_document: Optional[
+    tuple[str, DocumentSnapshot, ProjectDict, list[tuple[IndexRowCol, str, str]]]
+] = None
+
+
+def add_page_info(
+    records: list[dict[str, Any]], page_starts: list[tuple[IndexRowCol, str, str]]
+) -> None:
+    """Add the page image name & label to records that have a location.
+
+    Args:
+        records: Records output by a tool.
+        page_starts: Start index, image name and label of each page, in order.
+    """
+    if not page_starts:
+        return
+    start_rowcols = [start.rowcol() for start, _, _ in page_starts]
+    for record in records:
+        if "row" not in record:
+            continue
+        page_num = bisect.bisect_right(start_rowcols, (record["row"], record["col"]))
+        if page_num > 0:
+            _, record["page"], record["page_label"] = page_starts[page_num - 1]
+
+
+def check_file(filename: str, tool: str) -> list[dict[str, Any]]:
+    """Run one tool on one file.
+
+    Args:
+        filename: Name of file to check.
+        tool: Name of tool, one of the keys of `HEADLESS_TOOLS`.
+
+    Returns:
+        One record per line of the tool's output, each tagged with the file
+        and tool names, and the page if the file has page details. If the file
+        couldn't be loaded or the tool failed, a single "error" record.
+    """
+    global _loaded_document
+
+    try:
+        if _loaded_document is None or _loaded_document[0] != filename:
+            document, project_dict, page_details = load_document(filename)
+            page_starts = sorted(
+                (IndexRowCol(detail["index"]), img, detail["label"])
+                for img, detail in page_details.items()
+            )
+            _loaded_document = (filename, document, project_dict, page_starts)
+        _, document, project_dict, page_starts = _loaded_document
+        records = HEADLESS_TOOLS[tool](document, project_dict).to_dicts()
+        add_page_info(records, page_starts)
+    except (OSError, HeadlessCheckError) as exc:
+        records = [{"type": "error", "message": str(exc), "severity": "error"}]
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        # Unexpected failure, e.g. malformed bin file, shouldn't stop other jobs
+        message = f"{type(exc).__name__}: {exc}"
+        records = [{"type": "error", "message": message, "severity": "error"}]
+    return [{"file": filename, "tool": tool, **record} for record in records]
+
+
+def _init_check_worker(
+    pref_values: dict[PrefKey, Any], prefsdir: str, testing: bool
+) -> None:
+    """Copy preferences to worker process.
+
+    Args:
+        pref_values: Values of preferences in main process.
+        prefsdir: Directory containing user prefs & dictionaries.
+        testing: Whether running tests, so user dictionaries aren't loaded.
+    """
+    global _in_worker
+    _in_worker = True
+    for key, value in pref_values.items():
+        preferences.set_default(key, value)
+    preferences.prefsdir = prefsdir
+    is_test(testing)
+
+
+def _timed_check_job(job: tuple[str, str]) -> tuple[list[dict[str, Any]], float]:
+    """Run one (file, tool) job, possibly in worker process.
+
+    Args:
+        job: Name of file and tool.
+
+    Returns:
+        Result from `check_file`, and time taken in seconds.
+    """
+    start = time.perf_counter()
+    records = check_file(*job)
+    return records, time.perf_counter() - start
+
+
+def run_check_jobs(
+    jobs: list[tuple[str, str]],
+) -> Iterator[tuple[int, list[dict[str, Any]], float]]:
+    """Run (file, tool) jobs, yielding results as each job completes.
+
+    Jobs are run concurrently in worker processes if possible. Only a few jobs
+    per worker are queued at a time, so results can be dealt with as soon as
+    they are complete, rather than all held until the end.
+
+    Args:
+        jobs: Name of file and tool for each job.
+
+    Yields:
+        Index of job in `jobs`, result from `check_file`, and time taken.
+    """
+    done: set[int] = set()
+    n_workers = min(len(jobs), os.cpu_count() or 1)
+    if n_workers > 1:
+        pref_values = {key: preferences.get(key) for key in PrefKey}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_check_worker,
+                initargs=(pref_values, preferences.prefsdir, is_test()),
+            ) as executor:
+                pending: dict[Future, int] = {}
+                next_index = 0
+                while pending or next_index < len(jobs):
+                    while (
+                        next_index < len(jobs)
+                        and len(pending) < n_workers * MAX_QUEUED_JOBS_PER_WORKER
+                    ):
+                        future = executor.submit(_timed_check_job, jobs[next_index])
+                        pending[future] = next_index
+                        next_index += 1
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        index = pending.pop(future)
+                        records, seconds = future.result()
+                        done.add(index)
+                        yield index, records, seconds
+            return
+        except (OSError, BrokenProcessPool) as exc:
+            logger.debug(f"Check worker processes failed, so running serially: {exc}")
+    for index, job in enumerate(jobs):
+        if index not in done:
+            yield index, *_timed_check_job(job)
+
+
+def check_files(filenames: list[str], tools: list[str]) -> list[dict[str, Any]]:
+    """Run each tool on each file without using the GUI.
+
+    Args:
+        filenames: Names of files to check.
+        tools: Names of tools to run.
+
+    Returns:
+        Records from all jobs, ordered by file, then tool.
+    """
+    jobs = [(filename, tool) for filename in filenames for tool in tools]
+    results: list[list[dict[str, Any]]] = [[] for _ in jobs]
+    for index, records, _ in run_check_jobs(jobs):
+        results[index] = records
+    return [record for records in results for record in records]
+
+
+def _bad_tools(tools: list[str]) -> bool:
+    """Report any tools that can't be run headless.
+
+    Args:
+        tools: Names of tools requested.
+
+    Returns:
+        True if any tools are unknown.
+    """
+    if bad_tools := [tool for tool in tools if tool not in HEADLESS_TOOLS]:
+        logger.error(
+            f"Unknown tool(s): {', '.join(bad_tools)}. "
+            f"Available tools: {', '.join(HEADLESS_TOOLS)}"
+        )
+        return True
+    return False
+
+
+def _jsonl(records: list[dict[str, Any]]) -> str:
+    """Convert records to JSON Lines.
+
+    Args:
+        records: Records to convert.
+
+    Returns:
+        One line of JSON per record.
+    """
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+def check_headless(
+    filenames: list[str], tools: list[str], json_file: Optional[str]
+) -> int:
+    """Run tools on files and output the results as JSON Lines.
+
+    Args:
+        filenames: Names of files to check.
+        tools: Names of tools to run.
+        json_file: Name of file to write results to, or None for stdout.
+
+    Returns:
+        Exit status: 0 if all tools ran, 2 if any errors.
+    """
+    if _bad_tools(tools):
+        return 2
+    records = check_files(filenames, tools)
+    if json_file is None:
+        sys.stdout.write(_jsonl(records))
+    else:
+        try:
+            with open(json_file, "w", encoding="utf-8") as fp:
+                fp.write(_jsonl(records))
+        except OSError as exc:
+            logger.error(f"Unable to write {json_file}: {exc}")
+            return 2
+    return 2 if any(record["type"] == "error" for record in records) else 0
+
+
+def find_projects(top_dir: str) -> list[str]:
+    """Find projects in a directory tree.
+
+    A project is a text or HTML file with a bin file alongside it, and usually
+    a `pngs` folder and project dictionary.
+
+    Args:
+        top_dir: Directory to search.
+
+    Returns:
+        Sorted list of names of projects' main files.
+    """
+    projects = []
+    for dir_path, dir_names, file_names in os.walk(top_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            path = os.path.join(dir_path, file_name)
+            if file_name.lower().endswith(PROJECT_SUFFIXES) and os.path.isfile(
+                bin_name(path)
+            ):
+                projects.append(path)
+    return projects
+
+
+def batch_headless(top_dir: str, tools: list[str], report_dir: str) -> int:
+    """Run tools on all projects in a directory tree.
+
+    Writes one JSON Lines report per project to `report_dir`, mirroring the
+    layout of `top_dir`, as soon as all the tools have been run on that
+    project, and finally a `summary.json` with counts & timings.
+
+    Args:
+        top_dir: Directory containing projects.
+        tools: Names of tools to run.
+        report_dir: Directory to write reports to.
+
+    Returns:
+        Exit status: 0 if all tools ran, 2 if any errors.
+    """
+    if _bad_tools(tools):
+        return 2
+    projects = find_projects(top_dir)
+    if not projects:
+        logger.error(f"No projects (text/HTML files with bin files) in {top_dir}")
+        return 2
+    start = time.perf_counter()
+    jobs = [(project, tool) for project in projects for tool in tools]
+    # Results for each project, keyed by tool, until all its tools have run
+    project_results: dict[str, dict[str, tuple[list[dict[str, Any]], float]]] = {
+        project: {} for project in projects
+    }
+    summaries: dict[str, dict[str, Any]] = {}
+    tool_times = {tool: 0.0 for tool in tools}
+    for index, records, seconds in run_check_jobs(jobs):
+        project, tool = jobs[index]
+        tool_times[tool] += seconds
+        results = project_results[project]
+        results[tool] = (records, seconds)
+        if len(results) < len(tools):
+            continue
+        del project_results[project]
+        summaries[project] = _write_project_report(
+            top_dir, project, {tool: results[tool] for tool in tools}, report_dir
+        )
+        logger.info(f"Checked {project}")
+
+    summary: dict[str, Any] = {
+        "directory": top_dir,
+        "tools": tools,
+        "wall_time": round(time.perf_counter() - start, 3),
+        "tool_times": {tool: round(secs, 3) for tool, secs in tool_times.items()},
+        "projects": [summaries[project] for project in projects],
+    }
+    summary_file = os.path.join(report_dir, "summary.json")
+    try:
+        with open(summary_file, "w", encoding="utf-8") as fp:
+            json.dump(summary, fp, indent=2, ensure_ascii=False)
+    except OSError as exc:
+        logger.error(f"Unable to write {summary_file}: {exc}")
+        return 2
+    if any(project["errors"] for project in summary["projects"]):
+        return 2
+    return 0
+
+
+def _write_project_report(
+    top_dir: str,
+    project: str,
+    results: dict[str, tuple[list[dict[str, Any]], float]],
+    report_dir: str,
+) -> dict[str, Any]:
+    """Write the report for one project.
+
+    Args:
+        top_dir: Directory containing projects.
+        project: Name of project's main file.
+        results: Records and time taken, keyed by tool, in order.
+        report_dir: Directory to write reports to.
+
+    Returns:
+        Summary of the project's results.
+    """
+    records = [
+        record for tool_records, _ in results.values() for record in tool_records
+    ]
+    rel_name = os.path.relpath(project, top_dir)
+    report_file = os.path.join(report_dir, rel_name + ".jsonl")
+    errors = [record["message"] for record in records if record["type"] == "error"]
+    try:
+        os.makedirs(os.path.dirname(report_file), exist_ok=True)
+        with open(report_file, "w", encoding="utf-8") as fp:
+            fp.write(_jsonl(records))
+    except OSError as exc:
+        errors.append(f"Unable to write {report_file}: {exc}")
+        logger.error(errors[-1])
+    tool_counts: dict[str, int] = {}
+    for record in records:
+        if record["type"] == "content":
+            tool_counts[record["tool"]] = tool_counts.get(record["tool"], 0) + 1
+    return {
+        "project": rel_name,
+        "report": os.path.relpath(report_file, report_dir),
+        "has_pngs": os.path.isdir(os.path.join(os.path.dirname(project), "pngs")),
+        "entries": tool_counts,
+        "tool_times": {tool: round(secs, 3) for tool, (_, secs) in results.items()},
+        "errors": errors,
+    }
@@ -21,6 +21,7 @@ from guiguts.preferences import (
     PersistentString,
     PersistentBoolean,
 )
+from guiguts.profiling import timed
 from guiguts.utilities import (
     IndexRange,
     DiacriticRemover,
@@ -199,6 +200,7 @@ def html_autogenerate() -> None:
     Busy.unbusy()
 
 
+@timed("HTML Autogenerate")
 def do_html_autogenerate() -> None:
     """Do the work of HTML autogenerate."""
     css_indents.clear()
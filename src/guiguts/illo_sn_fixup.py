@@ -11,6 +11,7 @@ from guiguts.checkers import CheckerDialog, CheckerEntry
 from guiguts.maintext import maintext
 from guiguts.misc_tools import tool_save
 from guiguts.preferences import PrefKey, PersistentBoolean, preferences
+from guiguts.profiling import timed
 from guiguts.utilities import IndexRowCol, IndexRange, sound_bell
 from guiguts.widgets import ToolTip
 
@@ -755,6 +756,7 @@ def get_page_breaks(start: str, end: str) -> tuple[list[str], list[str]]:
     return mark_list, pagesep_list
 
 
+@timed("Illustration/Sidenote Check")
 def illosn_check(tag_type: str) -> None:
     """Check Illustration or Sidenote tags in the currently loaded file.
 
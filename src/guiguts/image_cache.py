@@ -0,0 +1,401 @@
+"""Cache of page images for the image viewer, with background prefetching.
+
+Rather than scaling the whole image, which needs a lot of memory at high
+zoom, images are drawn as tiles, so only those in view need to be created.
+Each tile is resampled from the smallest of a pyramid of images, each half
+the size of the one before, that is at least as big as the zoomed image.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import math
+import os.path
+import queue
+import threading
+from typing import Optional
+
+from PIL import Image, ImageChops
+
+# Memory available to cached images
+IMAGE_CACHE_MB = 256
+# Smallest size at which an image is shown, in pixels
+MIN_IMAGE_SIZE = 50
+# Width & height of tiles that images are drawn in, in pixels
+TILE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class ImageRendering:
+    """Settings for drawing an image in the image viewer.
+
+    Attributes:
+        scale: Zoom scale, used unless fitting image to viewer.
+        fit_width: Width to fit image to, or 0 if not fitting to width.
+        fit_height: Height to fit image to, or 0 if not fitting to height.
+        invert: True to invert the colors of grayscale images.
+        alpha: Opacity, to reduce contrast, or None for full contrast.
+    """
+
+    scale: float
+    fit_width: int = 0
+    fit_height: int = 0
+    invert: bool = False
+    alpha: Optional[int] = None
+
+    def scale_for(self, width: int, height: int) -> float:
+        """Return scale at which an image of the given size is drawn.
+
+        Args:
+            width: Width of image.
+            height: Height of image.
+        """
+        scale = self.scale
+        if self.fit_width:
+            scale = self.fit_width / width
+        elif self.fit_height:
+            scale = self.fit_height / height
+        return max(scale, MIN_IMAGE_SIZE / width, MIN_IMAGE_SIZE / height)
+
+    def scaled_size(self, width: int, height: int) -> tuple[int, int]:
+        """Return size at which an image of the given size is drawn.
+
+        Args:
+            width: Width of image.
+            height: Height of image.
+        """
+        scale = self.scale_for(width, height)
+        return int(scale * width + 1), int(scale * height + 1)
+
+    def level_for(self, width: int, height: int) -> int:
+        """Return pyramid level to resample tiles from: the smallest reduced
+        image that is no smaller than the drawn image.
+
+        Args:
+            width: Width of full size image.
+            height: Height of full size image.
+        """
+        scale = self.scale_for(width, height)
+        level = 0
+        while scale * 2 ** (level + 1) <= 1:
+            level += 1
+        return level
+
+
+def visible_tiles(
+    size: tuple[int, int], box: tuple[float, float, float, float]
+) -> list[tuple[int, int]]:
+    """Return column & row of each tile of a drawn image that overlaps a box.
+
+    Args:
+        size: Width & height of drawn image.
+        box: Left, top, right & bottom of box, e.g. the visible part of a canvas.
+    """
+    left, top, right, bottom = box
+    cols = range(
+        max(0, int(left) // TILE_SIZE),
+        min(math.ceil(size[0] / TILE_SIZE), math.ceil(right / TILE_SIZE)),
+    )
+    rows = range(
+        max(0, int(top) // TILE_SIZE),
+        min(math.ceil(size[1] / TILE_SIZE), math.ceil(bottom / TILE_SIZE)),
+    )
+    return [(col, row) for row in rows for col in cols]
+
+
+def is_grayscale(image: Image.Image) -> bool:
+    """Return True if image is grayscale (or at least invertable)."""
+    if image.mode in ("1", "L"):  # True grayscale
+        return True
+    if image.mode == "P":  # Palette - are all colors gray?
+        palette = image.getpalette()
+        if palette is None:
+            return False  # No palette defined
+        if len(palette) <= 2 * 3:
+            return True  # One- or two-color palette, OK to invert
+        return palette[0::3] == palette[1::3] == palette[2::3]
+    if image.mode == "RGB":  # RGB color - are all pixels gray?
+        red, green, blue = image.split()
+        # Differences between channels are all zero if there's no color
+        return (
+            ImageChops.difference(red, green).getbbox() is None
+            and ImageChops.difference(red, blue).getbbox() is None
+        )
+    return False
+
+
+def image_bytes(image: Image.Image) -> int:
+    """Return approximate memory used by an image."""
+    return image.width * image.height * len(image.getbands())
+
+
+class PageImageCache:
+    """Least recently used cache of decoded page images, their reduced copies
+    and drawn tiles, limited by the memory they use.
+
+    A worker thread can prefetch images, e.g. for the pages either side
+    of the current one, so they are ready when the user turns the page.
+    Prefetching never discards images of the page being viewed, i.e. the
+    one most recently requested by any other thread.
+    Methods may be called from any thread, but the cache never uses Tk.
+    """
+
+    def __init__(self, limit_mb: int = IMAGE_CACHE_MB) -> None:
+        """Initialize the cache.
+
+        Args:
+            limit_mb: Maximum memory to use for images, in MB.
+        """
+        self.limit = limit_mb * 1024 * 1024
+        self.size = 0
+        self._images: OrderedDict[tuple, tuple[Image.Image, bool]] = OrderedDict()
+        # Whether each file is grayscale, kept even if its images are discarded
+        self._grayscale: dict[tuple[str, float], bool] = {}
+        self._lock = threading.Lock()
+        self._prefetch_queue: queue.Queue[
+            tuple[str, int, ImageRendering, tuple[int, int]]
+        ] = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._current_path: Optional[str] = None
+
+    def _get(self, key: tuple) -> Optional[tuple[Image.Image, bool]]:
+        """Return cached image & grayscale flag, or None if not cached.
+
+        Args:
+            key: Key of image.
+        """
+        with self._lock:
+            value = self._images.get(key)
+            if value is not None:
+                self._images.move_to_end(key)
+            return value
+
+    def _put(self, key: tuple, image: Image.Image, grayscale: bool) -> None:
+        """Add image to cache, discarding least recently used images if needed.
+
+        Args:
+            key: Key of image.
+            image: Image to cache.
+            grayscale: True if image is grayscale.
+        """
+        with self._lock:
+            if key in self._images:
+                return
+            prefetching = self._prefetching()
+            if prefetching and not self._fits_beside_current(image_bytes(image)):
+                return
+            self._images[key] = (image, grayscale)
+            self.size += image_bytes(image)
+            # Always keep the newest image, even if it's bigger than the limit
+            for old_key in list(self._images):
+                if self.size <= self.limit:
+                    break
+                if old_key == key or (prefetching and old_key[1] == self._current_path):
+                    continue
+                old_image, _ = self._images.pop(old_key)
+                self.size -= image_bytes(old_image)
+
+    def _prefetching(self) -> bool:
+        """Return True if called from the prefetch worker thread."""
+        return threading.current_thread() is self._worker
+
+    def _fits_beside_current(self, n_bytes: int) -> bool:
+        """Return True if an image can be cached without discarding images of
+        the page being viewed. Must be called with the lock held.
+
+        Args:
+            n_bytes: Memory used by image.
+        """
+        current_bytes = sum(
+            image_bytes(image)
+            for key, (image, _) in self._images.items()
+            if key[1] == self._current_path
+        )
+        return current_bytes + n_bytes <= self.limit
+
+    def clear(self) -> None:
+        """Remove all images from the cache."""
+        with self._lock:
+            self._images.clear()
+            self._grayscale.clear()
+            self.size = 0
+
+    def decoded(self, path: str, rotation: int) -> tuple[Image.Image, bool]:
+        """Return the full size image from a file, loading it if not cached.
+
+        Args:
+            path: Name of image file.
+            rotation: Angle image is rotated counter-clockwise, in degrees.
+
+        Returns:
+            Tuple of RGB image, and whether it is grayscale.
+        """
+        if not self._prefetching():
+            self._current_path = path
+        mtime = os.path.getmtime(path)
+        key = ("decoded", path, mtime, rotation)
+        if (value := self._get(key)) is not None:
+            return value
+        if rotation:
+            image, grayscale = self.decoded(path, 0)
+            image = image.rotate(rotation, expand=True)
+        else:
+            with Image.open(path) as file_image:
+                if (path, mtime) not in self._grayscale:
+                    self._grayscale[(path, mtime)] = is_grayscale(file_image)
+                grayscale = self._grayscale[(path, mtime)]
+                image = file_image.convert("RGB")  # Needed for some operations
+        self._put(key, image, grayscale)
+        return image, grayscale
+
+    def level(self, path: str, rotation: int, level: int) -> Image.Image:
+        """Return image from a file, reduced by a power of two, creating it if
+        not cached.
+
+        Args:
+            path: Name of image file.
+            rotation: Angle image is rotated counter-clockwise, in degrees.
+            level: Level in image pyramid - image is reduced by `2 ** level`.
+        """
+        if level == 0:
+            return self.decoded(path, rotation)[0]
+        key = ("level", path, os.path.getmtime(path), rotation, level)
+        if (value := self._get(key)) is not None:
+            return value[0]
+        image = self.level(path, rotation, level - 1).reduce(2)
+        self._put(key, image, False)
+        return image
+
+    def adjusted_level(
+        self,
+        path: str,
+        rotation: int,
+        level: int,
+        invert: bool,
+        alpha: Optional[int],
+    ) -> Image.Image:
+        """Return pyramid level image with colors inverted and/or contrast
+        reduced, creating it if not cached, so that's only done once, rather
+        than for each tile at each zoom.
+
+        Args:
+            path: Name of image file.
+            rotation: Angle image is rotated counter-clockwise, in degrees.
+            level: Level in image pyramid - image is reduced by `2 ** level`.
+            invert: True to invert colors.
+            alpha: Opacity, to reduce contrast, or None for full contrast.
+        """
+        image = self.level(path, rotation, level)
+        if not invert and alpha is None:
+            return image
+        key = ("adjusted", path, os.path.getmtime(path), rotation, level, invert, alpha)
+        if (value := self._get(key)) is not None:
+            return value[0]
+        if invert:
+            image = ImageChops.invert(image)
+        else:
+            image = image.copy()
+        if alpha is not None:
+            image.putalpha(alpha)  # Adjust contrast using transparency
+        self._put(key, image, False)
+        return image
+
+    def tile(
+        self, path: str, rotation: int, rendering: ImageRendering, col: int, row: int
+    ) -> Image.Image:
+        """Return one tile of an image from a file, ready to draw, creating it
+        if not cached.
+
+        Args:
+            path: Name of image file.
+            rotation: Angle image is rotated counter-clockwise, in degrees.
+            rendering: How to draw the image.
+            col: Column of tile.
+            row: Row of tile.
+        """
+        image, grayscale = self.decoded(path, rotation)
+        width, height = rendering.scaled_size(image.width, image.height)
+        invert = rendering.invert and grayscale
+        key = (
+            "tile",
+            path,
+            os.path.getmtime(path),
+            rotation,
+            (width, height),
+            invert,
+            rendering.alpha,
+            col,
+            row,
+        )
+        if (value := self._get(key)) is not None:
+            return value[0]
+        source = self.adjusted_level(
+            path,
+            rotation,
+            rendering.level_for(image.width, image.height),
+            invert,
+            rendering.alpha,
+        )
+        # Resample the part of the source image that corresponds to the tile
+        x_ratio = source.width / width
+        y_ratio = source.height / height
+        left = col * TILE_SIZE
+        top = row * TILE_SIZE
+        right = min(left + TILE_SIZE, width)
+        bottom = min(top + TILE_SIZE, height)
+        tile = source.resize(
+            size=(right - left, bottom - top),
+            resample=Image.Resampling.BICUBIC,
+            box=(left * x_ratio, top * y_ratio, right * x_ratio, bottom * y_ratio),
+        )
+        self._put(key, tile, grayscale)
+        return tile
+
+    def prefetch(
+        self,
+        images: list[tuple[str, int]],
+        rendering: ImageRendering,
+        viewport: tuple[int, int],
+    ) -> None:
+        """Prepare the tiles that will be visible when images are first shown
+        in a worker thread, replacing any requests not yet started.
+
+        Args:
+            images: Tuples of image file name and rotation.
+            rendering: How the images will be drawn.
+            viewport: Width & height of area images will be shown in.
+        """
+        while True:
+            try:
+                self._prefetch_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._prefetch_queue.task_done()
+        for path, rotation in images:
+            self._prefetch_queue.put((path, rotation, rendering, viewport))
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._prefetch_worker, daemon=True)
+            self._worker.start()
+
+    def _prefetch_worker(self) -> None:
+        """Prepare images as they are requested."""
+        while True:
+            path, rotation, rendering, viewport = self._prefetch_queue.get()
+            try:
+                # Skip images too big to cache beside the page being viewed
+                with Image.open(path) as file_image:
+                    n_bytes = file_image.width * file_image.height * 3  # RGB
+                with self._lock:
+                    fits = self._fits_beside_current(n_bytes)
+                if fits:
+                    image = self.decoded(path, rotation)[0]
+                    size = rendering.scaled_size(image.width, image.height)
+                    for col, row in visible_tiles(size, (0, 0, *viewport)):
+                        self.tile(path, rotation, rendering, col, row)
+            except (OSError, ValueError):
+                # Not reported here, since the user may never turn to that
+                # page, but will be if they do
+                pass
+            self._prefetch_queue.task_done()
+
+
+page_image_cache = PageImageCache()
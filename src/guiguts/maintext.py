@@ -8,12 +8,15 @@ import subprocess
 import tkinter as tk
 from tkinter import ttk, Text, messagebox
 from tkinter import font as tk_font
-from typing import Any, Callable, Optional, Literal, Generator
+from typing import Any, Callable, Optional, Literal, Generator, Iterable
 from enum import auto, StrEnum
 
+from rapidfuzz import fuzz
 import regex as re
 
+from guiguts.change_scheduler import ChangeKind, ChangeScheduler
 from guiguts.preferences import preferences, PrefKey, PersistentBoolean
+from guiguts.profiling import profiled_command, register_tk_widget, timed
 from guiguts.utilities import (
     is_mac,
     is_x11,
@@ -123,6 +126,10 @@ class TextColumnNumbers(tk.Text):
         )
         self.bind("<<ThemeChanged>>", lambda event: self.theme_change())
         self.theme_change()
+        # Length of ruler, current column highlighted & highlight colors when last drawn
+        self.rulerlen = 0
+        self.cur_col = 0
+        self.cur_col_colors: tuple[str, str] = ("", "")
 
         # Ignore clicks, mousewheel scrolls, and click-drags on column ruler
         for event in (
@@ -156,7 +163,11 @@ class TextColumnNumbers(tk.Text):
         return ruler
 
     def redraw(self) -> None:
-        """Redraw the column ruler."""
+        """Redraw the column ruler.
+
+        The ruler text and current column highlight are only changed if the
+        ruler length or current column has changed.
+        """
         if not preferences.get(PrefKey.COLUMN_NUMBERS):
             return
 
@@ -168,15 +179,15 @@ class TextColumnNumbers(tk.Text):
         # respond to font size changing
         cur_col_tag = "curcol"
         self.configure(height=1)
-        self.tag_remove(cur_col_tag, "1.0", tk.END)
-        self.delete("1.0", tk.END)
 
         if maintext().focus_widget() == self.textwidget:
             cur_bg = self.textwidget["selectbackground"]
         else:
             cur_bg = self.textwidget["inactiveselectbackground"]
         cur_fg = self.textwidget["selectforeground"]
-        self.tag_configure(cur_col_tag, background=cur_bg, foreground=cur_fg)
+        if (cur_bg, cur_fg) != self.cur_col_colors:
+            self.tag_configure(cur_col_tag, background=cur_bg, foreground=cur_fg)
+            self.cur_col_colors = (cur_bg, cur_fg)
 
         # Draw the ruler to be the length of the longest line in the viewport.
         # If the longest line is narrower than the viewport, then pad it to be
@@ -184,26 +195,30 @@ class TextColumnNumbers(tk.Text):
         longest_line = self.longest_line()
         width = int(self.textwidget.winfo_width() / self.font.measure("8"))
         rulerlen = max(width, longest_line)
-        self.insert("1.0", self._ruler[:rulerlen])
+        if rulerlen != self.rulerlen:
+            self.delete("1.0", tk.END)
+            self.insert("1.0", self._ruler[:rulerlen])
+            self.rulerlen = rulerlen
+            self.cur_col = 0
 
         # Highlight the current column (unless we're at column 0)
         cur_col = IndexRowCol(self.textwidget.index(tk.INSERT)).col
-        if cur_col:
-            self.tag_add(cur_col_tag, f"1.{cur_col - 1}")
+        if cur_col != self.cur_col:
+            self.tag_remove(cur_col_tag, "1.0", tk.END)
+            if cur_col:
+                self.tag_add(cur_col_tag, f"1.{cur_col - 1}")
+            self.cur_col = cur_col
 
     def longest_line(self) -> int:
         """Look at lines in the current text widget's viewport and
         return length (in characters) of the longest one."""
-        longest = 0
-        index = self.textwidget.index("@0,0")
-        while True:
-            dline = self.textwidget.dlineinfo(index)
-            if dline is None:
-                break
-            linelen = len(self.textwidget.get(f"{index} linestart", f"{index} lineend"))
-            longest = max(longest, linelen)
-            index = self.textwidget.index(index + "+1l")
-        return longest
+        first_row = IndexRowCol(self.textwidget.index("@0,0")).row
+        last_row = IndexRowCol(
+            self.textwidget.index(f"@0,{self.textwidget.winfo_height()}")
+        ).row
+        # Get all the visible lines at once, rather than one at a time
+        text = self.textwidget.get(f"{first_row}.0", f"{last_row}.0 lineend")
+        return max(len(line) for line in text.split("\n"))
 
     def theme_change(self) -> None:
         """Handle change of color theme"""
@@ -253,56 +268,115 @@ class TextLineNumbers(tk.Canvas):
         self.bind("<Enter>", lambda _: bind_mouse_wheel(self, self.textwidget))
         self.bind("<Leave>", lambda _: unbind_mouse_wheel(self))
 
+        # Not redrawn while hidden, so redraw when shown
+        self.bind("<Map>", lambda _: self.redraw())
+
+        # Canvas items for line numbers, reused on each redraw, the line number,
+        # position & color each shows (None if hidden), & current line highlight
+        self.number_items: list[int] = []
+        self.numbers: list[Optional[tuple[int, int, int, str]]] = []
+        self.cur_rect = 0
+        self.gutter_width = 0
+        # Values that determined the line numbers when last drawn
+        self.drawn_with: Optional[tuple] = None
+
     def redraw(self) -> None:
-        """Redraw line numbers."""
+        """Redraw line numbers.
+
+        Canvas items are reused, and only changed if the line number, position
+        or color they show has changed. Unless lines are soft-wrapped, the
+        numbers shown depend only on the first line in view, the number of
+        lines, the current line and the size of the widget, so if none of those
+        have changed, nothing is done.
+        """
+        if not self.winfo_ismapped():
+            return
         # Allow for 5 digit line numbers
         width = self.font.measure("88888") + self.x_offset + 5
-        self["width"] = width
-        self.delete("all")
+        if width != self.gutter_width:
+            self.gutter_width = width
+            self["width"] = width
         cur_line = IndexRowCol(self.textwidget.index(tk.INSERT)).row
-        if maintext().focus_widget() == self.textwidget:
-            cur_bg = self.textwidget["selectbackground"]
-        else:
-            cur_bg = self.textwidget["inactiveselectbackground"]
-        cur_fg = self.textwidget["selectforeground"]
+        has_focus = maintext().focus_widget() == self.textwidget
         text_pos = self.winfo_width() - self.x_offset
         line_spacing_adj = int(self.textwidget["spacing1"])
         index = self.textwidget.index("@0,0")
-        while True:
-            dline = self.textwidget.dlineinfo(index)
-            if dline is None:
-                break
+        dline = self.textwidget.dlineinfo(index)
+        drawn_with = (
+            IndexRowCol(index).row,
+            dline and dline[1],
+            self.textwidget.index(tk.END),
+            cur_line,
+            has_focus,
+            self.winfo_height(),
+            text_pos,
+            line_spacing_adj,
+            self.font.metrics("linespace"),
+        )
+        if drawn_with == self.drawn_with and str(self.textwidget["wrap"]) == tk.NONE:
+            return
+        self.drawn_with = drawn_with
+
+        cur_fg = self.textwidget["selectforeground"]
+        count = 0
+        cur_item = 0
+        while dline is not None:
             linenum = IndexRowCol(index).row
-            text_color = cur_fg if linenum == cur_line else self.text_color
-            text = self.create_text(
+            number = (
+                linenum,
                 text_pos,
                 dline[1] + line_spacing_adj,
-                anchor="ne",
-                font=self.font,
-                text=linenum,
-                fill=text_color,
+                cur_fg if linenum == cur_line else self.text_color,
             )
-            # Highlight the line number of the current line
-            if linenum == cur_line:
-                bbox = list(self.bbox(text))
-                rect = self.create_rectangle(
-                    (
-                        3,
-                        bbox[1] - line_spacing_adj,
-                        bbox[2] + self.x_offset - 3,
-                        bbox[3],
-                    ),
-                    fill=cur_bg,
-                    width=0,
+            if count == len(self.number_items):
+                self.number_items.append(
+                    self.create_text(0, 0, anchor="ne", font=self.font)
                 )
-                self.tag_lower(rect, text)
+                self.numbers.append(None)
+            item = self.number_items[count]
+            if number != self.numbers[count]:
+                self.coords(item, number[1], number[2])
+                self.itemconfigure(
+                    item, text=number[0], fill=number[3], state=tk.NORMAL
+                )
+                self.numbers[count] = number
+            if linenum == cur_line:
+                cur_item = item
+            count += 1
             index = self.textwidget.index(index + "+1l")
+            dline = self.textwidget.dlineinfo(index)
+        # Hide unused items, so they are available for later
+        for idx in range(count, len(self.number_items)):
+            if self.numbers[idx] is not None:
+                self.itemconfigure(self.number_items[idx], state=tk.HIDDEN)
+                self.numbers[idx] = None
+
+        # Highlight the line number of the current line
+        if cur_item:
+            bbox = self.bbox(cur_item)
+            if self.cur_rect == 0:
+                self.cur_rect = self.create_rectangle(0, 0, 0, 0, width=0)
+                self.tag_lower(self.cur_rect)
+            self.coords(
+                self.cur_rect,
+                3,
+                bbox[1] - line_spacing_adj,
+                bbox[2] + self.x_offset - 3,
+                bbox[3],
+            )
+            cur_bg = self.textwidget[
+                "selectbackground" if has_focus else "inactiveselectbackground"
+            ]
+            self.itemconfigure(self.cur_rect, fill=cur_bg, state=tk.NORMAL)
+        elif self.cur_rect:
+            self.itemconfigure(self.cur_rect, state=tk.HIDDEN)
 
     def theme_change(self) -> None:
         """Handle change of color theme"""
         self.configure(background=themed_style().lookup("TButton", "background"))
         if tfg := themed_style().lookup("TButton", "foreground"):
             self.text_color = tfg
+        self.drawn_with = None  # Force redraw in new colors
 
     def drag_handler_start(self, evt: tk.Event) -> None:
         """Handle initial click for drag-select operation."""
@@ -700,6 +774,155 @@ class TextPeer(tk.Text):
         self.location_history = LocationHistory(self, "peerhist")
 
 
+def changed_lines(old_lines: list[str], new_lines: list[str]) -> tuple[int, int]:
+    """Return range of lines that have changed, found by skipping lines that
+    are the same at the start and end of the old & new lists of lines.
+
+    Args:
+        old_lines: Lines before change.
+        new_lines: Lines after change.
+
+    Returns:
+        Index of first changed line in new lines, and index after last changed
+        line, which are equal if lines were only deleted.
+    """
+    limit = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    return prefix, len(new_lines) - suffix
+
+
+class ViewportHighlighter:
+    """Highlight matches in the visible part of the main text & peer,
+    remembering which lines have been scanned for the current settings,
+    so they aren't scanned again.
+
+    For each viewport, the scanned lines are kept between two marks, so they
+    move with edits elsewhere, together with the text of those lines. When a
+    viewport scrolls, only newly exposed lines are scanned. When the text
+    changes, only the lines that differ from the saved text are rescanned.
+    A few lines either side of those are also rescanned, so that matches
+    spanning lines are still found.
+    """
+
+    # Lines rescanned either side of newly exposed or changed lines
+    OVERLAP_LINES = 5
+    # Scanned lines are forgotten if there are more than this in a viewport
+    MAX_LINES = 1000
+
+    def __init__(
+        self,
+        name: str,
+        tags: Iterable[str],
+        scan: Callable[[tk.Text, IndexRange], None],
+        margin: int,
+    ) -> None:
+        """Initialize highlighter.
+
+        Args:
+            name: Name of highlighter, used to name its marks.
+            tags: Highlight tags added by scan function.
+            scan: Function to highlight matches in the given range of the viewport.
+            margin: Number of lines to scan above & below the visible lines.
+        """
+        self.name = name
+        self.tags = list(tags)
+        self.scan = scan
+        self.margin = margin
+        self.settings: Optional[tuple] = None
+        # Text of scanned lines, keyed by viewport
+        self.scanned: dict[str, list[str]] = {}
+
+    def reset(self) -> None:
+        """Forget which lines have been scanned, e.g. when highlights removed."""
+        self.settings = None
+        self.scanned.clear()
+
+    def highlight(self, viewports: list[tk.Text], settings: tuple) -> None:
+        """Highlight matches in lines of the viewports that haven't been scanned
+        with the given settings, or have changed since they were scanned.
+
+        Args:
+            viewports: Viewports to highlight.
+            settings: Values that matches depend on, e.g. search pattern.
+                If they have changed, all lines are rescanned.
+        """
+        if settings != self.settings:
+            for tag in self.tags:
+                maintext().tag_remove(tag, "1.0", tk.END)
+            self.scanned.clear()
+            self.settings = settings
+        for viewport in viewports:
+            self.highlight_viewport(viewport)
+
+    def highlight_viewport(self, viewport: tk.Text) -> None:
+        """Highlight matches in lines of the viewport that need scanning.
+
+        Args:
+            viewport: Main text or peer.
+        """
+        text = maintext()
+        wanted = text.get_screen_window_coordinates(viewport, self.margin)
+        want_start, want_end = wanted.start.row, wanted.end.row
+        key = "Peer" if viewport is text.peer else "Main"
+        start_mark = f"{self.name}Scanned{key}Start"
+        end_mark = f"{self.name}Scanned{key}End"
+        overlap = ViewportHighlighter.OVERLAP_LINES
+
+        rescan: list[tuple[int, int]] = []
+        old_lines = self.scanned.get(key)
+        start = end = 0
+        if old_lines is not None:
+            try:
+                start = IndexRowCol(text.index(start_mark)).row
+                end = IndexRowCol(text.index(end_mark)).row
+            except tk.TclError:  # Marks removed, e.g. when file loaded
+                old_lines = None
+        if old_lines is not None:
+            new_lines = text.get(f"{start}.0", f"{end}.0").split("\n")
+            if new_lines != old_lines:
+                first, last = changed_lines(old_lines, new_lines)
+                rescan.append((start + first - overlap, start + last + overlap))
+        if old_lines is None or want_end <= start or want_start >= end:
+            rescan = [(want_start, want_end)]
+            start, end = want_start, want_end
+        else:
+            if want_start < start:
+                rescan.append((want_start, start + overlap))
+            if want_end > end:
+                rescan.append((end - overlap, want_end))
+            start, end = min(start, want_start), max(end, want_end)
+            if end - start > ViewportHighlighter.MAX_LINES:
+                start, end = want_start, want_end
+        if old_lines is not None and not rescan:
+            return
+
+        # Merge overlapping ranges, so matches found in one aren't removed by another
+        merged: list[list[int]] = []
+        for scan_start, scan_end in sorted(rescan):
+            scan_start, scan_end = max(scan_start, start), min(scan_end, end)
+            if scan_start >= scan_end:
+                continue
+            if merged and scan_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], scan_end)
+            else:
+                merged.append([scan_start, scan_end])
+        for scan_start, scan_end in merged:
+            for tag in self.tags:
+                text.tag_remove(tag, f"{scan_start}.0", f"{scan_end}.0")
+            self.scan(viewport, IndexRange(f"{scan_start}.0", f"{scan_end}.0"))
+
+        text.mark_set(start_mark, f"{start}.0")
+        text.mark_gravity(start_mark, tk.LEFT)
+        text.mark_set(end_mark, f"{end}.0")
+        text.mark_gravity(end_mark, tk.RIGHT)
+        self.scanned[key] = text.get(f"{start}.0", f"{end}.0").split("\n")
+
+
 class MainText(tk.Text):
     """MainText is the main text window, and inherits from ``tk.Text``."""
 
@@ -751,6 +974,7 @@ class MainText(tk.Text):
             **kwargs,
         )
         tk.Text.grid(self, column=1, row=1, sticky="NSEW")
+        register_tk_widget(self)
 
         self.location_history = LocationHistory(self, "mainhist")
 
@@ -774,27 +998,52 @@ class MainText(tk.Text):
         self.regex_nocase = False
         self.regex_start_mark = ""
         self.regex_end_mark = ""
+        self.search_highlighter = ViewportHighlighter(
+            "SearchHighlight",
+            [HighlightTag.SEARCH],
+            self.highlight_search_in_range,
+            80,
+        )
+        self.regex_highlighter = ViewportHighlighter(
+            "RegexHighlight",
+            [HighlightTag.CHAR_STR_REGEX],
+            self.highlight_regex_in_range,
+            80,
+        )
+        self.proofercomment_highlighter = ViewportHighlighter(
+            "ProoferCommentHighlight",
+            [HighlightTag.PROOFERCOMMENT],
+            self.highlight_proofercomment_in_range,
+            5,
+        )
+        self.html_tags_highlighter = ViewportHighlighter(
+            "HTMLTagsHighlight",
+            [HighlightTag.HTML_TAG_BAD, *HTML_TAG_TAGS.values()],
+            self.highlight_html_tags_in_range,
+            5,
+        )
 
         # Create Line Numbers widget
         self.linenumbers = TextLineNumbers(self.frame, self)
         self.linenumbers.grid(column=0, row=1, sticky="NSEW")
         self.colnumbers = TextColumnNumbers(self.frame, self)
         self.colnumbers.grid(column=1, row=0, sticky="NSEW")
-        self.numbers_need_updating = False
+        self.change_scheduler = ChangeScheduler(self)
+        self._add_change_passes()
 
         def hscroll_set(*args: Any) -> None:
             self.hscroll.set(*args)
             self.colnumbers.xview("moveto", args[0])
-            self._on_change()
+            self._on_change(kind=ChangeKind.VIEW)
 
         def vscroll_set(*args: Any) -> None:
             self.vscroll.set(*args)
-            self._on_change()
+            self._on_change(kind=ChangeKind.VIEW)
 
         def hscroll_main_and_ruler(*args: Any) -> None:
             self.xview(*args)
             self.colnumbers.xview(*args)
-            self._on_change()
+            self._on_change(kind=ChangeKind.VIEW)
 
         # Create scrollbars, place in Frame, and link to Text
         self.hscroll = ttk.Scrollbar(
@@ -856,16 +1105,16 @@ class MainText(tk.Text):
         def peer_hscroll_set(*args: Any) -> None:
             self.peer_hscroll.set(*args)
             self.peer_colnumbers.xview("moveto", args[0])
-            self._on_change()
+            self._on_change(kind=ChangeKind.VIEW)
 
         def peer_vscroll_set(*args: Any) -> None:
             self.peer_vscroll.set(*args)
-            self._on_change()
+            self._on_change(kind=ChangeKind.VIEW)
 
         def hscroll_peer_and_ruler(*args: Any) -> None:
             self.peer.xview(*args)
             self.peer_colnumbers.xview(*args)
-            self._on_change()
+            self._on_change(kind=ChangeKind.VIEW)
 
         # Create peer scrollbars, place in Frame, and link to peer Text
         self.peer_hscroll = ttk.Scrollbar(
@@ -1135,7 +1384,11 @@ class MainText(tk.Text):
         # Bind line numbers update routine to all events that might
         # change which line numbers should be displayed in maintext and peer
         self.bind_event(
-            "<Configure>", self._on_change, add=True, force_break=False, bind_peer=True
+            "<Configure>",
+            lambda _event: self._on_change(kind=ChangeKind.VIEW),
+            add=True,
+            force_break=False,
+            bind_peer=True,
         )
 
         # Intercept key presses that insert a character,
@@ -1455,20 +1708,21 @@ class MainText(tk.Text):
     def insert(self, index: Any, chars: str, *args: Any) -> None:
         """Override method to ensure line numbers are updated."""
         super().insert(index, chars, *args)
-        self._on_change()
+        self._on_change(kind=ChangeKind.TEXT)
 
     def delete(self, index1: Any, index2: Any = None) -> None:
         """Override method to ensure line numbers are updated."""
         super().delete(index1, index2)
-        self._on_change()
+        self._on_change(kind=ChangeKind.TEXT)
 
     def replace(self, index1: Any, index2: Any, chars: str, *args: Any) -> None:
         """Override method to ensure line numbers are updated.
 
         Also preserve pagemark locations within the replacement."""
         self._replace_preserving_pagemarks(index1, index2, chars, *args)
-        self._on_change()
+        self._on_change(kind=ChangeKind.TEXT)
 
+    @timed("Replace All Occurrences")
     def replace_all(
         self, search_str: str, replace_str: str, regexp: bool = False
     ) -> None:
@@ -1489,20 +1743,14 @@ class MainText(tk.Text):
         """Override method to ensure line numbers are updated when insert cursor is moved."""
         super().mark_set(markName, index)
         if markName == tk.INSERT:
-            self._on_change()
+            self._on_change(kind=ChangeKind.CURSOR)
 
     def _do_linenumbers_redraw(self) -> None:
-        """Only redraw line numbers once when process becomes idle.
-
-        Several calls to this may be queued by _on_change, but only
-        the first will actually do a redraw, because the flag will
-        only be true on the first call."""
-        if self.numbers_need_updating:
-            self.numbers_need_updating = False
-            self.linenumbers.redraw()
-            self.peer_linenumbers.redraw()
-            self.colnumbers.redraw()
-            self.peer_colnumbers.redraw()
+        """Redraw line & column numbers."""
+        self.linenumbers.redraw()
+        self.peer_linenumbers.redraw()
+        self.colnumbers.redraw()
+        self.peer_colnumbers.redraw()
 
     def add_undo_redo_callback(self, key: str, func: Callable[[], None]) -> None:
         """Add callback function to a list of functions to be called when
@@ -1548,25 +1796,101 @@ class MainText(tk.Text):
         for func in self.config_callbacks:
             func()
 
-    def _on_change(self, *_args: Any) -> None:
-        """Callback when visible region of file may have changed.
-
-        By setting flag now, and queuing calls to _do_linenumbers_redraw,
-        we ensure the flag will be true for the first call to
-        _do_linenumbers_redraw."""
-
-        if not self.numbers_need_updating:
-            self.root.after_idle(self._do_linenumbers_redraw)
-            self.root.after_idle(self._call_config_callbacks)
-            self.root.after_idle(self.save_sash_coords)
-            self.root.after_idle(self.highlight_quotbrac)
-            self.root.after_idle(self.highlight_aligncol)
-            self.root.after_idle(self.highlight_cursor_line)
-            self.root.after_idle(self.highlight_search)
-            self.root.after_idle(self.highlight_regex)
-            self.root.after_idle(self.highlight_proofercomment)
-            self.root.after_idle(self.highlight_html_tags)
-            self.numbers_need_updating = True
+    def _on_change(self, *_args: Any, kind: ChangeKind = ChangeKind.ALL) -> None:
+        """Callback when text, cursor position or visible region of file may have
+        changed, to redraw line numbers, highlighting, etc., when idle.
+
+        Args:
+            kind: Kind(s) of change - all kinds if unknown, e.g. after a key press.
+        """
+        self.change_scheduler.changed(kind)
+
+    def _add_change_passes(self) -> None:
+        """Add the passes to be run by the change scheduler.
+
+        Text widget's own bindings, e.g. typing, change the text without
+        calling `insert` or `delete` above, so the range of an edit is often
+        unknown. Instead, highlighting passes are skipped if the text they
+        scan, and their settings, are the same as when they last ran, or
+        find the lines that have changed by comparing the text with its
+        previous contents.
+        """
+        scheduler = self.change_scheduler
+        scheduler.add_pass("linenumbers", self._do_linenumbers_redraw)
+        scheduler.add_pass("config_callbacks", self._call_config_callbacks)
+        scheduler.add_pass("sash_coords", self.save_sash_coords, ChangeKind.VIEW)
+        scheduler.add_pass(
+            "quotbrac",
+            self.highlight_quotbrac,
+            inputs=lambda: (
+                preferences.get(PrefKey.HIGHLIGHT_QUOTBRAC),
+                str(self.focus_widget()),
+                self.index(tk.INSERT),
+                tuple(str(index) for index in self.tag_ranges("sel")),
+                self._scanned_text(),
+            ),
+        )
+        scheduler.add_pass(
+            "aligncol",
+            self.highlight_aligncol,
+            ChangeKind.TEXT | ChangeKind.VIEW,
+            inputs=lambda: (
+                preferences.get(PrefKey.ALIGN_COL_ACTIVE),
+                self.aligncol,
+                self._scanned_text(),
+            ),
+        )
+        scheduler.add_pass(
+            "cursor_line",
+            self.highlight_cursor_line,
+            ChangeKind.TEXT | ChangeKind.CURSOR,
+            inputs=lambda: (
+                preferences.get(PrefKey.HIGHLIGHT_CURSOR_LINE),
+                preferences.get(PrefKey.SPLIT_TEXT_WINDOW),
+                str(self.focus_widget()),
+                # Line length, since text typed at start of line isn't highlighted
+                *(
+                    (
+                        viewport.index(tk.INSERT),
+                        viewport.index(f"{tk.INSERT} lineend"),
+                        bool(viewport.tag_ranges("sel")),
+                    )
+                    for viewport in (self, self.peer)
+                ),
+            ),
+        )
+        # These passes remember which lines they have scanned, so are run
+        # after every change, but only scan newly visible or edited lines.
+        # Search also runs when cursor moves, since Search dialog sets a new
+        # pattern then moves the cursor, which may not scroll the view
+        scheduler.add_pass(
+            "search",
+            self.update_highlight_search,
+            ChangeKind.TEXT | ChangeKind.CURSOR | ChangeKind.VIEW,
+        )
+        for name in ("regex", "proofercomment", "html_tags"):
+            scheduler.add_pass(
+                name,
+                getattr(self, f"update_highlight_{name}"),
+                ChangeKind.TEXT | ChangeKind.VIEW,
+            )
+
+    def _scanned_text(self) -> tuple[str, ...]:
+        """Return the ranges of text that highlighting passes may scan in the
+        main text & peer, i.e. the visible text plus a margin, and the text in
+        those ranges, fetched only once each time the change scheduler runs."""
+
+        def get_scanned_text() -> tuple[str, ...]:
+            """Return ranges & text in both viewports."""
+            result: list[str] = []
+            for viewport in (self, self.peer):
+                scan_range = self.get_screen_window_coordinates(viewport, 80)
+                start = scan_range.start.index()
+                end = scan_range.end.index()
+                result.extend((start, end, self.get(start, end)))
+            return tuple(result)
+
+        return self.change_scheduler.run_value("scanned_text", get_scanned_text)
 
     def save_sash_coords(self) -> None:
         """Save the splitter sash coords in Prefs."""
@@ -1708,6 +2032,7 @@ class MainText(tk.Text):
         """Return whether widget's text has been modified."""
         return self.edit_modified()
 
+    @timed("Save File")
     def do_save(self, fname: str, clear_modified_flag: bool = True) -> None:
         """Save widget's text to file.
 
@@ -1722,6 +2047,7 @@ class MainText(tk.Text):
         if clear_modified_flag:
             self.set_modified(False)
 
+    @timed("Open File")
     def do_open(self, fname: str) -> None:
         """Load text from file into widget.
 
@@ -4090,6 +4416,7 @@ class MainText(tk.Text):
         """Remove highlights for search"""
         if maintext().winfo_exists():
             self.tag_remove(HighlightTag.SEARCH, "1.0", tk.END)
+            self.change_scheduler.invalidate("search")
 
     def remove_highlights(self) -> None:
         """Remove active highlights."""
@@ -4398,6 +4725,7 @@ class MainText(tk.Text):
             HighlightTag.CURLY_SINGLE_QUOTE,
         ):
             self.tag_remove(tag, "1.0", tk.END)
+        self.change_scheduler.invalidate("quotbrac")
 
     def highlight_aligncol_in_viewport(self, viewport: Text) -> None:
         """Do highlighting of the alignment column in a single viewport."""
@@ -4429,6 +4757,7 @@ class MainText(tk.Text):
     def remove_highlights_aligncol(self) -> None:
         """Remove highlights for alignment column"""
         self.tag_remove(HighlightTag.ALIGNCOL, "1.0", tk.END)
+        self.change_scheduler.invalidate("aligncol")
 
     def highlight_aligncol_callback(self, value: bool) -> None:
         """Callback when highlight_aligncol active state is changed."""
@@ -4471,13 +4800,19 @@ class MainText(tk.Text):
             row = IndexRowCol(viewport.index(tk.INSERT)).row
             viewport.tag_add(hilite, f"{row}.0", f"{row + 1}.0")
 
-    def highlight_search_in_viewport(self, viewport: Text) -> None:
-        """Highlights current search pattern in designated viewport."""
+    def highlight_viewports(self) -> list[tk.Text]:
+        """Return viewports to be highlighted: main text, and peer if shown."""
+        if preferences.get(PrefKey.SPLIT_TEXT_WINDOW):
+            return [self, self.peer]
+        return [self]
+
+    def highlight_search_in_range(
+        self, viewport: Text, index_range: IndexRange
+    ) -> None:
+        """Highlights current search pattern in given range of designated viewport."""
         if not self.search_pattern:
             return
-        for _match in self.find_all(
-            self.get_screen_window_coordinates(viewport, 80), self.search_pattern
-        ):
+        for _match in self.find_all(index_range, self.search_pattern):
             viewport.tag_add(
                 HighlightTag.SEARCH,
                 _match.rowcol.index(),
@@ -4485,29 +4820,44 @@ class MainText(tk.Text):
             )
 
     def highlight_search(self) -> None:
-        """Highlight search matches during redraw."""
+        """Highlight search matches, rescanning all visible lines."""
         self.remove_highlights_search()
+        self.update_highlight_search()
+
+    def update_highlight_search(self) -> None:
+        """Highlight search matches during redraw, only scanning lines that
+        are newly visible or have changed."""
         if self.search_highlight_active:
-            self.highlight_search_in_viewport(self)
-            if PrefKey.SPLIT_TEXT_WINDOW:
-                self.highlight_search_in_viewport(self.peer)
+            self.search_highlighter.highlight(
+                self.highlight_viewports(),
+                (
+                    self.search_pattern,
+                    # Search dialog settings, used when finding matches
+                    preferences.get(PrefKey.SEARCHDIALOG_REGEX),
+                    preferences.get(PrefKey.SEARCHDIALOG_WHOLE_WORD),
+                    preferences.get(PrefKey.SEARCHDIALOG_MATCH_CASE),
+                ),
+            )
+        elif self.search_highlighter.settings is not None:
+            self.remove_highlights_search()
 
     def remove_highlights_search(self) -> None:
         """Remove highlights for search."""
         if self.winfo_exists():
             self.tag_remove(HighlightTag.SEARCH, "1.0", tk.END)
+            self.search_highlighter.reset()
 
     def highlight_search_deactivate(self) -> None:
         """Turn off the highlight-matches mode."""
         self.search_highlight_active = False
         self.remove_highlights_search()
 
-    def highlight_regex_in_viewport(self, viewport: Text) -> None:
-        """Highlights current char/str/regex pattern in designated viewport."""
+    def highlight_regex_in_range(self, viewport: Text, index_range: IndexRange) -> None:
+        """Highlights current char/str/regex pattern in given range of designated
+        viewport."""
         if not self.regex_pattern:
             return
-        # Restrict search range to intersection of visible screen and marked area
-        index_range = self.get_screen_window_coordinates(viewport, 80)
+        # Restrict search range to intersection of given range and marked area
         idx_start = maintext().index(self.regex_start_mark)
         if maintext().compare(index_range.start.index(), "<", idx_start):
             index_range.start = IndexRowCol(idx_start)
@@ -4531,17 +4881,32 @@ class MainText(tk.Text):
             )
 
     def highlight_regex(self) -> None:
-        """Highlight char/str/regex matches."""
+        """Highlight char/str/regex matches, rescanning all visible lines,
+        e.g. because marked area has changed."""
         self.remove_highlights_regex()
+        self.update_highlight_regex()
+
+    def update_highlight_regex(self) -> None:
+        """Highlight char/str/regex matches during redraw, only scanning lines
+        that are newly visible or have changed."""
         if self.regex_highlight_active:
-            self.highlight_regex_in_viewport(self)
-            if PrefKey.SPLIT_TEXT_WINDOW:
-                self.highlight_regex_in_viewport(self.peer)
+            self.regex_highlighter.highlight(
+                self.highlight_viewports(),
+                (
+                    self.regex_pattern,
+                    self.regex_regexp,
+                    self.regex_wholeword,
+                    self.regex_nocase,
+                ),
+            )
+        elif self.regex_highlighter.settings is not None:
+            self.remove_highlights_regex()
 
     def remove_highlights_regex(self) -> None:
         """Remove highlights for char/str/regex highlighting."""
         if self.winfo_exists():
             self.tag_remove(HighlightTag.CHAR_STR_REGEX, "1.0", tk.END)
+            self.regex_highlighter.reset()
 
     def highlight_regex_deactivate(self) -> None:
         """Turn off the highlight char/str/regex mode."""
@@ -4549,18 +4914,26 @@ class MainText(tk.Text):
         self.remove_highlights_regex()
 
     def highlight_proofercomment(self) -> None:
-        """Highlight [** proofer comments] for attention."""
+        """Highlight [** proofer comments] for attention, rescanning all
+        visible lines."""
         self.remove_highlights_proofercomment()
+        self.update_highlight_proofercomment()
+
+    def update_highlight_proofercomment(self) -> None:
+        """Highlight [** proofer comments] during redraw, only scanning lines
+        that are newly visible or have changed."""
         if preferences.get(PrefKey.HIGHLIGHT_PROOFERCOMMENT):
-            self.highlight_proofercomment_in_viewport(maintext())
-            if preferences.get(PrefKey.SPLIT_TEXT_WINDOW):
-                self.highlight_proofercomment_in_viewport(maintext().peer)
+            self.proofercomment_highlighter.highlight(self.highlight_viewports(), ())
+        elif self.proofercomment_highlighter.settings is not None:
+            self.remove_highlights_proofercomment()
 
-    def highlight_proofercomment_in_viewport(self, viewport: Text) -> None:
-        """Highlight [** proofer comments] in a single viewport."""
+    def highlight_proofercomment_in_range(
+        self, viewport: Text, index_range: IndexRange
+    ) -> None:
+        """Highlight [** proofer comments] in given range of a single viewport."""
         for _match in self.find_matches(
             r"\[\*\*([^]]|\n)*\]",
-            self.get_screen_window_coordinates(viewport),
+            index_range,
             regexp=True,
         ):
             viewport.tag_add(
@@ -4572,6 +4945,7 @@ class MainText(tk.Text):
     def remove_highlights_proofercomment(self) -> None:
         """Remove proofer comment-related highlights"""
         self.tag_remove(HighlightTag.PROOFERCOMMENT, "1.0", tk.END)
+        self.proofercomment_highlighter.reset()
 
     def highlight_html_tags_callback(self, value: bool) -> None:
         """Callback when highlight HTML tags state is changed."""
@@ -4581,17 +4955,22 @@ class MainText(tk.Text):
             self.remove_highlights_html_tags()
 
     def highlight_html_tags(self) -> None:
-        """Highlight visible HTML tags in text file."""
+        """Highlight visible HTML tags in text file, rescanning all visible lines."""
         if not preferences.get(PrefKey.HIGHLIGHT_HTML_TAGS):
             return
         self.remove_highlights_html_tags()
-        self.highlight_html_tags_in_viewport(self)
-        if PrefKey.SPLIT_TEXT_WINDOW:
-            self.highlight_html_tags_in_viewport(self.peer)
+        self.update_highlight_html_tags()
 
-    def highlight_html_tags_in_viewport(self, viewport: Text) -> None:
-        """Highlight visible HTML tags in given viewport."""
-        vp_range = self.get_screen_window_coordinates(viewport)
+    def update_highlight_html_tags(self) -> None:
+        """Highlight visible HTML tags during redraw, only scanning lines
+        that are newly visible or have changed."""
+        if preferences.get(PrefKey.HIGHLIGHT_HTML_TAGS):
+            self.html_tags_highlighter.highlight(self.highlight_viewports(), ())
+
+    def highlight_html_tags_in_range(
+        self, viewport: Text, vp_range: IndexRange
+    ) -> None:
+        """Highlight HTML tags in given range of viewport."""
 
         class HTMLParserTags(HTMLParser):
             """Class to parse and tk-tag HTML tags in a section of the file."""
@@ -4629,6 +5008,7 @@ class MainText(tk.Text):
         self.tag_remove(HighlightTag.HTML_TAG_BAD, "1.0", tk.END)
         for tag in HTML_TAG_TAGS.values():
             self.tag_remove(tag, "1.0", tk.END)
+        self.html_tags_highlighter.reset()
 
     def highlight_configure_tags(self) -> None:
         """Initialize the tag stack order."""
@@ -5673,7 +6053,7 @@ class ButtonMetadata(EntryMetadata):
     ) -> None:
         """Initialize ButtonMetadata."""
         super().__init__(label, parent_label, shortcut)
-        self.command = command
+        self.command = profiled_command(self.display_label(), command)
         self.bind_all = bind_all
         self.add_to_command_palette = add_to_command_palette
 
@@ -5697,8 +6077,16 @@ class CheckbuttonMetadata(EntryMetadata):
         """Initialize CheckboxMetadata."""
         super().__init__(f"{label} (toggle)", parent_label, shortcut)
         self.pref_key = pref_key
-        self.command_on = command_on
-        self.command_off = command_off
+        self.command_on = (
+            None
+            if command_on is None
+            else profiled_command(self.display_label(), command_on)
+        )
+        self.command_off = (
+            None
+            if command_off is None
+            else profiled_command(self.display_label(), command_off)
+        )
         self.bind_all = True  # Checkbox bindings are always to "all" widgets
         self.add_to_command_palette = True  # Also always in command palette
 
@@ -5832,6 +6220,81 @@ class MenuMetadata(EntryMetadata):
         raise NotImplementedError()
 
 
+class PaletteIndex:
+    """Index of command palette commands, to filter & rank them quickly as the
+    user types.
+
+    A command matches if the typed characters appear in order in its menu
+    and label, so typing another character can only remove matches: the
+    previous matches are then filtered, rather than all the commands. Otherwise,
+    only commands containing all the typed characters are checked.
+    """
+
+    PREFIXMATCH = 100
+    SUBSTRMATCH = 90
+    MENUMATCH = 80
+
+    def __init__(self, commands: list[EntryMetadata]) -> None:
+        """Initialize index, normalizing the labels of the commands.
+
+        Args:
+            commands: Commands shown in command palette.
+        """
+        self.commands = commands
+        self.labels = [cmd.display_label().lower() for cmd in commands]
+        self.menus = [cmd.display_parent_label().lower() for cmd in commands]
+        self.texts = [f"{menu} {label}" for menu, label in zip(self.menus, self.labels)]
+        self.char_index: dict[str, set[int]] = {}
+        for idx, text in enumerate(self.texts):
+            for char in text:
+                self.char_index.setdefault(char, set()).add(idx)
+        self.last_search = ""
+        self.last_scores: dict[int, int] = {}
+
+    def score(self, idx: int, search_text: str) -> int:
+        """Return how well search text matches a command.
+
+        Args:
+            idx: Index of command in list of commands.
+            search_text: Lowercase text to match.
+        """
+        label = self.labels[idx]
+        if label.startswith(search_text):
+            return PaletteIndex.PREFIXMATCH  # strong prefix match
+        if search_text in label:
+            return PaletteIndex.SUBSTRMATCH  # weaker substring match
+        if self.menus[idx].startswith(search_text):
+            return PaletteIndex.MENUMATCH  # strong menu prefix
+        return int(fuzz.WRatio(search_text, self.texts[idx]))  # fuzzy match
+
+    def scores(self, search_text: str) -> dict[int, int]:
+        """Return scores of commands that match search text.
+
+        Args:
+            search_text: Lowercase text to match - all commands match if empty,
+                as a prefix match.
+
+        Returns:
+            Dictionary of match scores, keyed by index of command in list of commands.
+        """
+        if not search_text:
+            return dict.fromkeys(range(len(self.commands)), PaletteIndex.PREFIXMATCH)
+        if self.last_search and search_text.startswith(self.last_search):
+            candidates: Iterable[int] = self.last_scores
+        else:
+            candidates = set.intersection(
+                *(self.char_index.get(char, set()) for char in set(search_text))
+            )
+        scores = {}
+        for idx in sorted(candidates):
+            chars = iter(self.texts[idx])
+            if all(char in chars for char in search_text):
+                scores[idx] = self.score(idx, search_text)
+        self.last_search = search_text
+        self.last_scores = scores
+        return scores
+
+
 class MenubarMetadata:
     """Store metadata about entries in the menu bar."""
 
@@ -5840,6 +6303,7 @@ class MenubarMetadata:
         self.entries: list[MenuMetadata] = []
         self.orphans: list[EntryMetadata] = []
         self.stored_shortcuts: dict[str, bool] = {}  # Keyevents
+        self._palette_index: Optional[PaletteIndex] = None
 
     def add_menu(self, label: str) -> MenuMetadata:
         """Add a menu to the menubar structure & return it.
@@ -5897,6 +6361,16 @@ class MenubarMetadata:
         commands.extend(self.orphans)
         return commands
 
+    def palette_index(self) -> PaletteIndex:
+        """Return index of command palette commands, building it if necessary."""
+        if self._palette_index is None:
+            self._palette_index = PaletteIndex(self.get_all_palette_commands())
+        return self._palette_index
+
+    def invalidate_palette_index(self) -> None:
+        """Discard index of command palette commands, e.g. when menus change."""
+        self._palette_index = None
+
     def store_shortcut(self, accel: str, bind_all: bool) -> None:
         """Store a shortcut so it can be unbound later."""
         if not accel:
@@ -5954,8 +6428,7 @@ class MenubarMetadata:
         """Return metadata that has given shortcut assigned (or None)."""
         if not shortcut:
             return None
-        all_commands = self.get_all_palette_commands()
-        for command in all_commands:
+        for command in self.palette_index().commands:
             if process_accel(command.shortcut)[0] == shortcut:
                 return command
         return None
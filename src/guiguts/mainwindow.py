@@ -14,10 +14,16 @@ from typing import Any, Callable, Optional
 from pathlib import Path
 import urllib.parse
 
-from PIL import Image, ImageTk, ImageChops, ImageOps
+from PIL import Image, ImageTk, ImageOps
 import regex as re
 
 from guiguts.data import icons
+from guiguts.image_cache import (
+    ImageRendering,
+    page_image_cache,
+    TILE_SIZE,
+    visible_tiles,
+)
 from guiguts.maintext import (
     MainText,
     maintext,
@@ -25,6 +31,7 @@ from guiguts.maintext import (
     MenuMetadata,
     ScrolledReadOnlyText,
     add_text_context_menu,
+    img_from_page_mark,
 )
 from guiguts.preferences import preferences, PrefKey, PersistentBoolean
 from guiguts.root import Root, root
@@ -651,8 +658,8 @@ class MainImage(tk.Frame):
 
         self.canvas = tk.Canvas(
             top_frame,
-            xscrollcommand=self.hbar.set,
-            yscrollcommand=self.vbar.set,
+            xscrollcommand=lambda *args: self.set_scrollbar(self.hbar, *args),
+            yscrollcommand=lambda *args: self.set_scrollbar(self.vbar, *args),
             highlightthickness=0,
             highlightbackground="darkorange",
         )
@@ -682,8 +689,13 @@ class MainImage(tk.Frame):
         self.image_scale = float(preferences.get(PrefKey.IMAGE_SCALE_FACTOR))
         self.scale_delta = 1.1
         self.image: Optional[Image.Image] = None
-        self.imageid = 0
-        self.imagetk: Optional[ImageTk.PhotoImage] = None
+        # Image is drawn as tiles, keyed by column & row, of canvas item & image
+        self.tiles: dict[tuple[int, int], tuple[int, ImageTk.PhotoImage]] = {}
+        # File name, rotation & rendering that the tiles are drawn with
+        self.tiles_drawn_with: Optional[tuple[str, int, ImageRendering]] = None
+        self.draw_tiles_pending = False
+        self.scaled_width = 0
+        self.scaled_height = 0
         self.filename = ""
         self.width = 0
         self.height = 0
@@ -743,14 +755,25 @@ class MainImage(tk.Frame):
         )
 
     def scroll_y(self, *args: Any, **kwargs: Any) -> None:
-        """Scroll canvas vertically and redraw the image"""
+        """Scroll canvas vertically."""
         self.canvas.yview(*args, **kwargs)
-        self.show_image()
 
     def scroll_x(self, *args: Any, **kwargs: Any) -> None:
-        """Scroll canvas horizontally and redraw the image."""
+        """Scroll canvas horizontally."""
         self.canvas.xview(*args, **kwargs)
-        self.show_image()
+
+    def set_scrollbar(self, scrollbar: ttk.Scrollbar, *args: Any) -> None:
+        """Update scrollbar when canvas view changes, and draw any image tiles
+        that have come into view.
+
+        Args:
+            scrollbar: Horizontal or vertical scrollbar.
+            args: Position of visible part of canvas, to pass to scrollbar.
+        """
+        scrollbar.set(*args)
+        if not self.draw_tiles_pending:
+            self.draw_tiles_pending = True
+            self.after_idle(self.draw_tiles)
 
     def move_from(self, event: tk.Event) -> None:
         """Remember previous coordinates for dragging with the mouse."""
@@ -759,7 +782,6 @@ class MainImage(tk.Frame):
     def move_to(self, event: tk.Event) -> None:
         """Drag canvas to the new position."""
         self.canvas.scan_dragto(event.x, event.y, gain=1)
-        self.show_image()
 
     def wheel_zoom(self, event: tk.Event) -> None:
         """Zoom with mouse wheel.
@@ -794,25 +816,23 @@ class MainImage(tk.Frame):
 
     def image_zoom_to_width(self) -> None:
         """Zoom image to fit to width of image window."""
-        if not self.imageid:
+        if self.tiles_drawn_with is None:
             return
-        bbox_image = self.canvas.bbox(self.imageid)
         scale_factor = (
             self.canvas.canvasx(self.canvas.winfo_width()) - self.canvas.canvasx(0)
-        ) / (bbox_image[2] - bbox_image[0])
+        ) / self.scaled_width
         self.image_zoom_by_factor(scale_factor)
 
     def image_zoom_to_height(self, disable_autofit: bool = False) -> None:
         """Zoom image to fit to height of image window."""
-        if not self.imageid:
+        if self.tiles_drawn_with is None:
             return
         if disable_autofit:
             preferences.set(PrefKey.IMAGE_AUTOFIT_WIDTH, False)
             preferences.set(PrefKey.IMAGE_AUTOFIT_HEIGHT, False)
-        bbox_image = self.canvas.bbox(self.imageid)
         scale_factor = (
             self.canvas.canvasy(self.canvas.winfo_height()) - self.canvas.canvasy(0)
-        ) / (bbox_image[3] - bbox_image[1])
+        ) / self.scaled_height
         self.image_zoom_by_factor(scale_factor)
 
     def image_zoom_by_factor(self, scale_factor: float) -> None:
@@ -886,31 +906,58 @@ class MainImage(tk.Frame):
         if self.image is None:
             return
         self.canvas["background"] = themed_style().lookup("TButton", "background")
-        image = self.image
-        self.image_scale = max(self.image_scale, 50 / image.width, 50 / image.height)
+        rendering = self.rendering()
+        self.image_scale = rendering.scale_for(self.image.width, self.image.height)
         preferences.set(PrefKey.IMAGE_SCALE_FACTOR, self.image_scale)
-        scaled_width = int(self.image_scale * image.width + 1)
-        scaled_height = int(self.image_scale * image.height + 1)
-        if preferences.get(PrefKey.IMAGE_INVERT) and self.grayscale:
-            image = ImageChops.invert(self.image)
-        if self.imagetk:
-            del self.imagetk
-        image = image.resize(
-            size=(scaled_width, scaled_height), resample=Image.Resampling.LANCZOS
-        )
-        if not preferences.get(PrefKey.HIGH_CONTRAST):
-            alpha_value = 180 if themed_style().is_dark_theme() else 200
-            image.putalpha(alpha_value)  # Adjust contrast using transparency
-        self.imagetk = ImageTk.PhotoImage(image)
-        if self.imageid:
-            self.canvas.delete(self.imageid)
-        self.imageid = self.canvas.create_image(
-            0,
-            0,
-            anchor="nw",
-            image=self.imagetk,
-        )
-        self.canvas.configure(scrollregion=self.canvas.bbox(self.imageid))
+        drawn_with = (self.filename, self.get_current_rotation(), rendering)
+        if drawn_with != self.tiles_drawn_with:
+            self.delete_tiles()
+            self.tiles_drawn_with = drawn_with
+            self.scaled_width, self.scaled_height = rendering.scaled_size(
+                self.image.width, self.image.height
+            )
+            self.canvas.configure(
+                scrollregion=(0, 0, self.scaled_width, self.scaled_height)
+            )
+        self.draw_tiles()
+
+    def draw_tiles(self) -> None:
+        """Draw the image tiles that are in view, and delete the others."""
+        self.draw_tiles_pending = False
+        if self.tiles_drawn_with is None:
+            return
+        filename, rotation, rendering = self.tiles_drawn_with
+        # Include a margin of one tile, so small scrolls don't reveal gaps
+        left = self.canvas.canvasx(0) - TILE_SIZE
+        top = self.canvas.canvasy(0) - TILE_SIZE
+        box = (
+            left,
+            top,
+            left + self.canvas.winfo_width() + 2 * TILE_SIZE,
+            top + self.canvas.winfo_height() + 2 * TILE_SIZE,
+        )
+        visible = set(visible_tiles((self.scaled_width, self.scaled_height), box))
+        for col_row in set(self.tiles) - visible:
+            self.canvas.delete(self.tiles.pop(col_row)[0])
+        for col, row in visible - set(self.tiles):
+            try:
+                image = page_image_cache.tile(filename, rotation, rendering, col, row)
+            except OSError as exc:
+                logger.error(f"Unable to load image {filename}: {exc}")
+                self.tiles_drawn_with = None
+                return
+            photo = ImageTk.PhotoImage(image)
+            item = self.canvas.create_image(
+                col * TILE_SIZE, row * TILE_SIZE, anchor="nw", image=photo
+            )
+            self.tiles[(col, row)] = (item, photo)
+
+    def delete_tiles(self) -> None:
+        """Delete all the image tiles from the canvas."""
+        for item, _ in self.tiles.values():
+            self.canvas.delete(item)
+        self.tiles.clear()
+        self.tiles_drawn_with = None
 
     def regrab_focus(
         self, focus_widget: Optional[tk.Misc], remaining_period: int
@@ -988,62 +1035,80 @@ class MainImage(tk.Frame):
 
         if filename and os.path.isfile(filename):
             self.filename = filename
-            image = Image.open(filename)
-            self.grayscale = self.is_it_grayscale(image)
-            self.image = image.convert("RGB")  # Needed for some operations
+            self.set_short_name()
+            self.image, self.grayscale = page_image_cache.decoded(
+                filename, self.rotation_details.get(self.short_name, 0)
+            )
             self.width, self.height = self.image.size
             self.canvas.yview_moveto(0)
             self.canvas.xview_moveto(0)
-            self.set_short_name()
-            if self.short_name in self.rotation_details:
-                if self.rotation_details[self.short_name] != 0:
-                    self.image = self.image.rotate(
-                        self.rotation_details[self.short_name], expand=True
-                    )
+            # Apply any autofit now, rather than drawing image twice
+            rendering = self.rendering(fit=True)
+            self.image_scale = rendering.scale_for(self.image.width, self.image.height)
             self.show_image(internal_only=False)
-            if preferences.get(PrefKey.IMAGE_AUTOFIT_WIDTH):
-                mainimage().image_zoom_to_width()
-            elif preferences.get(PrefKey.IMAGE_AUTOFIT_HEIGHT):
-                mainimage().image_zoom_to_height()
+            self.prefetch_adjacent_pages(
+                rendering, (self.canvas.winfo_width(), self.canvas.winfo_height())
+            )
         else:
             self.clear_image()
         return True
 
-    def is_it_grayscale(self, image: Image.Image) -> bool:
-        """Return True if image is grayscale (or at least invertable)."""
-        if image.mode in ("1", "L"):  # True grayscale
-            return True
-        if image.mode == "P":  # Palette - are all colors gray?
-            palette = image.getpalette()
-            if palette is None:
-                return False  # No palette defined
-            if len(palette) <= 2 * 3:
-                return True  # One- or two-color palette, OK to invert
-            for idx in range(len(palette) // 3):
-                r = palette[idx * 3]
-                g = palette[idx * 3 + 1]
-                b = palette[idx * 3 + 2]
-                if r != g or r != b:
-                    return False
-            return True
-        if image.mode == "RGB":  # RGB color - are sample of colors all gray?
-            width, height = image.size
-            for y in range(0, height, 10):
-                for x in range(0, width, 10):
-                    rgb = image.getpixel((x, y))
-                    assert isinstance(rgb, tuple)
-                    if rgb[0] != rgb[1] or rgb[0] != rgb[2]:
-                        return False
-            return True
-        return False
+    def rendering(self, fit: bool = False) -> ImageRendering:
+        """Return settings for drawing images in the viewer.
+
+        Args:
+            fit: True to fit image to viewer if an autofit setting is on.
+        """
+        fit_width = 0
+        fit_height = 0
+        if fit:
+            if preferences.get(PrefKey.IMAGE_AUTOFIT_WIDTH):
+                fit_width = self.canvas.winfo_width()
+            elif preferences.get(PrefKey.IMAGE_AUTOFIT_HEIGHT):
+                fit_height = self.canvas.winfo_height()
+        alpha = None
+        if not preferences.get(PrefKey.HIGH_CONTRAST):
+            alpha = 180 if themed_style().is_dark_theme() else 200
+        return ImageRendering(
+            scale=self.image_scale,
+            fit_width=fit_width,
+            fit_height=fit_height,
+            invert=bool(preferences.get(PrefKey.IMAGE_INVERT)),
+            alpha=alpha,
+        )
+
+    def prefetch_adjacent_pages(
+        self, rendering: ImageRendering, viewport: tuple[int, int]
+    ) -> None:
+        """Prepare images for the pages before and after the one containing
+        the insert cursor in the background, so they can be shown immediately.
+
+        Args:
+            rendering: How the images will be drawn.
+            viewport: Width & height of visible part of canvas.
+        """
+        if not (self.image_dir and maintext().winfo_exists()):
+            return
+        mark = maintext().get_current_page_mark()
+        if not mark:
+            return
+        images = []
+        for adjacent in (
+            maintext().page_mark_next(mark),
+            maintext().page_mark_previous(mark),
+        ):
+            if adjacent:
+                stem = img_from_page_mark(adjacent)
+                path = os.path.join(self.image_dir, stem + ".png")
+                if os.path.isfile(path):
+                    images.append((path, self.rotation_details.get(stem, 0)))
+        page_image_cache.prefetch(images, rendering, viewport)
 
     def clear_image(self) -> None:
         """Clear the image and reset variables accordingly."""
         self.filename = ""
         self.image = None
-        if self.imageid:
-            self.canvas.delete(self.imageid)
-        self.imageid = 0
+        self.delete_tiles()
         self.set_short_name()
 
     def set_image_docking(self) -> None:
@@ -1179,7 +1244,9 @@ class MainImage(tk.Frame):
                 else:
                     self.rotation_details[self.short_name] = 90
 
-            self.image = self.image.rotate(90, expand=True)
+            self.image, self.grayscale = page_image_cache.decoded(
+                self.filename, self.get_current_rotation()
+            )
             maintext().set_modified(True)
             self.show_image()
 
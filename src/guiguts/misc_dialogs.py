@@ -7,6 +7,7 @@ import json
 import logging
 import platform
 import sys
+import threading
 import tkinter as tk
 from tkinter import ttk, font, messagebox, colorchooser
 from typing import Literal, Optional, Callable
@@ -14,7 +15,6 @@ import unicodedata
 import webbrowser
 
 from packaging.version import Version
-from rapidfuzz import process
 import regex as re
 
 from guiguts.data import tips
@@ -24,6 +24,7 @@ from guiguts.maintext import (
     menubar_metadata,
     EntryMetadata,
     KeyboardShortcutsDict,
+    PaletteIndex,
     StyleDict,
     ColorKey,
 )
@@ -36,6 +37,7 @@ from guiguts.preferences import (
     PersistentString,
     preferences,
 )
+from guiguts.profiling import TRACE_FILE_NAME
 from guiguts.root import root
 from guiguts.utilities import is_mac, is_windows, sound_bell, process_accel, IndexRange
 from guiguts.widgets import (
@@ -661,11 +663,24 @@ class PreferencesDialog(ToplevelDialog):
             'It can also include a year to select a specific dataset, e.g. "es-2019".',
         )
 
+        timing_check = ttk.Checkbutton(
+            advance_frame,
+            text="Log Tool Timings",
+            variable=PersistentBoolean(PrefKey.TOOL_TIMING),
+        )
+        timing_check.grid(column=0, row=12, sticky="NEW", pady=5)
+        ToolTip(
+            timing_check,
+            "Report time, Tk calls and memory used by tools in the Message Log,\n"
+            f"and write a trace file, {TRACE_FILE_NAME}, to the preferences folder.\n"
+            "Always on when running in debug mode.",
+        )
+
         ttk.Button(
             advance_frame,
             text="Reset shortcuts to default (requires restart)",
             command=lambda: KeyboardShortcutsDict().reset(),
-        ).grid(row=12, column=0, sticky="NSW", pady=5, columnspan=3)
+        ).grid(row=13, column=0, sticky="NSW", pady=5, columnspan=3)
 
         notebook.bind(
             "<<NotebookTabChanged>>",
@@ -693,6 +708,9 @@ class PreferencesDialog(ToplevelDialog):
             "High Contrast", PrefKey.HIGH_CONTRAST
         )
         menubar_metadata().add_checkbutton_orphan("Line Numbers", PrefKey.LINE_NUMBERS)
+        menubar_metadata().add_checkbutton_orphan(
+            "Log Tool Timings", PrefKey.TOOL_TIMING
+        )
         menubar_metadata().add_checkbutton_orphan(
             "Column Numbers", PrefKey.COLUMN_NUMBERS
         )
@@ -1735,17 +1753,19 @@ class ComposeHelpDialog(ToplevelDialog):
 
 
 class RecentPlusEntry:
-    """Class to store recent-ness plus a command structure."""
+    """Class to store recent-ness plus a command structure, and how well
+    the command matches the search text."""
 
     NONRECENT = 10000
     SEPARATOR = 1000  # Between NONRECENT and valid recentnesses
-    PREFIXMATCH = 100
-    SUBSTRMATCH = 90
-    MENUMATCH = 80
 
-    def __init__(self, recentness: int, entry: EntryMetadata) -> None:
+    def __init__(
+        self, recentness: int, entry: EntryMetadata, score: int = 0, idx: int = -1
+    ) -> None:
         self.recentness = recentness
         self.entry = entry
+        self.score = score
+        self.idx = idx  # Index of command in palette index, -1 for separator
 
 
 class CommandEditDialog(OkCancelDialog):
@@ -2011,8 +2031,9 @@ class CommandPaletteDialog(ToplevelDialog):
     """Command Palette Dialog.
 
     Commands are sorted alphabetically. User can click headings to sort by shortcut
-    or Menu. Click again for reverse sort. If user types search string, sorting is
-    by closeness of match with search string, not alphabetical."""
+    or Menu. Click again for reverse sort. If user types search string, only commands
+    whose menu & label contain its characters in order are listed, sorted by
+    closeness of match with search string, not alphabetical."""
 
     manual_page = "Help_Menu#Command_Palette"
     NUM_HISTORY = 5
@@ -2022,7 +2043,6 @@ class CommandPaletteDialog(ToplevelDialog):
     def __init__(self) -> None:
         """Initialize the command palette window."""
         super().__init__("Command Palette")
-        self.commands = menubar_metadata().get_all_palette_commands()
         self.filtered_entries: list[RecentPlusEntry] = []
         self.num_recent = 0
         self.edit_dialog: Optional[CommandEditDialog] = None
@@ -2138,40 +2158,26 @@ class CommandPaletteDialog(ToplevelDialog):
         search_text = self.search_var.get().lower().strip()
         sort_idx = preferences.get(PrefKey.COMMAND_PALETTE_SORT)
 
-        def score_command(cmd: EntryMetadata) -> int:
-            """Return how well search text matches this command."""
-            label_lower = cmd.display_label().lower()
-            menu_lower = cmd.display_parent_label().lower()
-            if label_lower.startswith(search_text):
-                score = RecentPlusEntry.PREFIXMATCH  # strong prefix match
-            elif search_text in label_lower:
-                score = RecentPlusEntry.SUBSTRMATCH  # weaker substring match
-            elif menu_lower.startswith(search_text):
-                score = RecentPlusEntry.MENUMATCH  # strong menu prefix
-            else:  # fallback to fuzzy match
-                score = int(
-                    process.extractOne(search_text, [f"{menu_lower} {label_lower}"])[
-                        1
-                    ]  # type: ignore[index]
-                )
-            return score
+        index = menubar_metadata().palette_index()
 
         def recent_key(recent_plus_entry: RecentPlusEntry) -> tuple[int, int, int, str]:
             """Sort based on recent/not, match score, recentness, then alphabetic."""
-            score = score_command(recent_plus_entry.entry)
+            score = recent_plus_entry.score
             # If recent, but not a direct match, pretend it's not recent
             if recent_plus_entry.recentness < RecentPlusEntry.SEPARATOR:
-                recent_band = 0 if score >= RecentPlusEntry.MENUMATCH else 2
+                recent_band = 0 if score >= PaletteIndex.MENUMATCH else 2
             elif recent_plus_entry.recentness == RecentPlusEntry.SEPARATOR:
                 recent_band = 1
             else:
                 recent_band = 2
-            if sort_idx in (1, -1):
-                alpha = recent_plus_entry.entry.display_label().lower()
+            if recent_plus_entry.idx < 0:
+                alpha = ""
+            elif sort_idx in (1, -1):
+                alpha = index.labels[recent_plus_entry.idx]
             elif sort_idx in (2, -2):
                 alpha = recent_plus_entry.entry.display_shortcut().lower()
             else:
-                alpha = recent_plus_entry.entry.display_parent_label().lower()
+                alpha = index.menus[recent_plus_entry.idx]
             # If reverse sort and not a recent command and no search text, then
             # "subtract" string from a "big" string, so it sorts in reverse alphabetical order
             if sort_idx < 0 and recent_band == 2 and not search_text:
@@ -2209,20 +2215,17 @@ class CommandPaletteDialog(ToplevelDialog):
                 )
             )
 
-        for cmd in self.commands:
-            self.filtered_entries.append(
-                RecentPlusEntry(RecentPlusEntry.NONRECENT, cmd)
+        # Add commands that match search text, with recentness for recent commands
+        recentnesses = {
+            (label, menu): recentness
+            for recentness, (label, menu) in enumerate(recent_commands)
+        }
+        for idx, score in index.scores(search_text).items():
+            cmd = index.commands[idx]
+            recentness = recentnesses.pop(
+                (cmd.label, cmd.parent_label), RecentPlusEntry.NONRECENT
             )
-
-        # Set recentness for recent commands
-        for recentness, (label, menu) in enumerate(recent_commands):
-            for recent_plus_entry in self.filtered_entries:
-                if (
-                    recent_plus_entry.entry.label == label
-                    and recent_plus_entry.entry.parent_label == menu
-                ):
-                    recent_plus_entry.recentness = recentness
-                    break
+            self.filtered_entries.append(RecentPlusEntry(recentness, cmd, score, idx))
 
         # Now sort commands by recentness, match score, and alphabetically
         self.filtered_entries.sort(key=recent_key)
@@ -2705,6 +2708,7 @@ class UnicodeSearchDialog(ToplevelDialog):
         """Initialize Unicode Search dialog."""
 
         super().__init__("Unicode Search")
+        unicode_name_index.build()  # Build in background while user types
 
         search_frame = ttk.Frame(self.top_frame)
         search_frame.grid(column=0, row=0, sticky="NSEW")
@@ -2820,22 +2824,13 @@ class UnicodeSearchDialog(ToplevelDialog):
         if len(match_words) > 0:
             self.search.add_to_history(string)
 
-        # Check every Unicode character to see if its name contains all the given words
+        # Find Unicode characters whose names contain all the given words
         # (including hyphenated, e.g. BREAK will match NO-BREAK, but not NON-BREAKING)
         found = False
-        if len(match_words) > 0:
-            for ordinal in range(0, sys.maxunicode + 1):
-                char = chr(ordinal)
-                name, flag = unicode_char_to_name(char)
-                name_list = name.lower().split(" ")
-                hyphen_parts: list[str] = []
-                for word in name_list:
-                    if "-" in word:
-                        hyphen_parts += word.split("-")
-                name_list += hyphen_parts
-                if name and all(word in name_list for word in match_words):
-                    self.add_row(char, flag)
-                    found = True
+        for ordinal in unicode_name_index.matches(match_words):
+            char = chr(ordinal)
+            self.add_row(char, unicode_char_to_name(char)[1])
+            found = True
 
         if not found:  # Maybe string was a hex codepoint?
             hex_string = re.sub(r"^(U\+|0?X)", "", string.strip(), flags=re.IGNORECASE)
@@ -2941,6 +2936,65 @@ class UnicodeSearchDialog(ToplevelDialog):
         dlg.block_selected()
 
 
+class UnicodeNameIndex:
+    """Index from words in Unicode character names to the characters' code points,
+    so searching by name doesn't need to check the name of every character.
+
+    Words are lowercase, and hyphenated words are also indexed by each of their
+    parts. Building the index takes about a second, so it is done in a worker
+    thread the first time it is needed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the index, without building it."""
+        self._index: dict[str, list[int]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def build(self) -> None:
+        """Start building the index in a worker thread, if not already started."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._build_worker, daemon=True)
+                self._thread.start()
+
+    def _build_worker(self) -> None:
+        """Build the index from the names of all Unicode characters."""
+        index: dict[str, list[int]] = {}
+        for ordinal in range(0, sys.maxunicode + 1):
+            name = unicodedata.name(chr(ordinal), "")
+            for word in name.lower().split(" ") if name else []:
+                index.setdefault(word, []).append(ordinal)
+                if "-" in word:
+                    for part in set(word.split("-")):
+                        index.setdefault(part, []).append(ordinal)
+        self._index = index
+
+    def matches(self, words: list[str]) -> list[int]:
+        """Return code points, in order, of characters whose names contain all
+        the given words, waiting for the index to be built if necessary.
+
+        Args:
+            words: Lowercase words to match.
+        """
+        if not words:
+            return []
+        self.build()
+        assert self._thread is not None
+        self._thread.join()
+        # Intersect the shortest lists first, to keep the sets small
+        ordinal_lists = sorted(
+            (self._index.get(word, []) for word in set(words)), key=len
+        )
+        ordinals = set(ordinal_lists[0])
+        for ordinal_list in ordinal_lists[1:]:
+            ordinals.intersection_update(ordinal_list)
+        return sorted(ordinals)
+
+
+unicode_name_index = UnicodeNameIndex()
+
+
 def unicode_char_to_name(char: str) -> tuple[str, str]:
     """Convert char to Unicode name, and return a warning character.
 
@@ -28,6 +28,7 @@ from guiguts.preferences import (
     preferences,
     PersistentBoolean,
 )
+from guiguts.profiling import timed
 from guiguts.search import (
     get_regex_replacement,
     message_from_regex_exception,
@@ -165,6 +166,7 @@ class BasicFixup:
             view_options_filters=BASIC_FIXUP_CHECKER_FILTERS,
         )
 
+    @timed("Basic Fixup")
     def run(self) -> None:
         """Check the currently loaded file for basic fixup errors."""
 
@@ -798,6 +800,7 @@ class UnmatchedBlockMarkupDialog(UnmatchedCheckerDialog):
         super().__init__("Unmatched Block markup", **kwargs)
 
 
+@timed("Unmatched Brackets")
 def unmatched_brackets() -> None:
     """Check for unmatched brackets."""
 
@@ -834,6 +837,7 @@ def unmatched_brackets() -> None:
     )
 
 
+@timed("Unmatched DP Markup")
 def unmatched_dp_markup() -> None:
     """Check for unmatched DP markup."""
 
@@ -878,6 +882,7 @@ def unmatched_dp_markup() -> None:
     )
 
 
+@timed("Unmatched HTML Markup")
 def unmatched_html_markup() -> None:
     """Check for unmatched HTML markup."""
     open_regex = "<([[:alnum:]]+)([ \n]([^>]|\n)+)?>"
@@ -941,6 +946,7 @@ def unmatched_html_markup() -> None:
     )
 
 
+@timed("Unmatched Block Markup")
 def unmatched_block_markup() -> None:
     """Check for unmatched block markup."""
 
@@ -1422,6 +1428,7 @@ class ProoferCommentChecker:
             f"Delete and hide all identical comments matching selected one (Shift {cmd_ctrl_string()} right-click)",
         )
 
+    @timed("Proofer Comments")
     def run(self) -> None:
         """Do the actual check and add messages to the dialog."""
         self.dialog.reset()
@@ -1469,6 +1476,7 @@ class ProoferCommentChecker:
             maintext().delete(start_mark)
 
 
+@timed("Asterisk Check")
 def asterisk_check() -> None:
     """Find all asterisks without slashes."""
 
@@ -2207,6 +2215,7 @@ def do_replace_scanno(checker_entry: CheckerEntry) -> None:
     do_replace_scanno_regex(ScannoRegexCheckerDialog.scanno_type, checker_entry)
 
 
+@timed("Stealth Scannos")
 def stealth_scannos() -> None:
     """Report potential stealth scannos in file."""
     global _the_stealth_scannos_dialog
@@ -2227,6 +2236,7 @@ def do_replace_regex(checker_entry: CheckerEntry) -> None:
     do_replace_scanno_regex(ScannoRegexCheckerDialog.regex_type, checker_entry)
 
 
+@timed("Regex Library")
 def library_regexes() -> None:
     """Operate the regex library."""
     global _the_regex_library_dialog
@@ -2896,6 +2906,7 @@ def sort_key_error(
     )
 
 
+@timed("Curly Quotes Check")
 def check_curly_quotes() -> None:
     """Check for suspect curly quotes."""
     global _the_curly_quotes_dialog
@@ -260,6 +260,8 @@ class PrefKey(StrEnum):
     PPCOMP_ROUNDS_REGROUP = auto()
     PPCOMP_ROUNDS_PAGE_BLOCK = auto()
     PPCOMP_DISPLAY_TYPE = auto()
+    TOOL_TIMING = auto()
+    PROFILE_NEXT_COMMAND = auto()
 
 
 class Preferences:
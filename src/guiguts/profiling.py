@@ -0,0 +1,311 @@
+"""Instrumentation of tools and bulk operations for performance measurement."""
+
+from collections import Counter
+import cProfile
+import functools
+import json
+import logging
+import os
+import pstats
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+import regex as re
+
+from guiguts.preferences import preferences, PrefKey
+from guiguts.utilities import is_debug, is_mac
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__package__)
+
+TRACE_FILE_NAME = "guiguts_trace.json"
+# Number of functions listed in profile summary
+PROFILE_TOP_N = 20
+# Tk text widget methods whose calls are counted
+TK_CALLS = ("get", "index", "search", "mark_set", "tag_add")
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+_TK_WIDGET: Any = None
+_tk_counts: Counter[str] = Counter()
+_open_timings: list["Timing"] = []
+_TRACE_FILE: Optional[str] = None
+_trace_start = time.perf_counter()
+
+
+def register_tk_widget(widget: Any) -> None:
+    """Register the text widget whose Tk calls are to be counted.
+
+    Args:
+        widget: Text widget, normally the main text window.
+    """
+    global _TK_WIDGET
+    _TK_WIDGET = widget
+
+
+def instrumentation_enabled() -> bool:
+    """Return whether timing instrumentation is turned on."""
+    return is_debug() or bool(preferences.get(PrefKey.TOOL_TIMING))
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Return peak memory used by process so far in MB, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024 if is_mac() else 1024)
+
+
+def _install_tk_counters() -> None:
+    """Wrap the registered widget's Tk methods so their calls are counted.
+
+    Wrappers are instance attributes, so deleting them restores the originals.
+    """
+    if _TK_WIDGET is None:
+        return
+    for name in TK_CALLS:
+        method = getattr(_TK_WIDGET, name)
+
+        def counted(
+            *args: Any, _method: Any = method, _name: str = name, **kwargs: Any
+        ) -> Any:
+            _tk_counts[_name] += 1
+            return _method(*args, **kwargs)
+
+        setattr(_TK_WIDGET, name, counted)
+
+
+def _remove_tk_counters() -> None:
+    """Restore the registered widget's original Tk methods."""
+    if _TK_WIDGET is None:
+        return
+    for name in TK_CALLS:
+        if name in vars(_TK_WIDGET):
+            delattr(_TK_WIDGET, name)
+
+
+class Timing:
+    """Context manager to time a tool or bulk operation.
+
+    Does nothing unless instrumentation is enabled via debug mode or the
+    Tool Timing preference. Timings may be nested: Tk calls and entries
+    are counted for each one, but only the outermost is reported in the
+    Message Log unless in debug mode. Each timing is also appended to the
+    JSON trace file in the prefs directory, which can be loaded into a
+    trace viewer such as `chrome://tracing` or Perfetto.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize timing.
+
+        Args:
+            name: Name of tool or operation, used in reports.
+        """
+        self.name = name
+        self.active = False
+        self.entries: Optional[int] = None
+        self.start_wall = 0.0
+        self.start_cpu = 0.0
+        self.start_counts: Counter[str] = Counter()
+
+    def __enter__(self) -> "Timing":
+        """Start timing if instrumentation is enabled."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop timing and report results."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start timing if instrumentation is enabled.
+
+        Use directly, rather than as a context manager, for operations
+        that finish in a later callback, e.g. background checker jobs.
+        """
+        if not instrumentation_enabled():
+            return
+        self.active = True
+        if not _open_timings:
+            _tk_counts.clear()
+            _install_tk_counters()
+        _open_timings.append(self)
+        self.start_counts = _tk_counts.copy()
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop timing and report results."""
+        if not self.active:
+            return
+        self.active = False
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        _open_timings.remove(self)
+        outermost = not _open_timings
+        if outermost:
+            _remove_tk_counters()
+        stats: dict[str, Any] = {
+            "wall_time": round(wall, 4),
+            "cpu_time": round(cpu, 4),
+            "tk_calls": dict(_tk_counts - self.start_counts),
+            "entries": self.entries,
+            "peak_memory_mb": peak_memory_mb(),
+        }
+        message = self.summary(stats)
+        if outermost:
+            logger.info(message)
+        else:
+            logger.debug(message)
+        _write_trace_event(self.name, self.start_wall, wall, stats)
+
+    def summary(self, stats: dict[str, Any]) -> str:
+        """Return one-line summary of timing statistics.
+
+        Args:
+            stats: Statistics recorded for this timing.
+        """
+        parts = [f"{stats['wall_time']:.3f}s wall", f"{stats['cpu_time']:.3f}s CPU"]
+        if stats["entries"] is not None:
+            parts.append(f"{stats['entries']} entries")
+        if stats["tk_calls"]:
+            calls = ", ".join(
+                f"{name} {count}" for name, count in sorted(stats["tk_calls"].items())
+            )
+            parts.append(f"Tk calls: {calls}")
+        if stats["peak_memory_mb"] is not None:
+            parts.append(f"peak memory {stats['peak_memory_mb']:.0f}MB")
+        return f"Timing - {self.name}: " + "; ".join(parts)
+
+
+def timed(name: str) -> Callable[[_F], _F]:
+    """Decorator to time each call of a function using `Timing`.
+
+    Args:
+        name: Name of tool or operation, used in reports.
+    """
+
+    def decorator(func: _F) -> _F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with Timing(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def note_entries(count: int) -> None:
+    """Record number of entries produced by the innermost running timing.
+
+    Args:
+        count: Number of entries, e.g. in a checker dialog.
+    """
+    if _open_timings:
+        _open_timings[-1].entries = count
+
+
+def _write_trace_event(
+    name: str, start: float, duration: float, stats: dict[str, Any]
+) -> None:
+    """Append a complete ("X") event in Trace Event Format to the trace file.
+
+    File is started afresh the first time in each session. The closing
+    bracket of the JSON array is optional in this format, so it is never
+    written, allowing events to be appended as they occur.
+
+    Args:
+        name: Name of event.
+        start: Start time, from `time.perf_counter`.
+        duration: Duration in seconds.
+        stats: Statistics to include as event arguments.
+    """
+    global _TRACE_FILE
+    event = {
+        "name": name,
+        "ph": "X",
+        "ts": round((start - _trace_start) * 1e6),
+        "dur": round(duration * 1e6),
+        "pid": os.getpid(),
+        "tid": 0,
+        "args": stats,
+    }
+    try:
+        if _TRACE_FILE is None:
+            _TRACE_FILE = os.path.join(preferences.prefsdir, TRACE_FILE_NAME)
+            with open(_TRACE_FILE, "w", encoding="utf-8") as fp:
+                fp.write("[\n")
+            logger.info(f"Writing timing trace to {_TRACE_FILE}")
+        with open(_TRACE_FILE, "a", encoding="utf-8") as fp:
+            fp.write(json.dumps(event) + ",\n")
+    except OSError as exc:
+        logger.debug(f"Unable to write timing trace: {exc}")
+
+
+def profiled_command(label: str, command: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap a menu/command palette command so it can be profiled.
+
+    If the Profile Next Command setting is on when the command runs, the
+    setting is turned off, and the command is run under `cProfile`.
+    Only the work done before the command returns is profiled, e.g. not
+    that done later by a dialog it opens.
+
+    Args:
+        label: Label of command, used in reports.
+        command: Command to wrap.
+    """
+
+    @functools.wraps(command)
+    def wrapper() -> Any:
+        if not preferences.get(PrefKey.PROFILE_NEXT_COMMAND):
+            return command()
+        preferences.set(PrefKey.PROFILE_NEXT_COMMAND, False)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(command)
+        finally:
+            report_profile(label, profiler)
+
+    return wrapper
+
+
+def report_profile(label: str, profiler: cProfile.Profile) -> None:
+    """Save profile to a `.prof` file in the prefs folder, and summarize the
+    functions with the most time spent in them in the Message Log.
+
+    The file can be examined with `pstats` or a viewer such as snakeviz.
+
+    Args:
+        label: Label of profiled command.
+        profiler: Profiler that ran the command.
+    """
+    stats = pstats.Stats(profiler)
+    slug = re.sub(r"\W+", "_", label).strip("_").lower()
+    filename = os.path.join(
+        preferences.prefsdir,
+        f"guiguts_profile_{slug}_{time.strftime('%Y%m%d_%H%M%S')}.prof",
+    )
+    try:
+        stats.dump_stats(filename)
+        saved = f"saved to {filename}"
+    except OSError as exc:
+        saved = f"unable to save: {exc}"
+    total_time: float = stats.total_tt  # type: ignore[attr-defined]
+    lines = [
+        f"Profile - {label}: {total_time:.3f}s, {saved}",
+        f"{'self s':>9}{'total s':>9}{'calls':>9}  function",
+    ]
+    # Keyed by (file, line, function), values (prim calls, calls, self, total, callers)
+    func_stats: dict[tuple, tuple] = stats.stats  # type: ignore[attr-defined]
+    hot = sorted(func_stats.items(), key=lambda item: item[1][2], reverse=True)
+    for (file, line, func), (_, calls, self_secs, total_secs, _) in hot[:PROFILE_TOP_N]:
+        # Built-in functions have no file or line number
+        where = f" ({os.path.basename(file)}:{line})" if line else ""
+        lines.append(f"{self_secs:>9.3f}{total_secs:>9.3f}{calls:>9}  {func}{where}")
+    logger.info("\n".join(lines))
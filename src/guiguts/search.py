@@ -13,6 +13,7 @@ import roman  # type: ignore[import-untyped]
 from guiguts.checkers import CheckerDialog, CheckerMatchType
 from guiguts.maintext import maintext, TclRegexCompileError, FindMatch, menubar_metadata
 from guiguts.preferences import preferences, PersistentBoolean, PrefKey, PersistentInt
+from guiguts.profiling import timed
 from guiguts.utilities import (
     sound_bell,
     IndexRowCol,
@@ -642,6 +643,7 @@ class SearchDialog(ToplevelDialog):
         self.display_message(f"Found: {match_str} {range_name}")
         return matches
 
+    @timed("Search Find All")
     def findall_clicked(self) -> None:
         """Callback when Find All button clicked.
 
@@ -779,6 +781,7 @@ class SearchDialog(ToplevelDialog):
             find_next(previous=opposite_dir)
         return "break"
 
+    @timed("Search Replace All")
     def replaceall_clicked(self, box_num: int, identicals_only: bool = False) -> str:
         """Callback when Replace All button clicked.
 
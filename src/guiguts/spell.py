@@ -12,10 +12,16 @@ import regex as re
 
 from guiguts.data import dictionaries
 from guiguts.file import ProjectDict, the_file
-from guiguts.checkers import CheckerDialog, CheckerEntry
+from guiguts.checkers import (
+    CheckerDialog,
+    CheckerEntry,
+    CheckerReport,
+    DocumentSnapshot,
+)
 from guiguts.maintext import maintext, FindMatch
 from guiguts.misc_tools import tool_save
 from guiguts.preferences import preferences, PersistentInt, PrefKey
+from guiguts.profiling import timed
 from guiguts.utilities import (
     IndexRowCol,
     IndexRange,
@@ -345,16 +351,30 @@ class SpellCheckerDialog(CheckerDialog):
 class SpellChecker:
     """Provides spell check functionality."""
 
-    def __init__(self) -> None:
-        """Initialize SpellChecker class."""
+    def __init__(self, language_list: Optional[list[str]] = None) -> None:
+        """Initialize SpellChecker class.
+
+        Args:
+            language_list: Languages to load dictionaries for - defaults to
+                languages of main text.
+        """
         self.dictionary: dict[str, bool] = {}
-        self.language_list = maintext().get_language_list()
+        self.language_list = (
+            maintext().get_language_list() if language_list is None else language_list
+        )
         for lang in self.language_list:
             self.add_words_from_language(lang)
 
-    def do_spell_check(self, project_dict: ProjectDict) -> list[SpellingError]:
+    def do_spell_check(
+        self, project_dict: ProjectDict, document: Optional[DocumentSnapshot] = None
+    ) -> list[SpellingError]:
         """Spell check the currently loaded file, or just the selected range(s).
 
+        Args:
+            project_dict: Project dictionary.
+            document: Snapshot of text to check instead of the currently
+                loaded file - selection is ignored in this case.
+
         Returns:
             List of spelling errors.
         """
@@ -362,13 +382,15 @@ class SpellChecker:
         spelling_counts: dict[str, int] = {}
 
         minrow = mincol = maxrow = maxcol = 0
-        if sel_ranges := maintext().selected_ranges():
+        sel_ranges = [] if document else maintext().selected_ranges()
+        if sel_ranges:
             minrow = sel_ranges[0].start.row
             mincol = sel_ranges[0].start.col
             maxrow = sel_ranges[-1].end.row
             maxcol = sel_ranges[-1].end.col
         column_selection = len(sel_ranges) > 1
-        for line, line_num in maintext().get_lines():
+        lines = document.get_lines() if document else maintext().get_lines()
+        for line, line_num in lines:
             # Handle doing selection only
             if sel_ranges:
                 # If haven't reached the line range, skip
@@ -603,25 +625,32 @@ class SpellChecker:
                 raise DictionaryNotFoundError(lang)
 
 
-def get_spell_checker() -> SpellChecker | None:
+def get_spell_checker(
+    language_list: Optional[list[str]] = None,
+) -> SpellChecker | None:
     """Avoid duplicate spell checker by returning a SpellChecker object to
     calling tool/application.
 
+    Args:
+        language_list: Languages required - defaults to languages of main text.
+
     Returns:
         A SpellChecker object if required dictionary present, otherwise None
     """
 
     global _the_spell_checker
 
+    if language_list is None:
+        language_list = maintext().get_language_list()
     # If we already have a spell checker with the wrong languages, delete it
     if (
         _the_spell_checker is not None
-        and _the_spell_checker.language_list != maintext().get_language_list()
+        and _the_spell_checker.language_list != language_list
     ):
         _the_spell_checker = None
     if _the_spell_checker is None:
         try:
-            _the_spell_checker = SpellChecker()
+            _the_spell_checker = SpellChecker(language_list)
         except DictionaryNotFoundError as exc:
             logger.error(f"Dictionary not found for language: {exc.language}")
             return None
@@ -644,6 +673,7 @@ def process_suggestion(checker_entry: CheckerEntry) -> None:
     maintext().replace(start_mark, end_mark, replacement_text)
 
 
+@timed("Spelling Check")
 def spell_check(
     project_dict: ProjectDict,
     add_project_word_callback: Callable[[str], None],
@@ -677,19 +707,33 @@ def spell_check(
     # Construct opening line describing the search
     sel_only = " (selected text only)" if len(maintext().selected_ranges()) > 0 else ""
     checker_dialog.add_header("Start of Spelling Check" + sel_only, "")
+    add_spelling_entries(bad_spellings, checker_dialog)
+    checker_dialog.display_entries()
 
+
+def add_spelling_entries(
+    bad_spellings: list[SpellingError],
+    checker_dialog: SpellCheckerDialog | CheckerReport,
+) -> None:
+    """Add spelling errors that don't exceed the threshold frequency to dialog.
+
+    Args:
+        bad_spellings: Spelling errors found by `do_spell_check`.
+        checker_dialog: Dialog or report to add entries to.
+    """
     threshold = preferences.get(PrefKey.SPELL_THRESHOLD)
     for spelling in bad_spellings:
         if spelling.frequency > threshold:
             continue
+        # Words never span lines, so end is on the same line as start
         end_rowcol = IndexRowCol(
-            maintext().index(spelling.rowcol.index() + f"+{spelling.count}c")
+            spelling.rowcol.row, spelling.rowcol.col + spelling.count
         )
         bad_str = " ***" if spelling.bad_word else ""
         checker_dialog.add_entry(
             f"{spelling.word} ({spelling.frequency})" + bad_str,
             IndexRange(spelling.rowcol, end_rowcol),
         )
-        # Sort by frequency in descending order
-        checker_dialog.entries[-1].custom_data = -spelling.frequency
-    checker_dialog.display_entries()
+        if isinstance(checker_dialog, SpellCheckerDialog):
+            # Sort by frequency in descending order
+            checker_dialog.entries[-1].custom_data = -spelling.frequency
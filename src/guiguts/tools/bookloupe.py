@@ -3,16 +3,28 @@
 # Based on http://www.juiblex.co.uk/pgdp/bookloupe which
 # was based on https://sourceforge.net/projects/gutcheck
 
+import bisect
 import logging
 from typing import Optional, Any
 
 import regex as re
 import roman  # type: ignore[import-untyped]
 
-from guiguts.checkers import CheckerDialog, CheckerViewOptionsDialog, CheckerFilterText
-from guiguts.maintext import maintext
+from guiguts.checkers import (
+    CheckerDialog,
+    CheckerViewOptionsDialog,
+    CheckerFilterText,
+    CheckerJob,
+    CheckerReport,
+    DocumentSnapshot,
+)
 from guiguts.misc_tools import tool_save
-from guiguts.utilities import IndexRange, DiacriticRemover, non_text_line
+from guiguts.utilities import (
+    IndexRange,
+    IndexRowCol,
+    DiacriticRemover,
+    non_text_line,
+)
 
 logger = logging.getLogger(__package__)
 
@@ -77,14 +89,14 @@ _alnum_suffixes = [
     "l", "d", "s",
 ]
 # Common scannos or letter pairs that rarely start words
-_nostart = [
+_nostart = (
     "hr", "hl", "cb", "sb", "tb", "wb", "tl", "tn", "rn", "lt", "tj",
-]
+)
 # Common scannos or letter pairs that rarely end words
-_noend = [
+_noend = (
     "cb", "gb", "pb", "sb", "tb", "wh", "fr", "br", "qu", "tw", "gl", "fl",
     "sw", "gr", "sl", "cl", "iy",
-]
+)
 # Common scannos or letter groups that are rarely in words
 _noanywhere = [
     "cb", "gbt", "pbt", "tbs", "mrn", "ahle", "ihle", "tbi", "tbe", "ii",
@@ -97,6 +109,37 @@ _okwords = [
     "outbid", "outbids", "frostbite", "frostbitten", "s^t", "wm", "ebook"
 ]
 # fmt: on
+
+# Rule tables and regexes used by `check_typos`, prepared once at import
+_noanywhere_regex = re.compile("|".join(re.escape(combo) for combo in _noanywhere))
+_okwords_set = frozenset(_okwords)
+_typos_set = frozenset(_typos)
+_alnum_suffixes_set = frozenset(_alnum_suffixes)
+_hyphen_regex = re.compile(r"(?<!\d)-(?!\d)")
+_word_split_regex = re.compile(
+    r"(?<![^ ])[^\p{Letter}\p{Number}'’{}]*(.+?)[^\p{Letter}\p{Number}'’{}]*(?![^ ])"
+)
+_markup_remnant_regex = re.compile(r"^.+>|<.+$|\[.+$")
+_trailing_punc_regex = re.compile(r"[.,!?;:_']+[’']$")
+_letter_regex = re.compile(r"\p{Letter}")
+_number_regex = re.compile(r"\p{Number}")
+_leading_number_regex = re.compile(r"^[\p{Number},]+")
+_trailing_number_regex = re.compile(r"[\p{Number},]+$")
+_image_file_regex = re.compile(r"\.(png|jpg)$")
+_latin_regex = re.compile(r"[\p{Latin}\p{Common}]")
+_mixed_case_regex = re.compile(r"\p{Lowercase_Letter}.*\p{Uppercase_Letter}")
+_mac_regex = re.compile(r"Ma?c\p{Uppercase_Letter}\p{Letter}+")
+_apostrophe_capital_regex = re.compile(
+    r"\p{Letter}*{Lowercase_Letter}+['’]\p{Uppercase_Letter}{Lowercase_Letter}+"
+)
+_vowel_regex = re.compile("[0-9aeiouy]")
+_consonant_regex = re.compile("[0-9b-df-hj-np-tv-z]")
+_letters_periods_regex = re.compile(r"\p{Letter}(\.\p{Letter})+")
+_letter_apostrophe_regex = re.compile(r"\p{Letter}['’]|['’]\p{Letter}")
+# Regexes used by `check_para`
+_space_punc_regex = re.compile(r"[\s\p{Punctuation}]")
+_spaced_single_quote_regex = re.compile(r"(?m)(^' | '$)")
+
 checker_filters = [
     CheckerFilterText("Asterisk", "Asterisk.*"),
     CheckerFilterText("Begins with punctuation", "Begins with punctuation.*"),
@@ -177,7 +220,7 @@ class BookloupeChecker:
 
     def __init__(self) -> None:
         """Initialize BookloupeChecker class."""
-        self.dialog: Optional[BookloupeCheckerDialog] = None
+        self.dialog: Optional[CheckerReport] = None
         self.hebe_regex = re.compile(
             r'(?i)(\b(be could|be would|be is|was be|is be|to he)|",? be)\b'
         )
@@ -185,34 +228,49 @@ class BookloupeChecker:
             r"(?i)\b(the had|a had|they bad|she bad|he bad|you bad|i bad)\b"
         )
         self.hutbut_regex = re.compile(r"(?i)[;,] hut\b")
+        # Context-free verdicts from `classify_word`, keyed by word
+        self.word_verdicts: dict[str, Optional[str]] = {}
+        # Snapshot of file's lines, so paragraph checks don't need to query Tk
+        self.text_lines: list[str] = []
 
     def check_file(self) -> None:
-        """Check for bookloupe errors in the currently loaded file."""
+        """Check for bookloupe errors in the currently loaded file.
+
+        Checks are run in the background, so the user can carry on working.
+        """
 
         # Create the checker dialog to show results
-        self.dialog = BookloupeCheckerDialog.show_dialog(
+        checker_dialog = BookloupeCheckerDialog.show_dialog(
             rerun_command=bookloupe_check,
             view_options_dialog_class=BookloupeCheckerViewOptionsDialog,
             view_options_filters=checker_filters,
         )
-        self.run_bookloupe()
-        self.dialog.display_entries()
 
-    def run_bookloupe(self) -> None:
-        """Run the bookloupe checks and display the results in the dialog.
+        def analyze(document: DocumentSnapshot, report: CheckerReport) -> None:
+            """Run checks, adding results to report."""
+            self.dialog = report
+            self.run_bookloupe(document)
+
+        CheckerJob(checker_dialog, "Bookloupe", analyze).start()
+
+    def run_bookloupe(self, document: DocumentSnapshot) -> None:
+        """Run the bookloupe checks and add the results to the report.
 
         Args:
-            checkerdialog: Dialog to contain results.
+            document: Snapshot of text to be checked.
         """
         next_step = 1
         para_first_step = 1
         para_last_step = 1
         paragraph = ""  # Store up paragraph for those checks that need whole para
-        step_end = maintext().end().row
+        assert self.dialog is not None
+        self.text_lines = document.lines
+        step_end = len(self.text_lines)
         while next_step <= step_end:
+            self.dialog.progress(next_step / step_end)
             step = next_step
             next_step += 1
-            line = maintext().get(f"{step}.0", f"{step}.end")
+            line = self.text_lines[step - 1]
             # If line is block markup or all asterisks/hyphens, pretend it's empty
             if self.is_skippable_line(line):
                 line = ""
@@ -267,34 +325,60 @@ class BookloupeChecker:
         For now, to be compatible with historic bookloupe, only checks
         straight quotes, and just does a simple count of open/close brackets.
 
+        Checks are done on strings from `text_lines`, and positions mapped back
+        to row/col, rather than searching the text widget.
+
         Args:
             para_start: First line number of paragraph.
             para_end: Last line number of paragraph.
             para_text: Text of paragraph.
         """
         assert self.dialog is not None
-        start_index = f"{para_start}.0"
-        end_index = maintext().index(f"{para_end}.end")
+        # Raw text of paragraph, including any page separators, etc., with
+        # up to 2 lines of context either side, each line ending in newline
+        # as in the text widget
+        first_row = max(para_start - 2, 1)
+        window_lines = self.text_lines[first_row - 1 : para_end + 2]
+        line_offsets = [0]
+        for window_line in window_lines:
+            line_offsets.append(line_offsets[-1] + len(window_line) + 1)
+        window = "".join(f"{window_line}\n" for window_line in window_lines)
+        start_offset = line_offsets[para_start - first_row]
+        end_offset = line_offsets[para_end - first_row + 1] - 1
+
+        def offset_rowcol(offset: int) -> IndexRowCol:
+            """Convert offset in window to row/col in file."""
+            line_num = bisect.bisect_right(line_offsets, offset) - 1
+            return IndexRowCol(first_row + line_num, offset - line_offsets[line_num])
+
+        def line_start_char(row: int) -> str:
+            """Return first character of given line, or empty string."""
+            return self.text_lines[row - 1][:1] if row <= len(self.text_lines) else ""
+
+        start_index = IndexRowCol(para_start, 0)
+        end_index = offset_rowcol(end_offset)
         para_range = IndexRange(start_index, end_index)
         # Straight double quotes - an odd number means a potential error unless
         # the next paragraph starts with a double quote
-        if para_text.count('"') % 2 and maintext().get(f"{para_end}.0+2l") != '"':
+        if para_text.count('"') % 2 and line_start_char(para_end + 2) != '"':
             self.dialog.add_entry(
                 "Mismatched double quotes",
                 para_range,
             )
         # Check double quotes are correctly spaced
         quotes_open = False
-        quote_index = f"{start_index}-1c"
+        quote_offset = start_offset - 1
         while True:
-            quote_index = maintext().search('"', f"{quote_index}+1c", end_index)
-            if not quote_index:
+            quote_offset = window.find('"', quote_offset + 1, end_offset)
+            if quote_offset < 0:
                 break
-            quote_index_p1 = maintext().index(f"{quote_index}+1c")
+            quote_range = IndexRange(
+                offset_rowcol(quote_offset), offset_rowcol(quote_offset + 1)
+            )
             # Attempt to ignore ditto marks (double space or line break both sides)
             # Get two characters each side of quotes, i.e. 'XX"XX'
-            test_text = maintext().get(f"{quote_index}-2c", f"{quote_index}+3c")
-            if len(test_text) != 5:  # Never happens in real life
+            test_text = window[max(quote_offset - 2, 0) : quote_offset + 3]
+            if len(test_text) != 5:  # Only at very start or end of file
                 continue
             if (
                 test_text[1:5] == '\n"  '
@@ -303,14 +387,10 @@ class BookloupeChecker:
             ):
                 continue
             # Always an error to not have whitespace or punctuation on one side or the other
-            space_punc_regex = r"[\s\p{Punctuation}]"
-            if not re.match(space_punc_regex, test_text[1]) and not re.match(
-                space_punc_regex, test_text[3]
-            ):
-                self.dialog.add_entry(
-                    "Unspaced double quotes?",
-                    IndexRange(quote_index, quote_index_p1),
-                )
+            if not _space_punc_regex.match(
+                test_text[1]
+            ) and not _space_punc_regex.match(test_text[3]):
+                self.dialog.add_entry("Unspaced double quotes?", quote_range)
                 continue
             # Check for space after quotes when quotes are already open or at start of line
             # or for space before quotes when quotes are not already open or at end of line
@@ -319,26 +399,23 @@ class BookloupeChecker:
             if (should_be_close and test_text[1] == " ") or (
                 should_be_open and test_text[3] == " "
             ):
-                self.dialog.add_entry(
-                    "Wrongspaced double quotes?",
-                    IndexRange(quote_index, quote_index_p1),
-                )
+                self.dialog.add_entry("Wrongspaced double quotes?", quote_range)
                 continue
             # Only toggle flag if no error, otherwise get lots of reports from one early error
             quotes_open = not quotes_open
 
         # Check single quotes are correctly spaced
         # Apostrophes mess things up, so just check start/end of line
-        quote_index = f"{start_index}-1c"
-        while True:
-            quote_index = maintext().search(
-                "(^' | '$)", f"{quote_index}+1c", end_index, regexp=True
-            )
-            if not quote_index:
-                break
+        quote_offset = start_offset - 1
+        while match := _spaced_single_quote_regex.search(
+            window, quote_offset + 1, end_offset
+        ):
+            quote_offset = match.start()
             self.dialog.add_entry(
                 "Wrongspaced single quotes?",
-                IndexRange(quote_index, maintext().index(f"{quote_index}+2c")),
+                IndexRange(
+                    offset_rowcol(quote_offset), offset_rowcol(quote_offset + 2)
+                ),
             )
 
         # Straight single quotes - add the open quotes, subtract the close quotes,
@@ -351,7 +428,7 @@ class BookloupeChecker:
         )
         if open_quote_count != close_quote_count and (
             open_quote_count != close_quote_count + 1
-            or maintext().get(f"{para_end}.0+2l") != "'"
+            or line_start_char(para_end + 2) != "'"
         ):
             self.dialog.add_entry(
                 "Mismatched single quotes",
@@ -387,8 +464,8 @@ class BookloupeChecker:
             self.dialog.add_entry(
                 "Para starts with lower-case",
                 IndexRange(
-                    maintext().rowcol(f"{start_index}+{skip_len}c"),
-                    maintext().rowcol(f"{start_index}+{skip_len + 1}c"),
+                    offset_rowcol(start_offset + skip_len),
+                    offset_rowcol(start_offset + skip_len + 1),
                 ),
             )
         # Does paragraph end with suitable punctuation
@@ -405,7 +482,7 @@ class BookloupeChecker:
         if last_line and last_line[-1] not in para_punc:
             self.dialog.add_entry(
                 "No punctuation at para end",
-                IndexRange(maintext().rowcol(f"{end_index}-1c"), end_index),
+                IndexRange(offset_rowcol(end_offset - 1), end_index),
             )
 
     def check_odd_characters(self, step: int, line: str) -> None:
@@ -442,18 +519,18 @@ class BookloupeChecker:
         # Single (not double) hyphen at end of line
         if len(line) > 1 and line[-1] == "-" and line[-2] != "-":
             # If next line starts with hyphen, broken emdash?
-            if maintext().get(f"{step + 1}.0") == "-":
+            next_line = self.text_lines[step] if step < len(self.text_lines) else ""
+            if next_line[:1] == "-":
                 self.dialog.add_entry(
                     "Broken em-dash",
-                    IndexRange(maintext().rowcol(f"{step}.end-1c"), f"{step + 1}.1"),
+                    IndexRange(IndexRowCol(step, len(line) - 1), f"{step + 1}.1"),
                 )
             # Otherwise query end of line hyphen
             else:
                 self.dialog.add_entry(
                     "Hyphen at end of line",
                     IndexRange(
-                        maintext().rowcol(f"{step}.end-1c"),
-                        maintext().rowcol(f"{step}.end"),
+                        IndexRowCol(step, len(line) - 1), IndexRowCol(step, len(line))
                     ),
                 )
         # Spaced emdash (4 hyphens represents a word, so is allowed to be spaced)
@@ -489,9 +566,9 @@ class BookloupeChecker:
             return
         # Nor if they are the last line of a paragraph (allowed to be short)
         # Look backwards to find first non-skippable line & check if it's blank
-        end_step = maintext().end().row
+        end_step = len(self.text_lines)
         for check_step in range(step + 1, end_step + 1):
-            check_line = maintext().get(f"{check_step}.0", f"{check_step}.end")
+            check_line = self.text_lines[check_step - 1]
             if not (self.is_skippable_line(check_line) or non_text_line(check_line)):
                 if len(check_line) == 0:
                     return
@@ -499,7 +576,7 @@ class BookloupeChecker:
         # Nor if the previous line was a short line (may be short-lined para, such as letter header)
         # Look backwards to find first non-skippable line & check its length
         for check_step in range(step - 1, 0, -1):
-            check_line = maintext().get(f"{check_step}.0", f"{check_step}.end")
+            check_line = self.text_lines[check_step - 1]
             if not (self.is_skippable_line(check_line) or non_text_line(check_line)):
                 if (
                     len(check_line) <= shortest_pg_line
@@ -637,25 +714,19 @@ class BookloupeChecker:
         # Consider hyphenated (or emdashed) words as two separate words
         # but exclude DP-style fractions, e.g. 1-3/4)
         s_line = line.replace("—", " ")
-        s_line = re.sub(r"(?<!\d)-(?!\d)", " ", s_line)
+        s_line = _hyphen_regex.sub(" ", s_line)
         # Treat nbsp as space
-        s_line = re.sub(r"\xa0", " ", s_line)
+        s_line = s_line.replace("\xa0", " ")
         # Split at spaces, ignoring leading/trailing non-word characters on words
-        for match in re.finditer(
-            r"(?<![^ ])[^\p{Letter}\p{Number}'’{}]*(.+?)[^\p{Letter}\p{Number}'’{}]*(?![^ ])",
-            s_line,
-        ):
+        for match in _word_split_regex.finditer(s_line):
             # Trim any markup or footnote remnants left at start/end of word
-            word = re.sub(r"^.+>|<.+$|\[.+$", "", match[1])
+            word = _markup_remnant_regex.sub("", match[1])
             # Trim trailing underscores, punct with final apostrophe, e.g. "C_.’"
-            word = re.sub(r"[.,!?;:_']+[’']$", "", word)
-            word_lower = word.lower()
+            word = _trailing_punc_regex.sub("", word)
             # Query standalone 0 or 1 except in `^[Footnote 1:`
             if word in ("0", "1"):
-                fn = maintext().get(f"{step}.0", f"{step}.12")
-                context = maintext().get(
-                    f"{step}.{match.start()}", f"{step}.{match.start()}+3c"
-                )
+                fn = line[:12]
+                context = line[match.start() : match.start() + 3]
                 if (
                     (match.start() != 10 or fn != "[Footnote 1:")
                     and context != "[1]"
@@ -663,90 +734,92 @@ class BookloupeChecker:
                 ):
                     self.add_match_entry(step, match, f"Standalone {word}")
                 continue
-            # Check for mixed alpha & numeric (with some exceptions)
-            if re.search(r"\p{Letter}", word_lower) and re.search(
-                r"\p{Number}", word_lower
-            ):
-                # If number followed by acceptable suffix, it's OK (e.g. 1st)
-                suffix = re.sub(r"^[\p{Number},]+", "", word_lower)
-                # If "L/l" followed by number, it's OK (English pounds)
-                prefix = re.sub(r"[\p{Number},]+$", "", word_lower)
-                if (
-                    word_lower not in ("4to", "8vo", "12mo", "16mo")
-                    and suffix not in _alnum_suffixes
-                    and prefix != "l"
-                    and re.search(r"\.(png|jpg)$", word) is None
-                ):
-                    self.add_match_entry(step, match, f"Digit in {word}")
-                    continue
-            # if not Latin script, then checks below are pointless
-            if not re.search(r"[\p{Latin}\p{Common}]", word_lower):
-                continue
-            # Set typo flag false at start, then re-set it under various circumstances
-            # Since few words are typos, avoid code complexity of repeated "if not typo:"
-            # and just do all the tests anyway - very little time wasted.
-            typo = False
-            # Check for mixed case (uppercase after lower case) (with some exceptions)
-            # Allow MacDonald, McARTHUR and l'Abbe
-            if (
-                re.search(r"\p{Lowercase_Letter}.*\p{Uppercase_Letter}", word)
-                and not re.fullmatch(r"Ma?c\p{Uppercase_Letter}\p{Letter}+", word)
-                and not re.fullmatch(
-                    r"\p{Letter}*{Lowercase_Letter}+['’]\p{Uppercase_Letter}{Lowercase_Letter}+",
-                    word,
-                )
-            ):
-                typo = True
-            for combo in _nostart:
-                if word_lower.startswith(combo):
-                    typo = True
-            for combo in _noend:
-                if word_lower.endswith(combo):
-                    typo = True
-            for combo in _noanywhere:
-                if combo in word_lower:
-                    typo = True
-            # Words should have at least 1 vowel and 1 consonant ("y" and digits count as both!)
-            word_no_accent = DiacriticRemover.remove_diacritics(word_lower)
-            if len(word_no_accent) > 1 and not (
-                re.search("[0-9aeiouy]", word_no_accent)
-                and re.search("[0-9b-df-hj-np-tv-z]", word_no_accent)
-            ):
-                typo = True
-            # Ignore valid Roman numerals
-            if typo:
-                try:
-                    roman.fromRoman(word.upper())
-                    typo = False
-                except roman.InvalidRomanNumeralError:
-                    pass
-                # Certain words are always good
-                for ok_word in _okwords:
-                    if word_lower == ok_word:
-                        typo = False
-                # Also permit "words" that consist of single letters with periods,
-                # like "i.e" or "B.B.C" (trailing period already stripped)
-                if re.fullmatch(r"\p{Letter}(\.\p{Letter})+", word_lower):
-                    typo = False
-                # Also permit "words" that consist of single letters with apostrophe,
-                # like "o'" or "'s"
-                if re.fullmatch(r"\p{Letter}['’]|['’]\p{Letter}", word_lower):
-                    typo = False
-            # But certain words are always typos
-            for typo_word in _typos:
-                if word_lower == typo_word:
-                    typo = True
+            # Verdict for the word itself doesn't depend on context, so only
+            # classify each distinct word once
+            if word not in self.word_verdicts:
+                self.word_verdicts[word] = self.classify_word(word)
+            message = self.word_verdicts[word]
             # Also certain single lowercase letters: "s", "l", "i", "m" and
             # "j" = ";"; "d" in "he d" (missing apostrophe); "n" for "in"
             # But don't report if hyphens/emdash, e.g. "d--n"
-            if len(word) == 1 and word in "slimjdn":
+            if message is None and len(word) == 1 and word in "slimjdn":
                 lbeg = max(match.start(1) - 2, 0)
                 lend = min(match.start(1) + 3, len(s_line))
                 test_str = line[lbeg:lend]
                 if not re.search(rf"^(--|.?—){word}|{word}(--|—.?)$", test_str):
-                    typo = True
-            if typo:
-                self.add_match_entry(step, match, f"Query word {word}")
+                    message = f"Query word {word}"
+            if message is not None:
+                self.add_match_entry(step, match, message)
+
+    def classify_word(self, word: str) -> Optional[str]:
+        """Classify a word for `check_typos`, independent of its context.
+
+        Args:
+            word: Word to be classified, with surrounding punctuation removed.
+
+        Returns:
+            Message to report for the word, or None if it is not suspect.
+        """
+        word_lower = word.lower()
+        # Check for mixed alpha & numeric (with some exceptions)
+        if _letter_regex.search(word_lower) and _number_regex.search(word_lower):
+            # If number followed by acceptable suffix, it's OK (e.g. 1st)
+            suffix = _leading_number_regex.sub("", word_lower)
+            # If "L/l" followed by number, it's OK (English pounds)
+            prefix = _trailing_number_regex.sub("", word_lower)
+            if (
+                word_lower not in ("4to", "8vo", "12mo", "16mo")
+                and suffix not in _alnum_suffixes_set
+                and prefix != "l"
+                and _image_file_regex.search(word) is None
+            ):
+                return f"Digit in {word}"
+        # if not Latin script, then checks below are pointless
+        if not _latin_regex.search(word_lower):
+            return None
+        # Certain words are always typos
+        if word_lower in _typos_set:
+            return f"Query word {word}"
+        # Check for mixed case (uppercase after lower case) (with some exceptions)
+        # Allow MacDonald, McARTHUR and l'Abbe
+        typo = bool(
+            _mixed_case_regex.search(word)
+            and not _mac_regex.fullmatch(word)
+            and not _apostrophe_capital_regex.fullmatch(word)
+        )
+        typo = (
+            typo
+            or word_lower.startswith(_nostart)
+            or word_lower.endswith(_noend)
+            or _noanywhere_regex.search(word_lower) is not None
+        )
+        # Words should have at least 1 vowel and 1 consonant ("y" and digits count as both!)
+        if not typo:
+            word_no_accent = DiacriticRemover.remove_diacritics(word_lower)
+            typo = len(word_no_accent) > 1 and not (
+                _vowel_regex.search(word_no_accent)
+                and _consonant_regex.search(word_no_accent)
+            )
+        if not typo:
+            return None
+        # Ignore valid Roman numerals
+        try:
+            roman.fromRoman(word.upper())
+            return None
+        except roman.InvalidRomanNumeralError:
+            pass
+        # Certain words are always good
+        if word_lower in _okwords_set:
+            return None
+        # Also permit "words" that consist of single letters with periods,
+        # like "i.e" or "B.B.C" (trailing period already stripped)
+        if _letters_periods_regex.fullmatch(word_lower):
+            return None
+        # Also permit "words" that consist of single letters with apostrophe,
+        # like "o'" or "'s"
+        if _letter_apostrophe_regex.fullmatch(word_lower):
+            return None
+        return f"Query word {word}"
 
     def check_misspaced_punctuation(self, step: int, line: str) -> None:
         """Check for mis-spaced punctuation.
@@ -8,7 +8,13 @@ import importlib.resources
 import logging
 import regex as re
 
-from guiguts.checkers import CheckerDialog, CheckerEntry
+from guiguts.checkers import (
+    CheckerDialog,
+    CheckerEntry,
+    CheckerJob,
+    CheckerReport,
+    DocumentSnapshot,
+)
 from guiguts.data import dictionaries
 from guiguts.maintext import maintext
 from guiguts.misc_tools import tool_save
@@ -102,14 +108,29 @@ class JeebiesChecker:
         self.load_phrases_file_into_dictionary()
 
     def check_for_jeebies_in_file(self) -> None:
-        """Check for jeebies in the currently loaded file."""
+        """Check for jeebies in the currently loaded file.
+
+        Check is run in the background, so the user can carry on working.
+        """
 
         # Create the checker dialog to show results
         checker_dialog = JeebiesCheckerDialog.show_dialog(
             rerun_command=jeebies_check,
             process_command=self.process_jeebies,
         )
+        CheckerJob(checker_dialog, "Jeebies", self.run_jeebies).start()
+
+    def run_jeebies(
+        self,
+        document: DocumentSnapshot,
+        checker_dialog: CheckerReport,
+    ) -> None:
+        """Run the jeebies check and add the results to the report.
 
+        Args:
+            document: Snapshot of text to be checked.
+            checker_dialog: Where report text is written.
+        """
         # Check level used last time Jeebies was run or default if first run.
         check_level = preferences.get(PrefKey.JEEBIES_PARANOIA_LEVEL)
 
@@ -122,7 +143,7 @@ class JeebiesChecker:
             paragraph_strings,
             paragraph_start_line_numbers,
             paragraph_line_boundaries,
-        ) = self.build_paragraph_structures()
+        ) = self.build_paragraph_structures(document)
 
         # Accumulate counts of 'be' and 'he' in the file.
 
@@ -155,6 +176,7 @@ class JeebiesChecker:
             # For each paragraph in book ...
 
             for paragraph_number, paragraph_text in enumerate(paragraph_strings):
+                checker_dialog.progress(paragraph_number / len(paragraph_strings))
                 # Search through paragraph text looking for three-word 'be' suspects.
 
                 # Dialog functionality will rearrange dialog output so that line.col numbers
@@ -200,17 +222,19 @@ class JeebiesChecker:
             if suspects_count == 0:
                 checker_dialog.add_footer("    No suspect phrases found.")
 
-        checker_dialog.display_entries()
-
-    def build_paragraph_structures(self) -> tuple[List, List, List, List]:
+    def build_paragraph_structures(
+        self, document: DocumentSnapshot
+    ) -> tuple[List, List, List, List]:
         """Make the paragraph strings and the ancillary lists that allow
         us to map a hebe in a paragraph string to its actual line/col
         position in the file.
 
+        Args:
+            document: Snapshot of text to be checked.
         """
 
-        # Get the whole of the file from the main text widget
-        input_lines = maintext().get_text().splitlines()
+        # Get the whole of the file from the snapshot
+        input_lines = document.text.splitlines()
         # Ensure last paragraph converts to a line of text
         input_lines.append("")
 
@@ -284,7 +308,7 @@ class JeebiesChecker:
         paragraph_start_line_numbers: list[int],
         paragraph_line_boundaries: list[list[int]],
         file_lines_list: list[str],
-        checker_dialog: JeebiesCheckerDialog,
+        checker_dialog: JeebiesCheckerDialog | CheckerReport,
         order: str,
         check_level: str,
     ) -> int:
@@ -454,12 +478,14 @@ class JeebiesChecker:
         paragraph_start_line_numbers: list[int],
         paragraph_line_boundaries: list[list[int]],
         file_lines_list: list[str],
-        checker_dialog: JeebiesCheckerDialog,
+        checker_dialog: JeebiesCheckerDialog | CheckerReport,
         check_level: str,
     ) -> int:
         """Look for suspect "w1 be w2" or "w1 he w2" phrases in paragraphs."""
 
-        def make_dialog_line(checker_dialog: JeebiesCheckerDialog) -> None:
+        def make_dialog_line(
+            checker_dialog: JeebiesCheckerDialog | CheckerReport,
+        ) -> None:
             """Helper function for abstraction of repeated code."""
 
             # We have the start position in the paragraph string of a suspect hebe.
@@ -602,7 +628,7 @@ class JeebiesChecker:
         line: str,
         line_number: int,
         hebe_start: int,
-        checker_dialog: JeebiesCheckerDialog,
+        checker_dialog: JeebiesCheckerDialog | CheckerReport,
     ) -> None:
         """Helper function that abstracts repeated code.
 
@@ -10,13 +10,13 @@ from tkinter import ttk
 from Levenshtein import distance
 import regex as re
 
-from guiguts.checkers import CheckerDialog
+from guiguts.checkers import CheckerDialog, CheckerReport, DocumentSnapshot
 from guiguts.data import dictionaries
 from guiguts.file import ProjectDict
-from guiguts.maintext import maintext
 from guiguts.misc_tools import tool_save
 from guiguts.preferences import PersistentInt, PrefKey, preferences, PersistentBoolean
-from guiguts.spell import get_spell_checker
+from guiguts.profiling import timed
+from guiguts.spell import get_spell_checker, SpellChecker
 from guiguts.utilities import IndexRowCol, IndexRange
 
 logger = logging.getLogger(__package__)
@@ -94,6 +94,37 @@ class LevenshteinCheckerDialog(CheckerDialog):
 def run_levenshtein_check_on_file(project_dict: ProjectDict) -> None:
     """Check Levenshtein edit distance between selected file words."""
 
+    # Set up SpellChecker here before the tool window is opened in
+    # case it cannot find the required dictionaries.
+    spell_checker = get_spell_checker()
+    if spell_checker is None:
+        return
+
+    # Create the checker dialog to show results
+    checker_dialog = LevenshteinCheckerDialog.show_dialog(
+        rerun_command=lambda: levenshtein_check(project_dict),
+    )
+    run_levenshtein_check(
+        DocumentSnapshot.from_maintext(), project_dict, spell_checker, checker_dialog
+    )
+    checker_dialog.display_entries()
+
+
+def run_levenshtein_check(
+    document: DocumentSnapshot,
+    project_dict: ProjectDict,
+    spell_checker: SpellChecker,
+    checker_dialog: LevenshteinCheckerDialog | CheckerReport,
+) -> None:
+    """Check Levenshtein edit distance between selected words in document.
+
+    Args:
+        document: Snapshot of text to be checked.
+        project_dict: Project dictionary.
+        spell_checker: Spell checker loaded with the document's languages.
+        checker_dialog: Dialog or report to add results to.
+    """
+
     ####
     # The following are declared and accessed as 'nonlocal' variables
     # by functions defined within the enclosing scope of this top-most
@@ -300,9 +331,7 @@ def run_levenshtein_check_on_file(project_dict: ProjectDict) -> None:
             error_start, error_end = make_into_strings(index_tuple, len(suspect_word))
             start_rowcol = IndexRowCol(error_start)
             end_rowcol = IndexRowCol(error_end)
-            file_line = maintext().get(
-                error_start + " linestart", error_end + " lineend"
-            )
+            file_line = document.lines[start_rowcol.row - 1]
             checker_dialog.add_entry(
                 file_line,
                 IndexRange(start_rowcol, end_rowcol),
@@ -333,9 +362,7 @@ def run_levenshtein_check_on_file(project_dict: ProjectDict) -> None:
             error_start, error_end = make_into_strings(index_tuple, len(test_word))
             start_rowcol = IndexRowCol(error_start)
             end_rowcol = IndexRowCol(error_end)
-            file_line = maintext().get(
-                error_start + " linestart", error_end + " lineend"
-            )
+            file_line = document.lines[start_rowcol.row - 1]
             checker_dialog.add_entry(
                 file_line,
                 IndexRange(start_rowcol, end_rowcol),
@@ -438,7 +465,7 @@ def run_levenshtein_check_on_file(project_dict: ProjectDict) -> None:
         # (they are in the spelling dictionary) or 'suspect_words' list (not in the
         # spelling dictionary). Some variable names changed to avoid pylint flagging
         # 'duplicate code' with the same block of code in spell.py.
-        for line_text, line_number in maintext().get_lines():
+        for line_text, line_number in document.get_lines():
             words = re.split(r"[^\p{Alnum}\p{Mark}'’]", line_text)
             next_column = 0
             for word in words:
@@ -654,16 +681,7 @@ def run_levenshtein_check_on_file(project_dict: ProjectDict) -> None:
     # Start time of prgram execution
     prog_start = time.time()
 
-    # Set up SpellChecker here before the tool window is opened in
-    # case it cannot find the required dictionaries.
-    _the_spell_checker = get_spell_checker()
-    if _the_spell_checker is None:
-        return
-
-    # Create the checker dialog to show results
-    checker_dialog = LevenshteinCheckerDialog.show_dialog(
-        rerun_command=lambda: levenshtein_check(project_dict),
-    )
+    _the_spell_checker = spell_checker
 
     # Get the edit distance used last time Levenshtein was run or default if first run.
     distance_to_check = preferences.get(PrefKey.LEVENSHTEIN_DISTANCE)
@@ -692,9 +710,8 @@ def run_levenshtein_check_on_file(project_dict: ProjectDict) -> None:
     prog_end = time.time()
     checker_dialog.add_footer(f"Execution time: {(prog_end - prog_start):.2f} seconds")
 
-    checker_dialog.display_entries()
-
 
+@timed("Levenshtein Check")
 def levenshtein_check(project_dict: ProjectDict) -> None:
     """Do Levenshtein edit distance checks"""
 
@@ -33,11 +33,16 @@ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 """
 
 import argparse
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import copy
 from dataclasses import dataclass
 import difflib
 from enum import StrEnum, auto
+import json
 import logging
+import multiprocessing
 import os
 import subprocess
 import tempfile
@@ -60,6 +65,7 @@ from guiguts.preferences import (
     PersistentString,
     preferences,
 )
+from guiguts.profiling import timed
 from guiguts.utilities import is_windows, IndexRowCol, IndexRange
 from guiguts.widgets import ToolTip, Busy, PathnameCombobox, FileDialog
 
@@ -77,6 +83,11 @@ NO_SPACE_AFTER = "[({"
 PAIR_RE = re.compile(
     rf"{FLAG_CH_1_L}(.*?){FLAG_CH_1_R}\s+{FLAG_CH_2_L}(.*?){FLAG_CH_2_R}"
 )
+# Runs of matching words at least this long are found directly, shorter ones
+# are left to SequenceMatcher
+ANCHOR_MIN_WORDS = 10
+# Diff windows are shared between worker processes if they contain this many tokens
+PARALLEL_MIN_TOKENS = 100000
 
 
 class PPcompDisplayType(StrEnum):
@@ -448,6 +459,7 @@ class PPcompChecker:
         self.dialog.update_count_label(False)
         Busy.unbusy()
 
+    @timed("PPcomp")
     def run(self) -> None:
         """Run PPcomp."""
 
@@ -462,7 +474,6 @@ class PPcompChecker:
             lift_and_unbusy()
             return
 
-        empty_args: list[str] = []
         PPcompChecker.files = []
         cur_fname = the_file().filename
         fnames: list[str] = [
@@ -497,14 +508,10 @@ class PPcompChecker:
                     self.dialog.lift()
                     lift_and_unbusy()
                     return
-            if os.path.splitext(fname)[1].lower() in (".htm", ".html", ".xhtml"):
-                PPcompChecker.files.append(PgdpFileHtml(empty_args))
-            else:
-                PPcompChecker.files.append(PgdpFileText(empty_args))
 
-        for idx, fname in enumerate(fnames):
+        for fname in fnames:
             try:
-                PPcompChecker.files[idx].load(fname)
+                PPcompChecker.files.append(load_pgdp_file(fname))
             except HTMLSyntaxError as exc:
                 # Output parsing errors to dialog rather than logging an error
                 self.dialog.reset()
@@ -534,10 +541,8 @@ class PPcompChecker:
                 logger.error(exc)
                 lift_and_unbusy()
                 return
-        for f in PPcompChecker.files:
-            f.cleanup()
-            # perform common cleanup for both files
-            PPComp.check_characters(PPcompChecker.files)
+        # perform common cleanup for both files
+        PPComp.check_characters(PPcompChecker.files)
 
         self.dialog.reset()
         self.dialog.update_count_label(working=True)
@@ -615,13 +620,213 @@ def token_span_to_lines(
     return min(lines) + offset, max(lines) + offset
 
 
+def matching_runs(words_a: list[str], words_b: list[str]) -> list[tuple[int, int, int]]:
+    """Find every run of at least `ANCHOR_MIN_WORDS` matching words.
+
+    Each run is as long as possible, i.e. the words either side of it don't
+    match, and runs may overlap or cross each other, e.g. if a paragraph is
+    repeated.
+
+    Args:
+        words_a: Words from first file.
+        words_b: Words from second file.
+
+    Returns:
+        List of (index in `words_a`, index in `words_b`, length) runs, in order
+        of index in `words_a`.
+    """
+    size = ANCHOR_MIN_WORDS
+    b_index: dict[tuple[str, ...], list[int]] = {}
+    for b_idx in range(len(words_b) - size + 1):
+        b_index.setdefault(tuple(words_b[b_idx : b_idx + size]), []).append(b_idx)
+
+    runs: list[tuple[int, int, int]] = []
+    diagonal_ends: dict[int, int] = {}  # a_idx - b_idx: end in a of latest run
+    for a_idx in range(len(words_a) - size + 1):
+        for b_idx in b_index.get(tuple(words_a[a_idx : a_idx + size]), []):
+            # Runs are found from their start, so skip the rest of the run
+            if diagonal_ends.get(a_idx - b_idx, 0) > a_idx:
+                continue
+            a_end, b_end = a_idx + size, b_idx + size
+            while (
+                a_end < len(words_a)
+                and b_end < len(words_b)
+                and words_a[a_end] == words_b[b_end]
+            ):
+                a_end += 1
+                b_end += 1
+            diagonal_ends[a_idx - b_idx] = a_end
+            runs.append((a_idx, b_idx, a_end - a_idx))
+    return runs
+
+
+def anchor_blocks(words_a: list[str], words_b: list[str]) -> list[tuple[int, int, int]]:
+    """Find the matching blocks of at least `ANCHOR_MIN_WORDS` words that
+    `SequenceMatcher` would find.
+
+    `SequenceMatcher` takes the longest match in a range (the earliest if
+    several are equally long), then repeats on the ranges either side of it.
+    Every match that long is part of one of the matching runs, so while
+    the longest run left in a range is at least that long, it is the match
+    `SequenceMatcher` would take. Ranges without one are left for
+    `SequenceMatcher` to diff.
+
+    Args:
+        words_a: Words from first file.
+        words_b: Words from second file.
+
+    Returns:
+        List of (index in `words_a`, index in `words_b`, length) blocks, in order
+        and not overlapping.
+    """
+    blocks: list[tuple[int, int, int]] = []
+    ranges = [(0, len(words_a), 0, len(words_b), matching_runs(words_a, words_b))]
+    while ranges:
+        a_lo, a_hi, b_lo, b_hi, runs = ranges.pop()
+        # Only the part of each run within the range can be matched
+        in_range: list[tuple[int, int, int]] = []
+        for a_start, b_start, length in runs:
+            start = max(0, a_lo - a_start, b_lo - b_start)
+            end = min(length, a_hi - a_start, b_hi - b_start)
+            if end - start >= ANCHOR_MIN_WORDS:
+                in_range.append((a_start + start, b_start + start, end - start))
+        if not in_range:
+            continue
+        a_start, b_start, length = max(
+            in_range, key=lambda run: (run[2], -run[0], -run[1])
+        )
+        blocks.append((a_start, b_start, length))
+        ranges.append((a_lo, a_start, b_lo, b_start, in_range))
+        ranges.append((a_start + length, a_hi, b_start + length, b_hi, in_range))
+    blocks.sort()
+    return blocks
+
+
+def window_matching_blocks(
+    window: tuple[list[str], list[str]],
+) -> list[tuple[int, int, int]]:
+    """Find matching blocks within one window of the diff.
+
+    Args:
+        window: Words from first and second file within the window.
+
+    Returns:
+        List of (index in first, index in second, length) matching blocks.
+    """
+    words_a, words_b = window
+    if not (words_a and words_b):
+        return []
+    sm = difflib.SequenceMatcher(a=words_a, b=words_b, autojunk=False)
+    return [(block.a, block.b, block.size) for block in sm.get_matching_blocks()[:-1]]
+
+
+def run_window_diffs(
+    windows: list[tuple[list[str], list[str]]],
+) -> list[list[tuple[int, int, int]]]:
+    """Find matching blocks in each window.
+
+    For large comparisons, windows are diffed concurrently in worker processes.
+    If that isn't possible, they are diffed in this process.
+
+    Args:
+        windows: List of word lists from first and second files.
+
+    Returns:
+        List of matching blocks, one list per window.
+    """
+    n_tokens = sum(len(wa) + len(wb) for wa, wb in windows)
+    n_workers = min(len(windows), os.cpu_count() or 1)
+    if n_workers > 1 and n_tokens >= PARALLEL_MIN_TOKENS:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                return list(
+                    executor.map(
+                        window_matching_blocks,
+                        windows,
+                        chunksize=max(1, len(windows) // (4 * n_workers)),
+                    )
+                )
+        except (OSError, BrokenProcessPool) as exc:
+            logger.debug(f"PPcomp worker processes failed, so running serially: {exc}")
+    return [window_matching_blocks(window) for window in windows]
+
+
+def diff_opcodes(
+    words_a: list[str], words_b: list[str]
+) -> list[tuple[str, int, int, int, int]]:
+    """Get opcodes to turn one list of words into another.
+
+    Rather than run `SequenceMatcher` over the whole of both lists, which can be
+    very slow for a whole book, long runs of matching words are found directly
+    and used as anchors, choosing the ones `SequenceMatcher` would. Then
+    `SequenceMatcher` only needs to be run on the small windows between them,
+    and the opcodes are the same as if it had been run on the whole lists.
+
+    Args:
+        words_a: Words from first file.
+        words_b: Words from second file.
+
+    Returns:
+        List of opcodes in the same format as `SequenceMatcher.get_opcodes`.
+    """
+    len_a = len(words_a)
+    len_b = len(words_b)
+
+    anchors = anchor_blocks(words_a, words_b)
+
+    # Diff the windows between the anchor blocks
+    a_end = b_end = 0
+    bounds: list[tuple[int, int]] = []
+    windows: list[tuple[list[str], list[str]]] = []
+    for a_start, b_start, length in anchors + [(len_a, len_b, 0)]:
+        bounds.append((a_end, b_end))
+        windows.append((words_a[a_end:a_start], words_b[b_end:b_start]))
+        a_end, b_end = a_start + length, b_start + length
+    window_blocks = run_window_diffs(windows)
+
+    # Merge window blocks and anchor blocks, combining adjacent blocks
+    blocks: list[tuple[int, int, int]] = []
+
+    def add_block(a_start: int, b_start: int, length: int) -> None:
+        if blocks:
+            a_prev, b_prev, len_prev = blocks[-1]
+            if a_prev + len_prev == a_start and b_prev + len_prev == b_start:
+                blocks[-1] = (a_prev, b_prev, len_prev + length)
+                return
+        blocks.append((a_start, b_start, length))
+
+    for idx, (a_offset, b_offset) in enumerate(bounds):
+        for a_start, b_start, length in window_blocks[idx]:
+            add_block(a_offset + a_start, b_offset + b_start, length)
+        if idx < len(anchors):
+            add_block(*anchors[idx])
+
+    # Convert blocks to opcodes, as SequenceMatcher does
+    opcodes: list[tuple[str, int, int, int, int]] = []
+    a_idx = b_idx = 0
+    for a_start, b_start, length in blocks + [(len_a, len_b, 0)]:
+        if a_idx < a_start and b_idx < b_start:
+            opcodes.append(("replace", a_idx, a_start, b_idx, b_start))
+        elif a_idx < a_start:
+            opcodes.append(("delete", a_idx, a_start, b_idx, b_start))
+        elif b_idx < b_start:
+            opcodes.append(("insert", a_idx, a_start, b_idx, b_start))
+        if length:
+            opcodes.append(
+                ("equal", a_start, a_start + length, b_start, b_start + length)
+            )
+        a_idx, b_idx = a_start + length, b_start + length
+    return opcodes
+
+
 def aligned_tokens(tok_list_a: list[Token], tok_list_b: list[Token]):
     """Check type of change and yield tokens."""
-    sm = difflib.SequenceMatcher(
-        a=[t.text for t in tok_list_a], b=[t.text for t in tok_list_b], autojunk=False
-    )
+    opcodes = diff_opcodes([t.text for t in tok_list_a], [t.text for t in tok_list_b])
 
-    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+    for tag, i1, i2, j1, j2 in opcodes:
         if tag == "equal":
             for k in range(i2 - i1):
                 yield tok_list_a[i1 + k], tok_list_b[j1 + k]
@@ -685,14 +890,23 @@ def join_tokens(tokens: list[str]) -> str:
     return "".join(out)
 
 
-def render_marked_diff(
-    dialog: PPcompCheckerDialog,
+def marked_diff_lines(
     a_text: str,
     b_text: str,
     a_file_start: int,
     b_file_start: int,
-) -> None:
-    """Render the diffs to the dialog."""
+) -> list[tuple[str, tuple[int, int] | None]]:
+    """Get the changed lines, with diffs marked.
+
+    Args:
+        a_text: Text of first file.
+        b_text: Text of second file.
+        a_file_start: Line number in first file where text starts.
+        b_file_start: Line number in second file where text starts.
+
+    Returns:
+        List of marked lines, with the line numbers in each file.
+    """
     rows = aligned_words_with_lines(a_text, b_text)
 
     lines: list[tuple[str, tuple[int, int] | None]] = []  # (text, a_line, b_line)
@@ -715,9 +929,6 @@ def render_marked_diff(
             cur_line.append(f"{FLAG_CH_2_L}{join_tokens(new_buf)}{FLAG_CH_2_R}")
             new_buf.clear()
 
-    f1_loaded = the_file().filename and os.path.samefile(
-        the_file().filename, preferences.get(PrefKey.PPCOMP_FILE_1)
-    )
     line_has_change = False
     a_line = a_file_start + 1
     b_line = b_file_start + 1
@@ -763,6 +974,24 @@ def render_marked_diff(
     flush_changes()
     if cur_line and line_has_change:
         lines.append((join_tokens(cur_line), cur_linenum))
+    return lines
+
+
+def render_marked_diff(
+    dialog: PPcompCheckerDialog,
+    a_text: str,
+    b_text: str,
+    a_file_start: int,
+    b_file_start: int,
+) -> None:
+    """Render the diffs to the dialog."""
+    lines = marked_diff_lines(a_text, b_text, a_file_start, b_file_start)
+    expanded = (
+        preferences.get(PrefKey.PPCOMP_DISPLAY_TYPE) == PPcompDisplayType.EXPANDED
+    )
+    f1_loaded = the_file().filename and os.path.samefile(
+        the_file().filename, preferences.get(PrefKey.PPCOMP_FILE_1)
+    )
 
     # ---- Send to the dialog ----
     no_lineno = IndexRange(IndexRowCol(-1, -1), IndexRowCol(-1, -1))
@@ -1056,6 +1285,210 @@ SUBSCRIPTS = {
     "x": "ₓ",
 }
 
+# Number of files whose loaded and cleaned up versions are cached
+PGDP_FILE_CACHE_FILES = 4
+# Loaded and cleaned up versions of recently compared files, keyed on path,
+# then file signature and cleanup stage, least recently used path first
+_pgdp_file_cache: OrderedDict[str, dict[tuple, "PgdpFile"]] = OrderedDict()
+
+
+def load_pgdp_file(filename: str) -> "PgdpFile":
+    """Load and clean up a text or HTML file for comparison.
+
+    Parsing and cleanup are slow for large HTML files, so the result of each
+    stage is cached, keyed on the file's path, modification time and size, and
+    the preferences that affect that stage and earlier ones. Only stages whose
+    inputs have changed are re-run. Only the stages for the current version of
+    the file and current preferences are kept, for the few most recently
+    loaded files.
+
+    Args:
+        filename: Name of file to load.
+
+    Returns:
+        Cleaned up file, which the caller may modify.
+
+    Raises:
+        FileNotFoundError: File does not exist.
+        SyntaxError: File cannot be loaded, including HTMLSyntaxError.
+    """
+    if os.path.splitext(filename)[1].lower() in (".htm", ".html", ".xhtml"):
+        file_class: type[PgdpFile] = PgdpFileHtml
+    else:
+        file_class = PgdpFileText
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError as exc:
+        raise FileNotFoundError("Cannot load file: " + filename) from exc
+    path = os.path.realpath(filename)
+    key: tuple = (path, stat.st_mtime_ns, stat.st_size)
+
+    # Stages cached from earlier versions of the file or with other preferences
+    # are discarded, by only keeping those used this time
+    old_stages = _pgdp_file_cache.pop(path, {})
+    stages: dict[tuple, PgdpFile] = {}
+
+    pgdp_file = old_stages.get(key)
+    if pgdp_file is None:
+        pgdp_file = file_class([])
+        pgdp_file.load(filename)
+    stages[key] = pgdp_file
+    for method_name, pref_keys in file_class.cleanup_stages:
+        key += (method_name, tuple(preferences.get(pk) for pk in pref_keys))
+        stage_file = old_stages.get(key)
+        if stage_file is None:
+            stage_file = copy.deepcopy(pgdp_file)
+            getattr(stage_file, method_name)()
+        stages[key] = stage_file
+        pgdp_file = stage_file
+    _pgdp_file_cache[path] = stages
+    while len(_pgdp_file_cache) > PGDP_FILE_CACHE_FILES:
+        _pgdp_file_cache.popitem(last=False)
+    # Caller only replaces attributes such as text, so shallow copy protects cache
+    return copy.copy(pgdp_file)
+
+
+def compare_files(filename_1: str, filename_2: str) -> dict[str, Any]:
+    """Compare two files without using the GUI.
+
+    Args:
+        filename_1: Name of first file.
+        filename_2: Name of second file.
+
+    Returns:
+        Dictionary containing the file names and either a list of differences,
+        or an error message.
+    """
+    result: dict[str, Any] = {"file1": filename_1, "file2": filename_2}
+    try:
+        files = [load_pgdp_file(filename_1), load_pgdp_file(filename_2)]
+    except HTMLSyntaxError as exc:
+        result["error"] = "\n".join(
+            [str(exc)]
+            + [f"{line}:{col}: {msg}" for (line, col), msg, _ in exc.parse_errors]
+        )
+        return result
+    except (FileNotFoundError, SyntaxError) as exc:
+        result["error"] = str(exc)
+        return result
+    PPComp.check_characters(files)
+
+    def diff_records(
+        a_text: str, b_text: str, a_file_start: int, b_file_start: int
+    ) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        for text, line_pair in marked_diff_lines(
+            a_text, b_text, a_file_start, b_file_start
+        ):
+            if line_pair is None:
+                continue
+            text = re.sub(f" *{FLAG_NL} *", "\n", refine_punctuation_diffs(text))
+            records.append(
+                {"file1_line": line_pair[0], "file2_line": line_pair[1], "text": text}
+            )
+        return records
+
+    result["diffs"] = diff_records(
+        files[0].text, files[1].text, files[0].start_line, files[1].start_line
+    )
+    if preferences.get(PrefKey.PPCOMP_EXTRACT_FOOTNOTES):
+        result["footnote_diffs"] = diff_records(
+            files[0].footnotes, files[1].footnotes, 0, 0
+        )
+    return result
+
+
+def _init_compare_worker(pref_values: dict[PrefKey, Any]) -> None:
+    """Copy PPcomp preferences to worker process.
+
+    Args:
+        pref_values: Values of PPcomp preferences in main process.
+    """
+    for key, value in pref_values.items():
+        preferences.set_default(key, value)
+
+
+def _compare_pair(pair: tuple[str, str]) -> dict[str, Any]:
+    """Compare one pair of files in worker process.
+
+    Args:
+        pair: Names of the two files.
+
+    Returns:
+        Result from `compare_files`.
+    """
+    return compare_files(*pair)
+
+
+def compare_file_pairs(pairs: list[tuple[str, str]]) -> list[dict[str, Any]]:
+    """Compare several pairs of files without using the GUI.
+
+    Pairs are compared concurrently in worker processes if possible.
+
+    Args:
+        pairs: Names of the files to be compared.
+
+    Returns:
+        List of results from `compare_files`, in the same order as `pairs`.
+    """
+    n_workers = min(len(pairs), os.cpu_count() or 1)
+    if n_workers > 1:
+        pref_values = {
+            key: preferences.get(key)
+            for key in PrefKey
+            if key.name.startswith("PPCOMP_")
+        }
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_compare_worker,
+                initargs=(pref_values,),
+            ) as executor:
+                return list(executor.map(_compare_pair, pairs))
+        except (OSError, BrokenProcessPool) as exc:
+            logger.debug(f"PPcomp worker processes failed, so running serially: {exc}")
+    return [compare_files(*pair) for pair in pairs]
+
+
+def ppcomp_headless(pairs: list[tuple[str, str]], output_format: str) -> int:
+    """Compare pairs of files and print the results to stdout.
+
+    Args:
+        pairs: Names of the files to be compared.
+        output_format: "json" or "text".
+
+    Returns:
+        Exit status: 0 if no differences, 1 if differences, 2 if any errors.
+    """
+    if preferences.get(PrefKey.PPCOMP_EXTRACT_FOOTNOTES) and preferences.get(
+        PrefKey.PPCOMP_SUPPRESS_FOOTNOTES
+    ):
+        logger.error("Cannot use both Extract Footnotes and Suppress Footnote Tags")
+        return 2
+    results = compare_file_pairs(pairs)
+    if output_format == "json":
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        for result in results:
+            print(f"==== {result['file1']} vs {result['file2']} ====")
+            if "error" in result:
+                print(result["error"])
+            for section in ("diffs", "footnote_diffs"):
+                if section == "footnote_diffs" and section in result:
+                    print("==== FOOTNOTES ====")
+                for record in result.get(section, []):
+                    prefix = f"{record['file1_line']}:{record['file2_line']}: "
+                    text = record["text"].replace("\n", "\n" + " " * len(prefix))
+                    print(f"{prefix}{text}")
+            print()
+    if any("error" in result for result in results):
+        return 2
+    if any(result["diffs"] or result.get("footnote_diffs") for result in results):
+        return 1
+    return 0
+
+
 # mypy: disallow-untyped-defs=False
 
 
@@ -1084,6 +1517,9 @@ def to_subscript(text):
 class PgdpFile:
     """Base class: Store and process a DP text or html file"""
 
+    # Cleanup methods, run in order, and the preferences that affect each
+    cleanup_stages: tuple[tuple[str, tuple[PrefKey, ...]], ...] = ()
+
     def __init__(self, args):
         self.args = args
         self.basename = ""
@@ -1133,6 +1569,22 @@ class PgdpFile:
 class PgdpFileText(PgdpFile):
     """Store and process a DP text file"""
 
+    cleanup_stages = (
+        (
+            "cleanup",
+            (
+                PrefKey.PPCOMP_ROUNDS_PAGE_BLOCK,
+                PrefKey.PPCOMP_ROUNDS_FORMAT,
+                PrefKey.PPCOMP_ROUNDS_PROOFERS,
+                PrefKey.PPCOMP_ROUNDS_REGROUP,
+                PrefKey.PPCOMP_EXTRACT_FOOTNOTES,
+                PrefKey.PPCOMP_SUPPRESS_FOOTNOTES,
+                PrefKey.PPCOMP_SUPPRESS_ILLOS,
+                PrefKey.PPCOMP_SUPPRESS_SIDENOTES,
+            ),
+        ),
+    )
+
     def __init__(self, args):
         super().__init__(args)
         self.from_pgdp_rounds = False  # THIS file is from proofing rounds
@@ -1425,6 +1877,22 @@ class PgdpFileText(PgdpFile):
 class PgdpFileHtml(PgdpFile):
     """Store and process a DP html file."""
 
+    cleanup_stages = (
+        (
+            "cleanup_tree",
+            (
+                PrefKey.PPCOMP_CSS_NO_DEFAULT,
+                PrefKey.PPCOMP_CSS_SMCAP,
+                PrefKey.PPCOMP_CSS_ADD_ILLOS,
+                PrefKey.PPCOMP_CSS_ADD_SIDENOTES,
+                PrefKey.PPCOMP_CSS_CUSTOM,
+                PrefKey.PPCOMP_CSS_CUSTOM_VALUE,
+                PrefKey.PPCOMP_EXTRACT_FOOTNOTES,
+            ),
+        ),
+        ("cleanup_text", (PrefKey.PPCOMP_SUPPRESS_NBSP, PrefKey.PPCOMP_SUPPRESS_WJ)),
+    )
+
     def __init__(self, args):
         super().__init__(args)
         self.tree = None
@@ -1562,8 +2030,13 @@ class PgdpFileHtml(PgdpFile):
         self.text = re.sub(r"\u00AD", r"", self.text)
 
     def cleanup(self):
-        """Perform cleanup for this type of file - build up a list of CSS transform rules,
-        process them against tree, then convert to text.
+        """Perform cleanup for this type of file"""
+        self.cleanup_tree()
+        self.cleanup_text()
+
+    def cleanup_tree(self):
+        """Build up a list of CSS transform rules, process them against tree,
+        then convert to text.
         """
         self.strip_pg_boilerplate()
         # load default CSS for transformations
@@ -1581,6 +2054,8 @@ class PgdpFileHtml(PgdpFile):
         # Transform html into text for character search.
         self.text = etree.XPath("string(/)")(self.tree)
 
+    def cleanup_text(self):
+        """Clean up text converted from tree"""
         self.remove_nbspaces()
         self.remove_soft_hyphen()
         self.remove_wordjoin()
@@ -1,7 +1,10 @@
 """PPhtml tool."""
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from html.parser import HTMLParser
+import json
+import logging
 import os.path
 from textwrap import wrap
 import tkinter as tk
@@ -15,7 +18,18 @@ from guiguts.checkers import CheckerDialog, CheckerEntryType
 from guiguts.file import the_file
 from guiguts.maintext import maintext, HighlightTag
 from guiguts.preferences import preferences, PrefKey, PersistentBoolean
-from guiguts.utilities import IndexRange, IndexRowCol, sing_plur
+from guiguts.profiling import timed
+from guiguts.utilities import (
+    IndexRange,
+    IndexRowCol,
+    sing_plur,
+)
+
+logger = logging.getLogger(__package__)
+
+# File in project folder that stores image metadata between runs
+IMAGE_METADATA_FILE = "pphtml_images.json"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".svg")
 
 
 class PPhtmlCheckerDialog(CheckerDialog):
@@ -54,6 +68,106 @@ class PPhtmlFileData:
     filesize: int
 
 
+def read_image_metadata(filepath: str) -> Optional[PPhtmlFileData]:
+    """Read size, format, etc., from the header of a JPEG/PNG image, or check
+    that an SVG file starts like one.
+
+    Args:
+        filepath: Name of image file.
+
+    Returns:
+        Image info, or None if file isn't in the format its extension implies.
+    """
+    fsize = os.path.getsize(filepath)
+    if filepath.lower().endswith(".svg"):
+        try:
+            with open(filepath, "r", encoding="utf-8") as file:
+                file_contents = file.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        # Check start of file is compatible with it being SVG format
+        if re.match(
+            r"(?:<\?xml\b[^>]*>[^<]*)?(?:<!--.*?-->[^<]*)*(?:<svg|<!DOCTYPE svg)\b",
+            file_contents,
+        ):
+            return PPhtmlFileData(0, 0, "SVG", "", fsize)
+        return None
+    try:
+        with Image.open(filepath) as im:
+            return PPhtmlFileData(im.width, im.height, im.format, im.mode, fsize)
+    except IOError:
+        return None
+
+
+def scan_image_metadata(
+    images_dir: str, image_files: list[str], cache_file: str
+) -> dict[str, Optional[PPhtmlFileData]]:
+    """Get metadata for each image file, reading only files that are new
+    or changed since the last run, concurrently.
+
+    Metadata is keyed by file modification time and size, and saved in
+    the cache file for next time. If the cache file can't be read, it is
+    rebuilt, since it's only there to save time.
+
+    Args:
+        images_dir: Folder containing the image files.
+        image_files: Names of files in the images folder.
+        cache_file: Name of file to cache metadata in.
+
+    Returns:
+        Metadata for each JPEG, PNG or SVG file, None if file is not valid.
+    """
+    cache: Any = {}
+    try:
+        with open(cache_file, "r", encoding="utf-8") as fp:
+            cache = json.load(fp)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as exc:
+        logger.debug(f"Unable to load image metadata, so rereading images: {exc}")
+    if not isinstance(cache, dict):
+        cache = {}
+    new_cache: dict[str, Any] = {}
+    metadata: dict[str, Optional[PPhtmlFileData]] = {}
+    to_read: dict[str, list[int]] = {}
+    for filename in image_files:
+        if not filename.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        stat = os.stat(os.path.join(images_dir, filename))
+        key = [stat.st_mtime_ns, stat.st_size]
+        entry: Any = cache.get(filename)
+        try:
+            if entry["key"] == key:
+                data = entry["data"]
+                metadata[filename] = None if data is None else PPhtmlFileData(**data)
+                new_cache[filename] = entry
+                continue
+        except (KeyError, TypeError):
+            pass  # Not cached or not valid, so read file
+        to_read[filename] = key
+    if to_read:
+        with ThreadPoolExecutor() as executor:
+            for filename, filedata in zip(
+                to_read,
+                executor.map(
+                    read_image_metadata,
+                    [os.path.join(images_dir, fn) for fn in to_read],
+                ),
+            ):
+                metadata[filename] = filedata
+                new_cache[filename] = {
+                    "key": to_read[filename],
+                    "data": None if filedata is None else asdict(filedata),
+                }
+    if new_cache != cache:
+        try:
+            with open(cache_file, "w", encoding="utf-8") as fp:
+                json.dump(new_cache, fp, indent=2)
+        except OSError as exc:
+            logger.debug(f"Unable to save image metadata: {exc}")
+    return metadata
+
+
 class PPhtmlChecker:
     """PPhtml checker"""
 
@@ -98,6 +212,7 @@ class PPhtmlChecker:
         self.used_classes = {}
         self.defined_classes = {}
 
+    @timed("PPhtml")
     def run(self) -> None:
         """Run PPhtml."""
         self.reset()
@@ -154,41 +269,20 @@ class PPhtmlChecker:
                 test_passed = False
 
         # Make sure all are JPEG, PNG or SVG images
+        metadata = scan_image_metadata(
+            self.images_dir,
+            self.image_files,
+            os.path.join(os.path.dirname(the_file().filename), IMAGE_METADATA_FILE),
+        )
         for filename in self.image_files:
-            filepath = os.path.join(self.images_dir, filename)
             _, extension = os.path.splitext(filename.lower())
-            fsize = os.path.getsize(filepath)
-            if extension in (".jpg", ".jpeg", ".png"):
-                try:
-                    with Image.open(filepath) as im:
-                        self.imagefiledata[filename] = PPhtmlFileData(
-                            im.width,
-                            im.height,
-                            im.format,
-                            im.mode,
-                            fsize,
-                        )
-                except IOError:
-                    errors.append(
-                        f"  File '{filename}' is not valid {'PNG' if extension == '.png' else 'JPG'} format"
-                    )
-                    test_passed = False
-                    continue
-            elif extension == ".svg":
-                with open(filepath, "r", encoding="utf-8") as file:
-                    file_contents = file.read()
-                # Check start of file is compatible with it being SVG format
-                if re.match(
-                    r"(?:<\?xml\b[^>]*>[^<]*)?(?:<!--.*?-->[^<]*)*(?:<svg|<!DOCTYPE svg)\b",
-                    file_contents,
-                ):
-                    self.imagefiledata[filename] = PPhtmlFileData(
-                        0, 0, "SVG", "", fsize
-                    )
-                else:
-                    errors.append(f"  File '{filename}' is not valid SVG format")
+            if extension in IMAGE_EXTENSIONS:
+                if (filedata := metadata[filename]) is None:
+                    fmt = {".png": "PNG", ".svg": "SVG"}.get(extension, "JPG")
+                    errors.append(f"  File '{filename}' is not valid {fmt} format")
                     test_passed = False
                     continue
+                self.imagefiledata[filename] = filedata
             else:
                 errors.append(
                     f"  File '{filename}' does not have extension jpg, png or svg"
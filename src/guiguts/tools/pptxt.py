@@ -1,17 +1,48 @@
 """PPtxt tool"""
 
+import bisect
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+import logging
+import multiprocessing
+import os
 from tkinter import ttk
-from typing import Dict, Sequence, List, Any
+from typing import Dict, Iterator, Sequence, List, Any, Optional
 import regex as re
 
-from guiguts.checkers import CheckerDialog
+from guiguts.checkers import (
+    CheckerDialog,
+    CheckerJob,
+    CheckerReport,
+    DocumentSnapshot,
+)
 from guiguts.file import ProjectDict
-from guiguts.maintext import maintext
 from guiguts.misc_tools import tool_save
 from guiguts.preferences import preferences, PrefKey, PersistentBoolean
 from guiguts.utilities import IndexRowCol, IndexRange, non_text_line, sing_plur
 
+logger = logging.getLogger(__package__)
+
+# Checks in the order their results are shown in the dialog
+PPTXT_CHECKS: list[tuple[PrefKey, str]] = [
+    (PrefKey.PPTXT_FILE_ANALYSIS_CHECK, "file_analysis_check"),
+    (PrefKey.PPTXT_SPACING_CHECK, "spacing_check"),
+    (PrefKey.PPTXT_REPEATED_WORDS_CHECK, "repeated_words_check"),
+    (PrefKey.PPTXT_ELLIPSIS_CHECK, "ellipsis_check"),
+    (PrefKey.PPTXT_CURLY_QUOTE_CHECK, "curly_quote_check"),
+    (PrefKey.PPTXT_HYPHENATED_WORDS_CHECK, "hyphenated_words_check"),
+    (PrefKey.PPTXT_ADJACENT_SPACES_CHECK, "adjacent_spaces_check"),
+    (PrefKey.PPTXT_DASH_REVIEW_CHECK, "dash_review_check"),
+    (PrefKey.PPTXT_SCANNO_CHECK, "scanno_check"),
+    (PrefKey.PPTXT_WEIRD_CHARACTERS_CHECK, "weird_characters_check"),
+    (PrefKey.PPTXT_HTML_CHECK, "html_check"),
+    (PrefKey.PPTXT_UNICODE_NUMERIC_CHARACTER_CHECK, "unicode_numeric_character_check"),
+    (PrefKey.PPTXT_SPECIALS_CHECK, "specials_check"),
+]
+# Files with fewer lines than this are quicker to check without starting processes
+PARALLEL_MIN_LINES = 20000
+
 
 class PPtxtCheckerDialog(CheckerDialog):
     """PPtxt dialog."""
@@ -66,23 +97,6 @@ class PPtxtCheckerDialog(CheckerDialog):
             ).grid(row=cnt // 5, column=cnt % 5, sticky="NSEW")
 
 
-report_limit: int  # Max number of times to report same issue for some checks
-
-found_long_doctype_declaration: bool
-checker_dialog: PPtxtCheckerDialog
-book: list[str]
-word_list_map_count: dict[str, int]
-word_list_map_lines: dict[str, list[int]]
-word_list_map_words: list[list[str]]
-# quote-type counters/flags
-ssq: int
-sdq: int
-csq: int
-cdq: int
-longest_line: tuple[int, int]
-shortest_line: tuple[int, int]
-
-
 ########################################################
 # pptxt.py
 # Perl author: Roger Franks (DP:rfrank) - 2009
@@ -132,2206 +146,33 @@ re27 = re.compile(r"②")
 re28 = re.compile(r"⑤")
 re29 = re.compile(r"⑥")
 re30 = re.compile(r"⑦")
+# Word, then same word separated by spaces and/or a line break
+repeated_words_regex = re.compile(
+    r"(?<![\w'’-])([^\W_]+(?:['’-][^\W_]+)*)( +| *\n *)\1\b"
+)
+number_regex = re.compile(r"\p{Nd}+")
 
 
-def get_words_on_line(line: str) -> list[str]:
-    """Extract all the words on one line."""
-    global found_long_doctype_declaration
-
-    # Words may be surrounded by abandoned HTML tags, HTML entities,
-    # Unicode numeric character references, etc. Remove these from
-    # the line first of all so the word-types we want to record are
-    # easier to identify.
-
-    # A document starting with a "<!DOCTYPE>" declaration is assumed
-    # to be an HTML file. We have to treat this HTML declaration
-    # specially as it may overflow onto a second line in the case of
-    # older documents (HTML 4 or XHTML). Check for this using the
-    # variable 'found_long_doctype_declaration' which needs to exist
-    # between calls of this function.
-
-    if found_long_doctype_declaration:
-        # Second line of a long <!DOCTYPE> declaration. Toss this 2nd line.
-        found_long_doctype_declaration = False
-        return []
-
-    if re1.search(line, re.IGNORECASE) and ">" not in line:
-        # Looks like a two-line <!DOCTYPE declaration. Toss this 1st line.
-        # and set flag to toss the 2nd line too.
-        found_long_doctype_declaration = True
-        return []
-
-    # A short HTML 5 <!DOCTYPE> declaration will not be detected
-    # by the above tests. However it will be detected as an HTML
-    # tag next and removed from line.
-    line = re2.sub(" ", line)
-
-    # &amp; &#1234;, etc. (&[a-z0-9#]+?;)
-    # Replace HTML entities (e.g. &amp;) and numeric character references
-    # (&#8212, &#x2014) with a space.
-    line = re3.sub(" ", line)
-
-    # Protect '&' in other tokens starting with '&'.
-    # Order of subs below important.
-    line = re4.sub(r"⑦\1⑤", line)
-    line = re5.sub(r"⑦\1", line)
-
-    # Replace 1/2-style fractions with space.
-    line = re6.sub(" ", line)
-
-    # Replace [99], [99a], etc., footnote anchors.
-    line = re7.sub(" ", line)
-
-    # Remove italic markup (_). Need to consider a two-line italic string.
-    # _blah123... or _"blah123...
-    line = re8.sub(r"\1", line)
-    # ...blah_ or ...blah._ or ...blah"_ or ...blah."_, etc.
-    line = re9.sub(r"\1", line)
-
-    # Protect other special cases by masking them temporarily:
-    # E.g.
-    # high-flying, hasn’t, ’tis, Househ^d
-    # all stay intact
-    # Capitalisation is retained.
-    # Additionally, an emdash separating words in, for
-    # example, the ToC is replaced by a space.
-
-    # Need these twice to handle alternates
-    # E.g. fo’c’s’le
-
-    # Newcastle-upon-Tyne
-    line = re10.sub(r"\1①\2", line)
-    line = re11.sub(r"\1①\2", line)
-    # paring- or -in (hyphen followed/preceded by whitespace)
-    line = re12.sub(r"\1①\2", line)
-    line = re13.sub(r"\1①\2", line)
-    # fo’c’s’le
-    line = re14.sub(r"\1②\2", line)
-    line = re15.sub(r"\1②\2", line)
-    # House^d
-    line = re16.sub(r"\1⑥\2", line)
-    # loupin’-on, frien’-o’-mine
-    line = re17.sub(r"\1②①", line)
-    # by-’n-by
-    line = re18.sub(r"\1①②\2", line)
-    # by ’n by
-    line = re19.sub(r"②\1", line)
-    # ’tis at start of line
-    line = re20.sub(r"②\1", line)
-    # ’tis prefxed by a space
-    line = re21.sub(r" ②\1", line)
-    # Peep o’ Day (?<=^| )(\p{L})’(?=$| )
-    line = re22.sub(r"\1②", line)
-    # Lieut.-Col. (\p{L})\.\-(\p{L})
-    line = re23.sub(r"\1⑤①\2", line)
-
-    # If user is using "--" in place of emdash convert
-    # that to a space so it can be a word separator.
-
-    line = re24.sub(" ", line)
-
-    # Replace all characters with " " other than letters, digits
-    # and protected characters. Note that ①, ①, ... are 'numeric'
-    # characters and are matched by \p{N}.
-
-    line = re25.sub(" ", line)
-
-    # Restore protected characters
-
-    line = re26.sub(r"-", line)
-    line = re27.sub(r"’", line)
-    line = re28.sub(r".", line)
-    line = re29.sub(r"^", line)
-    line = re30.sub(r"&", line)
-
-    # Create a list of whole words from the line.
-
-    line_list = line.split()
-
-    return line_list
-
-
-######################################################################
-# blank line spacing check
-######################################################################
-
-
-def spacing_check() -> None:
-    """Blank line spacing check that flags other than 4121, 421 or 411 spacing."""
-
-    checker_dialog.add_header(
-        "----- Paragraph spacing check - expecting 4121, 421 or 411 spacing -------------"
-    )
-
-    # This routine does not use the line text at all. It is only concerned with
-    # counting blank lines between paragraphs and other blocks/lines of text
-    # looking for anomolous numbers of blank lines.
-    #
-    # It expects to see irregular line spacing (e.g. in title page, etc.)
-    # until the first 4-line space is encountered. If no 4-line space is
-    # found there will be no spacing counts output to the report. However
-    # a warning message about this unusual situation is output.
-
-    # Initialise, counters, flags, etc.
-    bl_cnt = 0
-    prev_line_was_bl = False
-    prev_bl_cnt = 0
-    bl_spacing_issues = []
-    four_line_spacing_found = False
-    no_other_spacing_issues = False
-
-    for line_number, line in enumerate(book, start=1):
-        if non_text_line(line):
-            continue
-        blank_line = re.match(r"^ *$", line)
-        if blank_line:
-            # Blank line.
-            bl_cnt += 1
-            prev_line_was_bl = True
-        elif not blank_line and prev_line_was_bl:
-            if bl_cnt == 3 or bl_cnt > 4:
-                # i.e. 5..131.., 4..151.., etc, spacing.
-                bl_spacing_issues.append((bl_cnt, line_number))
-            elif bl_cnt == 4:
-                four_line_spacing_found = True
-                no_other_spacing_issues = True
-            elif bl_cnt == 2:
-                if prev_bl_cnt == 2:
-                    # i.e. 4..1221..., etc, spacing.
-                    bl_spacing_issues.append((bl_cnt, line_number))
-            prev_bl_cnt = bl_cnt
-            bl_cnt = 0
-            prev_line_was_bl = False
-
-    # Output to dialog any line spacing issues found. We have a list
-    # of issue tuples: (int: spacing count, int: line number)
-
-    for issue in bl_spacing_issues:
-        no_other_spacing_issues = False
-        # First value in an issue tuple is queried line spacing count.
-        if issue[0] == 2:
-            # Repeated 2-line spacing between paragraphs.
-            error_text = "End point of repeated 2-line spacing."
-
-            # There is no error as such on line in file. It is simply
-            # the line that starts a paragraph after the queried blank
-            # line spacing. Use the line_num.line_col string for start
-            # of this line as the 'error' since that's what is highlighted
-            # in the dialog text. It means the first few characters at the
-            # start of the file line are selected when dialog message clicked.
-
-            line_num = str(issue[1])
-            line_col = str(0)
-            error_start = line_num + "." + line_col
-            error_end = line_num + "." + str(len(error_start))
-            # Store in new structures for file row/col positions and ranges.
-            start_rowcol = IndexRowCol(error_start)
-            end_rowcol = IndexRowCol(error_end)
-            # Build record to add to dialog.
-            record = error_text
-            # Add record to dialog. No highlighting.
-            checker_dialog.add_entry(record, IndexRange(start_rowcol, end_rowcol))
-        else:
-            # Here for line count issues other than repeated 2-line spacing.
-            error_text = f"End point of unexpected {issue[0]}-line spacing."
-
-            # See comment above.
-
-            line_num = str(issue[1])
-            line_col = str(0)
-            error_start = line_num + "." + line_col
-            error_end = line_num + "." + str(len(error_start))
-            # Store in new structures for file row/col positions and ranges.
-            start_rowcol = IndexRowCol(error_start)
-            end_rowcol = IndexRowCol(error_end)
-            # Build record to add to dialog.
-            record = error_text
-            # Add error msg to dialog. No highlighting.
-            checker_dialog.add_entry(record, IndexRange(start_rowcol, end_rowcol))
-
-    if not four_line_spacing_found:
-        checker_dialog.add_footer(
-            "", "    No 4-line spacing found in book - that is unusual."
-        )
-    elif no_other_spacing_issues:
-        checker_dialog.add_footer(
-            "", "    Book appears to conform to DP paragraph/block spacing standards."
-        )
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# repeated words check
-######################################################################
-
-
-def repeated_words_check() -> None:
-    """Repeated words check."""
-
-    checker_dialog.add_header(
-        "----- Repeated words check - can be last word on a line and first on next ------"
-    )
-
-    # METHOD
-    #
-    # Uses the list of words on each line. For each word in the list it builds
-    # a regex that searches for pairs of that word separated only by space chars.
-    # After noting the start/end position of a repeated pair it obfuscates the
-    # first word of the pair before repeating the search using the next word in the
-    # list. That word could be the second word of the pair in which case the next
-    # search of the line will find the same pair again if obsfucation is not used.
-    #
-    # A repeated word may be the last word on a line and its repeat the first word
-    # on the next line. That is looked for and reported by a separate search.
-    #
-    # Searching with a regex is compute intensive and is also unnecessary for most
-    # lines in the file if there is a quick and cheap way of identifying POSSIBLE
-    # pairs of repeated words on a line. Only then is it necessary to use a regex
-    # search on that line.
-    #
-    # Possible pairs of words are cheaply found by comparing each word in the list
-    # of words on a line with the next word in the list. This is not determinative
-    # of a pair of repeated words, only the possibility. For example, the list of
-    # words on a line might contain 'very' followed by 'very'. If that arises from
-    # parsing a line that includes "that's very, very true", the repeats of 'very'
-    # in that case are not counted as repeated words. The regex search on that line
-    # will determine whether such repeats are counted as 'repeated words' or not.
-
-    # NOTE: This could potentially be simplified/improved using `findall` to get all
-    # non-overlapping matches of "word word" on the line after adding the first word
-    # of the next line. Or maybe slurp whole file, then search for "word \1".
-
-    repeat_msg: list[MsgInfo] = []
-
-    for rec_num, book_line in enumerate(book):
-        words_on_line = word_list_map_words[rec_num]
-        # Run through words found on a line looking for possible repeats. This quick
-        # and cheap check eliminates most lines from being 'possibles'. Numbers are
-        # eliminated at the same time; i.e. all-digit 'words'.
-        no_numbers_words_on_line = []
-        possibles = False
-        wordn1 = ""
-        for i in range(len(words_on_line) - 1):
-            word = words_on_line[i]
-            if re.match(r"^[\p{Nd}]+$", word):
-                continue
-            no_numbers_words_on_line.append(word)
-            wordn1 = words_on_line[i + 1]
-            # Chop apostrophe and following characters of second word.
-            # E.g. "Jackey Jackey's". Note that "he had haddock" as a
-            # possible from this edit will be eliminated by the more
-            # restrictive regex comparison below using word boundaries.
-            if word == wordn1[: len(word)]:
-                possibles = True
-        if len(words_on_line) == 1:
-            wordn1 = words_on_line[-1]
-        # Add last word on line to no_numbers_words_on_line if not a number.
-        if len(words_on_line) > 0 and wordn1 and not re.match(r"^[\p{Nd}]+$", wordn1):
-            no_numbers_words_on_line.append(wordn1)
-        # There may be possible repeats of words (non-numbers) on line.
-        if possibles:
-            # For each word on line see if a copy follows separated only
-            # by one or more spaces. These are the true repeated words.
-            for word in no_numbers_words_on_line:
-                # Build a regex.
-                regx = f"(\\b{word}\\b +\\b{word}\\b)"
-                if res := re.search(regx, book_line):
-                    repl = " " * len(word)
-                    # Obsfucate the first occurence of 'word' in the match so
-                    # next re.search can't find it. It's replaced by blanks
-                    # to the same length as 'word'.
-                    book_line = re.sub(word, repl, book_line, pos=res.start(0), count=1)
-                    # Get start/end of the repeated words in file.
-                    error_start = str(rec_num + 1) + "." + str(res.start(0))
-                    error_end = str(rec_num + 1) + "." + str(res.end(0))
-                    # Store in structure for file row/col positions & range.
-                    start_rowcol = IndexRowCol(error_start)
-                    end_rowcol = IndexRowCol(error_end)
-                    # Get whole of file line.
-                    line = maintext().get(
-                        error_start + " linestart", error_end + " lineend"
-                    )
-                    record = line
-                    # Calculate start/end of repeated words in dialog message.
-                    hilite_start = res.start(0)
-                    hilite_end = res.end(0)
-                    # Add message to dialog.
-                    repeat_msg.append(
-                        MsgInfo(
-                            record,
-                            IndexRange(start_rowcol, end_rowcol),
-                            hilite_start,
-                            hilite_end,
-                        )
-                    )
-
-        # We may get here also if current line is a blank line.
-
-        if len(no_numbers_words_on_line) > 0 and rec_num < len(book) - 1:
-            # Completed determinative search of line for possible repeated words.
-            # Now look at last word on the line and the first word of the next.
-            word = no_numbers_words_on_line[-1]
-            # If last word on current line is same as first word on next line then
-            # this is also an instance of repeated words.
-            regx1 = f"(\\b{word} *$)"
-            regx2 = f"(^ *{word}\\b)"
-            if (res1 := re.search(regx1, book[rec_num])) and (
-                res2 := re.search(regx2, book[rec_num + 1])
-            ):
-                # Get start/end of the repeated words in file.
-                error_start = str(rec_num + 1) + "." + str(res1.start(0))
-                error_end = str(rec_num + 2) + "." + str(res2.end(0))
-                # Store in structure for file row/col positions & range.
-                start_rowcol = IndexRowCol(error_start)
-                end_rowcol = IndexRowCol(error_end)
-                # Get whole of file line.
-                line = maintext().get(
-                    error_start + " linestart", error_end + " lineend"
-                )
-                record = line
-                # Calculate start/end of repeated words in dialog message.
-                hilite_start = res1.start(0)
-                # Since second repeated word is on next line just highlight
-                # to end of current line.
-                hilite_end = len(record)
-                # Add message to dialog.
-                repeat_msg.append(
-                    MsgInfo(
-                        record,
-                        IndexRange(start_rowcol, end_rowcol),
-                        hilite_start,
-                        hilite_end,
-                    )
-                )
-
-    # Only output the message if it's on a different line or a different word to the previous
-    if repeat_msg:
-        consolidate_messages(repeat_msg)
-    else:
-        checker_dialog.add_footer("", "    No repeated words found.")
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-def consolidate_messages(repeat_msg: list[MsgInfo], limit: int = 0) -> None:
-    """Consolidate messages.
+def double_dash_replace(matchobj: re.Match) -> str:
+    """Called to replace exactly 2 emdashes by 1 emdash.
 
     Args:
-        repeat_msg: List of messages to be consolidated.
-        limit: If > 0, limit number of messages output.
+        matchobj: A regex match object.
     """
-    prev_msg_info = None
-    build_msg = None
-    n_matches = 0
-    n_messages = 0
-    for msg_info in repeat_msg:
-        # If this message doesn't match previous message, ignoring multiple spaces...
-        if (
-            prev_msg_info is None
-            or msg_info.text_range.start.row != prev_msg_info.text_range.start.row
-            or msg_info.msg != prev_msg_info.msg
-            or re.sub(
-                "  +",
-                " ",
-                msg_info.msg[msg_info.hilite_start : msg_info.hilite_end],
-            )
-            != re.sub(
-                "  +",
-                " ",
-                prev_msg_info.msg[
-                    prev_msg_info.hilite_start : prev_msg_info.hilite_end
-                ],
-            )
-        ):
-            # Output any combined message we've previously built up
-            if build_msg is not None:
-                # No more than 5 of any type unless verbose
-                n_messages += 1
-                if limit > 0 and n_messages >= limit + 1:
-                    if n_messages == limit + 1:
-                        checker_dialog.add_footer("  ...more")
-                    continue
-
-                repeat_str = f"(x{n_matches}) " if n_matches > 1 else ""
-                checker_dialog.add_entry(
-                    f"{repeat_str}{build_msg.msg}",
-                    build_msg.text_range,
-                    build_msg.hilite_start + len(repeat_str),
-                    build_msg.hilite_end + len(repeat_str),
-                )
-            # Start a new build message
-            build_msg = MsgInfo(
-                msg_info.msg,
-                msg_info.text_range,
-                msg_info.hilite_start,
-                msg_info.hilite_end,
-            )
-            n_matches = 1
-        else:
-            # "Duplicate" message - amend build message to cover whole relevant range
-            assert build_msg is not None
-            build_msg.text_range.end = msg_info.text_range.end
-            build_msg.hilite_end = msg_info.hilite_end
-            n_matches += 1
-        prev_msg_info = msg_info
-    # Output last message
-    if build_msg is not None:
-        n_messages += 1
-        if limit > 0 and n_messages >= limit + 1:
-            if n_messages == limit + 1:
-                checker_dialog.add_footer("  ...more")
-        else:
-            repeat_str = f"(x{n_matches}) " if n_matches > 1 else ""
-            checker_dialog.add_entry(
-                f"{repeat_str}{build_msg.msg}",
-                build_msg.text_range,
-                build_msg.hilite_start + len(repeat_str),
-                build_msg.hilite_end + len(repeat_str),
-            )
-
-
-######################################################################
-# hyphenated/non-hyphenated words check
-######################################################################
-
-
-def hyphenated_words_check() -> None:
-    """Repeated words check."""
-
-    checker_dialog.add_header(
-        "----- Hyphenated/non-hyphenated words check ------------------------------------"
-    )
-
-    first_header = True
-    none_found = True
-
-    for word in word_list_map_count:
-        if re.search(r"-", word):
-            word_with_hyphen = word
-            # Hyphenated word found. Make a non-hyphenated version.
-            word_with_no_hyphen = re.sub("-", "", word_with_hyphen)
-            if word_with_no_hyphen in word_list_map_count:
-                # Here when hyphenated and non-hyphenated version of a word.
-                none_found = False
-                word_count_with_no_hyphen = word_list_map_count[word_with_no_hyphen]
-                word_count_with_hyphen = word_list_map_count[word_with_hyphen]
-                # Make a header with this info and output it to dialog.
-                # E.g. "sandhill (1) <-> sand-hill (3)".
-                record = f"{word_with_no_hyphen} ({word_count_with_no_hyphen}) <-> {word_with_hyphen} ({word_count_with_hyphen})"
-                # Insert a blank line before each header except the first one.
-                if first_header:
-                    first_header = False
-                else:
-                    checker_dialog.add_header("")
-                # Add header record to dialog.
-                checker_dialog.add_header(record)
-
-                # Under the header add to the dialog every line containing an instance of the
-                # hyphenated word. If more than 5 lines stop reporting them and warn, unless verbose.
-                # If there are multiple instances of a word on a line then the line will appear in
-                # the dialog multiple times, each time highlighting a different instance of word.
-                #
-                # We will do the same with the non-hyphenated version of the word.
-
-                line_number_list = word_list_map_lines[word_with_hyphen]
-                prev_line_number = -1
-                template = "{}{}{}"
-                regx = template.format("(", word_with_hyphen, "(?!\\p{L}))")
-                count = 0
-                for line_number in line_number_list:
-                    # The same line number can appear multiple times in the list if the word in question
-                    # appears multiple times on the line. Treat each appearance of the word separately.
-                    # At the first time the line number appears in the list report all the occurrences
-                    # on that line then ignore any other instances of that line number in the list.
-                    if line_number == prev_line_number:
-                        prev_line_number = line_number
-                        continue
-                    # Maybe limit the length of the report by reporting only first 5 lines for a word ...
-                    if count == report_limit:
-                        count = -1
-                        break
-                    # ... but note that a new dialog line is generated for each time the word appears
-                    # on the line so there may be more than 5 dialog lines output
-                    line = book[line_number - 1]
-                    report_all_occurrences_on_line(regx, line, line_number)
-                    count += 1
-                    prev_line_number = line_number
-
-                if count < 0:
-                    checker_dialog.add_footer("  ...more")
-
-                # We do the same for the non-hyphenated version of the word. Separate this
-                # list of lines from the ones above with a rule. Maybe limit the number of lines
-                # reported to report_limit (5 or 999999).
-
-                checker_dialog.add_header("-----")
-
-                line_number_list = word_list_map_lines[word_with_no_hyphen]
-                prev_line_number = -1
-                template = "{}{}{}"
-                regx = template.format("((?<!-)", word_with_no_hyphen, "(?!\\p{L}))")
-                count = 0
-                for line_number in line_number_list:
-                    # The same line number can appear multiple times in the list if the word in question
-                    # appears multiple times on the line. Treat each appearance of the word separately.
-                    # At the first time the line number appears in the list report all the occurrences
-                    # on that line then ignore any other instances of that line number in the list.
-                    if line_number == prev_line_number:
-                        prev_line_number = line_number
-                        continue
-                    # Maybe limit the length of the report by reporting only first 5 lines for a word ...
-                    if count == report_limit:
-                        count = -1
-                        break
-                    # ... but note that a new dialog line is generated for each time the word appears
-                    # on the line so there may be more than 5 dialog lines output.
-                    line = book[line_number - 1]
-                    report_all_occurrences_on_line(regx, line, line_number)
-                    count += 1
-                    prev_line_number = line_number
-
-                if count < 0:
-                    checker_dialog.add_footer("  ...more")
-
-    if none_found:
-        checker_dialog.add_footer("")
-        checker_dialog.add_footer(
-            "    No non-hyphenated versions of hyphenated words found."
-        )
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# Unusual character check. Collects and reports lines that contain
-# characters ('weirdos') not normally found in an an English text.
-# Each 'weirdo' on a line in the dialog is highlighted.
-######################################################################
-
-
-def weird_characters_check() -> None:
-    """Collects lines containing unusual characters. Lines in the report
-    are grouped by unusual character and each instance of the character
-    on a report line is highlighted."""
-
-    checker_dialog.add_header(
-        "----- Uncommon Characters ------------------------------------------------------"
-    )
-
-    first_header = True
-    none_found = True
-
-    weirdos_lines_dictionary: Dict[str, list[int]] = {}
-    weirdos_counts_dictionary: Dict[str, int] = {}
-
-    # If no curly quotes in file, don't consider straight quotes to be weirdos
-    straight_quotes = "\"'" if csq + cdq == 0 else ""
-    weirdo_regex = (
-        r"[^A-Za-z0-9\s.,:;?!&\\\-_—–=“”‘’\[\]\(\){}¼½¾¹²³⁰⁴-⁹₀-₉⅐-⅞"
-        + straight_quotes
-        + "]"
-    )
-
-    # Build dictionary of unusual characters ('weirdos'). The key is a
-    # weirdo and the value a list of line numbers on which that character
-    # appears.
-    for line_number, line in enumerate(book, start=1):
-        if non_text_line(line):
-            continue
-        # Get list of weirdos on this line. That means any character NOT in the regex.
-        weirdos_list = re.findall(weirdo_regex, line)
-        # Update dictionary with the weirdos from the line.
-        for weirdo in weirdos_list:
-            # Skip exceptions
-            # Thoughtbreak consists of 5 asterisks equally spaced,
-            # and indented by at least 3 spaces.
-            if weirdo == "*" and re.fullmatch(r" {3,}\*( {3,10}\*)\1\1\1", line):
-                continue
-            if weirdo in weirdos_lines_dictionary:
-                weirdos_lines_dictionary[weirdo].append(line_number)
-            else:
-                weirdos_lines_dictionary[weirdo] = [line_number]
-
-            if weirdo in weirdos_counts_dictionary:
-                weirdos_counts_dictionary[weirdo] += 1
-            else:
-                weirdos_counts_dictionary[weirdo] = 1
-
-    # Check whether to ignore Greek letters
-    skip_greek = (
-        sum(
-            1
-            for weirdo in weirdos_lines_dictionary
-            if re.fullmatch(r"\p{Greek}", weirdo)
-        )
-        > 5
-    )
-    if skip_greek:
-        checker_dialog.add_footer(
-            "[Book contains over 5 different Greek letters so not reporting them]", ""
-        )
-
-    # If nothing in the dictioary, nothing to do!
-    if len(weirdos_lines_dictionary) != 0:
-        none_found = False
-        for weirdo, line_list in weirdos_lines_dictionary.items():
-            if skip_greek and re.fullmatch(r"\p{Greek}", weirdo):
-                continue
-            count = weirdos_counts_dictionary[weirdo]
-            # Make a header with this info and output it to dialog.
-            # E.g. "'¢' (3)".
-            record = f"'{weirdo}' ({count})"
-            # Insert a blank line before each header except the first one.
-            if first_header:
-                first_header = False
-            else:
-                checker_dialog.add_header("")
-            # Add header record to dialog.
-            checker_dialog.add_header(record)
-
-            # Under the header add to the dialog every line containing an instance of the weirdo.
-            # If there are multiple instances of a weirdo on a line then the line will appear in
-            # the dialog multiple times, each time highlighting a different instance of it.
-
-            prev_line_number = -1
-            regx = "(" + "\\" + weirdo + ")"
-            count = 0
-            for line_number in line_list:
-                # The same line number can appear multiple times in the list if the weirdo in question
-                # appears multiple times on the line. Treat each appearance of the weirdo separately.
-                # At the first time the line number appears in the list report all the occurrences
-                # on that line then ignore any other instances of that line number in the list.
-                if line_number == prev_line_number:
-                    prev_line_number = line_number
-                    continue
-                # Maybe limit the length of the report by reporting only first 5 lines for a word ...
-                if count == report_limit:
-                    count = -1
-                    break
-                # ... but note that a new dialog line is generated for each time the word appears
-                # on the line so there may be more than 5 dialog lines output.
-                line = book[line_number - 1]
-                report_multiple_occurrences_on_line(regx, line, line_number)
-
-                count += 1
-                prev_line_number = line_number
-
-            if count < 0:
-                checker_dialog.add_footer("  ...more")
 
-    if none_found:
-        checker_dialog.add_footer("", "    No unusual characters found.")
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
+    return matchobj.group(1) + "—" + matchobj.group(2)
 
 
 ######################################################################
-# Specials check. Multiple checks done on each line during a single
-# read of book lines.
+# build dictionary used by scannos check
 ######################################################################
 
 
-def specials_check(project_dict: ProjectDict) -> None:
-    """A series of textual checks done on a single read of the book lines."""
-
-    checker_dialog.add_header(
-        "----- Special situations checks ------------------------------------------------"
-    )
-
-    # METHOD
-    #
-    # Multiple checks are performed on each line during a single
-    # pass through the book's lines. Thus reports of issues have
-    # to be temporarily stored and only output to the dialog at
-    # the end of the pass.
-    #
-    # Use a dictionary to collect reports on lines that contain
-    # the 'specials' we are testing for. The keys are the report
-    # headings (e.g. "full stop followed by letter") and the value
-    # assigned to the key is a list containing one or more tuples
-    # that contain the information needed to generate an appropriate
-    # dialog message. Each tuple will add a dialog message to display.
-
-    def process_line_with_pattern(
-        pattern: str, exceptions: Sequence[str], line: str
-    ) -> None:
-        """Helper function for abstraction of processing logic.
-
-        METHOD
-        On a copy of the line passed in:
-        1. Find all the exceptions and replace those matches
-           with an obscure string of the same length.
-        2. Find remaining matches of pattern in this obscured line.
-        3. Highlight text in same position on actual line.
-        """
-
-        line_copy = line
-        # This function is within the scope of specials_check() function from where it is called.
-        line_number = line_index + 1
-        for exception in exceptions:
-            # Replace the exception with obscure string of same length.
-            while res := re.search(exception, line_copy):
-                # Obscuring symbol is a dentistry symbol (Hex 23c0, Dec 9152).
-                line_copy = (
-                    line_copy[: res.start(0)]
-                    + "⏀" * (res.end(0) - res.start(0))
-                    + line_copy[res.end(0) :]
-                )
-
-        # Exceptions on line obscured. Any remaining instances of
-        # pattern are to be highlighted.
-        # Use re.finditer() to generate a new dialog line for each time the pattern (the issue
-        # being checked) appears on the line.
-
-        for match_obj in re.finditer(pattern, line_copy):
-            # Get start/end of error in file.
-            error_start = str(line_number) + "." + str(match_obj.start(0))
-            error_end = str(line_number) + "." + str(match_obj.end(0))
-            # Highlight occurrence of word in the line.
-            hilite_start = match_obj.start(0)
-            hilite_end = match_obj.end(0)
-            if heading not in specials_report:
-                specials_report[heading] = []
-            specials_report[heading].append(
-                MsgInfo(
-                    line, IndexRange(error_start, error_end), hilite_start, hilite_end
-                )
-            )
-
-    def process_word(word: str, exceptions: Sequence[str], line: str) -> None:
-        """Helper function for abstraction of processing logic.
-
-        METHOD
-        On the line passed in:
-        1. Find the word on the line.
-        2. Highlight text in same position on actual line.
-        """
-
-        # This function is within the scope of specials_check() function from where it is called.
-        line_number = line_index + 1
-        something_to_report = True
-        for exception in exceptions:
-            if re.match(exception, word):
-                # Word matches an exception so nothing to report.
-                something_to_report = False
-                break
-        # Report word if it is not an exception/empty exceptions list.
-        if something_to_report:
-            # Get all occurrences of word on this line and report them.
-            # regx = f"\\b{word}\\b"
-            regx = r"(?<!\p{L}|\p{Nd})" + word + r"(?!\p{L}|\p{Nd})"
-            for match_obj in re.finditer(regx, line):
-                # Get start/end of error in file.
-                error_start = str(line_number) + "." + str(match_obj.start(0))
-                error_end = str(line_number) + "." + str(match_obj.end(0))
-                # Highlight occurrence of word in the line.
-                hilite_start = match_obj.start(0)
-                hilite_end = match_obj.end(0)
-                if heading not in specials_report:
-                    specials_report[heading] = []
-                specials_report[heading].append(
-                    MsgInfo(
-                        line,
-                        IndexRange(error_start, error_end),
-                        hilite_start,
-                        hilite_end,
-                    )
-                )
-
-    specials_report: Dict[str, list[MsgInfo]] = {}
-
-    ####
-    # The following series of checks operate on text of each line.
-    ####
-
-    none_found = True
-
-    # NOTE: Count from 0 rather than 1. Actual line number for book
-    #       text will be line_index + 1.
-
-    for line_index, line in enumerate(book):
-        if non_text_line(line):
-            continue
-        exceptions: List[str] = []
-        # Allow Illustrations, Greek, Music or number in '[]'
-        heading = "Opening square bracket followed by other than I, G, M, S or digit."
-        exceptions.append(r"\[Blank Page\]")
-        process_line_with_pattern(r"\[[^IGMS\d]", exceptions, line)
-
-        # Clear out the exceptions for the previous check.
-        exceptions = []
-
-        # Don't allow 'Blank Page'
-        heading = "Blank Page place holder found."
-        process_line_with_pattern(r"\[Blank Page\]", exceptions, line)
-
-        # Mixed hyphen/dash in line"
-        heading = "Mixed hyphen/dash in line."
-        process_line_with_pattern(r"—-|-—|–-|-–", exceptions, line)
-
-        # Non-breaking space in line
-        heading = "Non-breaking space."
-        process_line_with_pattern(r"\u00A0", exceptions, line)
-
-        # Soft hyphen in line
-        heading = "Soft hyphen in line."
-        process_line_with_pattern(r"\u00AD", exceptions, line)
-
-        # Tab character in line
-        heading = "Tab character in line."
-        process_line_with_pattern(r"\u0009", exceptions, line)
-
-        # Ampersand character in line (excluding unicode numeric character references and '&c.')
-        exceptions.append(r"&c\.")
-        heading = "Ampersand character in line (excluding '&c.' and unicode numeric character references)."
-        process_line_with_pattern(r"&(?!#)", exceptions, line)
-
-        # Clear out the exceptions for the previous check.
-        exceptions = []
-
-        # Single character line
-        heading = "Single character line."
-        process_line_with_pattern(r"^[^]]$", exceptions, line)
-
-        # Broken hyphenation
-        heading = "Broken hyphenation."
-        process_line_with_pattern(
-            r"(\p{L}\- +?\p{L})|(\p{L} +?\-\p{L})", exceptions, line
-        )
-
-        # Comma spacing regexes
-        heading = "Comma spacing."
-        process_line_with_pattern(r"\p{L},\p{L}|\p{L},\p{N}|\s,|^,", exceptions, line)
-
-        # Oct. 8,2023 date fotmat
-        heading = "Date format."
-        process_line_with_pattern(r",[12]\p{Nd}{3}", exceptions, line)
-
-        # I in place of intended !
-        heading = "I/! check."
-        process_line_with_pattern(r"I”", exceptions, line)
-
-        # Disjointed contraction. E.g "I 've"
-        heading = "Disjointed contraction."
-        process_line_with_pattern(r"[A-Za-z]’ +?(m|ve|ll|t)\b", exceptions, line)
-
-        # Title/honorific abbreviations
-        heading = "Title abbreviation + comma."
-        process_line_with_pattern(
-            r"Mr,|Mrs,|Dr,|Drs,|Messrs,|Ms,|Hon,|Prof,", exceptions, line
-        )
-
-        # Spaced punctuation
-        heading = "Spaced punctuation."
-        # Exclude sequences of " ... ", etc.
-        exceptions.append(r"(?<=\s|^)\.\.\.(?=\s|$)")
-        # " .14567" is permitted, i.e. followed by digit
-        exceptions.append(r"(?<=\s|^)\.(?=\d)")
-        process_line_with_pattern(r"\s[\?!:;\.]", exceptions, line)
-
-        # Clear out the exceptions for the previous check.
-        exceptions = []
-
-        # Abbreviation &c without period
-        heading = "Abbreviation &c. without period."
-        process_line_with_pattern(r"&c(?= |$)", exceptions, line)
-
-        # Line starts with (selected) punctuation
-        heading = "Line start with suspect punctuation."
-        process_line_with_pattern(r"^[!;:,.?]", exceptions, line)
-
-        # Line starts with hyphen followed by non-hyphen
-        heading = "Line start with hyphen and then non-hyphen."
-        process_line_with_pattern(r"^-[^-]", exceptions, line)
-
-        # The following check for standalone 0 consists of:
-        #
-        # GENERAL TEST
-        pattern = r"\b0\b"
-        if re.search(pattern, line):
-            # Here if possible issue.
-            #
-            # EXCEPTIONS
-            #
-            # NB Each regex below returns the pattern in a match
-            #    as group(0).
-            exceptions = []
-            # standalone 0 allowed after dollar/pound sign; E.g. $0 25.
-            exceptions.append(r"(?<=[\$£])(0)(?=$|\P{Nd})")
-            # 0.123 or 29.0 or 0°
-            exceptions.append(r"\b(0)(?=\.)")
-            exceptions.append(r"(?<=\.)(0)\b")
-            exceptions.append(r"\b(0)(?=°)")
-            # Generate dialog tuples only if not an exception.
-            heading = "Standalone 0 (excluding exceptions)."
-            process_line_with_pattern(pattern, exceptions, line)
-
-        # The following check for standalone 1 consists of:
-        #
-        # GENERAL TEST
-        pattern = r"(?<=^|\P{Nd})(1)(?=$|\P{N})"
-        # NB should be equivalent to r"\b1\b"
-        if re.search(pattern, line):
-            # Here if possible issue.
-            #
-            # EXCEPTIONS
-            #
-            # NB Each regex below returns the pattern in a match
-            #    as group(0).
-            exceptions = []
-            # standalone 1 allowed after dollar/pound sign.
-            exceptions.append(r"(?<=[\$£])(1)(?=$|\P{Nd})")
-            # standalone 1 allowed before comma.
-            exceptions.append(r"(?<=^|\P{Nd})(1)(?=,)")
-            # standalone 1 allowed before dash+num.
-            exceptions.append(r"(?<=^|\P{Nd})(1)(?=[-‑‒–—―]\p{Nd})")
-            # standalone 1 allowed after num+dash.
-            exceptions.append(r"(?<=\p{Nd}[-‑‒–—―])(1)(?=$|\P{Nd})")
-            # 1.nnn or nnn.1 or 1°
-            exceptions.append(r"\b(1)(?=\.)")
-            exceptions.append(r"(?<=\.)(1)\b")
-            exceptions.append(r"\b(1)(?=°)")
-            # standalone 1 allowed as "1st".
-            exceptions.append(r"(?<=^|\P{Nd})(1)st")
-            # standalone 1 allowed as a footnote anchors
-            exceptions.append(r"\[(1)\]")
-            # Make exceptions of 1s. (1 shilling) and 1d. (1 pence/penny).
-            exceptions.append(r"\b1d\.")
-            exceptions.append(r"\b1s\.")
-            # Generate dialog tuples only if not an exception.
-            heading = "Single '1' in a word or a standalone '1' (excluding exceptions)."
-            process_line_with_pattern(pattern, exceptions, line)
-
-        # The following check for punctuation after case-insensitive 'the' consists of:
-        #
-        # GENERAL TEST
-        pattern = r"(?i)\bthe\p{P}"
-        if re.search(pattern, line):
-            # Here if possible issue.
-            #
-            # EXCEPTIONS
-            #
-            # NB Each regex below returns the pattern in a match
-            #    as group(0).
-            exceptions = []
-            # Ignore contexts such as "Will-o’-the-wisp"
-            exceptions.append(r"(?i)-the-")
-            # Ignore contexts such as "the’re", "the’ve"
-            exceptions.append(r"(?i)\bthe[’ve|’re]")
-            # Ignore "the," - checked below with a limit
-            exceptions.append(r"(?i)\bthe,")
-            # Generate dialog tuples only if not an exception.
-            heading = "Punctuation after 'the' (excluding exceptions)."
-            process_line_with_pattern(pattern, exceptions, line)
+def build_scanno_dictionary() -> Dict[str, int]:
+    """Builds a dictionary from a list of common misspelled words."""
 
-        # Check for comma after case-insensitive 'the'
-        pattern = r"(?i)\bthe,"
-        if re.search(pattern, line):
-            exceptions = []
-            heading = "Comma after 'the'."
-            process_line_with_pattern(pattern, exceptions, line)
-
-        # The following check for double punctuation consists of:
-        #
-        # GENERAL TEST
-        pattern = r",\.|,,|(?<!\.)\.\.(?!\.)"
-        if re.search(pattern, line):
-            # Here if possible issue.
-            #
-            # EXCEPTIONS
-            #
-            # NB Each regex below returns the pattern in a match
-            #    as group(0).
-            exceptions = []
-            # Ignore contexts such as 4-dot ellipsis
-            exceptions.append(r"(?i)etc\.{4}(?!\.)")
-            # Exclude sequences of " ... ", etc.
-            exceptions.append(r"(?<=\s|^)\.\.\.(?=\s|$)")
-            # Generate dialog tuples only if not an exception.
-            heading = "Query double punctuation (excluding exceptions)."
-            process_line_with_pattern(pattern, exceptions, line)
-
-        # The following check for period-comma consists of:
-        #
-        # GENERAL TEST
-        pattern = r"\.,"
-        if re.search(pattern, line):
-            exceptions = []
-            # Ignore contexts such as "etc.,", "&c.,"
-            exceptions.append(r"(?i)etc\.,")
-            exceptions.append(r"(?i)&c\.,")
-            # Generate dialog tuples only if not an exception.
-            heading = "Query period-comma (excluding exceptions)."
-            process_line_with_pattern(pattern, exceptions, line)
-
-        # Unexpected comma check. Commas should not occur after these words:
-        pattern = (
-            r"(?i)\bit’s,|\btheir,|\ban,|\ba,|\bour,|\bthat’s,|\bits,|\bwhose,|\bevery,"
-            r"|\bi’ll,|\byour,|\bmy,|\bmr,|\bmrs,|\bmss,|\bmssrs,|\bft,|\bpm,|\bst,|\bdr,|\brd,|\bpp,|\bcf,"
-            r"|\bjr,|\bsr,|\bvs,|\blb,|\blbs,|\bltd,|\bi’m,|\bduring,|\blet,|\btoward,|\bamong,"
-        )
-        # Generate dialog tuples for pattern, ignoring exceptions.
-        exceptions = []
-        heading = "Query unexpected comma after certain words."
-        process_line_with_pattern(pattern, exceptions, line)
-
-        # Unexpected period check. Periods should not occur after these words:
-        pattern = (
-            r"(?i)\bevery\.|\bi’m\.|\bduring\.|\bthat’s\.|\bthis’s\.|\btheir\.|\byour\.|\bour\.|\bmy\.|\bor\."
-            r"|\band\.|\bbut\.|\bas\.|\bif\.|\bits\.|\bit’s\.|\buntil\.|\bthan\.|\bwhether\.|\bi’ll\."
-            r"|\bwhose\.|\bwho\.|\bbecause\.|\bwhen\.|\blet\.|\btill\.|\bvery\.|\ban\.|\bamong\."
-            r"|\binto\.|\bwhom\.|\bhaving\.|\bthence\."
-        )
-        # Generate dialog tuples for pattern, ignoring exceptions.
-        exceptions = []
-        heading = "Query unexpected period after certain words."
-        process_line_with_pattern(pattern, exceptions, line)
-
-        ##
-        # The following series of checks operate on individual words
-        # on the line.
-        ##
-
-        # We already have a list of words for this line. Note that
-        # words are stripped of all punctuation except curly apostrophe.
-        # Thus &c. 1s. and 1d. on a line will appear as &c 1s and 1d
-        # in the list. Similarly "word" appears as word in the list but
-        # word’s has the apostrophe preserved and will appears as word’s
-        # in the list.
-
-        already_checked = []
-        for word in word_list_map_words[line_index]:
-            if word in already_checked:
-                # Word has occurred again on the line but it has
-                # already been reported on. Don't repeat reports.
-                continue
-
-            # Looks for mixed case within word but not if the word is in
-            # the good words list or occurs more than once in the book.
-            # Also allow "MacDonald", "McARTHUR", etc.
-            if word_list_map_count[word] == 1 and word not in project_dict.good_words:
-                if re.search(r".\p{Ll}+(?<!-)\p{Lu}", word) and not re.fullmatch(
-                    r"Ma?c\p{Uppercase_Letter}\p{Letter}+", word
-                ):
-                    # NB word occurs only once in the book and isn't in good_words.
-                    # Generate dialog tuples.
-                    heading = (
-                        "Mixed case in word (excluding words in project dictionary)."
-                    )
-                    process_word(word, [], line)
-
-            # Word start and word endings checks.
-
-            if len(word) > 2:
-                # Check word ending (last 2 characters).
-                last2 = word[len(word) - 2 :]
-                # The following pairs of characters are very rare at word end.
-                if (
-                    re.match(
-                        "cb|gb|pb|sb|tb|wh|fr|br|qu|tw|gl|fl|sw|gr|sl|cl|iy",
-                        last2,
-                        re.IGNORECASE,
-                    )
-                    and word not in project_dict.good_words
-                ):
-                    # Generate dialog tuples.
-                    heading = f"Query word ending with '{last2}' (excludes words in project dictionary)."
-                    process_word(word, [], line)
-
-                # Check word start (first 2 characters)
-                first2 = word[0:2]
-
-                # The following pairs of characters are very rare at start of word.
-                if (
-                    re.match("hr|hl|cb|sb|tb|wb|tl|tn|rn|lt|tj", first2, re.IGNORECASE)
-                    and word not in project_dict.good_words
-                ):
-                    # Generate dialog tuples.
-                    heading = f"Query word starting with '{first2}' (excludes words in project dictionary)."
-                    process_word(word, [], line)
-
-            # The following check for mixed letters/digits in word consists of:
-            #
-            # GENERAL TEST
-            pattern = r"\p{L}+\p{Nd}+|\p{Nd}+\p{L}+"
-            if re.search(pattern, word) and word.lower() not in (
-                "4to",
-                "8vo",
-                "12mo",
-                "16mo",
-            ):
-                # Here if possible issue.
-                #
-                # EXCEPTIONS
-                #
-                # NB Each regex below returns the pattern in a match
-                #    as group(0).
-                exceptions = []
-                # E.g. 191st
-                exceptions.append(r"(?i)\b(\p{Nd}*[02-9]1st|1st)\b")
-                # E.g. 282nd
-                exceptions.append(r"(?i)\b(\p{Nd}*[02-9]2nd|2nd)\b")
-                # E.g. 373rd
-                exceptions.append(r"(?i)\b(\p{Nd}*[02-9]3rd|3rd)\b")
-                # E.g. 373d
-                exceptions.append(r"(?i)\b\p{Nd}*[23]d\b")
-                # E.g. 65th
-                exceptions.append(r"(?i)\b\p{Nd}*[4567890]th\b")
-                # E.g. 511th, 212th, 13th
-                exceptions.append(r"(?i)\b\p{Nd}*1[123]th\b")
-                # Make exceptions of references to amounts in shillings
-                # and pence. E.g. £1 9s. 11d. Note that parsing a line
-                # into words strips punctuation except curly apostrophe
-                # so value of 'word' here would be '9s' & '11d'. Hence
-                # possibility of occasional false negatives.
-                if re.fullmatch(r"\p{Nd}{1,2}[sd]", word):
-                    exceptions.append(word)
-                # Generate dialog tuples only if not an exception.
-                heading = "Query mixed letters/digits in word (excluding exceptions)."
-                # NB 'heading' is accessed in the 'process_word' function
-                #    which is in same scope. flake8 complains about it.
-                process_word(word, exceptions, line)
-
-            # If the word occurs again on this line we will not
-            # repeat the checks.
-            already_checked.append(word)
-
-    # Done with specials checks. Report what, if anything, we've found.
-
-    # Produce dialog lines from the dialog MsgInfos generated by
-    # the checks above. The specials_report dictionary may be
-    # empty in which case there will be no dialog messages.
-    first_header = True
-    for header_line, msg_list in specials_report.items():
-        none_found = False
-        # Insert a blank line before each header except the first one.
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        # Add header record to dialog.
-        checker_dialog.add_header(header_line)
-        # Some checks have a limit for how many times to report
-        limit = (
-            report_limit
-            if header_line
-            in (
-                "Comma after 'the'.",
-                "Query period-comma (excluding exceptions).",
-                "Single '1' in a word or a standalone '1' (excluding exceptions).",
-            )
-            else 0
-        )
-        consolidate_messages(msg_list, limit=limit)
-
-    if none_found:
-        checker_dialog.add_footer("")
-        checker_dialog.add_footer("    No special situations reports.")
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# abandoned HTML tag check
-######################################################################
-
-
-def html_check() -> None:
-    """Abandoned HTML tag check."""
-
-    checker_dialog.add_header(
-        "----- Abandoned HTML tag check -------------------------------------------------"
-    )
-
-    # Courtesy limit if user uploads fpgen source, etc.
-    courtesy_limit = 5
-    abandoned_html_tag_count = 0
-    lines_with_html_tags = 0
-
-    regx = r"<(?=[!\/a-z]).*?(?<=[\"A-Za-z0-9\/]|-)>"
-    for line_number, line in enumerate(book, start=1):
-        if non_text_line(line):
-            continue
-        if re.search(regx, line):
-            # Generate a new dialog line for each tag on the line, keeping
-            # count of total tags found over all the lines reported.
-            abandoned_html_tag_count += report_all_occurrences_on_line(
-                regx, line, line_number
-            )
-            lines_with_html_tags += 1
-
-        # If abandoned_HTML_tag_count > courtesy_limit then it looks like we are
-        # not dealing with a plain text file after all. Flag this and report the
-        # number of HTML tags found so far then exit loop.
-
-        if abandoned_html_tag_count > courtesy_limit:
-            record = f"Source file not plain text: {lines_with_html_tags} book lines with {abandoned_html_tag_count} markup instances so far..."
-            checker_dialog.add_footer("", record, "...abandoning check.")
-            # Don't search any more book lines for HTML tags.
-            break
-
-    # All book lines scanned or scanning abandoned.
-    if abandoned_html_tag_count == 0:
-        checker_dialog.add_footer("", "    No abandoned HTML tags found.")
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# Unicode numeric character references check.
-######################################################################
-
-
-def unicode_numeric_character_check() -> None:
-    """Unicode numeric character references check."""
-
-    checker_dialog.add_header(
-        "----- Unicode numeric character references check -------------------------------"
-    )
-
-    # Courtesy limit if user uploads fpgen source, etc.
-    courtesy_limit = 5
-    numeric_char_reference_count = 0
-    lines_with_numeric_char_references = 0
-
-    regx = r"(&#[0-9]{1,5};|&#x[0-9a-fA-F]{1,4};)"
-    for line_number, line in enumerate(book, start=1):
-        if non_text_line(line):
-            continue
-        if re.search(regx, line):
-            # Generate a new dialog line for each match on the line, keeping
-            # count of number of character references encountered.
-            numeric_char_reference_count += report_all_occurrences_on_line(
-                regx, line, line_number
-            )
-            lines_with_numeric_char_references += 1
-
-        # If numeric_char_reference_count > courtesy_limit then it looks like we are
-        # not dealing with a plain text file afterall. Flag this and report the
-        # number of numeric character references found so far then exit loop.
-
-        if numeric_char_reference_count > courtesy_limit:
-            checker_dialog.add_entry("")
-            record = f"Source file not plain text: {lines_with_numeric_char_references} book lines with {numeric_char_reference_count} unicode numeric character references so far..."
-            checker_dialog.add_entry(record)
-            checker_dialog.add_entry("...abandoning check.")
-            # Don't search any more book lines for numeric character references.
-            break
-
-    # All book lines scanned.
-    if numeric_char_reference_count == 0:
-        checker_dialog.add_footer(
-            "", "    No unicode numeric character references found."
-        )
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# Scan book for two or more adjacent spaces on a line that
-# does not start with a space
-######################################################################
-
-
-def adjacent_spaces_check() -> None:
-    """Scans text of each book line for adjacent spaces."""
-
-    checker_dialog.add_header(
-        "----- Adjacent spaces check (poetry, block-quotes, etc., are ignored) ----------"
-    )
-
-    # If the line starts with one or more spaces (poetry, block-quotes, etc.,
-    # adjacent spaced will not be reported.
-
-    no_adjacent_spaces_found = True
-
-    for line_number, line in enumerate(book, start=1):
-        if non_text_line(line):
-            continue
-        #  Spaced poetry, block-quotes, etc., will fail the 'if' below.
-
-        # If adjacent spaces but no leading spaces then ...
-        if re.search(r"\s\s+?", line) and not re.search(r"^\s+?", line):
-            no_adjacent_spaces_found = False
-            # Generate a new dialog line for each match on the line.
-            report_multiple_occurrences_on_line(r"\s\s+", line, line_number)
-
-    # All book lines scanned.
-    if no_adjacent_spaces_found:
-        checker_dialog.add_footer("", "    No lines with adjacent spaces found.")
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-def double_dash_replace(matchobj: re.Match) -> str:
-    """Called to replace exactly 2 emdashes by 1 emdash.
-
-    Args:
-        matchobj: A regex match object.
-    """
-
-    return matchobj.group(1) + "—" + matchobj.group(2)
-
-
-def report_multiple_occurrences_on_line(
-    pattern: str, line: str, line_number: int, flags: int = 0
-) -> None:
-    """Report multiple occurrences in one message for this line.
-
-    Args:
-        pattern: A regex of the pattern to be matched and highlighted.
-        line: The string on which to match the pattern.
-        line_number: The line number of the line in the file.
-    """
-
-    matches = list(re.finditer(pattern, line, flags=flags))
-    if not matches:
-        return
-    # Get start/end of first/last error on line.
-    error_start = matches[0].start()
-    error_end = matches[-1].end()
-    # Add record to the dialog with prefix if repeated matches.
-    repeat_str = f"(x{len(matches)}) " if len(matches) > 1 else ""
-    checker_dialog.add_entry(
-        f"{repeat_str}{line}",
-        IndexRange(f"{line_number}.{error_start}", f"{line_number}.{error_end}"),
-        error_start + len(repeat_str),
-        error_end + len(repeat_str),
-    )
-
-
-def report_all_occurrences_on_line(pattern: str, line: str, line_number: int) -> int:
-    """Abstraction of dialog code that's used repeatedly for reporting.
-
-    Args:
-        pattern: A regex of the pattern to be matched and highlighted.
-        line: The string on which to match the pattern.
-        line_number: The line number of the line in the file.
-    """
-
-    count_of_matches = 0
-    for match_obj in re.finditer(pattern, line):
-        # Get start/end of error in file.
-        error_start = str(line_number) + "." + str(match_obj.start(0))
-        error_end = str(line_number) + "." + str(match_obj.end(0))
-        # Store in structure for file row/col positions & ranges.
-        start_rowcol = IndexRowCol(error_start)
-        end_rowcol = IndexRowCol(error_end)
-        # Highlight occurrence of word in the line.
-        hilite_start = match_obj.start(0)
-        hilite_end = match_obj.end(0)
-        # Add record to the dialog.
-        checker_dialog.add_entry(
-            line,
-            IndexRange(start_rowcol, end_rowcol),
-            hilite_start,
-            hilite_end,
-        )
-        count_of_matches += 1
-
-    return count_of_matches
-
-
-######################################################################
-# ellipses check
-######################################################################
-
-
-def ellipsis_check() -> None:
-    """Ellipses check."""
-
-    checker_dialog.add_header(
-        "----- Ellipsis check -----------------------------------------------------------"
-    )
-
-    # It checks for:
-    #
-    #    3-dot ellipses without a space or opening double quote before them
-    #    E.g. “... Him the Almighty Power
-    #    3-dot ellipses followed by full-stop and no trailing space
-    #      (AKA 4-dot ellipses)
-    #    2-dot ellipses
-    #    5-or-more-dot ellipses
-    #
-    # and highlights the suspect ellipsis.
-
-    # The comments and code below are a direct implementation in Python
-    # of code written in Go by Roger Franks (rfranks).
-
-    no_suspect_ellipsis_found = True
-
-    # Eliminate correct ellipsis then any sequence of two or more
-    # period ('.') characters left on line are highighted as suspect.
-
-    for line_number, line in enumerate(book, start=1):
-        if non_text_line(line):
-            continue
-        line_copy = line
-        # Obscure correct 4-dot ellipsis with space of same lenth.
-        line_copy = re.sub(r"(\p{L})(\.\.\.\.(?= |$))", r"\1    ", line_copy)
-        # Obscure correct 3-dot ellipsis with space of same lenth.
-        line_copy = re.sub(r"(?<= |“)\.\.\.(?= )", r"   ", line_copy)
-        # Any sequence of two or more period characters are suspect so
-        # highlight those sequences.
-        pattern = r"\.\.+"
-        # Find any remaining 'ellipsis' on edited line ...
-        if re.search(pattern, line_copy):
-            no_suspect_ellipsis_found = False
-            # Note we search line copy ...
-            for match_obj in re.finditer(pattern, line_copy):
-                # Get start/end of error in file.
-                error_start = str(line_number) + "." + str(match_obj.start(0))
-                error_end = str(line_number) + "." + str(match_obj.end(0))
-                # Store in structure for file row/col positions & ranges.
-                start_rowcol = IndexRowCol(error_start)
-                end_rowcol = IndexRowCol(error_end)
-                # Highlight occurrence of word in the line.
-                hilite_start = match_obj.start(0)
-                hilite_end = match_obj.end(0)
-                # ... but report original line when adding record to the dialog.
-                checker_dialog.add_entry(
-                    line,
-                    IndexRange(start_rowcol, end_rowcol),
-                    hilite_start,
-                    hilite_end,
-                )
-
-    if no_suspect_ellipsis_found:
-        checker_dialog.add_footer("", "    No suspect ellipsis found.")
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# curly quote check (positional, not using a state machine)
-######################################################################
-
-
-def curly_quote_check() -> None:
-    """Curly quote check."""
-
-    checker_dialog.add_header(
-        "----- Basic (positional) curly-quote check -------------------------------------"
-    )
-
-    # Report floating quotes - “” and ‘’ types.
-
-    first_match = True
-    no_suspect_curly_quote_found = True
-    pattern = r"""
-    # === Case A: Match “ ‘ ’ when spaced — always wrong ===
-    (?<=\ )[“‘’](?=\ )         |  # space on both sides
-    ^[“‘’](?=\ )               |  # start of line, space after
-    (?<=\ )[“‘’]$              |  # space before, end of line
-    # === Case B: Match ” unless ditto-style (2+ spaces or line start/end on BOTH sides) ===
-    (?<= (?<!\s)\s )”(?=\s+)   |  # Exactly one space before, 1+ spaces after
-    (?<=\s+)”(?= \s(?!\s) )    |  # 1+ spaces before, exactly one space after
-    ^”(?= \s(?!\s) )           |  # start of line, exactly one space after
-    (?<= (?<!\s)\s )”$            # exactly one space before, end of line    (
-    """
-
-    for line_number, line in enumerate(book, start=1):
-        if non_text_line(line):
-            continue
-        if re.search(pattern, line, flags=re.VERBOSE):
-            if first_match:
-                first_match = False
-                checker_dialog.add_header("floating quote (single or double)")
-            report_multiple_occurrences_on_line(
-                pattern, line, line_number, flags=re.VERBOSE
-            )
-            no_suspect_curly_quote_found = False
-
-    # Report 'wrong direction' quotes
-
-    first_match = True
-
-    for line_number, line in enumerate(book, start=1):
-        if non_text_line(line):
-            continue
-        # if |some text.“| or |some text‘| or |”some text|
-        pattern = r"(?<=[\.,;!?])[‘“]"
-        if re.search(pattern, line):
-            if first_match:
-                first_match = False
-                checker_dialog.add_header("quote direction")
-            report_all_occurrences_on_line(pattern, line, line_number)
-            no_suspect_curly_quote_found = False
-        pattern = r"(?<=\p{L})[\‘\“]"
-        if re.search(pattern, line):
-            if first_match:
-                first_match = False
-                checker_dialog.add_header("quote direction")
-            report_all_occurrences_on_line(pattern, line, line_number)
-            no_suspect_curly_quote_found = False
-        pattern = r"”(?=[\p{L}])"
-        if re.search(pattern, line):
-            if first_match:
-                first_match = False
-                checker_dialog.add_header("quote direction")
-            report_all_occurrences_on_line(pattern, line, line_number)
-            no_suspect_curly_quote_found = False
-
-    if no_suspect_curly_quote_found:
-        checker_dialog.add_footer("", "    No suspect curly quotes found.")
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# quote type checks
-######################################################################
-
-
-def file_analysis_check() -> None:
-    """Check for mixed straight/curly quotes & line lengths."""
-
-    checker_dialog.add_header(
-        "----- File analysis check -------------------------------------------------------",
-        "",
-    )
-
-    # Any straight single/double quotes?
-    if ssq > 0 or sdq > 0:
-        # Yep, so what about any curly single and double quotes?
-        if csq == 0 and cdq == 0:
-            checker_dialog.add_header("Only straight quotes found in this file.")
-        elif csq > 0 or cdq > 0:
-            checker_dialog.add_header(
-                "Both straight and curly quotes found in this file."
-            )
-    elif (ssq == 0 and sdq == 0) and (csq > 0 or cdq > 0):
-        checker_dialog.add_header("Only curly quotes found in this file.")
-    elif ssq == 0 and sdq == 0 and csq == 0 and cdq == 0:
-        checker_dialog.add_header(
-            "No single or double quotes of any type found in file - that is unusual."
-        )
-    checker_dialog.add_footer("")
-
-    if longest_line[1] > 0:
-        pos = maintext().rowcol(f"{longest_line[0]}.0")
-        checker_dialog.add_entry(
-            f"Longest line - {sing_plur(longest_line[1], 'character')}",
-            IndexRange(pos, pos),
-        )
-    if shortest_line[1] > 0:
-        pos = maintext().rowcol(f"{shortest_line[0]}.0")
-        checker_dialog.add_entry(
-            f"Shortest line - {sing_plur(shortest_line[1], 'character')}",
-            IndexRange(pos, pos),
-        )
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# dash review
-######################################################################
-
-
-def dash_review_check() -> None:
-    """Hyphen/dashes check."""
-
-    checker_dialog.add_header(
-        "----- Hyphen/dashes check (one or more present on line) ------------------------"
-    )
-
-    # The algorithm used below is adopted from the one Roger Franks uses in
-    # his Go version of PPTXT for the PPWB. It makes a copy of the book and
-    # runs multiple passes over the copy. The first set of passes protects
-    # what is allowed by removing them from line. The final pass categorises
-    # any dashes that remain and flags them in the report.
-
-    ####
-    # In the PPWB Go version of PPTXT, Roger qualifies and protects the following
-    # dash characters & sequences:
-    #    - hyphen-minus (keyboard "-")
-    #              allow these between two letters [\p{L}-\p{L}]
-    #              allow 8 or more of these as a separator [-{8,}]
-    #    ‐ hyphen
-    #              allow these between two letters [\p{L}‐\p{L}]
-    #              allow 8 or more of these as a separator [‐{8,}]
-    #    ‑ non-breaking hyphen
-    #              allow these between two letters [\p{L}‐\p{L}]
-    #    ‒ figure dash (i.e. to connect digits in a phone number)
-    #              allow these between two numbers [\p{Nd}‒\p{Nd}]
-    #    – en dash (to show a range of numbers)
-    #              allow these between two numbers \p{Nd}–\p{Nd}
-    #              allow these between two numbers \p{Nd}\s–\s\p{Nd}
-    #    — em dash
-    #              allow patterns:
-    #                   [\p{L}—\p{L}] between letters with no spacing
-    #                       My favorite food—pizza—originated in Italy.
-    #                       My granddaughter—Kenzie—plays volleyball.
-    #                   [\p{Ll}—\p{P}] between lower-case letter and punctuation
-    #                       “What if we—”
-    #                   \p{Ll}— \p{Lu} lower-case letter, en dash, space, upper-case letter
-    #                       If you tell him— Wait, I will give you this.
-    #
-    # These are dash characters that will be flagged if not in circumstances listed above:
-    #   - HYPHEN-MINUS
-    #   ‐ HYPHEN
-    #   ‑ NON-BREAKING HYPHEN
-    #   ‒ FIGURE DASH
-    #   – EN DASH
-    #   — EM DASH
-    #
-    # The following are among dash characters that will always be flagged:
-    #   ֊ ARMENIAN HYPHEN
-    #   ־ HEBREW PUNCTUATION MAQAF
-    #   ᐀ CANADIAN SYLLABICS HYPHEN
-    #        ᠆    MONGOLIAN TODO SOFT HYPHEN
-    #   ― HORIZONTAL BAR
-    #   ⸗ DOUBLE OBLIQUE HYPHEN
-    #   ⸚ HYPHEN WITH DIAERESIS
-    #   ⸺ TWO-EM DASH
-    #   ⸻ THREE-EM DASH
-    #   ⹀ DOUBLE HYPHEN
-    #   〜 WAVE DASH
-    #   〰 WAVY DASH
-    #   ゠ KATAKANA-HIRAGANA DOUBLE HYPHEN
-    #   ︱ PRESENTATION FORM FOR VERTICAL EM DASH
-    #   ︲ PRESENTATION FORM FOR VERTICAL EN DASH ﹘ SMALL EM DASH
-    #   ﹣ SMALL HYPHEN-MINUS
-    #   － FULLWIDTH HYPHEN-MINUS
-    ####
-
-    # INITIAL PASSES: protect what is allowed by overwriting lines in a copy of the book.
-
-    dbuf = book.copy()
-
-    # The dashes we recognise
-
-    ch_hm = "-"  # hyphen-minus
-    ch_hy = "‐"  # hyphen
-    ch_nb = "‑"  # non-breaking hyphen
-    ch_fd = "‒"  # figure dash
-    ch_en = "–"  # endash
-    ch_em = "—"  # emdash
-
-    # First pass allows em-dash to start a paragraph.
-    #
-    # The loop below assumes a paragraph starts after an empty line, which
-    # is generally the case, and goes through the book line by line looking
-    # for them.
-    #
-    # Deal with the special case of the first line of the file being the
-    # start of a paraqraph; i.e. it is not preceded by a blank line.
-
-    # line number = line_index + 1
-    line_index = 0
-    while line_index < len(dbuf) - 1:
-        if non_text_line(dbuf[line_index]):  # Ignore page separators, etc
-            line_index += 1
-            continue
-
-        # allow em-dash to start a paragraph.
-        if line_index == 0 and re.match(r"^\p{Zs}*—", dbuf[line_index]):
-            # Replace only one occurrence; i.e. the prefixing one.
-            dbuf[line_index] = dbuf[line_index].replace("—", "", 1)
-
-        else:
-            # General case. I.e. paragraphs preceded by an empty line OR
-            # the first line of the file contains text which does not
-            # start with an em-dash.
-            #
-            # The purpose of the loop is to obfuscate an em-dash if it
-            # appears at the start of a paragraph. NB em-dash can be
-            # separated from the left-margin by one or more Unicode
-            # space characters.
-
-            if dbuf[line_index] == "" and re.match(r"\p{Zs}*—", dbuf[line_index + 1]):
-                # Replace only one occurrence; i.e. the prefixing one.
-                dbuf[line_index + 1] = dbuf[line_index + 1].replace("—", "", 1)
-
-        line_index += 1
-
-    # Second pass.
-    #
-    # Go through the book line by line again and obfuscate valid occurrences
-    # of Unicode dash characters. This is the second of the initial passes.
-    #
-    # The order of execution of these replacements on a line is important!
-    reg1 = re.compile(r"—{8,}")
-    reg2 = re.compile(r"(?<=[ \p{L}])——(?!$|—)")
-    reg3 = re.compile(r"\p{L}-\p{L}")
-    reg4 = re.compile(r"\p{L}’-\p{L}")
-    reg5 = re.compile(r"\p{L}-’\p{L}")
-    reg6 = re.compile(r"(?<=\p{L}\.)-(?=\p{L})")
-    reg7 = re.compile(r"\p{L}‐\p{L}")  # U+2010 '‐'
-    reg8 = re.compile(r"-{8,}")
-    reg9 = re.compile(r"\p{L}-\p{L}")  # U+2011 '-'
-    reg10 = re.compile(r"\p{Nd}‒\p{Nd}")  # U+2012 '‒'
-    reg11 = re.compile(r"\p{Nd}–\p{Nd}")  # U+2013 '–'
-    reg12 = re.compile(r"\p{Nd}\s–\s\p{Nd}")
-    reg13 = re.compile(r"\p{L}—\p{L}")
-    reg14 = re.compile(r"[\p{Ll}I]—\p{P}")
-    reg15 = re.compile(r"[\._=+\)\]]—[\p{L}_=+\()]")
-    reg16 = re.compile(r"\p{Ll}— \p{Lu}")
-    reg17 = re.compile(r"—\s*$")
-    # line number = line_index + 1
-    line_index = 0
-    while line_index < len(dbuf):
-        if non_text_line(dbuf[line_index]):
-            line_index += 1
-            continue
-
-        line = dbuf[line_index].replace("_", "")
-
-        # em-dash when 8 or more act as a separator
-        line = reg1.sub("", line)
-        # deleted words E.g. "as soon as Mr. —— had left the ship"
-        line = reg2.sub(" QQ ", line)
-
-        # consider exactly two em-dashes as one - WHY?
-        # dbuf[line_index] = re.sub(
-        #     r"([^—])——([^—])", double_dash_replace, dbuf[line_index]
-        # )
-
-        # hyphen-minus between two letters. E.g:
-        # sand-hill
-        # Repeat to deal with lines like:
-        #   "pur-r-rta-a-a-tu-ur? I b’long to the Twenty-secun’ Nor’ Ka-a-a-li-i-na"
-        line = reg3.sub("QQ", line)
-        line = reg3.sub("QQ", line)
-        # Repeat to deal with lines like:
-        #   "frien’-o’-mine", etc.
-        line = reg4.sub("QQ", line)
-        line = reg4.sub("QQ", line)
-        # Repeat to deal with lines like:
-        #   "by-’n-by", etc.
-        line = reg5.sub("QQ", line)
-        line = reg5.sub("QQ", line)
-        # Hyphen-minus in Lieut.-Governor, etc.
-        line = reg6.sub("QQ", line)
-        # Hyphen between two letters
-        line = reg7.sub("QQ", line)
-        line = reg7.sub("QQ", line)
-        # hyphen-minus when 8 or more act as a separator
-        line = reg8.sub("", line)
-        # non-breaking hyphen between two letters
-        line = reg9.sub("", line)
-        # figure dash between two digits
-        line = reg10.sub("", line)
-        # en-dash between two digits
-        line = reg11.sub("", line)
-        # en-dash with spaces between two digits
-        line = reg12.sub("", line)
-        # em-dash between letters with no spacing
-        line = reg13.sub("", line)
-        # em-dash between lower-case letter or 'I' and punctuation
-        line = reg14.sub("", line)
-        # em-dash between period or markup and letter
-        line = reg15.sub("", line)
-        # lower-case letter, em-dash, space, upper-case letter
-        line = reg16.sub("", line)
-        # em-dash should not end a line - may be exceptions
-        line = reg17.sub("", line)
-
-        dbuf[line_index] = line
-        line_index += 1
-
-    # FINAL PASS: flag what remains.
-
-    a_h2 = []
-    a_h4 = []
-    a_hh = []
-    a_hm = []
-    a_hy = []
-    a_nb = []
-    a_fd = []
-    a_en = []
-    a_em = []
-    a_un = []
-
-    dash_suspects_found = False
-    line_index = 0
-    counth2 = 0
-    counth4 = 0
-
-    reg18 = re.compile(r"\p{Pd}")
-    reg19 = re.compile(r"(?<!-)--(?!-)")
-    reg20 = re.compile(r"(?<!-)----(?!-)")
-    reg21 = re.compile(
-        r"\p{Pd}\p{Pd}+",
-    )
-    reg22 = re.compile(r"\p{Pd}")
-    while line_index < len(dbuf):
-        if non_text_line(dbuf[line_index]):  # Ignore page separators, etc
-            line_index += 1
-            continue
-
-        line = dbuf[line_index]
-
-        # Does line contain any dashes?
-        if reg18.search(line):
-            # Line has dashes so generate output records to flag
-            # each type of invalid dash types found.
-
-            dash_suspects_found = True
-            not_consecutive_dashes = True
-
-            # Look for pairs of hyphen-minus (keyboard "-") possibly being
-            # used in place of em-dash. We will check and flag this later.
-            if reg19.search(line):
-                resall = reg19.findall(line)
-                counth2 += len(resall)
-                a_h2.append((line_index + 1, book[line_index]))
-                # Delete all the pairs just found.
-                line = reg19.sub("", line)
-            # Look for quads of hyphen-minus (keyboard "-") possibly being
-            # used in place of long em-dash. We will check and flag this later.
-            if reg20.search(line):
-                resall = reg20.findall(line)
-                counth4 += len(resall)
-                a_h4.append((line_index + 1, book[line_index]))
-                # Delete all the quads just found.
-                line = reg20.sub("", line)
-            # Look for other consecutive dashes (of any kind).
-            if reg21.search(line):
-                a_hh.append((line_index + 1, book[line_index]))
-                # Delete consecutive dashes just found. Any left at final test are 'unrecognised'.
-                line = reg21.sub("", line)
-                not_consecutive_dashes = False
-            # Look for hyphen-minus
-            if ch_hm in line and not_consecutive_dashes:
-                a_hm.append((line_index + 1, book[line_index]))
-                # Delete dash(es) just found. Any left at final test is 'unrecognised'.
-                line = line.replace(ch_hm, "")
-            # Look for hyphen
-            if ch_hy in line:
-                a_hy.append((line_index + 1, book[line_index]))
-                # Delete dash(es) just found. Any left at final test is 'unrcognised'.
-                line = line.replace(ch_hy, "")
-            # Look for non-breaking hyphen
-            if ch_nb in line:
-                a_nb.append((line_index + 1, book[line_index]))
-                # Delete dash(es) just found. Any left at final test is 'unrecognised'.
-                line = line.replace(ch_nb, "")
-            # Look for figure dash
-            if ch_fd in line:
-                a_fd.append((line_index + 1, book[line_index]))
-                # Delete dash(es) just found. Any left at final test is 'unrecognised'.
-                line = line.replace(ch_fd, "")
-            # Look for endash
-            if ch_en in line:
-                a_en.append((line_index + 1, book[line_index]))
-                # Delete dash(es) just found. Any left at final test is 'unrecognised'.
-                line = line.replace(ch_en, "")
-            # Look for emdash
-            if ch_em in line:
-                a_em.append((line_index + 1, book[line_index]))
-                # Delete dash(es) just found. Any left at final test is 'unrecognised'.
-                line = line.replace(ch_em, "")
-            # If any dashes left on line at this point treat them as unrecognised
-            if reg22.search(line):
-                a_un.append((line_index + 1, book[line_index]))
-
-        line_index += 1
-
-    # Generate dialog entries about remaining entries.
-
-    first_header = True
-
-    # If many pairs of "--" detected report only the first five.
-
-    if len(a_h2) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header("'--' (keyboard '-') found")
-
-        count = 0
-        for record in a_h2:
-            line_number = record[0]
-            line = record[1]
-
-            if count < 5:
-                report_all_occurrences_on_line(r"(?<!-)--(?!-)", line, line_number)
-            count += 1
-        if count > 5:
-            if len(a_h2) - 5 == 1:
-                output_record = "  ...1 more line"
-            else:
-                output_record = f"  ...{len(a_h2) - 5} more lines"
-            checker_dialog.add_footer(output_record)
-        if counth2 > 5:
-            checker_dialog.add_footer(
-                "",
-                "    [Book seems to use '--' as em-dash so not reporting these further]",
-            )
-
-    # If many pairs of "----" detected report only the first five.
-
-    if len(a_h4) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header("'----' (keyboard '-') found")
-
-        count = 0
-        for record in a_h4:
-            line_number = record[0]
-            line = record[1]
-
-            if count < 5:
-                report_all_occurrences_on_line(r"(?<!-)----(?!-)", line, line_number)
-            count += 1
-        if count > 5:
-            if len(a_h4) - 5 == 1:
-                output_record = "  ...1 more line"
-            else:
-                output_record = f"  ...{len(a_h4) - 5} more lines"
-            checker_dialog.add_footer(output_record)
-        if counth4 > 5:
-            checker_dialog.add_footer(
-                "",
-                "    [Book seems to use '----' as long em-dash so not reporting these further]",
-            )
-
-    # Report other consecutive dashes
-
-    if len(a_hh) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header(
-            "Adjacent dashes (expected at least 8 emdash or keyboard '-' as a separator)"
-        )
-
-        for record in a_hh:
-            line_number = record[0]
-            line = record[1]
-            report_multiple_occurrences_on_line(r"(\p{Pd}\p{Pd}+)", line, line_number)
-
-    # Report hyphen-minus
-
-    if len(a_hm) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header("Hyphen-minus (single keyboard '-')")
-        for record in a_hm:
-            line_number = record[0]
-            line = record[1]
-            pattern = r"(?<![\p{Pd}\p{L}])-(?![\p{Pd}\p{L}])"
-            report_all_occurrences_on_line(pattern, line, line_number)
-
-    # Report hyphen
-
-    if len(a_hy) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header("Hyphen")
-        for record in a_hy:
-            line_number = record[0]
-            line = record[1]
-            report_all_occurrences_on_line(ch_hy, line, line_number)
-
-    # Report non-breaking hyphen
-
-    if len(a_nb) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header("Non-breaking hyphen")
-        for record in a_nb:
-            line_number = record[0]
-            line = record[1]
-            report_all_occurrences_on_line(ch_nb, line, line_number)
-
-    # Report figure dash
-
-    if len(a_fd) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header("Figure dash")
-        for record in a_fd:
-            line_number = record[0]
-            line = record[1]
-            report_all_occurrences_on_line(ch_fd, line, line_number)
-
-    # Report en-dash
-
-    if len(a_en) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header("En-dash")
-        for record in a_en:
-            line_number = record[0]
-            line = record[1]
-            report_all_occurrences_on_line(ch_en, line, line_number)
-
-    # Report em-dash
-
-    if len(a_em) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header("Em-dash")
-        for record in a_em:
-            line_number = record[0]
-            line = record[1]
-            report_all_occurrences_on_line(ch_em, line, line_number)
-
-    # Report unrecognised dash
-
-    if len(a_un) > 0:
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        checker_dialog.add_header("Unrecognised dash")
-        for record in a_un:
-            line_number = record[0]
-            line = record[1]
-            report_all_occurrences_on_line(r"\p{Pd}", line, line_number)
-
-    # All book lines scanned.
-    if not dash_suspects_found:
-        checker_dialog.add_footer("", "    No dash suspects found.")
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# scanno check
-######################################################################
-
-
-def scanno_check() -> None:
-    """Checks the 'words' on a line against a long list
-    of commonly misspelled words."""
-
-    checker_dialog.add_header(
-        "----- Scannos check ------------------------------------------------------------"
-    )
-
-    scanno_dictionary = build_scanno_dictionary()
-    scanno_outrecs: Dict[str, list[tuple]] = {}
-    no_scannos_found = True
-
-    for line_index, line in enumerate(book):
-        if non_text_line(line):
-            continue
-
-        # We have the list of words on the line already in the
-        # array 'word_list_map_words]'. It is indexed from zero.
-        word_list = word_list_map_words[line_index]
-        previously_found_on_this_line = []
-
-        # Look for scannos among the words on this line.
-        for word in word_list:
-            word_lc = word.lower()
-            if (word_lc in scanno_dictionary) and (
-                word_lc not in previously_found_on_this_line
-            ):
-                # word on line is a scanno and we haven't seen it before on the line.
-                no_scannos_found = False
-                # We only want to create a tuple here for the first instance
-                # of a scanno on this line, ignoring case. When we use the
-                # tuples below to add dialog records, we will also find and
-                # report to the dialog other instances of the same scanno on
-                # this line.
-                previously_found_on_this_line.append(word_lc)
-                # Add to list of tuples from which dialog entries
-                # will be generated later.
-                if word_lc not in scanno_outrecs:
-                    scanno_outrecs[word_lc] = [(line_index + 1, line)]
-                else:
-                    scanno_outrecs[word_lc].append((line_index + 1, line))
-
-    # We're done looking for scannos on each line. Report what we found.
-    # NB 'scanno_outrecs' is a dictionary. The keys are a scanno and the
-    #    value is a list of tuples: [(line number, line text), ...]
-
-    first_header = True
-    for scanno, tple_list in scanno_outrecs.items():
-        # The value of each scanno key in scanno_outrecs dictionary
-        # is a list of tuples: (line_number, line). For a given scanno
-        # only one instance of it on a line has been noted in a tuple.
-        # Find and add to dialog other instances that may also be on
-        # the line.
-
-        if first_header:
-            first_header = False
-        else:
-            checker_dialog.add_header("")
-        # Header is the scanno.
-        checker_dialog.add_header(scanno)
-
-        for cnt, tple in enumerate(tple_list):
-            if cnt >= report_limit:
-                checker_dialog.add_footer("  ...more")
-                break
-
-            line_number = tple[0]
-            line = tple[1]
-
-            # We know that scanno appears at least once on line; it may
-            # be repeated, possibly in a different case.
-            # Get all occurrences of scanno on line and report them.
-
-            regx = r"(?<!\p{L}|\p{Nd})" + scanno + r"(?!\p{L}|\p{Nd})"
-            match_list = list(re.finditer(regx, line, re.IGNORECASE))
-            if not match_list:
-                continue
-            multiplier = f"(x{len(match_list)}) " if len(match_list) > 1 else ""
-            # Get start/end of all errors on line.
-            start_rowcol = IndexRowCol(line_number, match_list[0].start(0))
-            end_rowcol = IndexRowCol(line_number, match_list[-1].end(0))
-            # Highlight occurrence of word in the line.
-            hilite_start = match_list[0].start(0) + len(multiplier)
-            hilite_end = match_list[-1].end(0) + len(multiplier)
-            # Add record to the dialog.
-            checker_dialog.add_entry(
-                f"{multiplier}{line}",
-                IndexRange(start_rowcol, end_rowcol),
-                hilite_start,
-                hilite_end,
-            )
-
-    if no_scannos_found:
-        checker_dialog.add_footer("")
-        checker_dialog.add_footer("    No scannos found.")
-
-    # Add line spacer at end of this checker section.
-    checker_dialog.add_footer("")
-
-
-######################################################################
-# build dictionary used by scannos check
-######################################################################
-
-
-def build_scanno_dictionary() -> Dict[str, int]:
-    """Builds a dictionary from a list of common misspelled words."""
-
-    # List of common scannos. Add additions to end of the list.
-    # Duplicates will be dealt with when building the dictionary.
+    # List of common scannos. Add additions to end of the list.
+    # Duplicates will be dealt with when building the dictionary.
 
     # fmt: off
     scannos_misspelled = [
@@ -2729,153 +570,2342 @@ def build_scanno_dictionary() -> Dict[str, int]:
     ]
     # fmt: on
 
-    # Build scanno dictionary. All words made lower case.
+    # Build scanno dictionary. All words made lower case.
+
+    scanno_dictionary = {}
+    for entry in scannos_misspelled:
+        scoword = entry.lower()
+        # Deal with duplicates.
+        if scoword in scanno_dictionary:
+            continue
+        scanno_dictionary[scoword] = 0
+
+    return scanno_dictionary
+
+
+class PPtxtAnalysis:
+    """Analysis of a snapshot of the file's text, used by the PPtxt checks.
+
+    Each check is a method that adds its messages to `report`. Checks only
+    read the analysis, so they are independent of each other and of the
+    main text widget.
+    """
+
+    def __init__(
+        self, text: str, project_dict: ProjectDict, verbose: bool = False
+    ) -> None:
+        """Initialize PPtxtAnalysis by analysing the given text.
+
+        Args:
+            text: Text of whole file.
+            project_dict: Project dictionary, used to find good words.
+            verbose: True to report every occurrence of some issues.
+        """
+        # Max number of times to report same issue for some checks
+        self.report_limit = 999999 if verbose else 5
+        self.project_dict = project_dict
+        self.report = CheckerReport()
+        self.found_long_doctype_declaration = False
+
+        # Get book lines, list of words on line and word frequency.
+
+        self.book: list[str] = []
+        self.word_list_map_words: list[list[str]] = []
+        self.word_list_map_count: dict[str, int] = {}
+        self.word_list_map_lines: dict[str, list[int]] = {}
+
+        # Counters for each quote type
+        self.ssq = 0
+        self.sdq = 0
+        self.csq = 0
+        self.cdq = 0
+        self.longest_line = (0, 0)
+        self.shortest_line = (0, 9999)
+
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            line = line.rstrip("\r\n")
+
+            self.book.append(line)
+
+            if non_text_line(line):
+                self.word_list_map_words.append(
+                    []
+                )  # Needs to correspond to lines, even when ignored
+                continue
+
+            line_length = len(line)
+            if line_length > self.longest_line[1]:
+                self.longest_line = (line_number, line_length)
+            if 0 < line_length < self.shortest_line[1]:
+                self.shortest_line = (line_number, line_length)
+
+            # Note types of single/double quotes if present. They are
+            # not being counted here, only their presence in the file.
+            if "'" in line:
+                self.ssq += 1
+            if '"' in line:
+                self.sdq += 1
+            if re.search(r"[‘’]", line):
+                self.csq += 1
+            if re.search(r"[“”]", line):
+                self.cdq += 1
+
+            # Build a list, 'self.word_list_map_words', whose entries are themselves
+            # a list of words on each line. It is indexed from zero and
+            # will have as many entries as there are lines in the self.book.
+
+            # Build a dictionary, 'self.word_list_map_count', of words in the self.book
+            # and their frequency.
+
+            # Build a dictionary, 'self.word_list_map_lines', whose key is a word
+            # and its value a list of integer line numbers on which that word
+            # appears.
+
+            # Collect a dictionary of hyphenated words as well.
+
+            wol = self.get_words_on_line(line)
+            self.word_list_map_words.append(wol)
+            for word in wol:
+                if word in self.word_list_map_count:
+                    self.word_list_map_count[word] += 1
+                else:
+                    self.word_list_map_count[word] = 1
+
+                if word in self.word_list_map_lines:
+                    self.word_list_map_lines[word].append(line_number)
+                else:
+                    self.word_list_map_lines[word] = [line_number]
+
+    def run_check(self, check_name: str) -> CheckerReport:
+        """Run one check on the analysis.
+
+        Args:
+            check_name: Name of check method, e.g. "spacing_check".
+
+        Returns:
+            Report containing the messages output by the check.
+        """
+        self.report = CheckerReport()
+        getattr(self, check_name)()
+        return self.report
+
+    def get_words_on_line(self, line: str) -> list[str]:
+        """Extract all the words on one line."""
+
+        # Words may be surrounded by abandoned HTML tags, HTML entities,
+        # Unicode numeric character references, etc. Remove these from
+        # the line first of all so the word-types we want to record are
+        # easier to identify.
+
+        # A document starting with a "<!DOCTYPE>" declaration is assumed
+        # to be an HTML file. We have to treat this HTML declaration
+        # specially as it may overflow onto a second line in the case of
+        # older documents (HTML 4 or XHTML). Check for this using the
+        # variable 'found_long_doctype_declaration' which needs to exist
+        # between calls of this function.
+
+        if self.found_long_doctype_declaration:
+            # Second line of a long <!DOCTYPE> declaration. Toss this 2nd line.
+            self.found_long_doctype_declaration = False
+            return []
+
+        if re1.search(line, re.IGNORECASE) and ">" not in line:
+            # Looks like a two-line <!DOCTYPE declaration. Toss this 1st line.
+            # and set flag to toss the 2nd line too.
+            self.found_long_doctype_declaration = True
+            return []
+
+        # A short HTML 5 <!DOCTYPE> declaration will not be detected
+        # by the above tests. However it will be detected as an HTML
+        # tag next and removed from line.
+        line = re2.sub(" ", line)
+
+        # &amp; &#1234;, etc. (&[a-z0-9#]+?;)
+        # Replace HTML entities (e.g. &amp;) and numeric character references
+        # (&#8212, &#x2014) with a space.
+        line = re3.sub(" ", line)
+
+        # Protect '&' in other tokens starting with '&'.
+        # Order of subs below important.
+        line = re4.sub(r"⑦\1⑤", line)
+        line = re5.sub(r"⑦\1", line)
+
+        # Replace 1/2-style fractions with space.
+        line = re6.sub(" ", line)
+
+        # Replace [99], [99a], etc., footnote anchors.
+        line = re7.sub(" ", line)
+
+        # Remove italic markup (_). Need to consider a two-line italic string.
+        # _blah123... or _"blah123...
+        line = re8.sub(r"\1", line)
+        # ...blah_ or ...blah._ or ...blah"_ or ...blah."_, etc.
+        line = re9.sub(r"\1", line)
+
+        # Protect other special cases by masking them temporarily:
+        # E.g.
+        # high-flying, hasn’t, ’tis, Househ^d
+        # all stay intact
+        # Capitalisation is retained.
+        # Additionally, an emdash separating words in, for
+        # example, the ToC is replaced by a space.
+
+        # Need these twice to handle alternates
+        # E.g. fo’c’s’le
+
+        # Newcastle-upon-Tyne
+        line = re10.sub(r"\1①\2", line)
+        line = re11.sub(r"\1①\2", line)
+        # paring- or -in (hyphen followed/preceded by whitespace)
+        line = re12.sub(r"\1①\2", line)
+        line = re13.sub(r"\1①\2", line)
+        # fo’c’s’le
+        line = re14.sub(r"\1②\2", line)
+        line = re15.sub(r"\1②\2", line)
+        # House^d
+        line = re16.sub(r"\1⑥\2", line)
+        # loupin’-on, frien’-o’-mine
+        line = re17.sub(r"\1②①", line)
+        # by-’n-by
+        line = re18.sub(r"\1①②\2", line)
+        # by ’n by
+        line = re19.sub(r"②\1", line)
+        # ’tis at start of line
+        line = re20.sub(r"②\1", line)
+        # ’tis prefxed by a space
+        line = re21.sub(r" ②\1", line)
+        # Peep o’ Day (?<=^| )(\p{L})’(?=$| )
+        line = re22.sub(r"\1②", line)
+        # Lieut.-Col. (\p{L})\.\-(\p{L})
+        line = re23.sub(r"\1⑤①\2", line)
+
+        # If user is using "--" in place of emdash convert
+        # that to a space so it can be a word separator.
+
+        line = re24.sub(" ", line)
+
+        # Replace all characters with " " other than letters, digits
+        # and protected characters. Note that ①, ①, ... are 'numeric'
+        # characters and are matched by \p{N}.
+
+        line = re25.sub(" ", line)
+
+        # Restore protected characters
+
+        line = re26.sub(r"-", line)
+        line = re27.sub(r"’", line)
+        line = re28.sub(r".", line)
+        line = re29.sub(r"^", line)
+        line = re30.sub(r"&", line)
+
+        # Create a list of whole words from the line.
+
+        line_list = line.split()
+
+        return line_list
+
+    ######################################################################
+    # blank line spacing check
+    ######################################################################
+
+    def spacing_check(self) -> None:
+        """Blank line spacing check that flags other than 4121, 421 or 411 spacing."""
+
+        self.report.add_header(
+            "----- Paragraph spacing check - expecting 4121, 421 or 411 spacing -------------"
+        )
+
+        # This routine does not use the line text at all. It is only concerned with
+        # counting blank lines between paragraphs and other blocks/lines of text
+        # looking for anomolous numbers of blank lines.
+        #
+        # It expects to see irregular line spacing (e.g. in title page, etc.)
+        # until the first 4-line space is encountered. If no 4-line space is
+        # found there will be no spacing counts output to the report. However
+        # a warning message about this unusual situation is output.
+
+        # Initialise, counters, flags, etc.
+        bl_cnt = 0
+        prev_line_was_bl = False
+        prev_bl_cnt = 0
+        bl_spacing_issues = []
+        four_line_spacing_found = False
+        no_other_spacing_issues = False
+
+        for line_number, line in enumerate(self.book, start=1):
+            if non_text_line(line):
+                continue
+            blank_line = re.match(r"^ *$", line)
+            if blank_line:
+                # Blank line.
+                bl_cnt += 1
+                prev_line_was_bl = True
+            elif not blank_line and prev_line_was_bl:
+                if bl_cnt == 3 or bl_cnt > 4:
+                    # i.e. 5..131.., 4..151.., etc, spacing.
+                    bl_spacing_issues.append((bl_cnt, line_number))
+                elif bl_cnt == 4:
+                    four_line_spacing_found = True
+                    no_other_spacing_issues = True
+                elif bl_cnt == 2:
+                    if prev_bl_cnt == 2:
+                        # i.e. 4..1221..., etc, spacing.
+                        bl_spacing_issues.append((bl_cnt, line_number))
+                prev_bl_cnt = bl_cnt
+                bl_cnt = 0
+                prev_line_was_bl = False
+
+        # Output to dialog any line spacing issues found. We have a list
+        # of issue tuples: (int: spacing count, int: line number)
+
+        for issue in bl_spacing_issues:
+            no_other_spacing_issues = False
+            # First value in an issue tuple is queried line spacing count.
+            if issue[0] == 2:
+                # Repeated 2-line spacing between paragraphs.
+                error_text = "End point of repeated 2-line spacing."
+
+                # There is no error as such on line in file. It is simply
+                # the line that starts a paragraph after the queried blank
+                # line spacing. Use the line_num.line_col string for start
+                # of this line as the 'error' since that's what is highlighted
+                # in the dialog text. It means the first few characters at the
+                # start of the file line are selected when dialog message clicked.
+
+                line_num = str(issue[1])
+                line_col = str(0)
+                error_start = line_num + "." + line_col
+                error_end = line_num + "." + str(len(error_start))
+                # Store in new structures for file row/col positions and ranges.
+                start_rowcol = IndexRowCol(error_start)
+                end_rowcol = IndexRowCol(error_end)
+                # Build record to add to dialog.
+                record = error_text
+                # Add record to dialog. No highlighting.
+                self.report.add_entry(record, IndexRange(start_rowcol, end_rowcol))
+            else:
+                # Here for line count issues other than repeated 2-line spacing.
+                error_text = f"End point of unexpected {issue[0]}-line spacing."
+
+                # See comment above.
+
+                line_num = str(issue[1])
+                line_col = str(0)
+                error_start = line_num + "." + line_col
+                error_end = line_num + "." + str(len(error_start))
+                # Store in new structures for file row/col positions and ranges.
+                start_rowcol = IndexRowCol(error_start)
+                end_rowcol = IndexRowCol(error_end)
+                # Build record to add to dialog.
+                record = error_text
+                # Add error msg to dialog. No highlighting.
+                self.report.add_entry(record, IndexRange(start_rowcol, end_rowcol))
+
+        if not four_line_spacing_found:
+            self.report.add_footer(
+                "", "    No 4-line spacing found in book - that is unusual."
+            )
+        elif no_other_spacing_issues:
+            self.report.add_footer(
+                "",
+                "    Book appears to conform to DP paragraph/block spacing standards.",
+            )
+
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+    ######################################################################
+    # repeated words check
+    ######################################################################
+
+    def repeated_words_check(self) -> None:
+        """Repeated words check."""
+
+        self.report.add_header(
+            "----- Repeated words check - can be last word on a line and first on next ------"
+        )
+
+        # METHOD
+        #
+        # Makes a single pass over the whole text with a regex that matches a word
+        # followed by the same word, separated only by spaces, or by a line break
+        # with optional spaces either side. Matches may overlap, so that all pairs
+        # in, say, "the the the" are found.
+        #
+        # The second word may be followed by an apostrophe, hyphen, etc., e.g.
+        # "Jackey Jackey's", but must not just be the start of a longer word,
+        # e.g. "he had haddock". Punctuation between the words, as in "that's
+        # very, very true", stops them being a repeat. All-digit "words" and
+        # page separators, etc., are ignored.
+
+        repeat_msg: list[MsgInfo] = []
+
+        text = "\n".join(self.book)
+        line_starts = [0]
+        for book_line in self.book:
+            line_starts.append(line_starts[-1] + len(book_line) + 1)
+
+        for match in repeated_words_regex.finditer(text, overlapped=True):
+            if number_regex.fullmatch(match[1]):
+                continue
+            rec_num = bisect.bisect_right(line_starts, match.start()) - 1
+            if non_text_line(self.book[rec_num]):
+                continue
+            # Get start/end of the repeated words in file and dialog message.
+            hilite_start = match.start() - line_starts[rec_num]
+            start_rowcol = IndexRowCol(rec_num + 1, hilite_start)
+            if "\n" in match[2]:
+                # Second repeated word is on next line, so show both lines
+                # and highlight to the end of the message.
+                record = f"{self.book[rec_num]}\n{self.book[rec_num + 1]}"
+                end_rowcol = IndexRowCol(
+                    rec_num + 2, match.end() - line_starts[rec_num + 1]
+                )
+                hilite_end = len(record)
+            else:
+                record = self.book[rec_num]
+                end_rowcol = IndexRowCol(
+                    rec_num + 1, match.end() - line_starts[rec_num]
+                )
+                hilite_end = end_rowcol.col
+            repeat_msg.append(
+                MsgInfo(
+                    record,
+                    IndexRange(start_rowcol, end_rowcol),
+                    hilite_start,
+                    hilite_end,
+                )
+            )
+
+        # Only output the message if it's on a different line or a different word to the previous
+        if repeat_msg:
+            self.consolidate_messages(repeat_msg)
+        else:
+            self.report.add_footer("", "    No repeated words found.")
+
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+    def consolidate_messages(self, repeat_msg: list[MsgInfo], limit: int = 0) -> None:
+        """Consolidate messages.
+
+        Args:
+            repeat_msg: List of messages to be consolidated.
+            limit: If > 0, limit number of messages output.
+        """
+        prev_msg_info = None
+        build_msg = None
+        n_matches = 0
+        n_messages = 0
+        for msg_info in repeat_msg:
+            # If this message doesn't match previous message, ignoring multiple spaces...
+            if (
+                prev_msg_info is None
+                or msg_info.text_range.start.row != prev_msg_info.text_range.start.row
+                or msg_info.msg != prev_msg_info.msg
+                or re.sub(
+                    "  +",
+                    " ",
+                    msg_info.msg[msg_info.hilite_start : msg_info.hilite_end],
+                )
+                != re.sub(
+                    "  +",
+                    " ",
+                    prev_msg_info.msg[
+                        prev_msg_info.hilite_start : prev_msg_info.hilite_end
+                    ],
+                )
+            ):
+                # Output any combined message we've previously built up
+                if build_msg is not None:
+                    # No more than 5 of any type unless verbose
+                    n_messages += 1
+                    if limit > 0 and n_messages >= limit + 1:
+                        if n_messages == limit + 1:
+                            self.report.add_footer("  ...more")
+                        continue
+
+                    repeat_str = f"(x{n_matches}) " if n_matches > 1 else ""
+                    self.report.add_entry(
+                        f"{repeat_str}{build_msg.msg}",
+                        build_msg.text_range,
+                        build_msg.hilite_start + len(repeat_str),
+                        build_msg.hilite_end + len(repeat_str),
+                    )
+                # Start a new build message
+                build_msg = MsgInfo(
+                    msg_info.msg,
+                    msg_info.text_range,
+                    msg_info.hilite_start,
+                    msg_info.hilite_end,
+                )
+                n_matches = 1
+            else:
+                # "Duplicate" message - amend build message to cover whole relevant range
+                assert build_msg is not None
+                build_msg.text_range.end = msg_info.text_range.end
+                build_msg.hilite_end = msg_info.hilite_end
+                n_matches += 1
+            prev_msg_info = msg_info
+        # Output last message
+        if build_msg is not None:
+            n_messages += 1
+            if limit > 0 and n_messages >= limit + 1:
+                if n_messages == limit + 1:
+                    self.report.add_footer("  ...more")
+            else:
+                repeat_str = f"(x{n_matches}) " if n_matches > 1 else ""
+                self.report.add_entry(
+                    f"{repeat_str}{build_msg.msg}",
+                    build_msg.text_range,
+                    build_msg.hilite_start + len(repeat_str),
+                    build_msg.hilite_end + len(repeat_str),
+                )
+
+    ######################################################################
+    # hyphenated/non-hyphenated words check
+    ######################################################################
+
+    def hyphenated_words_check(self) -> None:
+        """Repeated words check."""
+
+        self.report.add_header(
+            "----- Hyphenated/non-hyphenated words check ------------------------------------"
+        )
+
+        first_header = True
+        none_found = True
+
+        for word in self.word_list_map_count:
+            if re.search(r"-", word):
+                word_with_hyphen = word
+                # Hyphenated word found. Make a non-hyphenated version.
+                word_with_no_hyphen = re.sub("-", "", word_with_hyphen)
+                if word_with_no_hyphen in self.word_list_map_count:
+                    # Here when hyphenated and non-hyphenated version of a word.
+                    none_found = False
+                    word_count_with_no_hyphen = self.word_list_map_count[
+                        word_with_no_hyphen
+                    ]
+                    word_count_with_hyphen = self.word_list_map_count[word_with_hyphen]
+                    # Make a header with this info and output it to dialog.
+                    # E.g. "sandhill (1) <-> sand-hill (3)".
+                    record = f"{word_with_no_hyphen} ({word_count_with_no_hyphen}) <-> {word_with_hyphen} ({word_count_with_hyphen})"
+                    # Insert a blank line before each header except the first one.
+                    if first_header:
+                        first_header = False
+                    else:
+                        self.report.add_header("")
+                    # Add header record to dialog.
+                    self.report.add_header(record)
+
+                    # Under the header add to the dialog every line containing an instance of the
+                    # hyphenated word. If more than 5 lines stop reporting them and warn, unless verbose.
+                    # If there are multiple instances of a word on a line then the line will appear in
+                    # the dialog multiple times, each time highlighting a different instance of word.
+                    #
+                    # We will do the same with the non-hyphenated version of the word.
+
+                    line_number_list = self.word_list_map_lines[word_with_hyphen]
+                    prev_line_number = -1
+                    template = "{}{}{}"
+                    regx = template.format("(", word_with_hyphen, "(?!\\p{L}))")
+                    count = 0
+                    for line_number in line_number_list:
+                        # The same line number can appear multiple times in the list if the word in question
+                        # appears multiple times on the line. Treat each appearance of the word separately.
+                        # At the first time the line number appears in the list report all the occurrences
+                        # on that line then ignore any other instances of that line number in the list.
+                        if line_number == prev_line_number:
+                            prev_line_number = line_number
+                            continue
+                        # Maybe limit the length of the report by reporting only first 5 lines for a word ...
+                        if count == self.report_limit:
+                            count = -1
+                            break
+                        # ... but note that a new dialog line is generated for each time the word appears
+                        # on the line so there may be more than 5 dialog lines output
+                        line = self.book[line_number - 1]
+                        self.report_all_occurrences_on_line(regx, line, line_number)
+                        count += 1
+                        prev_line_number = line_number
+
+                    if count < 0:
+                        self.report.add_footer("  ...more")
+
+                    # We do the same for the non-hyphenated version of the word. Separate this
+                    # list of lines from the ones above with a rule. Maybe limit the number of lines
+                    # reported to report_limit (5 or 999999).
+
+                    self.report.add_header("-----")
+
+                    line_number_list = self.word_list_map_lines[word_with_no_hyphen]
+                    prev_line_number = -1
+                    template = "{}{}{}"
+                    regx = template.format(
+                        "((?<!-)", word_with_no_hyphen, "(?!\\p{L}))"
+                    )
+                    count = 0
+                    for line_number in line_number_list:
+                        # The same line number can appear multiple times in the list if the word in question
+                        # appears multiple times on the line. Treat each appearance of the word separately.
+                        # At the first time the line number appears in the list report all the occurrences
+                        # on that line then ignore any other instances of that line number in the list.
+                        if line_number == prev_line_number:
+                            prev_line_number = line_number
+                            continue
+                        # Maybe limit the length of the report by reporting only first 5 lines for a word ...
+                        if count == self.report_limit:
+                            count = -1
+                            break
+                        # ... but note that a new dialog line is generated for each time the word appears
+                        # on the line so there may be more than 5 dialog lines output.
+                        line = self.book[line_number - 1]
+                        self.report_all_occurrences_on_line(regx, line, line_number)
+                        count += 1
+                        prev_line_number = line_number
+
+                    if count < 0:
+                        self.report.add_footer("  ...more")
+
+        if none_found:
+            self.report.add_footer("")
+            self.report.add_footer(
+                "    No non-hyphenated versions of hyphenated words found."
+            )
+
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+    ######################################################################
+    # Unusual character check. Collects and reports lines that contain
+    # characters ('weirdos') not normally found in an an English text.
+    # Each 'weirdo' on a line in the dialog is highlighted.
+    ######################################################################
+
+    def weird_characters_check(self) -> None:
+        """Collects lines containing unusual characters. Lines in the report
+        are grouped by unusual character and each instance of the character
+        on a report line is highlighted."""
+
+        self.report.add_header(
+            "----- Uncommon Characters ------------------------------------------------------"
+        )
+
+        first_header = True
+        none_found = True
+
+        weirdos_lines_dictionary: Dict[str, list[int]] = {}
+        weirdos_counts_dictionary: Dict[str, int] = {}
+
+        # If no curly quotes in file, don't consider straight quotes to be weirdos
+        straight_quotes = "\"'" if self.csq + self.cdq == 0 else ""
+        weirdo_regex = (
+            r"[^A-Za-z0-9\s.,:;?!&\\\-_—–=“”‘’\[\]\(\){}¼½¾¹²³⁰⁴-⁹₀-₉⅐-⅞"
+            + straight_quotes
+            + "]"
+        )
+
+        # Build dictionary of unusual characters ('weirdos'). The key is a
+        # weirdo and the value a list of line numbers on which that character
+        # appears.
+        for line_number, line in enumerate(self.book, start=1):
+            if non_text_line(line):
+                continue
+            # Get list of weirdos on this line. That means any character NOT in the regex.
+            weirdos_list = re.findall(weirdo_regex, line)
+            # Update dictionary with the weirdos from the line.
+            for weirdo in weirdos_list:
+                # Skip exceptions
+                # Thoughtbreak consists of 5 asterisks equally spaced,
+                # and indented by at least 3 spaces.
+                if weirdo == "*" and re.fullmatch(r" {3,}\*( {3,10}\*)\1\1\1", line):
+                    continue
+                if weirdo in weirdos_lines_dictionary:
+                    weirdos_lines_dictionary[weirdo].append(line_number)
+                else:
+                    weirdos_lines_dictionary[weirdo] = [line_number]
+
+                if weirdo in weirdos_counts_dictionary:
+                    weirdos_counts_dictionary[weirdo] += 1
+                else:
+                    weirdos_counts_dictionary[weirdo] = 1
+
+        # Check whether to ignore Greek letters
+        skip_greek = (
+            sum(
+                1
+                for weirdo in weirdos_lines_dictionary
+                if re.fullmatch(r"\p{Greek}", weirdo)
+            )
+            > 5
+        )
+        if skip_greek:
+            self.report.add_footer(
+                "[Book contains over 5 different Greek letters so not reporting them]",
+                "",
+            )
+
+        # If nothing in the dictioary, nothing to do!
+        if len(weirdos_lines_dictionary) != 0:
+            none_found = False
+            for weirdo, line_list in weirdos_lines_dictionary.items():
+                if skip_greek and re.fullmatch(r"\p{Greek}", weirdo):
+                    continue
+                count = weirdos_counts_dictionary[weirdo]
+                # Make a header with this info and output it to dialog.
+                # E.g. "'¢' (3)".
+                record = f"'{weirdo}' ({count})"
+                # Insert a blank line before each header except the first one.
+                if first_header:
+                    first_header = False
+                else:
+                    self.report.add_header("")
+                # Add header record to dialog.
+                self.report.add_header(record)
+
+                # Under the header add to the dialog every line containing an instance of the weirdo.
+                # If there are multiple instances of a weirdo on a line then the line will appear in
+                # the dialog multiple times, each time highlighting a different instance of it.
+
+                prev_line_number = -1
+                regx = "(" + "\\" + weirdo + ")"
+                count = 0
+                for line_number in line_list:
+                    # The same line number can appear multiple times in the list if the weirdo in question
+                    # appears multiple times on the line. Treat each appearance of the weirdo separately.
+                    # At the first time the line number appears in the list report all the occurrences
+                    # on that line then ignore any other instances of that line number in the list.
+                    if line_number == prev_line_number:
+                        prev_line_number = line_number
+                        continue
+                    # Maybe limit the length of the report by reporting only first 5 lines for a word ...
+                    if count == self.report_limit:
+                        count = -1
+                        break
+                    # ... but note that a new dialog line is generated for each time the word appears
+                    # on the line so there may be more than 5 dialog lines output.
+                    line = self.book[line_number - 1]
+                    self.report_multiple_occurrences_on_line(regx, line, line_number)
+
+                    count += 1
+                    prev_line_number = line_number
+
+                if count < 0:
+                    self.report.add_footer("  ...more")
+
+        if none_found:
+            self.report.add_footer("", "    No unusual characters found.")
+
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+    ######################################################################
+    # Specials check. Multiple checks done on each line during a single
+    # read of book lines.
+    ######################################################################
+
+    def specials_check(self) -> None:
+        """A series of textual checks done on a single read of the book lines."""
+
+        self.report.add_header(
+            "----- Special situations checks ------------------------------------------------"
+        )
+
+        # METHOD
+        #
+        # Multiple checks are performed on each line during a single
+        # pass through the book's lines. Thus reports of issues have
+        # to be temporarily stored and only output to the dialog at
+        # the end of the pass.
+        #
+        # Use a dictionary to collect reports on lines that contain
+        # the 'specials' we are testing for. The keys are the report
+        # headings (e.g. "full stop followed by letter") and the value
+        # assigned to the key is a list containing one or more tuples
+        # that contain the information needed to generate an appropriate
+        # dialog message. Each tuple will add a dialog message to display.
+
+        def process_line_with_pattern(
+            pattern: str, exceptions: Sequence[str], line: str
+        ) -> None:
+            """Helper function for abstraction of processing logic.
+
+            METHOD
+            On a copy of the line passed in:
+            1. Find all the exceptions and replace those matches
+               with an obscure string of the same length.
+            2. Find remaining matches of pattern in this obscured line.
+            3. Highlight text in same position on actual line.
+            """
+
+            line_copy = line
+            # This function is within the scope of specials_check() function from where it is called.
+            line_number = line_index + 1
+            for exception in exceptions:
+                # Replace the exception with obscure string of same length.
+                while res := re.search(exception, line_copy):
+                    # Obscuring symbol is a dentistry symbol (Hex 23c0, Dec 9152).
+                    line_copy = (
+                        line_copy[: res.start(0)]
+                        + "⏀" * (res.end(0) - res.start(0))
+                        + line_copy[res.end(0) :]
+                    )
+
+            # Exceptions on line obscured. Any remaining instances of
+            # pattern are to be highlighted.
+            # Use re.finditer() to generate a new dialog line for each time the pattern (the issue
+            # being checked) appears on the line.
+
+            for match_obj in re.finditer(pattern, line_copy):
+                # Get start/end of error in file.
+                error_start = str(line_number) + "." + str(match_obj.start(0))
+                error_end = str(line_number) + "." + str(match_obj.end(0))
+                # Highlight occurrence of word in the line.
+                hilite_start = match_obj.start(0)
+                hilite_end = match_obj.end(0)
+                if heading not in specials_report:
+                    specials_report[heading] = []
+                specials_report[heading].append(
+                    MsgInfo(
+                        line,
+                        IndexRange(error_start, error_end),
+                        hilite_start,
+                        hilite_end,
+                    )
+                )
+
+        def process_word(word: str, exceptions: Sequence[str], line: str) -> None:
+            """Helper function for abstraction of processing logic.
+
+            METHOD
+            On the line passed in:
+            1. Find the word on the line.
+            2. Highlight text in same position on actual line.
+            """
+
+            # This function is within the scope of specials_check() function from where it is called.
+            line_number = line_index + 1
+            something_to_report = True
+            for exception in exceptions:
+                if re.match(exception, word):
+                    # Word matches an exception so nothing to report.
+                    something_to_report = False
+                    break
+            # Report word if it is not an exception/empty exceptions list.
+            if something_to_report:
+                # Get all occurrences of word on this line and report them.
+                # regx = f"\\b{word}\\b"
+                regx = r"(?<!\p{L}|\p{Nd})" + word + r"(?!\p{L}|\p{Nd})"
+                for match_obj in re.finditer(regx, line):
+                    # Get start/end of error in file.
+                    error_start = str(line_number) + "." + str(match_obj.start(0))
+                    error_end = str(line_number) + "." + str(match_obj.end(0))
+                    # Highlight occurrence of word in the line.
+                    hilite_start = match_obj.start(0)
+                    hilite_end = match_obj.end(0)
+                    if heading not in specials_report:
+                        specials_report[heading] = []
+                    specials_report[heading].append(
+                        MsgInfo(
+                            line,
+                            IndexRange(error_start, error_end),
+                            hilite_start,
+                            hilite_end,
+                        )
+                    )
+
+        specials_report: Dict[str, list[MsgInfo]] = {}
+
+        ####
+        # The following series of checks operate on text of each line.
+        ####
+
+        none_found = True
+
+        # NOTE: Count from 0 rather than 1. Actual line number for book
+        #       text will be line_index + 1.
+
+        for line_index, line in enumerate(self.book):
+            if non_text_line(line):
+                continue
+            exceptions: List[str] = []
+            # Allow Illustrations, Greek, Music or number in '[]'
+            heading = (
+                "Opening square bracket followed by other than I, G, M, S or digit."
+            )
+            exceptions.append(r"\[Blank Page\]")
+            process_line_with_pattern(r"\[[^IGMS\d]", exceptions, line)
+
+            # Clear out the exceptions for the previous check.
+            exceptions = []
+
+            # Don't allow 'Blank Page'
+            heading = "Blank Page place holder found."
+            process_line_with_pattern(r"\[Blank Page\]", exceptions, line)
+
+            # Mixed hyphen/dash in line"
+            heading = "Mixed hyphen/dash in line."
+            process_line_with_pattern(r"—-|-—|–-|-–", exceptions, line)
+
+            # Non-breaking space in line
+            heading = "Non-breaking space."
+            process_line_with_pattern(r"\u00A0", exceptions, line)
+
+            # Soft hyphen in line
+            heading = "Soft hyphen in line."
+            process_line_with_pattern(r"\u00AD", exceptions, line)
+
+            # Tab character in line
+            heading = "Tab character in line."
+            process_line_with_pattern(r"\u0009", exceptions, line)
+
+            # Ampersand character in line (excluding unicode numeric character references and '&c.')
+            exceptions.append(r"&c\.")
+            heading = "Ampersand character in line (excluding '&c.' and unicode numeric character references)."
+            process_line_with_pattern(r"&(?!#)", exceptions, line)
+
+            # Clear out the exceptions for the previous check.
+            exceptions = []
+
+            # Single character line
+            heading = "Single character line."
+            process_line_with_pattern(r"^[^]]$", exceptions, line)
+
+            # Broken hyphenation
+            heading = "Broken hyphenation."
+            process_line_with_pattern(
+                r"(\p{L}\- +?\p{L})|(\p{L} +?\-\p{L})", exceptions, line
+            )
+
+            # Comma spacing regexes
+            heading = "Comma spacing."
+            process_line_with_pattern(
+                r"\p{L},\p{L}|\p{L},\p{N}|\s,|^,", exceptions, line
+            )
+
+            # Oct. 8,2023 date fotmat
+            heading = "Date format."
+            process_line_with_pattern(r",[12]\p{Nd}{3}", exceptions, line)
+
+            # I in place of intended !
+            heading = "I/! check."
+            process_line_with_pattern(r"I”", exceptions, line)
+
+            # Disjointed contraction. E.g "I 've"
+            heading = "Disjointed contraction."
+            process_line_with_pattern(r"[A-Za-z]’ +?(m|ve|ll|t)\b", exceptions, line)
+
+            # Title/honorific abbreviations
+            heading = "Title abbreviation + comma."
+            process_line_with_pattern(
+                r"Mr,|Mrs,|Dr,|Drs,|Messrs,|Ms,|Hon,|Prof,", exceptions, line
+            )
+
+            # Spaced punctuation
+            heading = "Spaced punctuation."
+            # Exclude sequences of " ... ", etc.
+            exceptions.append(r"(?<=\s|^)\.\.\.(?=\s|$)")
+            # " .14567" is permitted, i.e. followed by digit
+            exceptions.append(r"(?<=\s|^)\.(?=\d)")
+            process_line_with_pattern(r"\s[\?!:;\.]", exceptions, line)
+
+            # Clear out the exceptions for the previous check.
+            exceptions = []
+
+            # Abbreviation &c without period
+            heading = "Abbreviation &c. without period."
+            process_line_with_pattern(r"&c(?= |$)", exceptions, line)
+
+            # Line starts with (selected) punctuation
+            heading = "Line start with suspect punctuation."
+            process_line_with_pattern(r"^[!;:,.?]", exceptions, line)
+
+            # Line starts with hyphen followed by non-hyphen
+            heading = "Line start with hyphen and then non-hyphen."
+            process_line_with_pattern(r"^-[^-]", exceptions, line)
+
+            # The following check for standalone 0 consists of:
+            #
+            # GENERAL TEST
+            pattern = r"\b0\b"
+            if re.search(pattern, line):
+                # Here if possible issue.
+                #
+                # EXCEPTIONS
+                #
+                # NB Each regex below returns the pattern in a match
+                #    as group(0).
+                exceptions = []
+                # standalone 0 allowed after dollar/pound sign; E.g. $0 25.
+                exceptions.append(r"(?<=[\$£])(0)(?=$|\P{Nd})")
+                # 0.123 or 29.0 or 0°
+                exceptions.append(r"\b(0)(?=\.)")
+                exceptions.append(r"(?<=\.)(0)\b")
+                exceptions.append(r"\b(0)(?=°)")
+                # Generate dialog tuples only if not an exception.
+                heading = "Standalone 0 (excluding exceptions)."
+                process_line_with_pattern(pattern, exceptions, line)
+
+            # The following check for standalone 1 consists of:
+            #
+            # GENERAL TEST
+            pattern = r"(?<=^|\P{Nd})(1)(?=$|\P{N})"
+            # NB should be equivalent to r"\b1\b"
+            if re.search(pattern, line):
+                # Here if possible issue.
+                #
+                # EXCEPTIONS
+                #
+                # NB Each regex below returns the pattern in a match
+                #    as group(0).
+                exceptions = []
+                # standalone 1 allowed after dollar/pound sign.
+                exceptions.append(r"(?<=[\$£])(1)(?=$|\P{Nd})")
+                # standalone 1 allowed before comma.
+                exceptions.append(r"(?<=^|\P{Nd})(1)(?=,)")
+                # standalone 1 allowed before dash+num.
+                exceptions.append(r"(?<=^|\P{Nd})(1)(?=[-‑‒–—―]\p{Nd})")
+                # standalone 1 allowed after num+dash.
+                exceptions.append(r"(?<=\p{Nd}[-‑‒–—―])(1)(?=$|\P{Nd})")
+                # 1.nnn or nnn.1 or 1°
+                exceptions.append(r"\b(1)(?=\.)")
+                exceptions.append(r"(?<=\.)(1)\b")
+                exceptions.append(r"\b(1)(?=°)")
+                # standalone 1 allowed as "1st".
+                exceptions.append(r"(?<=^|\P{Nd})(1)st")
+                # standalone 1 allowed as a footnote anchors
+                exceptions.append(r"\[(1)\]")
+                # Make exceptions of 1s. (1 shilling) and 1d. (1 pence/penny).
+                exceptions.append(r"\b1d\.")
+                exceptions.append(r"\b1s\.")
+                # Generate dialog tuples only if not an exception.
+                heading = (
+                    "Single '1' in a word or a standalone '1' (excluding exceptions)."
+                )
+                process_line_with_pattern(pattern, exceptions, line)
+
+            # The following check for punctuation after case-insensitive 'the' consists of:
+            #
+            # GENERAL TEST
+            pattern = r"(?i)\bthe\p{P}"
+            if re.search(pattern, line):
+                # Here if possible issue.
+                #
+                # EXCEPTIONS
+                #
+                # NB Each regex below returns the pattern in a match
+                #    as group(0).
+                exceptions = []
+                # Ignore contexts such as "Will-o’-the-wisp"
+                exceptions.append(r"(?i)-the-")
+                # Ignore contexts such as "the’re", "the’ve"
+                exceptions.append(r"(?i)\bthe[’ve|’re]")
+                # Ignore "the," - checked below with a limit
+                exceptions.append(r"(?i)\bthe,")
+                # Generate dialog tuples only if not an exception.
+                heading = "Punctuation after 'the' (excluding exceptions)."
+                process_line_with_pattern(pattern, exceptions, line)
+
+            # Check for comma after case-insensitive 'the'
+            pattern = r"(?i)\bthe,"
+            if re.search(pattern, line):
+                exceptions = []
+                heading = "Comma after 'the'."
+                process_line_with_pattern(pattern, exceptions, line)
+
+            # The following check for double punctuation consists of:
+            #
+            # GENERAL TEST
+            pattern = r",\.|,,|(?<!\.)\.\.(?!\.)"
+            if re.search(pattern, line):
+                # Here if possible issue.
+                #
+                # EXCEPTIONS
+                #
+                # NB Each regex below returns the pattern in a match
+                #    as group(0).
+                exceptions = []
+                # Ignore contexts such as 4-dot ellipsis
+                exceptions.append(r"(?i)etc\.{4}(?!\.)")
+                # Exclude sequences of " ... ", etc.
+                exceptions.append(r"(?<=\s|^)\.\.\.(?=\s|$)")
+                # Generate dialog tuples only if not an exception.
+                heading = "Query double punctuation (excluding exceptions)."
+                process_line_with_pattern(pattern, exceptions, line)
+
+            # The following check for period-comma consists of:
+            #
+            # GENERAL TEST
+            pattern = r"\.,"
+            if re.search(pattern, line):
+                exceptions = []
+                # Ignore contexts such as "etc.,", "&c.,"
+                exceptions.append(r"(?i)etc\.,")
+                exceptions.append(r"(?i)&c\.,")
+                # Generate dialog tuples only if not an exception.
+                heading = "Query period-comma (excluding exceptions)."
+                process_line_with_pattern(pattern, exceptions, line)
+
+            # Unexpected comma check. Commas should not occur after these words:
+            pattern = (
+                r"(?i)\bit’s,|\btheir,|\ban,|\ba,|\bour,|\bthat’s,|\bits,|\bwhose,|\bevery,"
+                r"|\bi’ll,|\byour,|\bmy,|\bmr,|\bmrs,|\bmss,|\bmssrs,|\bft,|\bpm,|\bst,|\bdr,|\brd,|\bpp,|\bcf,"
+                r"|\bjr,|\bsr,|\bvs,|\blb,|\blbs,|\bltd,|\bi’m,|\bduring,|\blet,|\btoward,|\bamong,"
+            )
+            # Generate dialog tuples for pattern, ignoring exceptions.
+            exceptions = []
+            heading = "Query unexpected comma after certain words."
+            process_line_with_pattern(pattern, exceptions, line)
+
+            # Unexpected period check. Periods should not occur after these words:
+            pattern = (
+                r"(?i)\bevery\.|\bi’m\.|\bduring\.|\bthat’s\.|\bthis’s\.|\btheir\.|\byour\.|\bour\.|\bmy\.|\bor\."
+                r"|\band\.|\bbut\.|\bas\.|\bif\.|\bits\.|\bit’s\.|\buntil\.|\bthan\.|\bwhether\.|\bi’ll\."
+                r"|\bwhose\.|\bwho\.|\bbecause\.|\bwhen\.|\blet\.|\btill\.|\bvery\.|\ban\.|\bamong\."
+                r"|\binto\.|\bwhom\.|\bhaving\.|\bthence\."
+            )
+            # Generate dialog tuples for pattern, ignoring exceptions.
+            exceptions = []
+            heading = "Query unexpected period after certain words."
+            process_line_with_pattern(pattern, exceptions, line)
+
+            ##
+            # The following series of checks operate on individual words
+            # on the line.
+            ##
+
+            # We already have a list of words for this line. Note that
+            # words are stripped of all punctuation except curly apostrophe.
+            # Thus &c. 1s. and 1d. on a line will appear as &c 1s and 1d
+            # in the list. Similarly "word" appears as word in the list but
+            # word’s has the apostrophe preserved and will appears as word’s
+            # in the list.
+
+            already_checked = []
+            for word in self.word_list_map_words[line_index]:
+                if word in already_checked:
+                    # Word has occurred again on the line but it has
+                    # already been reported on. Don't repeat reports.
+                    continue
+
+                # Looks for mixed case within word but not if the word is in
+                # the good words list or occurs more than once in the book.
+                # Also allow "MacDonald", "McARTHUR", etc.
+                if (
+                    self.word_list_map_count[word] == 1
+                    and word not in self.project_dict.good_words
+                ):
+                    if re.search(r".\p{Ll}+(?<!-)\p{Lu}", word) and not re.fullmatch(
+                        r"Ma?c\p{Uppercase_Letter}\p{Letter}+", word
+                    ):
+                        # NB word occurs only once in the book and isn't in good_words.
+                        # Generate dialog tuples.
+                        heading = "Mixed case in word (excluding words in project dictionary)."
+                        process_word(word, [], line)
+
+                # Word start and word endings checks.
+
+                if len(word) > 2:
+                    # Check word ending (last 2 characters).
+                    last2 = word[len(word) - 2 :]
+                    # The following pairs of characters are very rare at word end.
+                    if (
+                        re.match(
+                            "cb|gb|pb|sb|tb|wh|fr|br|qu|tw|gl|fl|sw|gr|sl|cl|iy",
+                            last2,
+                            re.IGNORECASE,
+                        )
+                        and word not in self.project_dict.good_words
+                    ):
+                        # Generate dialog tuples.
+                        heading = f"Query word ending with '{last2}' (excludes words in project dictionary)."
+                        process_word(word, [], line)
+
+                    # Check word start (first 2 characters)
+                    first2 = word[0:2]
+
+                    # The following pairs of characters are very rare at start of word.
+                    if (
+                        re.match(
+                            "hr|hl|cb|sb|tb|wb|tl|tn|rn|lt|tj", first2, re.IGNORECASE
+                        )
+                        and word not in self.project_dict.good_words
+                    ):
+                        # Generate dialog tuples.
+                        heading = f"Query word starting with '{first2}' (excludes words in project dictionary)."
+                        process_word(word, [], line)
+
+                # The following check for mixed letters/digits in word consists of:
+                #
+                # GENERAL TEST
+                pattern = r"\p{L}+\p{Nd}+|\p{Nd}+\p{L}+"
+                if re.search(pattern, word) and word.lower() not in (
+                    "4to",
+                    "8vo",
+                    "12mo",
+                    "16mo",
+                ):
+                    # Here if possible issue.
+                    #
+                    # EXCEPTIONS
+                    #
+                    # NB Each regex below returns the pattern in a match
+                    #    as group(0).
+                    exceptions = []
+                    # E.g. 191st
+                    exceptions.append(r"(?i)\b(\p{Nd}*[02-9]1st|1st)\b")
+                    # E.g. 282nd
+                    exceptions.append(r"(?i)\b(\p{Nd}*[02-9]2nd|2nd)\b")
+                    # E.g. 373rd
+                    exceptions.append(r"(?i)\b(\p{Nd}*[02-9]3rd|3rd)\b")
+                    # E.g. 373d
+                    exceptions.append(r"(?i)\b\p{Nd}*[23]d\b")
+                    # E.g. 65th
+                    exceptions.append(r"(?i)\b\p{Nd}*[4567890]th\b")
+                    # E.g. 511th, 212th, 13th
+                    exceptions.append(r"(?i)\b\p{Nd}*1[123]th\b")
+                    # Make exceptions of references to amounts in shillings
+                    # and pence. E.g. £1 9s. 11d. Note that parsing a line
+                    # into words strips punctuation except curly apostrophe
+                    # so value of 'word' here would be '9s' & '11d'. Hence
+                    # possibility of occasional false negatives.
+                    if re.fullmatch(r"\p{Nd}{1,2}[sd]", word):
+                        exceptions.append(word)
+                    # Generate dialog tuples only if not an exception.
+                    heading = (
+                        "Query mixed letters/digits in word (excluding exceptions)."
+                    )
+                    # NB 'heading' is accessed in the 'process_word' function
+                    #    which is in same scope. flake8 complains about it.
+                    process_word(word, exceptions, line)
+
+                # If the word occurs again on this line we will not
+                # repeat the checks.
+                already_checked.append(word)
+
+        # Done with specials checks. Report what, if anything, we've found.
+
+        # Produce dialog lines from the dialog MsgInfos generated by
+        # the checks above. The specials_report dictionary may be
+        # empty in which case there will be no dialog messages.
+        first_header = True
+        for header_line, msg_list in specials_report.items():
+            none_found = False
+            # Insert a blank line before each header except the first one.
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            # Add header record to dialog.
+            self.report.add_header(header_line)
+            # Some checks have a limit for how many times to report
+            limit = (
+                self.report_limit
+                if header_line
+                in (
+                    "Comma after 'the'.",
+                    "Query period-comma (excluding exceptions).",
+                    "Single '1' in a word or a standalone '1' (excluding exceptions).",
+                )
+                else 0
+            )
+            self.consolidate_messages(msg_list, limit=limit)
+
+        if none_found:
+            self.report.add_footer("")
+            self.report.add_footer("    No special situations reports.")
+
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+    ######################################################################
+    # abandoned HTML tag check
+    ######################################################################
+
+    def html_check(self) -> None:
+        """Abandoned HTML tag check."""
+
+        self.report.add_header(
+            "----- Abandoned HTML tag check -------------------------------------------------"
+        )
+
+        # Courtesy limit if user uploads fpgen source, etc.
+        courtesy_limit = 5
+        abandoned_html_tag_count = 0
+        lines_with_html_tags = 0
+
+        regx = r"<(?=[!\/a-z]).*?(?<=[\"A-Za-z0-9\/]|-)>"
+        for line_number, line in enumerate(self.book, start=1):
+            if non_text_line(line):
+                continue
+            if re.search(regx, line):
+                # Generate a new dialog line for each tag on the line, keeping
+                # count of total tags found over all the lines reported.
+                abandoned_html_tag_count += self.report_all_occurrences_on_line(
+                    regx, line, line_number
+                )
+                lines_with_html_tags += 1
+
+            # If abandoned_HTML_tag_count > courtesy_limit then it looks like we are
+            # not dealing with a plain text file after all. Flag this and report the
+            # number of HTML tags found so far then exit loop.
 
-    scanno_dictionary = {}
-    for entry in scannos_misspelled:
-        scoword = entry.lower()
-        # Deal with duplicates.
-        if scoword in scanno_dictionary:
-            continue
-        scanno_dictionary[scoword] = 0
+            if abandoned_html_tag_count > courtesy_limit:
+                record = f"Source file not plain text: {lines_with_html_tags} book lines with {abandoned_html_tag_count} markup instances so far..."
+                self.report.add_footer("", record, "...abandoning check.")
+                # Don't search any more book lines for HTML tags.
+                break
 
-    return scanno_dictionary
+        # All book lines scanned or scanning abandoned.
+        if abandoned_html_tag_count == 0:
+            self.report.add_footer("", "    No abandoned HTML tags found.")
 
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
 
-##
-# PPTXT Main Function
-##
+    ######################################################################
+    # Unicode numeric character references check.
+    ######################################################################
 
+    def unicode_numeric_character_check(self) -> None:
+        """Unicode numeric character references check."""
 
-def pptxt(project_dict: ProjectDict) -> None:
-    """Top-level pptxt function."""
-    global checker_dialog
-    global book, word_list_map_count, word_list_map_lines, word_list_map_words
-    global found_long_doctype_declaration
-    global ssq, sdq, csq, cdq
-    global longest_line, shortest_line
-    global report_limit
+        self.report.add_header(
+            "----- Unicode numeric character references check -------------------------------"
+        )
 
-    if not tool_save():
-        return
+        # Courtesy limit if user uploads fpgen source, etc.
+        courtesy_limit = 5
+        numeric_char_reference_count = 0
+        lines_with_numeric_char_references = 0
 
-    report_limit = 999999 if preferences.get(PrefKey.PPTEXT_VERBOSE) else 5
+        regx = r"(&#[0-9]{1,5};|&#x[0-9a-fA-F]{1,4};)"
+        for line_number, line in enumerate(self.book, start=1):
+            if non_text_line(line):
+                continue
+            if re.search(regx, line):
+                # Generate a new dialog line for each match on the line, keeping
+                # count of number of character references encountered.
+                numeric_char_reference_count += self.report_all_occurrences_on_line(
+                    regx, line, line_number
+                )
+                lines_with_numeric_char_references += 1
+
+            # If numeric_char_reference_count > courtesy_limit then it looks like we are
+            # not dealing with a plain text file afterall. Flag this and report the
+            # number of numeric character references found so far then exit loop.
+
+            if numeric_char_reference_count > courtesy_limit:
+                self.report.add_entry("")
+                record = f"Source file not plain text: {lines_with_numeric_char_references} book lines with {numeric_char_reference_count} unicode numeric character references so far..."
+                self.report.add_entry(record)
+                self.report.add_entry("...abandoning check.")
+                # Don't search any more book lines for numeric character references.
+                break
 
-    found_long_doctype_declaration = False
+        # All book lines scanned.
+        if numeric_char_reference_count == 0:
+            self.report.add_footer(
+                "", "    No unicode numeric character references found."
+            )
 
-    # Create the checker dialog to show results
-    checker_dialog = PPtxtCheckerDialog.show_dialog(
-        rerun_command=lambda: pptxt(project_dict),
-    )
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
 
-    # Get the whole of the file from the main text widget
+    ######################################################################
+    # Scan book for two or more adjacent spaces on a line that
+    # does not start with a space
+    ######################################################################
 
-    text = maintext().get_text()
-    input_lines = text.splitlines()
+    def adjacent_spaces_check(self) -> None:
+        """Scans text of each book line for adjacent spaces."""
 
-    # Get book lines, list of words on line and word frequency.
+        self.report.add_header(
+            "----- Adjacent spaces check (poetry, block-quotes, etc., are ignored) ----------"
+        )
 
-    book = []
-    word_list_map_words = []
-    word_list_map_count = {}
-    word_list_map_lines = {}
+        # If the line starts with one or more spaces (poetry, block-quotes, etc.,
+        # adjacent spaced will not be reported.
 
-    # Counters for each quote type
-    ssq = 0
-    sdq = 0
-    csq = 0
-    cdq = 0
-    longest_line = (0, 0)
-    shortest_line = (0, 9999)
+        no_adjacent_spaces_found = True
 
-    for line_number, line in enumerate(input_lines, start=1):
-        line = line.rstrip("\r\n")
+        for line_number, line in enumerate(self.book, start=1):
+            if non_text_line(line):
+                continue
+            #  Spaced poetry, block-quotes, etc., will fail the 'if' below.
 
-        book.append(line)
+            # If adjacent spaces but no leading spaces then ...
+            if re.search(r"\s\s+?", line) and not re.search(r"^\s+?", line):
+                no_adjacent_spaces_found = False
+                # Generate a new dialog line for each match on the line.
+                self.report_multiple_occurrences_on_line(r"\s\s+", line, line_number)
 
-        if non_text_line(line):
-            word_list_map_words.append(
-                []
-            )  # Needs to correspond to lines, even when ignored
-            continue
+        # All book lines scanned.
+        if no_adjacent_spaces_found:
+            self.report.add_footer("", "    No lines with adjacent spaces found.")
 
-        line_length = len(line)
-        if line_length > longest_line[1]:
-            longest_line = (line_number, line_length)
-        if 0 < line_length < shortest_line[1]:
-            shortest_line = (line_number, line_length)
-
-        # Note types of single/double quotes if present. They are
-        # not being counted here, only their presence in the file.
-        if "'" in line:
-            ssq += 1
-        if '"' in line:
-            sdq += 1
-        if re.search(r"[‘’]", line):
-            csq += 1
-        if re.search(r"[“”]", line):
-            cdq += 1
-
-        # Build a list, 'word_list_map_words', whose entries are themselves
-        # a list of words on each line. It is indexed from zero and
-        # will have as many entries as there are lines in the book.
-
-        # Build a dictionary, 'word_list_map_count', of words in the book
-        # and their frequency.
-
-        # Build a dictionary, 'word_list_map_lines', whose key is a word
-        # and its value a list of integer line numbers on which that word
-        # appears.
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+    def report_multiple_occurrences_on_line(
+        self, pattern: str, line: str, line_number: int, flags: int = 0
+    ) -> None:
+        """Report multiple occurrences in one message for this line.
+
+        Args:
+            pattern: A regex of the pattern to be matched and highlighted.
+            line: The string on which to match the pattern.
+            line_number: The line number of the line in the file.
+        """
+
+        matches = list(re.finditer(pattern, line, flags=flags))
+        if not matches:
+            return
+        # Get start/end of first/last error on line.
+        error_start = matches[0].start()
+        error_end = matches[-1].end()
+        # Add record to the dialog with prefix if repeated matches.
+        repeat_str = f"(x{len(matches)}) " if len(matches) > 1 else ""
+        self.report.add_entry(
+            f"{repeat_str}{line}",
+            IndexRange(f"{line_number}.{error_start}", f"{line_number}.{error_end}"),
+            error_start + len(repeat_str),
+            error_end + len(repeat_str),
+        )
+
+    def report_all_occurrences_on_line(
+        self, pattern: str, line: str, line_number: int
+    ) -> int:
+        """Abstraction of dialog code that's used repeatedly for reporting.
+
+        Args:
+            pattern: A regex of the pattern to be matched and highlighted.
+            line: The string on which to match the pattern.
+            line_number: The line number of the line in the file.
+        """
+
+        count_of_matches = 0
+        for match_obj in re.finditer(pattern, line):
+            # Get start/end of error in file.
+            error_start = str(line_number) + "." + str(match_obj.start(0))
+            error_end = str(line_number) + "." + str(match_obj.end(0))
+            # Store in structure for file row/col positions & ranges.
+            start_rowcol = IndexRowCol(error_start)
+            end_rowcol = IndexRowCol(error_end)
+            # Highlight occurrence of word in the line.
+            hilite_start = match_obj.start(0)
+            hilite_end = match_obj.end(0)
+            # Add record to the dialog.
+            self.report.add_entry(
+                line,
+                IndexRange(start_rowcol, end_rowcol),
+                hilite_start,
+                hilite_end,
+            )
+            count_of_matches += 1
+
+        return count_of_matches
+
+    ######################################################################
+    # ellipses check
+    ######################################################################
+
+    def ellipsis_check(self) -> None:
+        """Ellipses check."""
+
+        self.report.add_header(
+            "----- Ellipsis check -----------------------------------------------------------"
+        )
+
+        # It checks for:
+        #
+        #    3-dot ellipses without a space or opening double quote before them
+        #    E.g. “... Him the Almighty Power
+        #    3-dot ellipses followed by full-stop and no trailing space
+        #      (AKA 4-dot ellipses)
+        #    2-dot ellipses
+        #    5-or-more-dot ellipses
+        #
+        # and highlights the suspect ellipsis.
+
+        # The comments and code below are a direct implementation in Python
+        # of code written in Go by Roger Franks (rfranks).
+
+        no_suspect_ellipsis_found = True
+
+        # Eliminate correct ellipsis then any sequence of two or more
+        # period ('.') characters left on line are highighted as suspect.
+
+        for line_number, line in enumerate(self.book, start=1):
+            if non_text_line(line):
+                continue
+            line_copy = line
+            # Obscure correct 4-dot ellipsis with space of same lenth.
+            line_copy = re.sub(r"(\p{L})(\.\.\.\.(?= |$))", r"\1    ", line_copy)
+            # Obscure correct 3-dot ellipsis with space of same lenth.
+            line_copy = re.sub(r"(?<= |“)\.\.\.(?= )", r"   ", line_copy)
+            # Any sequence of two or more period characters are suspect so
+            # highlight those sequences.
+            pattern = r"\.\.+"
+            # Find any remaining 'ellipsis' on edited line ...
+            if re.search(pattern, line_copy):
+                no_suspect_ellipsis_found = False
+                # Note we search line copy ...
+                for match_obj in re.finditer(pattern, line_copy):
+                    # Get start/end of error in file.
+                    error_start = str(line_number) + "." + str(match_obj.start(0))
+                    error_end = str(line_number) + "." + str(match_obj.end(0))
+                    # Store in structure for file row/col positions & ranges.
+                    start_rowcol = IndexRowCol(error_start)
+                    end_rowcol = IndexRowCol(error_end)
+                    # Highlight occurrence of word in the line.
+                    hilite_start = match_obj.start(0)
+                    hilite_end = match_obj.end(0)
+                    # ... but report original line when adding record to the dialog.
+                    self.report.add_entry(
+                        line,
+                        IndexRange(start_rowcol, end_rowcol),
+                        hilite_start,
+                        hilite_end,
+                    )
+
+        if no_suspect_ellipsis_found:
+            self.report.add_footer("", "    No suspect ellipsis found.")
+
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+    ######################################################################
+    # curly quote check (positional, not using a state machine)
+    ######################################################################
+
+    def curly_quote_check(self) -> None:
+        """Curly quote check."""
+
+        self.report.add_header(
+            "----- Basic (positional) curly-quote check -------------------------------------"
+        )
+
+        # Report floating quotes - “” and ‘’ types.
+
+        first_match = True
+        no_suspect_curly_quote_found = True
+        pattern = r"""
+        # === Case A: Match “ ‘ ’ when spaced — always wrong ===
+        (?<=\ )[“‘’](?=\ )         |  # space on both sides
+        ^[“‘’](?=\ )               |  # start of line, space after
+        (?<=\ )[“‘’]$              |  # space before, end of line
+        # === Case B: Match ” unless ditto-style (2+ spaces or line start/end on BOTH sides) ===
+        (?<= (?<!\s)\s )”(?=\s+)   |  # Exactly one space before, 1+ spaces after
+        (?<=\s+)”(?= \s(?!\s) )    |  # 1+ spaces before, exactly one space after
+        ^”(?= \s(?!\s) )           |  # start of line, exactly one space after
+        (?<= (?<!\s)\s )”$            # exactly one space before, end of line    (
+        """
+
+        for line_number, line in enumerate(self.book, start=1):
+            if non_text_line(line):
+                continue
+            if re.search(pattern, line, flags=re.VERBOSE):
+                if first_match:
+                    first_match = False
+                    self.report.add_header("floating quote (single or double)")
+                self.report_multiple_occurrences_on_line(
+                    pattern, line, line_number, flags=re.VERBOSE
+                )
+                no_suspect_curly_quote_found = False
+
+        # Report 'wrong direction' quotes
+
+        first_match = True
+
+        for line_number, line in enumerate(self.book, start=1):
+            if non_text_line(line):
+                continue
+            # if |some text.“| or |some text‘| or |”some text|
+            pattern = r"(?<=[\.,;!?])[‘“]"
+            if re.search(pattern, line):
+                if first_match:
+                    first_match = False
+                    self.report.add_header("quote direction")
+                self.report_all_occurrences_on_line(pattern, line, line_number)
+                no_suspect_curly_quote_found = False
+            pattern = r"(?<=\p{L})[\‘\“]"
+            if re.search(pattern, line):
+                if first_match:
+                    first_match = False
+                    self.report.add_header("quote direction")
+                self.report_all_occurrences_on_line(pattern, line, line_number)
+                no_suspect_curly_quote_found = False
+            pattern = r"”(?=[\p{L}])"
+            if re.search(pattern, line):
+                if first_match:
+                    first_match = False
+                    self.report.add_header("quote direction")
+                self.report_all_occurrences_on_line(pattern, line, line_number)
+                no_suspect_curly_quote_found = False
+
+        if no_suspect_curly_quote_found:
+            self.report.add_footer("", "    No suspect curly quotes found.")
+
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+    ######################################################################
+    # quote type checks
+    ######################################################################
+
+    def file_analysis_check(self) -> None:
+        """Check for mixed straight/curly quotes & line lengths."""
+
+        self.report.add_header(
+            "----- File analysis check -------------------------------------------------------",
+            "",
+        )
+
+        # Any straight single/double quotes?
+        if self.ssq > 0 or self.sdq > 0:
+            # Yep, so what about any curly single and double quotes?
+            if self.csq == 0 and self.cdq == 0:
+                self.report.add_header("Only straight quotes found in this file.")
+            elif self.csq > 0 or self.cdq > 0:
+                self.report.add_header(
+                    "Both straight and curly quotes found in this file."
+                )
+        elif (self.ssq == 0 and self.sdq == 0) and (self.csq > 0 or self.cdq > 0):
+            self.report.add_header("Only curly quotes found in this file.")
+        elif self.ssq == 0 and self.sdq == 0 and self.csq == 0 and self.cdq == 0:
+            self.report.add_header(
+                "No single or double quotes of any type found in file - that is unusual."
+            )
+        self.report.add_footer("")
+
+        if self.longest_line[1] > 0:
+            pos = IndexRowCol(self.longest_line[0], 0)
+            self.report.add_entry(
+                f"Longest line - {sing_plur(self.longest_line[1], 'character')}",
+                IndexRange(pos, pos),
+            )
+        if self.shortest_line[1] > 0:
+            pos = IndexRowCol(self.shortest_line[0], 0)
+            self.report.add_entry(
+                f"Shortest line - {sing_plur(self.shortest_line[1], 'character')}",
+                IndexRange(pos, pos),
+            )
+        self.report.add_footer("")
+
+    ######################################################################
+    # dash review
+    ######################################################################
+
+    def dash_review_check(self) -> None:
+        """Hyphen/dashes check."""
+
+        self.report.add_header(
+            "----- Hyphen/dashes check (one or more present on line) ------------------------"
+        )
+
+        # The algorithm used below is adopted from the one Roger Franks uses in
+        # his Go version of PPTXT for the PPWB. It makes a copy of the book and
+        # runs multiple passes over the copy. The first set of passes protects
+        # what is allowed by removing them from line. The final pass categorises
+        # any dashes that remain and flags them in the report.
+
+        ####
+        # In the PPWB Go version of PPTXT, Roger qualifies and protects the following
+        # dash characters & sequences:
+        #    - hyphen-minus (keyboard "-")
+        #              allow these between two letters [\p{L}-\p{L}]
+        #              allow 8 or more of these as a separator [-{8,}]
+        #    ‐ hyphen
+        #              allow these between two letters [\p{L}‐\p{L}]
+        #              allow 8 or more of these as a separator [‐{8,}]
+        #    ‑ non-breaking hyphen
+        #              allow these between two letters [\p{L}‐\p{L}]
+        #    ‒ figure dash (i.e. to connect digits in a phone number)
+        #              allow these between two numbers [\p{Nd}‒\p{Nd}]
+        #    – en dash (to show a range of numbers)
+        #              allow these between two numbers \p{Nd}–\p{Nd}
+        #              allow these between two numbers \p{Nd}\s–\s\p{Nd}
+        #    — em dash
+        #              allow patterns:
+        #                   [\p{L}—\p{L}] between letters with no spacing
+        #                       My favorite food—pizza—originated in Italy.
+        #                       My granddaughter—Kenzie—plays volleyball.
+        #                   [\p{Ll}—\p{P}] between lower-case letter and punctuation
+        #                       “What if we—”
+        #                   \p{Ll}— \p{Lu} lower-case letter, en dash, space, upper-case letter
+        #                       If you tell him— Wait, I will give you this.
+        #
+        # These are dash characters that will be flagged if not in circumstances listed above:
+        #   - HYPHEN-MINUS
+        #   ‐ HYPHEN
+        #   ‑ NON-BREAKING HYPHEN
+        #   ‒ FIGURE DASH
+        #   – EN DASH
+        #   — EM DASH
+        #
+        # The following are among dash characters that will always be flagged:
+        #   ֊ ARMENIAN HYPHEN
+        #   ־ HEBREW PUNCTUATION MAQAF
+        #   ᐀ CANADIAN SYLLABICS HYPHEN
+        #        ᠆    MONGOLIAN TODO SOFT HYPHEN
+        #   ― HORIZONTAL BAR
+        #   ⸗ DOUBLE OBLIQUE HYPHEN
+        #   ⸚ HYPHEN WITH DIAERESIS
+        #   ⸺ TWO-EM DASH
+        #   ⸻ THREE-EM DASH
+        #   ⹀ DOUBLE HYPHEN
+        #   〜 WAVE DASH
+        #   〰 WAVY DASH
+        #   ゠ KATAKANA-HIRAGANA DOUBLE HYPHEN
+        #   ︱ PRESENTATION FORM FOR VERTICAL EM DASH
+        #   ︲ PRESENTATION FORM FOR VERTICAL EN DASH ﹘ SMALL EM DASH
+        #   ﹣ SMALL HYPHEN-MINUS
+        #   － FULLWIDTH HYPHEN-MINUS
+        ####
+
+        # INITIAL PASSES: protect what is allowed by overwriting lines in a copy of the book.
+
+        dbuf = self.book.copy()
+
+        # The dashes we recognise
+
+        ch_hm = "-"  # hyphen-minus
+        ch_hy = "‐"  # hyphen
+        ch_nb = "‑"  # non-breaking hyphen
+        ch_fd = "‒"  # figure dash
+        ch_en = "–"  # endash
+        ch_em = "—"  # emdash
+
+        # First pass allows em-dash to start a paragraph.
+        #
+        # The loop below assumes a paragraph starts after an empty line, which
+        # is generally the case, and goes through the book line by line looking
+        # for them.
+        #
+        # Deal with the special case of the first line of the file being the
+        # start of a paraqraph; i.e. it is not preceded by a blank line.
+
+        # line number = line_index + 1
+        line_index = 0
+        while line_index < len(dbuf) - 1:
+            if non_text_line(dbuf[line_index]):  # Ignore page separators, etc
+                line_index += 1
+                continue
+
+            # allow em-dash to start a paragraph.
+            if line_index == 0 and re.match(r"^\p{Zs}*—", dbuf[line_index]):
+                # Replace only one occurrence; i.e. the prefixing one.
+                dbuf[line_index] = dbuf[line_index].replace("—", "", 1)
+
+            else:
+                # General case. I.e. paragraphs preceded by an empty line OR
+                # the first line of the file contains text which does not
+                # start with an em-dash.
+                #
+                # The purpose of the loop is to obfuscate an em-dash if it
+                # appears at the start of a paragraph. NB em-dash can be
+                # separated from the left-margin by one or more Unicode
+                # space characters.
+
+                if dbuf[line_index] == "" and re.match(
+                    r"\p{Zs}*—", dbuf[line_index + 1]
+                ):
+                    # Replace only one occurrence; i.e. the prefixing one.
+                    dbuf[line_index + 1] = dbuf[line_index + 1].replace("—", "", 1)
+
+            line_index += 1
+
+        # Second pass.
+        #
+        # Go through the book line by line again and obfuscate valid occurrences
+        # of Unicode dash characters. This is the second of the initial passes.
+        #
+        # The order of execution of these replacements on a line is important!
+        reg1 = re.compile(r"—{8,}")
+        reg2 = re.compile(r"(?<=[ \p{L}])——(?!$|—)")
+        reg3 = re.compile(r"\p{L}-\p{L}")
+        reg4 = re.compile(r"\p{L}’-\p{L}")
+        reg5 = re.compile(r"\p{L}-’\p{L}")
+        reg6 = re.compile(r"(?<=\p{L}\.)-(?=\p{L})")
+        reg7 = re.compile(r"\p{L}‐\p{L}")  # U+2010 '‐'
+        reg8 = re.compile(r"-{8,}")
+        reg9 = re.compile(r"\p{L}-\p{L}")  # U+2011 '-'
+        reg10 = re.compile(r"\p{Nd}‒\p{Nd}")  # U+2012 '‒'
+        reg11 = re.compile(r"\p{Nd}–\p{Nd}")  # U+2013 '–'
+        reg12 = re.compile(r"\p{Nd}\s–\s\p{Nd}")
+        reg13 = re.compile(r"\p{L}—\p{L}")
+        reg14 = re.compile(r"[\p{Ll}I]—\p{P}")
+        reg15 = re.compile(r"[\._=+\)\]]—[\p{L}_=+\()]")
+        reg16 = re.compile(r"\p{Ll}— \p{Lu}")
+        reg17 = re.compile(r"—\s*$")
+        # line number = line_index + 1
+        line_index = 0
+        while line_index < len(dbuf):
+            if non_text_line(dbuf[line_index]):
+                line_index += 1
+                continue
+
+            line = dbuf[line_index].replace("_", "")
+
+            # em-dash when 8 or more act as a separator
+            line = reg1.sub("", line)
+            # deleted words E.g. "as soon as Mr. —— had left the ship"
+            line = reg2.sub(" QQ ", line)
+
+            # consider exactly two em-dashes as one - WHY?
+            # dbuf[line_index] = re.sub(
+            #     r"([^—])——([^—])", double_dash_replace, dbuf[line_index]
+            # )
+
+            # hyphen-minus between two letters. E.g:
+            # sand-hill
+            # Repeat to deal with lines like:
+            #   "pur-r-rta-a-a-tu-ur? I b’long to the Twenty-secun’ Nor’ Ka-a-a-li-i-na"
+            line = reg3.sub("QQ", line)
+            line = reg3.sub("QQ", line)
+            # Repeat to deal with lines like:
+            #   "frien’-o’-mine", etc.
+            line = reg4.sub("QQ", line)
+            line = reg4.sub("QQ", line)
+            # Repeat to deal with lines like:
+            #   "by-’n-by", etc.
+            line = reg5.sub("QQ", line)
+            line = reg5.sub("QQ", line)
+            # Hyphen-minus in Lieut.-Governor, etc.
+            line = reg6.sub("QQ", line)
+            # Hyphen between two letters
+            line = reg7.sub("QQ", line)
+            line = reg7.sub("QQ", line)
+            # hyphen-minus when 8 or more act as a separator
+            line = reg8.sub("", line)
+            # non-breaking hyphen between two letters
+            line = reg9.sub("", line)
+            # figure dash between two digits
+            line = reg10.sub("", line)
+            # en-dash between two digits
+            line = reg11.sub("", line)
+            # en-dash with spaces between two digits
+            line = reg12.sub("", line)
+            # em-dash between letters with no spacing
+            line = reg13.sub("", line)
+            # em-dash between lower-case letter or 'I' and punctuation
+            line = reg14.sub("", line)
+            # em-dash between period or markup and letter
+            line = reg15.sub("", line)
+            # lower-case letter, em-dash, space, upper-case letter
+            line = reg16.sub("", line)
+            # em-dash should not end a line - may be exceptions
+            line = reg17.sub("", line)
+
+            dbuf[line_index] = line
+            line_index += 1
+
+        # FINAL PASS: flag what remains.
+
+        a_h2 = []
+        a_h4 = []
+        a_hh = []
+        a_hm = []
+        a_hy = []
+        a_nb = []
+        a_fd = []
+        a_en = []
+        a_em = []
+        a_un = []
+
+        dash_suspects_found = False
+        line_index = 0
+        counth2 = 0
+        counth4 = 0
+
+        reg18 = re.compile(r"\p{Pd}")
+        reg19 = re.compile(r"(?<!-)--(?!-)")
+        reg20 = re.compile(r"(?<!-)----(?!-)")
+        reg21 = re.compile(
+            r"\p{Pd}\p{Pd}+",
+        )
+        reg22 = re.compile(r"\p{Pd}")
+        while line_index < len(dbuf):
+            if non_text_line(dbuf[line_index]):  # Ignore page separators, etc
+                line_index += 1
+                continue
+
+            line = dbuf[line_index]
+
+            # Does line contain any dashes?
+            if reg18.search(line):
+                # Line has dashes so generate output records to flag
+                # each type of invalid dash types found.
+
+                dash_suspects_found = True
+                not_consecutive_dashes = True
+
+                # Look for pairs of hyphen-minus (keyboard "-") possibly being
+                # used in place of em-dash. We will check and flag this later.
+                if reg19.search(line):
+                    resall = reg19.findall(line)
+                    counth2 += len(resall)
+                    a_h2.append((line_index + 1, self.book[line_index]))
+                    # Delete all the pairs just found.
+                    line = reg19.sub("", line)
+                # Look for quads of hyphen-minus (keyboard "-") possibly being
+                # used in place of long em-dash. We will check and flag this later.
+                if reg20.search(line):
+                    resall = reg20.findall(line)
+                    counth4 += len(resall)
+                    a_h4.append((line_index + 1, self.book[line_index]))
+                    # Delete all the quads just found.
+                    line = reg20.sub("", line)
+                # Look for other consecutive dashes (of any kind).
+                if reg21.search(line):
+                    a_hh.append((line_index + 1, self.book[line_index]))
+                    # Delete consecutive dashes just found. Any left at final test are 'unrecognised'.
+                    line = reg21.sub("", line)
+                    not_consecutive_dashes = False
+                # Look for hyphen-minus
+                if ch_hm in line and not_consecutive_dashes:
+                    a_hm.append((line_index + 1, self.book[line_index]))
+                    # Delete dash(es) just found. Any left at final test is 'unrecognised'.
+                    line = line.replace(ch_hm, "")
+                # Look for hyphen
+                if ch_hy in line:
+                    a_hy.append((line_index + 1, self.book[line_index]))
+                    # Delete dash(es) just found. Any left at final test is 'unrcognised'.
+                    line = line.replace(ch_hy, "")
+                # Look for non-breaking hyphen
+                if ch_nb in line:
+                    a_nb.append((line_index + 1, self.book[line_index]))
+                    # Delete dash(es) just found. Any left at final test is 'unrecognised'.
+                    line = line.replace(ch_nb, "")
+                # Look for figure dash
+                if ch_fd in line:
+                    a_fd.append((line_index + 1, self.book[line_index]))
+                    # Delete dash(es) just found. Any left at final test is 'unrecognised'.
+                    line = line.replace(ch_fd, "")
+                # Look for endash
+                if ch_en in line:
+                    a_en.append((line_index + 1, self.book[line_index]))
+                    # Delete dash(es) just found. Any left at final test is 'unrecognised'.
+                    line = line.replace(ch_en, "")
+                # Look for emdash
+                if ch_em in line:
+                    a_em.append((line_index + 1, self.book[line_index]))
+                    # Delete dash(es) just found. Any left at final test is 'unrecognised'.
+                    line = line.replace(ch_em, "")
+                # If any dashes left on line at this point treat them as unrecognised
+                if reg22.search(line):
+                    a_un.append((line_index + 1, self.book[line_index]))
+
+            line_index += 1
+
+        # Generate dialog entries about remaining entries.
+
+        first_header = True
+
+        # If many pairs of "--" detected report only the first five.
 
-        # Collect a dictionary of hyphenated words as well.
+        if len(a_h2) > 0:
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            self.report.add_header("'--' (keyboard '-') found")
+
+            count = 0
+            for record in a_h2:
+                line_number = record[0]
+                line = record[1]
+
+                if count < 5:
+                    self.report_all_occurrences_on_line(
+                        r"(?<!-)--(?!-)", line, line_number
+                    )
+                count += 1
+            if count > 5:
+                if len(a_h2) - 5 == 1:
+                    output_record = "  ...1 more line"
+                else:
+                    output_record = f"  ...{len(a_h2) - 5} more lines"
+                self.report.add_footer(output_record)
+            if counth2 > 5:
+                self.report.add_footer(
+                    "",
+                    "    [Book seems to use '--' as em-dash so not reporting these further]",
+                )
+
+        # If many pairs of "----" detected report only the first five.
+
+        if len(a_h4) > 0:
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            self.report.add_header("'----' (keyboard '-') found")
+
+            count = 0
+            for record in a_h4:
+                line_number = record[0]
+                line = record[1]
+
+                if count < 5:
+                    self.report_all_occurrences_on_line(
+                        r"(?<!-)----(?!-)", line, line_number
+                    )
+                count += 1
+            if count > 5:
+                if len(a_h4) - 5 == 1:
+                    output_record = "  ...1 more line"
+                else:
+                    output_record = f"  ...{len(a_h4) - 5} more lines"
+                self.report.add_footer(output_record)
+            if counth4 > 5:
+                self.report.add_footer(
+                    "",
+                    "    [Book seems to use '----' as long em-dash so not reporting these further]",
+                )
+
+        # Report other consecutive dashes
+
+        if len(a_hh) > 0:
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            self.report.add_header(
+                "Adjacent dashes (expected at least 8 emdash or keyboard '-' as a separator)"
+            )
+
+            for record in a_hh:
+                line_number = record[0]
+                line = record[1]
+                self.report_multiple_occurrences_on_line(
+                    r"(\p{Pd}\p{Pd}+)", line, line_number
+                )
+
+        # Report hyphen-minus
+
+        if len(a_hm) > 0:
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            self.report.add_header("Hyphen-minus (single keyboard '-')")
+            for record in a_hm:
+                line_number = record[0]
+                line = record[1]
+                pattern = r"(?<![\p{Pd}\p{L}])-(?![\p{Pd}\p{L}])"
+                self.report_all_occurrences_on_line(pattern, line, line_number)
+
+        # Report hyphen
+
+        if len(a_hy) > 0:
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            self.report.add_header("Hyphen")
+            for record in a_hy:
+                line_number = record[0]
+                line = record[1]
+                self.report_all_occurrences_on_line(ch_hy, line, line_number)
+
+        # Report non-breaking hyphen
+
+        if len(a_nb) > 0:
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            self.report.add_header("Non-breaking hyphen")
+            for record in a_nb:
+                line_number = record[0]
+                line = record[1]
+                self.report_all_occurrences_on_line(ch_nb, line, line_number)
+
+        # Report figure dash
+
+        if len(a_fd) > 0:
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            self.report.add_header("Figure dash")
+            for record in a_fd:
+                line_number = record[0]
+                line = record[1]
+                self.report_all_occurrences_on_line(ch_fd, line, line_number)
+
+        # Report en-dash
+
+        if len(a_en) > 0:
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            self.report.add_header("En-dash")
+            for record in a_en:
+                line_number = record[0]
+                line = record[1]
+                self.report_all_occurrences_on_line(ch_en, line, line_number)
+
+        # Report em-dash
 
-        wol = get_words_on_line(line)
-        word_list_map_words.append(wol)
-        for word in wol:
-            if word in word_list_map_count:
-                word_list_map_count[word] += 1
+        if len(a_em) > 0:
+            if first_header:
+                first_header = False
+            else:
+                self.report.add_header("")
+            self.report.add_header("Em-dash")
+            for record in a_em:
+                line_number = record[0]
+                line = record[1]
+                self.report_all_occurrences_on_line(ch_em, line, line_number)
+
+        # Report unrecognised dash
+
+        if len(a_un) > 0:
+            if first_header:
+                first_header = False
             else:
-                word_list_map_count[word] = 1
+                self.report.add_header("")
+            self.report.add_header("Unrecognised dash")
+            for record in a_un:
+                line_number = record[0]
+                line = record[1]
+                self.report_all_occurrences_on_line(r"\p{Pd}", line, line_number)
+
+        # All book lines scanned.
+        if not dash_suspects_found:
+            self.report.add_footer("", "    No dash suspects found.")
+
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+    ######################################################################
+    # scanno check
+    ######################################################################
+
+    def scanno_check(self) -> None:
+        """Checks the 'words' on a line against a long list
+        of commonly misspelled words."""
+
+        self.report.add_header(
+            "----- Scannos check ------------------------------------------------------------"
+        )
 
-            if word in word_list_map_lines:
-                word_list_map_lines[word].append(line_number)
+        scanno_dictionary = build_scanno_dictionary()
+        scanno_outrecs: Dict[str, list[tuple]] = {}
+        no_scannos_found = True
+
+        for line_index, line in enumerate(self.book):
+            if non_text_line(line):
+                continue
+
+            # We have the list of words on the line already in the
+            # array 'word_list_map_words]'. It is indexed from zero.
+            word_list = self.word_list_map_words[line_index]
+            previously_found_on_this_line = []
+
+            # Look for scannos among the words on this line.
+            for word in word_list:
+                word_lc = word.lower()
+                if (word_lc in scanno_dictionary) and (
+                    word_lc not in previously_found_on_this_line
+                ):
+                    # word on line is a scanno and we haven't seen it before on the line.
+                    no_scannos_found = False
+                    # We only want to create a tuple here for the first instance
+                    # of a scanno on this line, ignoring case. When we use the
+                    # tuples below to add dialog records, we will also find and
+                    # report to the dialog other instances of the same scanno on
+                    # this line.
+                    previously_found_on_this_line.append(word_lc)
+                    # Add to list of tuples from which dialog entries
+                    # will be generated later.
+                    if word_lc not in scanno_outrecs:
+                        scanno_outrecs[word_lc] = [(line_index + 1, line)]
+                    else:
+                        scanno_outrecs[word_lc].append((line_index + 1, line))
+
+        # We're done looking for scannos on each line. Report what we found.
+        # NB 'scanno_outrecs' is a dictionary. The keys are a scanno and the
+        #    value is a list of tuples: [(line number, line text), ...]
+
+        first_header = True
+        for scanno, tple_list in scanno_outrecs.items():
+            # The value of each scanno key in scanno_outrecs dictionary
+            # is a list of tuples: (line_number, line). For a given scanno
+            # only one instance of it on a line has been noted in a tuple.
+            # Find and add to dialog other instances that may also be on
+            # the line.
+
+            if first_header:
+                first_header = False
             else:
-                word_list_map_lines[word] = [line_number]
-
-    ###################################################
-    # We're done reading the input. Start processing it.
-    ###################################################
-
-    if preferences.get(PrefKey.PPTXT_FILE_ANALYSIS_CHECK):
-        file_analysis_check()
-    if preferences.get(PrefKey.PPTXT_SPACING_CHECK):
-        spacing_check()
-    if preferences.get(PrefKey.PPTXT_REPEATED_WORDS_CHECK):
-        repeated_words_check()
-    if preferences.get(PrefKey.PPTXT_ELLIPSIS_CHECK):
-        ellipsis_check()
-    if preferences.get(PrefKey.PPTXT_CURLY_QUOTE_CHECK):
-        curly_quote_check()
-    if preferences.get(PrefKey.PPTXT_HYPHENATED_WORDS_CHECK):
-        hyphenated_words_check()
-    if preferences.get(PrefKey.PPTXT_ADJACENT_SPACES_CHECK):
-        adjacent_spaces_check()
-    if preferences.get(PrefKey.PPTXT_DASH_REVIEW_CHECK):
-        dash_review_check()
-    if preferences.get(PrefKey.PPTXT_SCANNO_CHECK):
-        scanno_check()
-    if preferences.get(PrefKey.PPTXT_WEIRD_CHARACTERS_CHECK):
-        weird_characters_check()
-    if preferences.get(PrefKey.PPTXT_HTML_CHECK):
-        html_check()
-    if preferences.get(PrefKey.PPTXT_UNICODE_NUMERIC_CHARACTER_CHECK):
-        unicode_numeric_character_check()
-    if preferences.get(PrefKey.PPTXT_SPECIALS_CHECK):
-        specials_check(project_dict)
-
-    # Add final divider line to dialog.
-
-    checker_dialog.add_footer(f"{'-' * 80}")
-    checker_dialog.display_entries()
-    # Select first entry (which might not be one with a line number)
-    checker_dialog.select_entry_by_index(0)
+                self.report.add_header("")
+            # Header is the scanno.
+            self.report.add_header(scanno)
+
+            for cnt, tple in enumerate(tple_list):
+                if cnt >= self.report_limit:
+                    self.report.add_footer("  ...more")
+                    break
+
+                line_number = tple[0]
+                line = tple[1]
+
+                # We know that scanno appears at least once on line; it may
+                # be repeated, possibly in a different case.
+                # Get all occurrences of scanno on line and report them.
+
+                regx = r"(?<!\p{L}|\p{Nd})" + scanno + r"(?!\p{L}|\p{Nd})"
+                match_list = list(re.finditer(regx, line, re.IGNORECASE))
+                if not match_list:
+                    continue
+                multiplier = f"(x{len(match_list)}) " if len(match_list) > 1 else ""
+                # Get start/end of all errors on line.
+                start_rowcol = IndexRowCol(line_number, match_list[0].start(0))
+                end_rowcol = IndexRowCol(line_number, match_list[-1].end(0))
+                # Highlight occurrence of word in the line.
+                hilite_start = match_list[0].start(0) + len(multiplier)
+                hilite_end = match_list[-1].end(0) + len(multiplier)
+                # Add record to the dialog.
+                self.report.add_entry(
+                    f"{multiplier}{line}",
+                    IndexRange(start_rowcol, end_rowcol),
+                    hilite_start,
+                    hilite_end,
+                )
+
+        if no_scannos_found:
+            self.report.add_footer("")
+            self.report.add_footer("    No scannos found.")
+
+        # Add line spacer at end of this checker section.
+        self.report.add_footer("")
+
+
+_worker_analysis: Optional[PPtxtAnalysis] = None
+
+
+def _init_worker(analysis: PPtxtAnalysis) -> None:
+    """Store analysis in worker process, so it is only sent once per worker.
+
+    Args:
+        analysis: Analysis to run checks on.
+    """
+    global _worker_analysis
+    _worker_analysis = analysis
+
+
+def _run_worker_check(check_name: str) -> CheckerReport:
+    """Run one check in worker process.
+
+    Args:
+        check_name: Name of check method, e.g. "spacing_check".
+
+    Returns:
+        Report containing the messages output by the check.
+    """
+    assert _worker_analysis is not None
+    return _worker_analysis.run_check(check_name)
+
+
+def iter_pptxt_checks(
+    analysis: PPtxtAnalysis, check_names: list[str]
+) -> Iterator[CheckerReport]:
+    """Run the given checks on the analysis, yielding each report when ready.
+
+    For large files, checks are run concurrently in worker processes. If that
+    isn't possible, they are run in this process.
+
+    Args:
+        analysis: Analysis to run checks on.
+        check_names: Names of check methods, e.g. "spacing_check".
+
+    Yields:
+        Reports, in the same order as `check_names`.
+    """
+    n_done = 0
+    n_workers = min(len(check_names), os.cpu_count() or 1)
+    if n_workers > 1 and len(analysis.book) >= PARALLEL_MIN_LINES:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(analysis,),
+            ) as executor:
+                try:
+                    for report in executor.map(_run_worker_check, check_names):
+                        yield report
+                        n_done += 1
+                finally:
+                    # Don't wait for queued checks if caller stops early
+                    executor.shutdown(wait=False, cancel_futures=True)
+            return
+        except (OSError, BrokenProcessPool) as exc:
+            logger.debug(f"PPtxt worker processes failed, so running serially: {exc}")
+    for check_name in check_names[n_done:]:
+        yield analysis.run_check(check_name)
+
+
+def run_pptxt_checks(
+    analysis: PPtxtAnalysis, check_names: list[str]
+) -> list[CheckerReport]:
+    """Run the given checks on the analysis.
+
+    Args:
+        analysis: Analysis to run checks on.
+        check_names: Names of check methods, e.g. "spacing_check".
+
+    Returns:
+        List of reports, in the same order as `check_names`.
+    """
+    return list(iter_pptxt_checks(analysis, check_names))
+
+
+##
+# PPTXT Main Function
+##
+
+
+def pptxt(project_dict: ProjectDict) -> None:
+    """Top-level pptxt function.
+
+    Checks are run in the background, so the user can carry on working.
+    """
+
+    if not tool_save():
+        return
+
+    # Create the checker dialog to show results
+    checker_dialog = PPtxtCheckerDialog.show_dialog(
+        rerun_command=lambda: pptxt(project_dict),
+    )
+    verbose = preferences.get(PrefKey.PPTEXT_VERBOSE)
+    check_names = [name for prefkey, name in PPTXT_CHECKS if preferences.get(prefkey)]
+
+    def analyze(document: DocumentSnapshot, report: CheckerReport) -> None:
+        """Analyse the whole of the file, then run the checks on it."""
+        analysis = PPtxtAnalysis(document.text, project_dict, verbose=verbose)
+        # Count analysis as one step, plus one per check
+        n_steps = len(check_names) + 1
+        report.progress(1 / n_steps)
+        for n_done, check_report in enumerate(
+            iter_pptxt_checks(analysis, check_names), start=2
+        ):
+            report.records.extend(check_report.records)
+            report.progress(n_done / n_steps)
+        # Add final divider line to dialog.
+        report.add_footer(f"{'-' * 80}")
+
+    CheckerJob(
+        checker_dialog,
+        "PPtxt",
+        analyze,
+        # Select first entry (which might not be one with a line number)
+        on_complete=lambda: checker_dialog.select_entry_by_index(0),
+    ).start()
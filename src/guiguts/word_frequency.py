@@ -19,6 +19,7 @@ from guiguts.preferences import (
     PersistentString,
     PrefKey,
 )
+from guiguts.profiling import timed
 from guiguts.search import SearchDialog
 from guiguts.utilities import (
     sing_plur,
@@ -1387,6 +1388,7 @@ class WordFrequencyDialog(ToplevelDialog):
         dlg.display_entries()
 
 
+@timed("Word Frequency")
 def word_frequency() -> None:
     """Do word frequency analysis on file."""
     global _the_word_lists
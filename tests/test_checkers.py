@@ -1,13 +1,34 @@
 """Test functions for Checker tools."""
 
+import difflib
+import json
+from pathlib import Path
+import random
+
 import pytest
 
 from guiguts.application import Guiguts
+from guiguts.checkers import CheckerEntryType
 from guiguts.file import the_file
+from guiguts.headless import batch_headless, check_file
 from guiguts.spell import spell_check, SpellCheckerDialog
 from guiguts.tools.jeebies import jeebies_check, JeebiesCheckerDialog
 from guiguts.tools.pphtml import PPhtmlChecker, PPhtmlCheckerDialog
-from guiguts.tools.pptxt import pptxt, PPtxtCheckerDialog
+from guiguts.project_dict import ProjectDict
+from guiguts.tools.pptxt import (
+    pptxt,
+    PPtxtCheckerDialog,
+    PPtxtAnalysis,
+    run_pptxt_checks,
+)
+from guiguts.tools.ppcomp import (
+    compare_files,
+    diff_opcodes,
+    load_pgdp_file,
+    PgdpFileHtml,
+    PGDP_FILE_CACHE_FILES,
+    _pgdp_file_cache,
+)
 from .test_support import run_test
 
 
@@ -89,3 +110,217 @@ def test_pphtml_output(
         lambda: PPhtmlChecker().run(),
         PPhtmlCheckerDialog,
     )
+
+
+def test_pptxt_analysis() -> None:
+    """Test PPtxt checks can be run without the dialog."""
+    analysis = PPtxtAnalysis("The the cat sat\non the\nthe mat.\n", ProjectDict())
+    check_names = ["repeated_words_check", "file_analysis_check"]
+    reports = run_pptxt_checks(analysis, check_names)
+    assert len(reports) == len(check_names)
+    entries = [
+        args
+        for entry_type, args, _ in reports[0].records
+        if entry_type == CheckerEntryType.CONTENT
+    ]
+    assert [entry[0] for entry in entries] == ["on the\nthe mat."]
+    assert entries[0][1].start.rowcol() == (2, 3)
+    assert entries[0][1].end.rowcol() == (3, 3)
+
+
+def test_pptxt_repeated_words() -> None:
+    """Test PPtxt repeated words check on same and adjacent lines."""
+    text = "that's very, very true\nthe the the 12 12\nsand sand-hill and\nand then"
+    report = PPtxtAnalysis(text, ProjectDict()).run_check("repeated_words_check")
+    ranges = [
+        (args[1].start.rowcol(), args[1].end.rowcol())
+        for entry_type, args, _ in report.records
+        if entry_type == CheckerEntryType.CONTENT
+    ]
+    assert ranges == [((2, 0), (2, 11)), ((3, 0), (3, 9)), ((3, 15), (4, 3))]
+
+
+def test_ppcomp_diff_opcodes() -> None:
+    """Test anchored PPcomp diff gives same opcodes as a full SequenceMatcher."""
+    words_a = (
+        "On the means of identifying the authors of 35 anonymous and "
+        "pseudonymous publications List of Works by a Lady 40 Preface to "
+        "the Second Edition with Notes and Index 45 The end of the book is near and the end of the line is here"
+    ).split()
+    words_b = (
+        "On the means of identifying the authors of anonymous and "
+        "pseudonymous publications 35 List of Works by a Lady 40 Preface to "
+        "the Second Edition with Notes and Index 45 The end of this book is near and the end of the line is there"
+    ).split()
+    # Paragraph repeated, so a longer match crosses the one around unique words
+    unique = [f"unique{idx}" for idx in range(10)]
+    para = [f"word{idx}" for idx in range(100)]
+    for a, b in (
+        (words_a, words_b),
+        (words_b, words_a),
+        (words_a, []),
+        ([], []),
+        (unique + para + para, para + unique),
+    ):
+        expected = difflib.SequenceMatcher(a=a, b=b, autojunk=False).get_opcodes()
+        assert diff_opcodes(a, b) == expected
+
+
+def test_ppcomp_diff_opcodes_random_edits() -> None:
+    """Test anchored PPcomp diff matches SequenceMatcher after random edits to a book."""
+    text = (Path(__file__).parent / "input" / "pp_complete.txt").read_text(
+        encoding="utf-8"
+    )
+    words_a = text.split()
+    # Doubled word, where either neighboring match could claim the repeat
+    edits = [text.replace("books in the British", "books in the the British").split()]
+    rng = random.Random(20260501)
+    for _ in range(5):
+        words_b = list(words_a)
+        for _ in range(rng.randint(1, 5)):
+            idx = rng.randrange(len(words_b))
+            edit = rng.choice(("double", "delete", "replace", "insert", "repeat"))
+            if edit == "double":
+                words_b.insert(idx, words_b[idx])
+            elif edit == "repeat":  # Copy a passage elsewhere
+                start = rng.randrange(len(words_b))
+                words_b[idx:idx] = words_b[start : start + rng.randint(20, 200)]
+            elif edit == "delete":
+                del words_b[idx]
+            elif edit == "replace":
+                words_b[idx] = rng.choice(words_a)
+            else:
+                words_b.insert(idx, rng.choice(words_a))
+        edits.append(words_b)
+    for words_b in edits:
+        expected = difflib.SequenceMatcher(
+            a=words_a, b=words_b, autojunk=False
+        ).get_opcodes()
+        assert diff_opcodes(words_a, words_b) == expected
+
+
+def test_ppcomp_load_cache(tmp_path: Path) -> None:
+    """Test cached PPcomp files are protected from changes and reloaded if edited."""
+    html_path = tmp_path / "test.html"
+    html_path.write_text(
+        "<!DOCTYPE html>\n<html><head><title>T</title></head>\n"
+        "<body><p>The quick brown fox.</p></body></html>\n",
+        encoding="utf-8",
+    )
+    first = load_pgdp_file(str(html_path))
+    assert first.text.strip() == "The quick brown fox."
+    first.text = "Changed by caller"
+    assert load_pgdp_file(str(html_path)).text.strip() == "The quick brown fox."
+
+    html_path.write_text(
+        "<!DOCTYPE html>\n<html><head><title>T</title></head>\n"
+        "<body><p>The slow brown fox jumped.</p></body></html>\n",
+        encoding="utf-8",
+    )
+    assert load_pgdp_file(str(html_path)).text.strip() == "The slow brown fox jumped."
+    # Only stages for latest version of file are kept
+    stages = _pgdp_file_cache[str(html_path.resolve())]
+    assert len(stages) == 1 + len(PgdpFileHtml.cleanup_stages)
+
+    # Only most recently loaded files are kept
+    text_paths = [tmp_path / f"test{num}.txt" for num in range(PGDP_FILE_CACHE_FILES)]
+    for text_path in text_paths:
+        text_path.write_text("The quick brown fox.\n", encoding="utf-8")
+        load_pgdp_file(str(text_path))
+    assert len(_pgdp_file_cache) == PGDP_FILE_CACHE_FILES
+    assert str(html_path.resolve()) not in _pgdp_file_cache
+    assert str(text_paths[0].resolve()) in _pgdp_file_cache
+
+
+def test_ppcomp_compare_files() -> None:
+    """Test comparing files with PPcomp without using the GUI."""
+    input_dir = Path(__file__).parent / "input"
+    result = compare_files(
+        str(input_dir / "pp_complete.txt"), str(input_dir / "pp_complete.html")
+    )
+    assert "error" not in result
+    assert {
+        "file1_line": 65,
+        "file2_line": 198,
+        "text": "On the means of identifying the authors of ⦓35⦔",
+    } in result["diffs"]
+    result = compare_files(str(input_dir / "pp_complete.txt"), "nonexistent.txt")
+    assert result["error"] == "Cannot load file: nonexistent.txt"
+
+
+def test_headless_check(tmp_path: Path) -> None:
+    """Test running a checker tool without using the GUI."""
+    text_path = tmp_path / "test.txt"
+    text_path.write_text(
+        "\ufeffThe quick brown fox jumped over the lazy dog and ran off to a\n"
+        "far-away place on the other side of the hill, where he -\n"
+        "stayed.\n",
+        encoding="utf-8",
+    )
+    records = check_file(str(text_path), "bookloupe")
+    assert {
+        "file": str(text_path),
+        "tool": "bookloupe",
+        "type": "content",
+        "message": "Spaced dash",
+        "severity": "info",
+        "row": 2,
+        "col": 54,
+        "end_row": 2,
+        "end_col": 56,
+    } in records
+    records = check_file(str(tmp_path / "nonexistent.txt"), "bookloupe")
+    assert len(records) == 1
+    assert records[0]["type"] == "error"
+    # Malformed bin file gives error record, rather than exception
+    bad_path = tmp_path / "bad.txt"
+    bad_path.write_text("Some text.\n", encoding="utf-8")
+    (tmp_path / "bad.txt.json").write_text(
+        '{"pagedetails": {"001": {"index": "1.0", "number": "1"}}}',
+        encoding="utf-8",
+    )
+    records = check_file(str(bad_path), "bookloupe")
+    assert len(records) == 1
+    assert records[0]["type"] == "error"
+    assert "style" in records[0]["message"]
+
+
+def test_headless_batch(tmp_path: Path) -> None:
+    """Test running checker tools on a tree of projects."""
+    project_dir = tmp_path / "projects" / "book"
+    project_dir.mkdir(parents=True)
+    (project_dir / "book.txt").write_text(
+        "A line that is long enough not to be reported as a short line here.\n"
+        "\n"
+        "-----File: 002.png-----\n"
+        "Another paragraph - with a spaced dash in it, on the second page.\n",
+        encoding="utf-8",
+    )
+    (project_dir / "book.txt.json").write_text(
+        json.dumps(
+            {
+                "pagedetails": {
+                    "001": {"index": "1.0", "style": "Arabic", "number": "1"},
+                    "002": {"index": "3.0", "style": '"', "number": "+1"},
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    (tmp_path / "projects" / "notes.txt").write_text("Not a project", encoding="utf-8")
+    report_dir = tmp_path / "reports"
+    assert (
+        batch_headless(str(tmp_path / "projects"), ["bookloupe"], str(report_dir)) == 0
+    )
+
+    summary = json.loads((report_dir / "summary.json").read_text(encoding="utf-8"))
+    assert [project["project"] for project in summary["projects"]] == [
+        str(Path("book", "book.txt"))
+    ]
+    assert set(summary["tool_times"]) == {"bookloupe"}
+    report = (report_dir / "book" / "book.txt.jsonl").read_text(encoding="utf-8")
+    records = [json.loads(line) for line in report.splitlines()]
+    spaced = [record for record in records if record["message"] == "Spaced dash"]
+    assert spaced[0]["row"] == 4
+    assert spaced[0]["page"] == "002"
+    assert spaced[0]["page_label"] == "Pg 2"
@@ -1,9 +1,34 @@
 """Test functions"""
 
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from PIL import Image
+import pytest
+
 from guiguts.application import Guiguts
+from guiguts.change_scheduler import ChangeKind, ChangeScheduler
+from guiguts.checkers import CheckerEntryType, CheckerReport
+from guiguts.content_providing import compress_png_file
 from guiguts.file import File
+from guiguts.image_cache import (
+    ImageRendering,
+    is_grayscale,
+    PageImageCache,
+    TILE_SIZE,
+    visible_tiles,
+)
+from guiguts.maintext import changed_lines, EntryMetadata, PaletteIndex
+from guiguts.misc_dialogs import unicode_name_index
 from guiguts.preferences import preferences, PrefKey
+from guiguts.tools import pphtml
+from guiguts.tools.pphtml import read_image_metadata, scan_image_metadata
+from guiguts import profiling
 from guiguts.utilities import (
+    IndexRange,
+    IndexRowCol,
     is_mac,
     is_windows,
     is_x11,
@@ -67,3 +92,366 @@ def test_mainwindow(guiguts_app: Guiguts) -> None:  # pylint: disable=unused-arg
     accel, event = process_accel("Shift+Ctrl+Z")
     assert accel == "Shift+Ctrl+Z"
     assert event == "<Shift-Control-Z>"
+
+
+class CountedWidget:
+    """Stand-in for text widget with methods whose calls are counted."""
+
+    def get(self, *_args: Any) -> str:
+        """Dummy get."""
+        return ""
+
+    def index(self, *_args: Any) -> str:
+        """Dummy index."""
+        return "1.0"
+
+    def search(self, *_args: Any, **_kwargs: Any) -> str:
+        """Dummy search."""
+        return ""
+
+    def mark_set(self, *_args: Any) -> None:
+        """Dummy mark_set."""
+
+    def tag_add(self, *_args: Any) -> None:
+        """Dummy tag_add."""
+
+
+def test_timing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test timing instrumentation and trace file"""
+    widget = CountedWidget()
+    monkeypatch.setitem(preferences.dict, PrefKey.TOOL_TIMING, True)
+    monkeypatch.setattr(preferences, "prefsdir", str(tmp_path))
+    monkeypatch.setattr(profiling, "_TRACE_FILE", None)
+    monkeypatch.setattr(profiling, "_TK_WIDGET", widget)
+
+    @profiling.timed("Inner")
+    def inner() -> None:
+        widget.index("1.0")
+        widget.search("x", "1.0", regexp=True)
+        profiling.note_entries(3)
+
+    with profiling.Timing("Outer"):
+        widget.get("1.0")
+        inner()
+        profiling.note_entries(5)
+    # Counting wrappers are removed afterwards
+    assert "get" not in vars(widget)
+
+    trace = (tmp_path / profiling.TRACE_FILE_NAME).read_text(encoding="utf-8")
+    events = json.loads(trace.rstrip(",\n") + "]")
+    assert [event["name"] for event in events] == ["Inner", "Outer"]
+    assert events[0]["args"]["tk_calls"] == {"index": 1, "search": 1}
+    assert events[0]["args"]["entries"] == 3
+    assert events[1]["args"]["tk_calls"] == {"get": 1, "index": 1, "search": 1}
+    assert events[1]["args"]["entries"] == 5
+    assert events[1]["dur"] >= events[0]["dur"]
+
+
+def test_profile_next_command(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only the next command is profiled"""
+    monkeypatch.setattr(preferences, "prefsdir", str(tmp_path))
+    monkeypatch.setattr(preferences, "permanent", False)
+    monkeypatch.setitem(preferences.dict, PrefKey.PROFILE_NEXT_COMMAND, True)
+    command = profiling.profiled_command("Sum ~Squares", lambda: sum(range(1000)))
+
+    assert command() == 499500
+    assert not preferences.get(PrefKey.PROFILE_NEXT_COMMAND)
+    profiles = list(tmp_path.glob("guiguts_profile_sum_squares_*.prof"))
+    assert len(profiles) == 1
+    assert command() == 499500
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+
+
+def test_page_image_cache(tmp_path: Path) -> None:
+    """Test caching of page images"""
+    paths = []
+    for page in range(3):
+        path = tmp_path / f"00{page}.png"
+        Image.new("L", (200, 100), color=64 * page).save(path)
+        paths.append(str(path))
+    gray = Image.new("RGB", (200, 100), color=(90, 90, 90))
+    assert is_grayscale(gray)
+    gray.putpixel((199, 99), (90, 91, 90))
+    assert not is_grayscale(gray)
+    assert is_grayscale(gray.convert("L").convert("P"))
+    assert not is_grayscale(gray.convert("P"))
+
+    # Limit is enough for two decoded images & a few scaled ones
+    cache = PageImageCache(limit_mb=1)
+    cache.limit = 2 * 200 * 100 * 3 + 10000
+
+    image, grayscale = cache.decoded(paths[0], 0)
+    assert grayscale and image.mode == "RGB" and image.size == (200, 100)
+    assert cache.decoded(paths[0], 0)[0] is image
+    assert cache.decoded(paths[0], 90)[0].size == (100, 200)
+
+    rendering = ImageRendering(scale=0.5, invert=True, alpha=200)
+    assert rendering.level_for(200, 100) == 1
+    tile = cache.tile(paths[0], 0, rendering, 0, 0)
+    assert tile.size == (101, 51)
+    assert tile.getpixel((0, 0)) == (255, 255, 255, 200)
+    assert cache.tile(paths[0], 0, rendering, 0, 0) is tile
+    fitted = ImageRendering(scale=0.5, fit_width=2 * TILE_SIZE + 10)
+    assert fitted.level_for(200, 100) == 0
+    assert fitted.scaled_size(200, 100) == (2 * TILE_SIZE + 11, TILE_SIZE + 6)
+    assert cache.tile(paths[0], 0, fitted, 2, 1).size == (11, 6)
+    assert visible_tiles((2 * TILE_SIZE + 11, TILE_SIZE + 6), (10, 10, 300, 100)) == [
+        (0, 0),
+        (1, 0),
+    ]
+
+    # Least recently used images are discarded to stay within limit
+    cache.decoded(paths[1], 0)
+    cache.decoded(paths[2], 0)
+    assert cache.size <= cache.limit
+    assert cache.decoded(paths[0], 0)[0] is not image
+
+    # Prefetched images are ready when needed
+    cache.clear()
+    cache.prefetch([(paths[1], 0)], rendering, (50, 50))
+    cache._prefetch_queue.join()  # pylint: disable=protected-access
+    # Full size & reduced images, the latter also inverted with alpha, and tile
+    prefetched_size = 200 * 100 * 3 + 100 * 50 * 3 + 100 * 50 * 4 + 101 * 51 * 4
+    assert cache.size == prefetched_size
+    cache.tile(paths[1], 0, rendering, 0, 0)
+    assert cache.size == prefetched_size
+
+    # Prefetching never discards the page being viewed
+    cache.clear()
+    image = cache.decoded(paths[0], 0)[0]
+    cache.prefetch([(paths[1], 0), (paths[2], 0)], rendering, (50, 50))
+    cache._prefetch_queue.join()  # pylint: disable=protected-access
+    assert cache.size <= cache.limit
+    assert cache.decoded(paths[0], 0)[0] is image
+    # or prefetches an image that won't fit beside it
+    cache.clear()
+    cache.limit = 200 * 100 * 3 + 10000
+    image = cache.decoded(paths[0], 0)[0]
+    cache.prefetch([(paths[1], 0)], rendering, (50, 50))
+    cache._prefetch_queue.join()  # pylint: disable=protected-access
+    assert cache.size == 200 * 100 * 3
+    assert cache.decoded(paths[0], 0)[0] is image
+
+
+def test_compress_png_file(tmp_path: Path) -> None:
+    """Test compressing a PNG file with Pillow"""
+    src = tmp_path / "001.png"
+    Image.new("L", (100, 100), color=255).save(src, compress_level=0)
+    result = compress_png_file([], src, tmp_path / "new.png")
+    assert not result.error
+    assert result.size_after < result.size_before == src.stat().st_size
+    assert (tmp_path / "new.png").stat().st_size == result.size_after
+
+    # Original is kept if it can't be made smaller
+    result = compress_png_file([], tmp_path / "new.png", tmp_path / "newer.png")
+    assert result.size_after == result.size_before
+    assert (tmp_path / "newer.png").read_bytes() == (tmp_path / "new.png").read_bytes()
+
+    src.write_text("Not a PNG")
+    result = compress_png_file([], src, tmp_path / "bad.png")
+    assert result.error.endswith("Unable to identify image")
+
+    result = compress_png_file([], tmp_path / "missing.png", tmp_path / "none.png")
+    assert result.error.startswith("Failed to compress")
+
+
+def test_read_image_metadata(tmp_path: Path) -> None:
+    """Test reading image metadata for PPhtml"""
+    Image.new("RGB", (30, 20)).save(tmp_path / "i_001.jpg")
+    data = read_image_metadata(str(tmp_path / "i_001.jpg"))
+    assert data is not None
+    assert (data.width, data.height, data.format, data.mode) == (30, 20, "JPEG", "RGB")
+    assert data.filesize == (tmp_path / "i_001.jpg").stat().st_size
+    (tmp_path / "i_002.svg").write_text('<?xml version="1.0"?>\n<svg></svg>')
+    data = read_image_metadata(str(tmp_path / "i_002.svg"))
+    assert data is not None and data.format == "SVG"
+    (tmp_path / "i_003.png").write_text("<svg></svg>")
+    assert read_image_metadata(str(tmp_path / "i_003.png")) is None
+
+
+def test_unicode_name_index() -> None:
+    """Test searching for Unicode characters by words in their names"""
+    assert unicode_name_index.matches(["no-break", "space"]) == [0xA0, 0x202F, 0xFEFF]
+    # Parts of hyphenated words also match, but not parts of words
+    assert 0xA0 in unicode_name_index.matches(["break"])
+    assert 0x2011 not in unicode_name_index.matches(["break"])  # NON-BREAKING
+    assert unicode_name_index.matches(["small", "latin", "a"])[0] == ord("a")
+    assert not unicode_name_index.matches(["latin", "nosuchword"])
+    assert not unicode_name_index.matches([])
+
+
+def test_palette_index() -> None:
+    """Test filtering & ranking command palette commands"""
+    index = PaletteIndex(
+        [
+            EntryMetadata("~Find Next", "~Search", ""),
+            EntryMetadata("~Spelling Check", "~Tools", ""),
+            EntryMetadata("Re~place All", "~Search", ""),
+            EntryMetadata("Save ~As...", "~File", ""),
+        ]
+    )
+    assert index.scores("") == dict.fromkeys(range(4), PaletteIndex.PREFIXMATCH)
+    assert index.scores("s") == dict.fromkeys(range(4), PaletteIndex.MENUMATCH) | {
+        1: PaletteIndex.PREFIXMATCH,
+        3: PaletteIndex.PREFIXMATCH,
+    }
+    # Typed characters must appear in order, but not necessarily together
+    assert list(index.scores("se")) == [0, 1, 2, 3]
+    assert list(index.scores("sear")) == [0, 2]
+    assert index.scores("sear")[2] == PaletteIndex.MENUMATCH
+    assert list(index.scores("spck")) == [1]
+    assert not index.scores("sz")
+    assert index.scores("check")[1] == PaletteIndex.SUBSTRMATCH
+
+
+def test_change_scheduler() -> None:
+    """Test running passes after changes to main text"""
+
+    class IdleWidget:
+        """Stands in for widget, to run scheduled functions on request."""
+
+        def __init__(self) -> None:
+            self.idle: list[Any] = []
+            self.later: list[Any] = []
+
+        def after_idle(self, func: Any) -> None:
+            """Schedule function to run when idle."""
+            self.idle.append(func)
+
+        def after(self, _ms: int, func: Any) -> None:
+            """Schedule function to run later."""
+            self.later.append(func)
+
+    widget = IdleWidget()
+    scheduler = ChangeScheduler(widget)  # type: ignore[arg-type]
+    runs: list[str] = []
+    inputs = {"text": "abc"}
+    scheduler.add_pass("always", lambda: runs.append("always"))
+    scheduler.add_pass("view", lambda: runs.append("view"), ChangeKind.VIEW)
+    scheduler.add_pass(
+        "text",
+        lambda: runs.append("text"),
+        ChangeKind.TEXT,
+        inputs=lambda: inputs["text"],
+    )
+
+    # Several changes only schedule one run
+    scheduler.changed(ChangeKind.TEXT)
+    scheduler.changed(ChangeKind.CURSOR)
+    assert len(widget.idle) == 1
+    widget.idle.pop()()
+    assert runs == ["always", "text"]
+    # Pass skipped if inputs unchanged, unless invalidated
+    runs.clear()
+    scheduler.changed(ChangeKind.ALL)
+    widget.idle.pop()()
+    assert runs == ["always", "view"]
+    scheduler.invalidate("text")
+    scheduler.changed(ChangeKind.TEXT)
+    widget.idle.pop()()
+    assert runs == ["always", "view", "always", "text"]
+
+    # Slow pass is deferred if it ran recently
+    runs.clear()
+    inputs["text"] = "abcd"
+    scheduler.passes["text"].avg_secs = 1.0
+    scheduler.changed(ChangeKind.TEXT)
+    widget.idle.pop()()
+    assert runs == ["always"] and len(widget.later) == 1
+    widget.later.pop()()
+    assert runs == ["always", "text"]
+
+
+def test_changed_lines() -> None:
+    """Test finding lines changed by an edit"""
+    old = ["one", "two", "three", "four"]
+    assert changed_lines(old, old) == (4, 4)
+    assert changed_lines(old, ["one", "TWO", "three", "four"]) == (1, 2)
+    assert changed_lines(old, ["one", "two", "new", "three", "four"]) == (2, 3)
+    assert changed_lines(old, ["one", "four"]) == (1, 1)
+    assert changed_lines(old, ["zero", "one", "two", "three", "four"]) == (0, 1)
+    assert changed_lines(old, ["one", "two", "three", "four", "five"]) == (4, 5)
+    # Repeated lines are not counted twice as both prefix & suffix
+    assert changed_lines(["a", "a"], ["a", "a", "a"]) == (2, 3)
+    assert changed_lines(["a", "a", "a"], ["a"]) == (1, 1)
+
+
+def test_checker_report_remap_rows() -> None:
+    """Test moving checker entries to allow for lines edited during a check"""
+
+    def report_rows() -> list[tuple[int, int]]:
+        return [
+            (args[1].start.row, args[1].end.row)
+            for entry_type, args, _ in report.records
+            if entry_type == CheckerEntryType.CONTENT and args[1] is not None
+        ]
+
+    old = ["one", "two", "three", "four", "five"]
+    report = CheckerReport()
+    report.add_header("Header")
+    for row in range(1, 6):
+        report.add_entry(
+            old[row - 1], IndexRange(IndexRowCol(row, 0), IndexRowCol(row, 3))
+        )
+    report.add_entry("No position")
+
+    # Two lines inserted after line 2
+    new = ["one", "two", "new", "new", "three", "four", "five"]
+    first, end = changed_lines(old, new)
+    shift = len(new) - len(old)
+    assert report.remap_rows(first, end - shift, shift) == 0
+    assert report_rows() == [(1, 1), (2, 2), (5, 5), (6, 6), (7, 7)]
+    assert report.records[3][1][0] == "three"
+
+    # Line 3 edited & line 4 deleted, so entries there can't be moved
+    report = CheckerReport()
+    for row in range(1, 6):
+        report.add_entry(
+            old[row - 1], IndexRange(IndexRowCol(row, 0), IndexRowCol(row, 3))
+        )
+    new = ["one", "two", "THREE", "five"]
+    first, end = changed_lines(old, new)
+    shift = len(new) - len(old)
+    assert report.remap_rows(first, end - shift, shift) == 2
+    assert report_rows() == [(1, 1), (2, 2), (3, 3), (4, 4), (4, 4)]
+
+
+def test_scan_image_metadata(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test image metadata for PPhtml is cached until files change"""
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    Image.new("RGB", (30, 20)).save(images_dir / "i_001.jpg")
+    Image.new("L", (10, 10)).save(images_dir / "i_002.png")
+    files = ["i_001.jpg", "i_002.png"]
+    cache_file = tmp_path / pphtml.IMAGE_METADATA_FILE
+    read_files: list[str] = []
+
+    def counting_read(filepath: str) -> Optional[pphtml.PPhtmlFileData]:
+        read_files.append(os.path.basename(filepath))
+        return read_image_metadata(filepath)
+
+    monkeypatch.setattr(pphtml, "read_image_metadata", counting_read)
+
+    first = scan_image_metadata(str(images_dir), files, str(cache_file))
+    assert sorted(read_files) == files
+    assert first["i_001.jpg"] is not None and first["i_001.jpg"].width == 30
+
+    # Unchanged files are not reread
+    read_files.clear()
+    assert scan_image_metadata(str(images_dir), files, str(cache_file)) == first
+    assert not read_files
+
+    # Changed size or modification time causes file to be reread
+    Image.new("RGB", (40, 20)).save(images_dir / "i_001.jpg")
+    stat = os.stat(images_dir / "i_002.png")
+    os.utime(images_dir / "i_002.png", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = scan_image_metadata(str(images_dir), files, str(cache_file))
+    assert sorted(read_files) == files
+    assert second["i_001.jpg"] is not None and second["i_001.jpg"].width == 40
+
+    # Invalid or unexpected cache contents are ignored
+    for contents in ("[1, 2]", "{not json", '{"i_001.jpg": "junk"}'):
+        cache_file.write_text(contents, encoding="utf-8")
+        read_files.clear()
+        assert scan_image_metadata(str(images_dir), files, str(cache_file)) == second
+        assert read_files
@@ -1,6 +1,7 @@
 """Support functions for testing."""
 
 from pathlib import Path
+import time
 import tkinter as tk
 from typing import Callable, Optional
 
@@ -35,6 +36,10 @@ def run_test(
     else:
         dlg = dialog_class.get_dialog()
         assert dlg is not None
+        # Wait for tool to finish if it runs in the background
+        while dlg.job is not None:
+            time.sleep(0.01)
+            dlg.update()
         actual_output = dlg.text.get("1.0", tk.END)
 
     try: